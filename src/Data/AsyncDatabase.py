@@ -0,0 +1,65 @@
+# src/Data/AsyncDatabase.py
+#
+# Awaitable access to Database for async servers (src/UI/WebUI/AsgiApp.py).
+#
+# The mariadb connector is blocking, so calls are offloaded to a bounded thread pool; each
+# call checks a connection out of Database's pool (src/Data/ConnectionPool.py, also
+# DB_POOL_SIZE) and hands it back when it returns. The event loop stays free while queries
+# run, so one process can hold hundreds of requests waiting on the database while at most
+# DB_POOL_SIZE of them use a connection at a time.
+#
+#   rows = await AsyncDatabase.get_report_rows(empids, None, start, end)
+#   result = await AsyncDatabase.run(some_function_that_uses_Database, arg)
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from src.Data.Database import Database
+
+DEFAULT_POOL_SIZE = 16
+
+
+class _AsyncDatabase:
+    def __init__(self, pool_size=None):
+        self.pool_size = pool_size or int(os.getenv("DB_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.__executor = None
+
+    def __get_executor(self):
+        # created on first use so importing this module starts no threads
+        if self.__executor is None:
+            self.__executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="db")
+        return self.__executor
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking function (anything that calls Database) on the pool and await its result.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__get_executor(), partial(self.__call, func, args, kwargs))
+
+    @staticmethod
+    def __call(func, args, kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            Database.release_connection()
+
+    def __getattr__(self, name):
+        method = getattr(Database, name)
+        if not callable(method):
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def shutdown(self, wait=True):
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=wait)
+            self.__executor = None
+
+
+AsyncDatabase = _AsyncDatabase()
@@ -0,0 +1,61 @@
+# src/Data/CacheBus.py
+#
+# Same-host invalidation channel between worker processes.
+#
+# Every cached entity ("projects", "employees", ...) has a stamp file in a shared directory.
+# Publishing a change appends one byte to the entity's file; checking for changes is a
+# single os.stat(), so workers can check before every cached read without touching the
+# database. The (mtime_ns, size) pair changes on every publish, even two within the same
+# clock tick, and the file is truncated back to empty when it grows past a few KB.
+#
+# This covers gunicorn workers on one host. Database still polls the cache_version table
+# now and then for changes made on other hosts.
+
+import os
+import tempfile
+
+DEFAULT_BUS_DIR = os.path.join(tempfile.gettempdir(), "time_tracker_cache_bus")
+MAX_STAMP_BYTES = 4096
+
+
+class CacheBus:
+    def __init__(self, bus_dir=None):
+        self.bus_dir = bus_dir or os.getenv("CACHE_BUS_DIR") or DEFAULT_BUS_DIR
+        try:
+            os.makedirs(self.bus_dir, exist_ok=True)
+            self.available = True
+        except OSError:
+            self.available = False
+
+    def _path(self, entity):
+        return os.path.join(self.bus_dir, f"{entity}.stamp")
+
+    def publish(self, entity):
+        """
+        Tell every process on this host that entity changed.
+        """
+        if not self.available:
+            return
+        path = self._path(entity)
+        try:
+            with open(path, "ab") as f:
+                if f.tell() >= MAX_STAMP_BYTES:
+                    f.truncate(0)
+                f.write(b".")
+        except OSError:
+            pass
+
+    def stamp(self, entity):
+        """
+        Current stamp for entity; compare with an earlier stamp to see whether it changed.
+
+        Returns:
+            (mtime_ns, size), or (0, 0) if nothing was published yet
+        """
+        if not self.available:
+            return (0, 0)
+        try:
+            st = os.stat(self._path(entity))
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return (0, 0)
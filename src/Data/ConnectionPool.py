@@ -0,0 +1,125 @@
+# src/Data/ConnectionPool.py
+#
+# A bounded pool of database connections, checked out for one web request (or one
+# AsyncDatabase call) at a time instead of being held by a thread.
+#
+# Werkzeug's development server runs every request on a new thread, so a connection per
+# thread was opened and dropped with each request, and every statement prepared on it
+# (src/Data/StatementCache.py) with it. Pooled connections outlive the threads that use
+# them: each keeps its own StatementCache and temporary tables while it waits in the pool.
+#
+# At most `size` connections are open per pool (env DB_POOL_SIZE, the same bound as
+# AsyncDatabase's threads); they are opened as needed, and a checkout waits up to `timeout`
+# seconds (env DB_POOL_TIMEOUT) for one to be handed back. A connection that failed is
+# closed instead of handed back (discard), so a broken one is never handed out again.
+#
+# The connector's own mariadb.ConnectionPool is not used: it opens every connection up
+# front, cannot drop a single broken one, and resetting connections on return would throw
+# away the prepared statements this pool is meant to keep.
+
+import os
+import threading
+import time
+from src.Data.Resilience import DatabaseUnavailableError
+from src.Data.StatementCache import StatementCache
+from src.Utils.AppLogger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_POOL_TIMEOUT_SECONDS = 10
+
+
+class PoolExhaustedError(DatabaseUnavailableError):
+    """
+    Raised when no connection was handed back within the pool's timeout. Like an open
+    circuit breaker, it means "try again shortly" (the web app answers 503 with Retry-After).
+    """
+
+
+class PooledConnection:
+    """
+    A connection and what was set up on it: its prepared statements and the temporary
+    tables created on it (see Database.id_list).
+    """
+    __slots__ = ("connection", "statements", "temp_tables", "used_at")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.statements = StatementCache(connection)
+        self.temp_tables = set()
+        self.used_at = time.monotonic()
+
+
+class ConnectionPool:
+    def __init__(self, connect, size=None, timeout=None):
+        """
+        Args:
+            connect: Callable opening a new connection; its errors are raised from checkout()
+            size: Most connections open at once (env DB_POOL_SIZE)
+            timeout: Seconds checkout() waits for a free connection (env DB_POOL_TIMEOUT)
+        """
+        self.size = size or int(os.getenv("DB_POOL_SIZE", DEFAULT_POOL_SIZE))
+        self.timeout = timeout or float(os.getenv("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT_SECONDS))
+        self.__connect = connect
+        self.__idle = []        # most recently handed back last
+        self.__open = 0
+        self.__cond = threading.Condition()
+
+    def checkout(self):
+        """
+        An idle connection, most recently used first so the others can time out unused, or a
+        new one while fewer than size are open.
+
+        Returns:
+            a PooledConnection; hand it back with checkin(), or discard() it if it failed
+
+        Raises:
+            PoolExhaustedError: when none is free after timeout seconds
+        """
+        deadline = time.monotonic() + self.timeout
+        with self.__cond:
+            while not self.__idle and self.__open >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("All %d database connections stayed in use for %ss", self.size, self.timeout)
+                    raise PoolExhaustedError(f"All {self.size} database connections are in use")
+                self.__cond.wait(remaining)
+            if self.__idle:
+                return self.__idle.pop()
+            self.__open += 1
+
+        try:
+            return PooledConnection(self.__connect())
+        except BaseException:
+            self.__closed()
+            raise
+
+    def checkin(self, pooled):
+        """
+        Hand a connection back for the next checkout. End its transaction first.
+        """
+        with self.__cond:
+            self.__idle.append(pooled)
+            self.__cond.notify()
+
+    def discard(self, pooled):
+        """
+        Close a connection that failed instead of handing it back; its slot is freed for a
+        new one. Errors are ignored: the connection is often already broken.
+        """
+        pooled.statements.close()
+        try:
+            pooled.connection.close()
+        except Exception as e:
+            logger.debug("Closing a discarded connection failed: %s", e)
+        self.__closed()
+
+    def __closed(self):
+        with self.__cond:
+            self.__open -= 1
+            self.__cond.notify()
+
+    def stats(self):
+        with self.__cond:
+            return {"size": self.size, "open": self.__open, "idle": len(self.__idle)}
@@ -0,0 +1,482 @@
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+# Author:           Erika Brooks
+# TTfeature:        Test_01
+# Date:             10.19.2026
+# Description:      content-addressed store for data backup directories. Every file of a backup is split into
+#                       chunks on row boundaries, each chunk is stored once under its SHA-256 hash, and a
+#                       manifest per backup lists the chunks and checksums needed to rebuild it. Unchanged
+#                       tables (department.json, login_table.json, ...) therefore cost no extra disk space.
+# Input:            a *_data_backup_* directory (ingest) or a backup name (restore / verify)
+# Output:           backup_store/ directory with chunks and manifests, confirmation message
+#
+# Change Log:       - 10.19.2026: Initial setup
+#                   - 10.19.2026: Added the order-independent table checksum shared by the backup script
+#                       (recorded in backup_metadata.json) and the restore tool's --dry-run verification
+#                   - 10.19.2026: An existing chunk is only reused after checking it against its hash
+#                   - 10.19.2026: ingest and gc take the store lock (shared / exclusive), and gc leaves chunks
+#                       younger than a grace period alone, so gc cannot delete the chunks of a running ingest
+#
+#     Store Layout
+#         backup_store/chunks/ab/abcdef...     zlib compressed chunk named after the SHA-256 of its contents
+#         backup_store/manifests/<backup>.json  files of one backup: size, SHA-256 and ordered chunk list
+#         backup_store/store.lock              held shared by ingest and exclusively by gc
+#
+#     Chunking
+#         Table files hold one row per line, so chunks always end on a line. A chunk ends after a line whose
+#         CRC is divisible by CHUNK_LINE_DIVISOR (content defined: inserting a row only changes the chunk
+#         it lands in, the chunks after it keep their hashes) or when it reaches MAX_CHUNK_BYTES.
+#
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+
+
+import os
+import sys
+import json
+import zlib
+import hashlib
+import argparse
+import datetime
+import contextlib
+import time
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; there only the gc grace period protects a running ingest
+    fcntl = None
+
+# Default store location, next to the backup directories
+DEFAULT_STORE_DIR = "backup_store"
+
+# On average one line in this many ends a chunk
+CHUNK_LINE_DIVISOR = 64
+
+# Chunks are cut at the next line once they reach this size, whatever the line hashes say
+MAX_CHUNK_BYTES = 1024 * 1024
+
+# gc leaves chunks written (or reused) this recently alone, in case an ingest still needs them
+GC_GRACE_SECONDS = 24 * 60 * 60
+
+# Table checksums are the sum of the row hashes modulo 2^256, so row order does not matter
+CHECKSUM_MODULUS = 2 ** 256
+
+
+def row_checksum(row):
+    """
+    Hash a row (dict of column -> value) the same way whether it comes from the database
+    or from a backup file; values are compared in their JSON text form
+    """
+    row_json = json.dumps(row, sort_keys=True, default=str)
+    return int(hashlib.sha256(row_json.encode("utf-8")).hexdigest(), 16)
+
+
+def table_checksum(rows):
+    """
+    Order-independent checksum of an iterable of rows, as a hex string
+    """
+    total = 0
+    for row in rows:
+        total = (total + row_checksum(row)) % CHECKSUM_MODULUS
+    return format(total, "064x")
+
+
+def chunk_path(store_dir, chunk_hash):
+    """
+    Location of a chunk in the store (fanned out by the first two hex digits)
+    """
+    return os.path.join(store_dir, "chunks", chunk_hash[:2], chunk_hash)
+
+
+def manifest_path(store_dir, backup_name):
+    """
+    Location of the manifest for a backup
+    """
+    return os.path.join(store_dir, "manifests", f"{backup_name}.json")
+
+
+@contextlib.contextmanager
+def store_lock(store_dir, exclusive=False):
+    """
+    Hold the store lock: shared while ingesting (several ingests can run at once),
+    exclusive while collecting garbage. Waits until the lock is free.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, "store.lock"), 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def iter_chunks(file_obj):
+    """
+    Split a binary file into content-defined chunks that end on line boundaries
+    """
+    chunk = []
+    chunk_size = 0
+
+    for line in file_obj:
+        chunk.append(line)
+        chunk_size += len(line)
+
+        if zlib.crc32(line) % CHUNK_LINE_DIVISOR == 0 or chunk_size >= MAX_CHUNK_BYTES:
+            yield b"".join(chunk)
+            chunk = []
+            chunk_size = 0
+
+    if chunk:
+        yield b"".join(chunk)
+
+
+def store_chunk(store_dir, data):
+    """
+    Store a chunk unless the store already has an intact copy of it
+
+    Returns a tuple of (chunk hash, bytes written)
+    """
+    chunk_hash = hashlib.sha256(data).hexdigest()
+    path = chunk_path(store_dir, chunk_hash)
+
+    # Only reuse a stored chunk that still matches its hash; a corrupt one is written again
+    if os.path.exists(path):
+        if read_chunk(store_dir, chunk_hash) is not None:
+            # Reset its age so gc's grace period covers the backup that now uses it
+            os.utime(path)
+            return chunk_hash, 0
+        print(f"Warning: stored chunk {chunk_hash} is corrupt, writing it again")
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    compressed = zlib.compress(data)
+
+    # Write to a temporary name first so a crash never leaves a truncated chunk behind
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(compressed)
+    os.replace(temp_path, path)
+
+    return chunk_hash, len(compressed)
+
+
+def read_chunk(store_dir, chunk_hash):
+    """
+    Read a chunk and check it still matches its hash
+
+    Returns the chunk data, or None if the chunk is missing or corrupt
+    """
+    path = chunk_path(store_dir, chunk_hash)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, 'rb') as f:
+            data = zlib.decompress(f.read())
+    except (OSError, zlib.error):
+        return None
+
+    if hashlib.sha256(data).hexdigest() != chunk_hash:
+        return None
+    return data
+
+
+def load_manifest(backup_name, store_dir=DEFAULT_STORE_DIR):
+    """
+    Load the manifest for a backup, or None if the store does not have it
+    """
+    path = manifest_path(store_dir, backup_name)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def list_manifests(store_dir=DEFAULT_STORE_DIR):
+    """
+    Return the names of all backups in the store (newest first)
+    """
+    manifest_dir = os.path.join(store_dir, "manifests")
+    if not os.path.isdir(manifest_dir):
+        return []
+    names = [name[:-len(".json")] for name in os.listdir(manifest_dir) if name.endswith(".json")]
+    return sorted(names, reverse=True)
+
+
+def ingest_backup(backup_dir, store_dir=DEFAULT_STORE_DIR):
+    """
+    Add every file of a backup directory to the store and write its manifest
+
+    Returns the manifest path
+    """
+    with store_lock(store_dir):
+        return _ingest_backup(backup_dir, store_dir)
+
+
+def _ingest_backup(backup_dir, store_dir):
+    backup_name = os.path.basename(os.path.normpath(backup_dir))
+    files = {}
+    total_size = 0
+    new_bytes = 0
+
+    print(f"Adding {backup_name} to backup store {store_dir}")
+
+    for dirpath, dirnames, filenames in os.walk(backup_dir):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            rel_path = os.path.relpath(file_path, backup_dir).replace(os.sep, "/")
+
+            file_hash = hashlib.sha256()
+            chunks = []
+            size = 0
+
+            with open(file_path, 'rb') as f:
+                for data in iter_chunks(f):
+                    chunk_hash, written = store_chunk(store_dir, data)
+                    file_hash.update(data)
+                    chunks.append(chunk_hash)
+                    size += len(data)
+                    new_bytes += written
+
+            files[rel_path] = {"size": size, "sha256": file_hash.hexdigest(), "chunks": chunks}
+            total_size += size
+
+    # Keep a copy of the backup metadata so backups in the store can be found without rebuilding them
+    metadata = None
+    metadata_file = os.path.join(backup_dir, "backup_metadata.json")
+    if os.path.exists(metadata_file):
+        with open(metadata_file, 'r') as f:
+            metadata = json.load(f)
+
+    manifest = {
+        "backup": backup_name,
+        "stored_date": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "metadata": metadata,
+        "files": files
+    }
+
+    path = manifest_path(store_dir, backup_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"  {len(files)} files, {total_size} bytes; {new_bytes} bytes of new chunk data stored")
+    return path
+
+
+def verify_backup(backup_name, store_dir=DEFAULT_STORE_DIR):
+    """
+    Check that every chunk of a backup is present and matches its hash, and that the
+    chunks of each file add up to the recorded file checksum
+
+    Returns a list of problems (empty if the backup is intact)
+    """
+    manifest = load_manifest(backup_name, store_dir)
+    if manifest is None:
+        return [f"No manifest found for {backup_name}"]
+
+    problems = []
+    for rel_path, info in manifest["files"].items():
+        file_hash = hashlib.sha256()
+        size = 0
+        for chunk_hash in info["chunks"]:
+            data = read_chunk(store_dir, chunk_hash)
+            if data is None:
+                problems.append(f"{rel_path}: chunk {chunk_hash} is missing or corrupt")
+                break
+            file_hash.update(data)
+            size += len(data)
+        else:
+            if size != info["size"] or file_hash.hexdigest() != info["sha256"]:
+                problems.append(f"{rel_path}: checksum does not match the manifest")
+
+    return problems
+
+
+def materialize_backup(backup_name, output_dir=None, store_dir=DEFAULT_STORE_DIR):
+    """
+    Rebuild a backup directory from the store, verifying every chunk and file checksum.
+    Exits if the backup is missing or corrupt.
+
+    Returns the rebuilt directory
+    """
+    manifest = load_manifest(backup_name, store_dir)
+    if manifest is None:
+        print(f"Error: Backup {backup_name} not found in store {store_dir}")
+        sys.exit(1)
+
+    if output_dir is None:
+        output_dir = backup_name
+
+    print(f"Rebuilding {backup_name} from backup store into {output_dir}")
+
+    for rel_path, info in manifest["files"].items():
+        target = os.path.join(output_dir, *rel_path.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        file_hash = hashlib.sha256()
+        with open(target, 'wb') as f:
+            for chunk_hash in info["chunks"]:
+                data = read_chunk(store_dir, chunk_hash)
+                if data is None:
+                    print(f"Error: {rel_path}: chunk {chunk_hash} is missing or corrupt")
+                    sys.exit(1)
+                file_hash.update(data)
+                f.write(data)
+
+        if file_hash.hexdigest() != info["sha256"]:
+            print(f"Error: {rel_path} does not match the checksum in the manifest")
+            sys.exit(1)
+
+    print(f"  {len(manifest['files'])} files verified")
+    return output_dir
+
+
+def read_backup_file(backup_name, rel_path, store_dir=DEFAULT_STORE_DIR):
+    """
+    Read a single file of a stored backup without rebuilding the whole directory
+
+    Returns the file contents as bytes, or None if the store does not have the file
+    """
+    manifest = load_manifest(backup_name, store_dir)
+    if manifest is None or rel_path not in manifest["files"]:
+        return None
+
+    info = manifest["files"][rel_path]
+    parts = []
+    for chunk_hash in info["chunks"]:
+        data = read_chunk(store_dir, chunk_hash)
+        if data is None:
+            print(f"Error: {rel_path}: chunk {chunk_hash} is missing or corrupt")
+            sys.exit(1)
+        parts.append(data)
+
+    contents = b"".join(parts)
+    if hashlib.sha256(contents).hexdigest() != info["sha256"]:
+        print(f"Error: {rel_path} does not match the checksum in the manifest")
+        sys.exit(1)
+    return contents
+
+
+def ensure_backup_dir(backup_dir, store_dir=DEFAULT_STORE_DIR):
+    """
+    Return backup_dir if it exists, otherwise rebuild it from the store if the store has it.
+    Returns None if the backup is in neither place.
+    """
+    if os.path.isdir(backup_dir):
+        return backup_dir
+
+    backup_name = os.path.basename(os.path.normpath(backup_dir))
+    if load_manifest(backup_name, store_dir) is None:
+        return None
+
+    return materialize_backup(backup_name, backup_dir, store_dir)
+
+
+def delete_manifest(backup_name, store_dir=DEFAULT_STORE_DIR):
+    """
+    Remove a backup from the store (its chunks are freed by the next garbage collection)
+    """
+    path = manifest_path(store_dir, backup_name)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def collect_garbage(store_dir=DEFAULT_STORE_DIR, dry_run=False, grace_seconds=GC_GRACE_SECONDS):
+    """
+    Delete chunks that no manifest references any more and that were not written or
+    reused within the last grace_seconds. Holds the store lock exclusively, so it waits
+    for running ingests to write their manifests.
+
+    Returns a tuple of (chunks removed, bytes freed)
+    """
+    with store_lock(store_dir, exclusive=True):
+        return _collect_garbage(store_dir, dry_run, grace_seconds)
+
+
+def _collect_garbage(store_dir, dry_run, grace_seconds):
+    referenced = set()
+    for backup_name in list_manifests(store_dir):
+        manifest = load_manifest(backup_name, store_dir)
+        for info in manifest["files"].values():
+            referenced.update(info["chunks"])
+
+    removed = 0
+    freed = 0
+    chunk_root = os.path.join(store_dir, "chunks")
+    if not os.path.isdir(chunk_root):
+        return removed, freed
+
+    cutoff = time.time() - grace_seconds
+    for dirpath, dirnames, filenames in os.walk(chunk_root):
+        for filename in filenames:
+            if filename in referenced:
+                continue
+            path = os.path.join(dirpath, filename)
+            if os.path.getmtime(path) > cutoff:
+                continue
+            freed += os.path.getsize(path)
+            removed += 1
+            if not dry_run:
+                os.remove(path)
+
+    return removed, freed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Deduplicated store for MariaDB data backups')
+    parser.add_argument('-s', '--store', help=f'Backup store directory (default: {DEFAULT_STORE_DIR})',
+                        default=DEFAULT_STORE_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='Add a data backup directory to the store')
+    ingest_parser.add_argument('backup_dir', help='Data backup directory to add')
+
+    restore_parser = subparsers.add_parser('restore', help='Rebuild a backup directory from the store')
+    restore_parser.add_argument('backup_name', help='Name of the backup to rebuild')
+    restore_parser.add_argument('-o', '--output', help='Directory to rebuild into (default: the backup name)')
+
+    verify_parser = subparsers.add_parser('verify', help='Check the chunks and checksums of stored backups')
+    verify_parser.add_argument('backup_name', nargs='?', help='Backup to verify (default: all)')
+
+    subparsers.add_parser('list', help='List the backups in the store')
+
+    gc_parser = subparsers.add_parser('gc', help='Delete chunks no backup references')
+    gc_parser.add_argument('-d', '--dry-run', action='store_true', help='Only report what would be deleted')
+    gc_parser.add_argument('-g', '--grace-hours', type=float, default=GC_GRACE_SECONDS / 3600,
+                           help='Keep unreferenced chunks younger than this (default: %(default)s)')
+
+    args = parser.parse_args()
+
+    print("=== MariaDB Backup Store ===")
+
+    if args.command == 'ingest':
+        ingest_backup(args.backup_dir, args.store)
+
+    elif args.command == 'restore':
+        materialize_backup(args.backup_name, args.output, args.store)
+
+    elif args.command == 'verify':
+        names = [args.backup_name] if args.backup_name else list_manifests(args.store)
+        failed = False
+        for name in names:
+            problems = verify_backup(name, args.store)
+            if problems:
+                failed = True
+                print(f"✗ {name}")
+                for problem in problems:
+                    print(f"    {problem}")
+            else:
+                print(f"✓ {name}")
+        if failed:
+            sys.exit(1)
+
+    elif args.command == 'list':
+        for name in list_manifests(args.store):
+            print(name)
+
+    elif args.command == 'gc':
+        removed, freed = collect_garbage(args.store, args.dry_run, args.grace_hours * 3600)
+        action = "Would remove" if args.dry_run else "Removed"
+        print(f"{action} {removed} unreferenced chunks ({freed} bytes)")
+
+# **********************************************************************************************************************
+# **********************************************************************************************************************
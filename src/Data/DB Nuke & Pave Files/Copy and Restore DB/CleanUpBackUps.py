@@ -12,6 +12,10 @@
 # Change Log:       - 5.11.2025: Initial setup
 #                   - 5.26.2025: Refactored script for better error handling and
 #                       cleaner output
+#                   - 10.19.2026: Data backups that kept incremental backups are based on
+#                       (their parent and base backups) are no longer deleted
+#                   - 10.19.2026: Also prunes old manifests in the backup store (BackupStore.py)
+#                       and garbage-collects the chunks no remaining backup references
 
 # A comprehensive script that will manage backup files by keeping only the most recent ones.
 #
@@ -64,6 +68,7 @@ It keeps the 3 most recent backups of each type and removes the older ones to sa
 Types of backup files handled:
 1. Schema backups (*_schema_backup_*.sql)
 2. Data backups (directories matching *_data_backup_*)
+3. Backups in the deduplicated backup store (manifests and unreferenced chunks)
 """
 
 import os
@@ -73,7 +78,9 @@ import shutil
 import argparse
 import stat
 import subprocess
+import json
 from datetime import datetime
+from BackupStore import DEFAULT_STORE_DIR, collect_garbage, delete_manifest, list_manifests, load_manifest
 
 
 # ANSI colors for output formatting
@@ -264,7 +271,91 @@ def delete_directory_safely(path):
         return delete_directory_unix(path)
 
 
-def cleanup_backups(keep_count=3, dry_run=False, force=False):
+def find_backup_ancestors(backup_dir):
+    """
+    Return the names of the backups an incremental data backup depends on
+    (its parent, the parent's parent and so on down to the full base backup)
+    """
+    ancestors = []
+    parent_root = os.path.dirname(os.path.normpath(backup_dir))
+    current = backup_dir
+
+    while True:
+        try:
+            with open(os.path.join(current, "backup_metadata.json"), 'r') as f:
+                metadata = json.load(f)
+        except (OSError, IOError, ValueError):
+            break
+
+        parent = metadata.get("parent_backup")
+        if metadata.get("backup_type", "full") == "full" or not parent or parent in ancestors:
+            break
+
+        ancestors.append(parent)
+        current = os.path.join(parent_root, parent)
+
+    return ancestors
+
+
+def find_stored_backup_ancestors(backup_name, store_dir):
+    """
+    Same as find_backup_ancestors, for a backup that lives in the backup store
+    """
+    ancestors = []
+    current = backup_name
+
+    while True:
+        manifest = load_manifest(current, store_dir)
+        metadata = (manifest or {}).get("metadata") or {}
+
+        parent = metadata.get("parent_backup")
+        if metadata.get("backup_type", "full") == "full" or not parent or parent in ancestors:
+            break
+
+        ancestors.append(parent)
+        current = parent
+
+    return ancestors
+
+
+def cleanup_backup_store(store_dir, keep_count=3, dry_run=False):
+    """
+    Delete all but the most recent manifests in the backup store (plus the backups kept
+    incremental backups depend on), then remove the chunks nothing references any more
+
+    Returns the number of bytes freed
+    """
+    print(f"\n{Colors.HEADER}BACKUP STORE ({store_dir}):{Colors.END}")
+
+    manifests = list_manifests(store_dir)
+    print(f"  Found {len(manifests)} stored backups")
+
+    to_keep = manifests[:keep_count]
+    required = set()
+    for name in to_keep:
+        required.update(find_stored_backup_ancestors(name, store_dir))
+    to_keep += [name for name in manifests[keep_count:] if name in required]
+    to_delete = [name for name in manifests if name not in to_keep]
+
+    for name in to_keep:
+        print(f"    {Colors.GREEN}✓ {name}{Colors.END}")
+
+    for name in to_delete:
+        action = "Would delete" if dry_run else "Deleting"
+        print(f"    {Colors.FAIL}✗ {action}: {name}{Colors.END}")
+        if not dry_run:
+            delete_manifest(name, store_dir)
+
+    # In a dry run the manifests are still there, so only chunks that are already orphaned show up
+    removed, freed = collect_garbage(store_dir, dry_run)
+    action = "Would remove" if dry_run else "Removed"
+    print(f"  {action} {removed} unreferenced chunks")
+    print(f"  Space freed from the backup store: {Colors.BOLD}{format_size(freed)}{Colors.END}")
+
+    return freed
+
+
+def cleanup_backups(keep_count=3, dry_run=False, force=False, store_dir=DEFAULT_STORE_DIR):
     """
     Find and delete old backup files and directories
     """
@@ -336,6 +427,18 @@ def cleanup_backups(keep_count=3, dry_run=False, force=False):
         to_keep = data_backups[:keep_count]
         to_delete = data_backups[keep_count:]
 
+        # Older backups still needed to restore a kept incremental backup must stay as well
+        required = set()
+        for item, mtime in to_keep:
+            required.update(find_backup_ancestors(item))
+
+        chain_members = [(item, mtime) for item, mtime in to_delete
+                         if os.path.basename(os.path.normpath(item)) in required]
+        if chain_members:
+            print(f"  Also keeping {len(chain_members)} older backups that kept incremental backups depend on")
+            to_keep = to_keep + chain_members
+            to_delete = [entry for entry in to_delete if entry not in chain_members]
+
         print(f"  Keeping {len(to_keep)} recent data backups:")
         for item, mtime in to_keep:
             mtime_str = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
@@ -366,6 +469,10 @@ def cleanup_backups(keep_count=3, dry_run=False, force=False):
         else:
             print("  No old data backups to delete")
 
+    # Process the deduplicated backup store
+    if store_dir and os.path.isdir(store_dir):
+        total_space_freed += cleanup_backup_store(store_dir, keep_count, dry_run)
+
     # Print summary
     print(f"\n{Colors.HEADER}SUMMARY:{Colors.END}")
     if dry_run:
@@ -388,6 +495,8 @@ if __name__ == "__main__":
                         help='Show what would be deleted without actually deleting')
     parser.add_argument('-y', '--yes', action='store_true',
                         help='Skip confirmation prompt')
+    parser.add_argument('-s', '--store', default=DEFAULT_STORE_DIR,
+                        help=f'Backup store directory to clean up (default: {DEFAULT_STORE_DIR})')
 
     args = parser.parse_args()
 
@@ -403,7 +512,7 @@ if __name__ == "__main__":
             print("Operation cancelled.")
             sys.exit(0)
 
-    changed = cleanup_backups(args.keep, args.dry_run)
+    changed = cleanup_backups(args.keep, args.dry_run, store_dir=args.store)
 
     if args.dry_run:
         print(f"\nRun without --dry-run to actually delete the files.")
@@ -45,6 +45,12 @@
 #
 # Change Log:       - 05.08.2025: Initial setup; code left in non-functional state
 #                   - 05.11.2025: All updates complete; code runs as expected
+#                   - 10.19.2026: The five steps now run in-process through run_pipeline() on one shared
+#                       connection, with per-step timing, a progress report and a state file so a failed
+#                       run can be resumed from the step that failed (--resume). The old behaviour of
+#                       running each script in its own process is still available with --subprocess
+#                   - 10.19.2026: --resume after a failed data restore restores the schema again first,
+#                       so tables restored before the failure are not inserted twice
 #
 # **********************************************************************************************************************
 # **********************************************************************************************************************  
@@ -63,15 +69,23 @@ It runs the individual scripts in the following order:
 5. RestoreTime_tracker_data_backup.py - Restores the data from backup files
 
 This provides a "one-click" solution for a complete database refresh process.
+
+The same pipeline can be run from other code (e.g. tests) with run_pipeline().
 """
 
 import os
 import sys
+import json
 import subprocess
 import time
 import datetime
 import argparse
 from dotenv import load_dotenv
+from Get_SaveAllCurrentData import backup_table_data
+from GetCaseysSchema import backup_database_schema
+from Discover_DropTables import drop_all_tables
+from RestoreCaseysSchema import restore_database_schema
+from RestoreTime_tracker_data_backup import connect_to_database, restore_table_data
 
 # Load environment variables
 load_dotenv()
@@ -90,6 +104,181 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Where run_pipeline keeps track of finished steps so a failed run can be resumed
+DEFAULT_STATE_FILE = "big_red_button_state.json"
+
+# Pipeline steps in order: (name, description, required). A step that is not required
+# only produces a warning when it fails and the pipeline carries on.
+PIPELINE_STEPS = [
+    ("backup_data", "Backing up all table data", True),
+    ("backup_schema", "Backing up database schema", True),
+    ("drop_tables", "Dropping all tables from the database", False),
+    ("restore_schema", "Restoring database schema", True),
+    ("restore_data", "Restoring data from backups", True),
+]
+
+
+def _step_backup_data(state, conn):
+    state["backup_dir"] = backup_table_data(conn=conn)
+
+
+def _step_backup_schema(state, conn):
+    state["schema_file"] = backup_database_schema(conn=conn)
+
+
+def _step_drop_tables(state, conn):
+    drop_all_tables(conn=conn)
+
+
+def _step_restore_schema(state, conn):
+    restore_database_schema(state["schema_file"], auto_yes=True, conn=conn)
+
+
+def _step_restore_data(state, conn):
+    restore_table_data(state["backup_dir"], conn=conn)
+
+
+STEP_FUNCTIONS = {
+    "backup_data": _step_backup_data,
+    "backup_schema": _step_backup_schema,
+    "drop_tables": _step_drop_tables,
+    "restore_schema": _step_restore_schema,
+    "restore_data": _step_restore_data,
+}
+
+
+def load_pipeline_state(state_file):
+    """
+    Load the state of a previous run, or None if there is none
+    """
+    if not state_file or not os.path.exists(state_file):
+        return None
+    with open(state_file, 'r') as f:
+        return json.load(f)
+
+
+def save_pipeline_state(state, state_file):
+    """
+    Write the pipeline state so a failed run can be resumed
+    """
+    if not state_file:
+        return
+    with open(state_file, 'w') as f:
+        json.dump(state, f, indent=2)
+
+
+def print_progress_report(state):
+    """
+    Print the status and duration of every pipeline step
+    """
+    print(f"\n{Colors.BLUE}{Colors.BOLD}PROGRESS REPORT{Colors.END}")
+    total = 0.0
+    for name, description, required in PIPELINE_STEPS:
+        step = state["steps"].get(name, {})
+        status = step.get("status", "pending")
+        seconds = step.get("seconds", 0.0)
+        total += seconds
+
+        color = {"done": Colors.GREEN, "warning": Colors.WARNING, "failed": Colors.FAIL}.get(status, "")
+        print(f"  {color}{status:<8}{Colors.END} {description:<42} {seconds:>8.2f}s")
+
+    print(f"  {'':<8} {'Total':<42} {total:>8.2f}s")
+
+
+def run_pipeline(resume=False, state_file=DEFAULT_STATE_FILE, conn=None, confirm_destructive=None):
+    """
+    Run backup -> drop -> schema restore -> data restore in this process.
+
+    All steps share one connection (conn, or one opened here). Each step's status and
+    duration are written to state_file after it finishes; with resume=True, steps that
+    already finished in the previous run are skipped and their outputs (backup directory,
+    schema file) reused, except restore_schema, which runs again while restore_data has not
+    finished so no table is restored twice. confirm_destructive, if given, is called before tables are dropped
+    and the pipeline stops if it returns False.
+
+    Returns the pipeline state; state["status"] is "done", "failed" or "cancelled"
+    """
+    state = load_pipeline_state(state_file) if resume else None
+    if state is None or state.get("status") == "done":
+        state = {
+            "started": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "status": "running",
+            "steps": {}
+        }
+    else:
+        print(f"{Colors.BLUE}Resuming pipeline started at {state['started']}{Colors.END}")
+        state["status"] = "running"
+        # restore_data commits table by table, so a failed run leaves some tables filled;
+        # restore the schema again (it drops and recreates the database) before re-inserting
+        if state["steps"].get("restore_data", {}).get("status") != "done":
+            if state["steps"].pop("restore_schema", None):
+                print(f"{Colors.BLUE}Restoring the schema again so restore_data starts from empty tables{Colors.END}")
+
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_database()
+
+    try:
+        for name, description, required in PIPELINE_STEPS:
+            if state["steps"].get(name, {}).get("status") in ("done", "warning"):
+                print(f"{Colors.BLUE}Skipping {name}: already completed{Colors.END}")
+                continue
+
+            if name == "drop_tables" and confirm_destructive and not confirm_destructive():
+                state["status"] = "cancelled"
+                break
+
+            print(f"\n{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.END}")
+            print(f"{Colors.HEADER}{Colors.BOLD}STEP: {name} - {description}{Colors.END}")
+            print(f"{Colors.HEADER}{Colors.BOLD}{'=' * 80}{Colors.END}\n")
+
+            start_time = time.time()
+            error = None
+            try:
+                STEP_FUNCTIONS[name](state, conn)
+            except SystemExit as e:
+                # The step scripts report their own errors and call sys.exit
+                error = f"exited with code {e.code}"
+            except Exception as e:
+                error = str(e)
+
+            duration = time.time() - start_time
+            step = {"seconds": duration}
+
+            if error is None:
+                step["status"] = "done"
+                print(f"\n{Colors.GREEN}{Colors.BOLD}SUCCESS: {name} completed in {duration:.2f} seconds{Colors.END}")
+            elif not required:
+                step["status"] = "warning"
+                step["error"] = error
+                print(f"{Colors.WARNING}Warning: {name} failed ({error}). Continuing anyway.{Colors.END}")
+            else:
+                step["status"] = "failed"
+                step["error"] = error
+                state["status"] = "failed"
+                print(f"{Colors.FAIL}{Colors.BOLD}ERROR: {name} failed ({error}){Colors.END}")
+
+            state["steps"][name] = step
+            save_pipeline_state(state, state_file)
+
+            if state["status"] == "failed":
+                print(f"{Colors.FAIL}Fix the problem and run again with --resume to continue from {name}.{Colors.END}")
+                break
+        else:
+            state["status"] = "done"
+
+    finally:
+        save_pipeline_state(state, state_file)
+        if own_conn:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    print_progress_report(state)
+    return state
+
+
 def run_script(script_name, description, args=None):
     """
     Run a Python script and handle its output
@@ -193,6 +382,10 @@ def main():
     parser = argparse.ArgumentParser(description='Run the complete database backup and restore process')
     parser.add_argument('--skip-confirm', action='store_true',
                         help='Skip confirmation prompts (Use with caution!)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue a failed run from the step that failed')
+    parser.add_argument('--subprocess', action='store_true',
+                        help='Run each step as a separate script (the original behaviour)')
     args = parser.parse_args()
 
     # Print banner
@@ -208,7 +401,7 @@ def main():
     print("5. Restore the data from backup files\n")
 
     # Environment and scripts check
-    if not check_environment() or not check_scripts_exist():
+    if not check_environment() or (args.subprocess and not check_scripts_exist()):
         sys.exit(1)
 
     # Confirmation
@@ -223,6 +416,30 @@ def main():
     current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     print(f"\n{Colors.BLUE}Starting database backup and restore process at {current_time}{Colors.END}")
 
+    if not args.subprocess:
+        def confirm_drop():
+            if args.skip_confirm:
+                return True
+            confirmation = input(f"\n{Colors.WARNING}Data and schema backups are complete. The next step will DROP ALL TABLES. Continue? (yes/no): {Colors.END}")
+            if confirmation.lower() != 'yes':
+                print("Operation cancelled by user.")
+                return False
+            return True
+
+        state = run_pipeline(resume=args.resume, confirm_destructive=confirm_drop)
+        if state["status"] == "cancelled":
+            sys.exit(0)
+        if state["status"] != "done":
+            print(f"{Colors.FAIL}Process incomplete.{Colors.END}")
+            sys.exit(1)
+
+        overall_duration = time.time() - overall_start_time
+        print(f"\n{Colors.GREEN}{Colors.BOLD}{'=' * 80}{Colors.END}")
+        print(f"{Colors.GREEN}{Colors.BOLD}DATABASE BACKUP AND RESTORE PROCESS COMPLETED SUCCESSFULLY!{Colors.END}")
+        print(f"{Colors.GREEN}Total duration: {overall_duration:.2f} seconds{Colors.END}")
+        print(f"{Colors.GREEN}{Colors.BOLD}{'=' * 80}{Colors.END}\n")
+        return
+
     # Step 1: Back up all current data
     if not run_script("Get_SaveAllCurrentData.py", "Backing up all table data"):
         print(f"{Colors.FAIL}Failed to back up data. Aborting process.{Colors.END}")
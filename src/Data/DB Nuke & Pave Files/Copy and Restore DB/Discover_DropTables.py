@@ -9,6 +9,7 @@
 # Sources:          Project Charter - Jira Story: Tests 1 & 2
 #
 # Change Log:       - 04.20.2025: Initial setup
+#                   - 10.19.2026: accepts an open connection so DB_BigRedButton can run it in-process
 #
 # **********************************************************************************************************************
 # **********************************************************************************************************************
@@ -22,20 +23,23 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
-def drop_all_tables():
+def drop_all_tables(conn=None):
     """
     Check for existing tables in the database and drop them all.
+    Uses conn if one is given (it is left open), otherwise opens its own connection.
     """
+    own_conn = conn is None
     try:
         # Connect to MariaDB
-        conn = mariadb.connect(
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            host=os.getenv("DB_HOST"),
-            port=int(os.getenv("DB_PORT")),
-            database=os.getenv("DB_NAME"),
-            connect_timeout=5
-        )
+        if own_conn:
+            conn = mariadb.connect(
+                user=os.getenv("DB_USER"),
+                password=os.getenv("DB_PASSWORD"),
+                host=os.getenv("DB_HOST"),
+                port=int(os.getenv("DB_PORT")),
+                database=os.getenv("DB_NAME"),
+                connect_timeout=5
+            )
 
         # Create a cursor
         cursor = conn.cursor()
@@ -90,7 +94,8 @@ def drop_all_tables():
 
         # Close cursor and connection
         cursor.close()
-        conn.close()
+        if own_conn:
+            conn.close()
 
     except mariadb.Error as error:
         print(f"Error dropping tables: {error}")
@@ -19,6 +19,7 @@
 #                       is now the current file
 #                   - 5.11.2025: File name changes will no longer be tracked as all restore
 #                       files have been updated to find the most recent copy to work with
+#                   - 10.19.2026: accepts an open connection so DB_BigRedButton can run it in-process
 #
 # **********************************************************************************************************************
 # **********************************************************************************************************************  
@@ -84,11 +85,14 @@ def connect_to_database():
         sys.exit(1)
 
 
-def backup_database_schema(output_file=None):
+def backup_database_schema(output_file=None, conn=None):
     """
-    Main function to create a complete database schema backup
+    Main function to create a complete database schema backup.
+    Uses conn if one is given (it is left open), otherwise opens its own connection.
     """
-    conn = connect_to_database()
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_database()
     cursor = conn.cursor()
 
     try:
@@ -429,7 +433,8 @@ def backup_database_schema(output_file=None):
         sys.exit(1)
     finally:
         cursor.close()
-        conn.close()
+        if own_conn:
+            conn.close()
 
 
 if __name__ == "__main__":
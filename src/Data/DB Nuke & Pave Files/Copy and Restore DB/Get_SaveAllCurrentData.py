@@ -13,6 +13,20 @@
 # Change Log:       - 04.05.2025: Initial setup
 #                   - 05.11.2025: Updated to also send all data to a single text file to account for an
 #                       edge case where the backup file folder system fails or is corrupt
+#                   - 10.19.2026: Added --incremental: only rows whose UPDATED_AT changed since the
+#                       previous backup are exported, plus the primary keys of deleted rows.
+#                       Every backup now also saves [table]_keys.json and the server snapshot time
+#                       so the next incremental backup knows what changed
+#                   - 10.19.2026: Added --store: the finished backup is added to the deduplicated
+#                       backup store (BackupStore.py) and only its manifest is kept
+#                   - 10.19.2026: backup_metadata.json records an order-independent checksum for every
+#                       fully exported table so restores can be verified
+#                   - 10.19.2026: accepts an open connection so DB_BigRedButton can run it in-process
+#                   - 10.19.2026: rows are exported in primary key order with keyset paging instead of
+#                       LIMIT/OFFSET without ORDER BY, which could skip or repeat rows between batches
+#                   - 10.19.2026: incremental backups read deleted keys from the row_deletions log
+#                       (Holding Area/AddChangeTrackingColumns.py) instead of reading and saving every
+#                       primary key of every table on each run
 #
 # **********************************************************************************************************************
 # **********************************************************************************************************************  
@@ -31,11 +45,24 @@ import json
 import datetime
 import mariadb
 import argparse
+import glob
+import shutil
 from dotenv import load_dotenv
+from BackupStore import (CHECKSUM_MODULUS, DEFAULT_STORE_DIR, ingest_backup, list_manifests, load_manifest,
+                         read_backup_file, row_checksum)
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Column maintained by the server (ON UPDATE current_timestamp()) that incremental backups use
+# to find changed rows. Added by "Holding Area/AddChangeTrackingColumns.py"
+CHANGE_TRACKING_COLUMN = "UPDATED_AT"
+
+# Table the AFTER DELETE triggers added by the same script write the key of every deleted row to,
+# so incremental backups find deletions without reading every key of every table
+DELETION_LOG_TABLE = "row_deletions"
+DELETION_LOG_TRIGGER = "trg_{table}_log_delete"
+
 
 def connect_to_database():
     """
@@ -79,17 +106,211 @@ def connect_to_database():
         sys.exit(1)
 
 
-def backup_table_data(output_dir=None):
+def find_previous_backup(db_name, store_dir=DEFAULT_STORE_DIR):
+    """
+    Find the most recent data backup that an incremental backup can be based on, either as a
+    directory or in the backup store. Only backups that recorded a snapshot time qualify.
+
+    Returns a tuple of (backup directory, metadata) or (None, None). The directory may only
+    exist in the store; load_table_keys reads from the store in that case.
+    """
+    backup_dirs = {d for d in glob.glob(f"{db_name}_data_backup_*") if os.path.isdir(d)}
+    backup_dirs.update(name for name in list_manifests(store_dir)
+                       if name.startswith(f"{db_name}_data_backup_"))
+
+    # Directory names end in a timestamp, so sorting by name puts the newest first
+    for backup_dir in sorted(backup_dirs, reverse=True):
+        metadata_file = os.path.join(backup_dir, "backup_metadata.json")
+        if os.path.exists(metadata_file):
+            with open(metadata_file, 'r') as f:
+                metadata = json.load(f)
+        else:
+            manifest = load_manifest(backup_dir, store_dir)
+            metadata = manifest.get("metadata") if manifest else None
+
+        if metadata and metadata.get("snapshot_time"):
+            return backup_dir, metadata
+
+    return None, None
+
+
+def get_primary_key_columns(cursor, table_name):
+    """
+    Return the primary key column names of a table in key order
+    """
+    cursor.execute("""
+        SELECT column_name AS column_name
+        FROM information_schema.key_column_usage
+        WHERE table_schema = DATABASE()
+          AND table_name = ?
+          AND constraint_name = 'PRIMARY'
+        ORDER BY ordinal_position
+    """, (table_name,))
+    return [row['column_name'] for row in cursor.fetchall()]
+
+
+def get_deletion_logging(cursor):
+    """
+    Return {table name: time its deletions started being logged} for the tables whose
+    deletions are written to the deletion log, or {} if there is no deletion log
+    """
+    cursor.execute("""
+        SELECT event_object_table AS table_name, trigger_name AS trigger_name, created AS created
+        FROM information_schema.triggers
+        WHERE trigger_schema = DATABASE()
+          AND event_manipulation = 'DELETE'
+          AND action_timing = 'AFTER'
+    """)
+    return {row['table_name']: str(row['created'])[:19] for row in cursor.fetchall()
+            if row['created'] is not None
+            and row['trigger_name'] == DELETION_LOG_TRIGGER.format(table=row['table_name'])}
+
+
+def load_logged_deletions(cursor, table_name, since_time):
+    """
+    Return the primary keys of the rows of a table deleted since since_time, from the deletion log
+    """
+    cursor.execute(f"""
+        SELECT ROW_KEY AS row_key
+        FROM `{DELETION_LOG_TABLE}`
+        WHERE TABLE_NAME = ? AND DELETED_AT >= ?
+        ORDER BY ID
+    """, (table_name, since_time))
+    return [json.loads(row['row_key']) for row in cursor.fetchall()]
+
+
+def load_table_keys(backup_dir, table_name, store_dir=DEFAULT_STORE_DIR):
+    """
+    Load the primary keys saved for a table by a previous backup, or None if there are none
+    """
+    keys_file = os.path.join(backup_dir, f"{table_name}_keys.json")
+    if os.path.exists(keys_file):
+        with open(keys_file, 'r') as f:
+            return {tuple(key) for key in json.load(f)}
+
+    # The previous backup may only exist in the backup store
+    contents = read_backup_file(os.path.basename(os.path.normpath(backup_dir)),
+                                f"{table_name}_keys.json", store_dir)
+    if contents is None:
+        return None
+    return {tuple(key) for key in json.loads(contents)}
+
+
+def keyset_condition(key_columns):
+    """
+    SQL condition matching the rows after a given primary key in key order, for
+    (a, b): a > ? OR (a = ? AND b > ?). Returns (condition, function turning the last
+    row of a batch into the condition's parameters)
+    """
+    terms = []
+    for i, col in enumerate(key_columns):
+        equal = [f"`{c}` = ?" for c in key_columns[:i]]
+        terms.append("(" + " AND ".join(equal + [f"`{col}` > ?"]) + ")")
+
+    def params_after(row):
+        return tuple(row[c] for i in range(len(key_columns)) for c in key_columns[:i + 1])
+
+    return " OR ".join(terms), params_after
+
+
+def export_rows(cursor, table_name, where_sql, params, key_columns, total_rows, json_path, txt_file,
+                batch_size=5000):
+    """
+    Write the rows of a table matching where_sql (None for all rows) to a JSON array file (one
+    row per line) and to the consolidated txt file.
+
+    Rows are fetched in batches in primary key order, each batch starting after the last key
+    of the previous one, so every batch is an index range read and no row is skipped or
+    repeated (LIMIT/OFFSET without ORDER BY guarantees neither). A table without a primary
+    key is read with a single query.
+
+    Returns a tuple of (rows exported, checksum of the rows (see BackupStore.table_checksum))
+    """
+    checksum = 0
+    exported = 0
+    last_row = None
+
+    if key_columns:
+        keyset_sql, params_after = keyset_condition(key_columns)
+        order_str = ", ".join(f"`{col}`" for col in key_columns)
+
+    print(f"  Exporting {total_rows} rows in batches of {batch_size}")
+
+    with open(json_path, 'w') as f:
+        f.write('[')  # Start JSON array
+
+        while True:
+            conditions = [where_sql] if where_sql else []
+            batch_params = tuple(params)
+            if last_row is not None:
+                # The next batch starts after the last key of this one
+                conditions.append(keyset_sql)
+                batch_params += params_after(last_row)
+
+            sql = f"SELECT * FROM `{table_name}`"
+            if conditions:
+                sql += " WHERE " + " AND ".join(f"({condition})" for condition in conditions)
+            if key_columns:
+                sql += f" ORDER BY {order_str} LIMIT {batch_size}"
+
+            cursor.execute(sql, batch_params)
+            batch_data = cursor.fetchall()
+
+            for row in batch_data:
+                json_str = json.dumps(row, default=str)
+                f.write(f"{',' if exported else ''}\n  {json_str}")
+
+                exported += 1
+                # Write data to txt file in a readable format
+                txt_file.write(f"Row {exported}: {json_str}\n")
+
+                checksum = (checksum + row_checksum(row)) % CHECKSUM_MODULUS
+
+            if not key_columns or len(batch_data) < batch_size:
+                break
+            last_row = batch_data[-1]
+            print(f"  {exported} rows exported")
+
+        f.write('\n]')  # End JSON array
+
+    return exported, format(checksum, "064x")
+
+
+def backup_table_data(output_dir=None, incremental=False, store_dir=None, conn=None):
     """
-    Main function to create backups of all data in existing tables
+    Main function to create backups of all data in existing tables.
+
+    With incremental=True, tables that have an UPDATED_AT column only export the rows changed
+    since the previous backup, plus a [table]_deleted.json with the keys of removed rows.
+    Deleted keys are read from the deletion log (row_deletions) for tables whose deletions it
+    has recorded since the previous backup; only other tables have every primary key read and
+    saved in [table]_keys.json to compare with the next backup. Tables without change tracking
+    are always exported in full.
+
+    With store_dir set, the finished backup is added to that backup store and the
+    directory is removed; only the deduplicated chunks and the manifest are kept.
+
+    Uses conn if one is given (it is left open), otherwise opens its own connection.
     """
-    conn = connect_to_database()
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_database()
     cursor = conn.cursor(dictionary=True)
 
     try:
-        # Get database name
-        cursor.execute("SELECT DATABASE()")
-        db_name = cursor.fetchone()['DATABASE()']
+        # Get database name and the server time the backup starts from
+        cursor.execute("SELECT DATABASE() AS db_name, NOW() AS snapshot_time")
+        server_info = cursor.fetchone()
+        db_name = server_info['db_name']
+        snapshot_time = str(server_info['snapshot_time'])
+
+        # Work out what an incremental backup is based on
+        parent_dir, parent_metadata = (None, None)
+        if incremental:
+            parent_dir, parent_metadata = find_previous_backup(db_name, store_dir or DEFAULT_STORE_DIR)
+            if parent_dir is None:
+                print("No previous backup with a snapshot time was found; creating a full backup instead")
+                incremental = False
 
         # Create timestamp for directory name
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -102,26 +323,39 @@ def backup_table_data(output_dir=None):
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        print(f"Creating data backup for database: {db_name}")
+        print(f"Creating {'incremental' if incremental else 'full'} data backup for database: {db_name}")
         print(f"Backup directory: {output_dir}")
 
         # Create a metadata file with information about the backup
         metadata = {
             "database": db_name,
             "backup_date": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "backup_type": "incremental" if incremental else "full",
+            "snapshot_time": snapshot_time,
             "tables": []
         }
 
-        # Get list of all tables
+        if incremental:
+            since_time = parent_metadata["snapshot_time"]
+            metadata["parent_backup"] = os.path.basename(os.path.normpath(parent_dir))
+            metadata["base_backup"] = parent_metadata.get("base_backup", metadata["parent_backup"])
+            metadata["changes_since"] = since_time
+            print(f"Based on: {parent_dir} (changes since {since_time})")
+
+        # Get list of all tables (the deletion log is bookkeeping for backups, not data)
         cursor.execute("""
             SELECT table_name 
             FROM information_schema.tables 
             WHERE table_schema = DATABASE()
             AND table_type = 'BASE TABLE'
+            AND table_name <> ?
             ORDER BY table_name
-        """)
+        """, (DELETION_LOG_TABLE,))
         tables = cursor.fetchall()
 
+        # Tables whose deletions are logged, and since when
+        deletions_logged_since = get_deletion_logging(cursor)
+
         if not tables:
             print("No tables found in the database.")
             return output_dir
@@ -150,6 +384,8 @@ def backup_table_data(output_dir=None):
             # Write header to txt file
             txt_file.write(f"MariaDB Data Backup for database: {db_name}\n")
             txt_file.write(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            if incremental:
+                txt_file.write(f"Incremental backup: changes since {metadata['changes_since']}\n")
             txt_file.write("=" * 80 + "\n\n")
 
             for table in tables:
@@ -160,25 +396,6 @@ def backup_table_data(output_dir=None):
                 cursor.execute(f"SELECT COUNT(*) as count FROM `{table_name}`")
                 row_count = cursor.fetchone()['count']
 
-                # Add table to metadata
-                metadata['tables'].append({
-                    "name": table_name,
-                    "rows": row_count
-                })
-
-                # Write table header to txt file
-                txt_file.write(f"TABLE: {table_name}\n")
-                txt_file.write(f"ROWS: {row_count}\n")
-                txt_file.write("-" * 80 + "\n")
-
-                # Skip empty tables but create an empty file
-                if row_count == 0:
-                    print(f"  Table {table_name} is empty")
-                    with open(os.path.join(output_dir, f"{table_name}.json"), 'w') as f:
-                        json.dump([], f)
-                    txt_file.write("No data (table is empty)\n\n")
-                    continue
-
                 # Get column information for the table
                 cursor.execute(f"""
                     SELECT 
@@ -192,45 +409,100 @@ def backup_table_data(output_dir=None):
                     ORDER BY ordinal_position
                 """)
                 columns = cursor.fetchall()
-
-                # Save column metadata for restoration
-                with open(os.path.join(output_dir, f"{table_name}_columns.json"), 'w') as f:
-                    json.dump(columns, f, default=str)
-
-                # Write column headers to txt file
                 column_names = [col['column_name'] for col in columns]
-                txt_file.write(f"Columns: {', '.join(column_names)}\n\n")
 
-                # Fetch data in batches to avoid memory issues with large tables
-                batch_size = 5000
-                total_batches = (row_count + batch_size - 1) // batch_size  # Ceiling division
+                # Deletions since the previous backup come from the deletion log if it covers that
+                # whole period, otherwise from comparing every primary key with the saved ones
+                key_columns = get_primary_key_columns(cursor, table_name)
+                logged_since = deletions_logged_since.get(table_name)
+                uses_deletion_log = (incremental and key_columns and logged_since is not None
+                                     and logged_since <= metadata["changes_since"])
+
+                # Save the primary keys so the next incremental backup can detect deletions, unless
+                # the deletion log will have them
+                current_keys = None
+                previous_keys = None
+                if key_columns and not uses_deletion_log and (logged_since is None or incremental):
+                    key_str = ", ".join(f"`{col}`" for col in key_columns)
+                    cursor.execute(f"SELECT {key_str} FROM `{table_name}`")
+                    current_keys = [[row[col] for col in key_columns] for row in cursor.fetchall()]
+                    with open(os.path.join(output_dir, f"{table_name}_keys.json"), 'w') as f:
+                        json.dump(current_keys, f, default=str)
+                    if incremental:
+                        previous_keys = load_table_keys(parent_dir, table_name, store_dir or DEFAULT_STORE_DIR)
+
+                # Decide whether this table can be backed up as a delta
+                is_delta = (incremental
+                            and CHANGE_TRACKING_COLUMN in column_names
+                            and (uses_deletion_log or (current_keys is not None and previous_keys is not None)))
+
+                table_info = {
+                    "name": table_name,
+                    "rows": row_count,
+                    "mode": "delta" if is_delta else "full"
+                }
+
+                if is_delta:
+                    where_sql = f"`{CHANGE_TRACKING_COLUMN}` >= ?"
+                    select_params = (metadata["changes_since"],)
+                    cursor.execute(f"SELECT COUNT(*) as count FROM `{table_name}` "
+                                   f"WHERE `{CHANGE_TRACKING_COLUMN}` >= ?", select_params)
+                    export_count = cursor.fetchone()['count']
+
+                    if uses_deletion_log:
+                        deleted_keys = load_logged_deletions(cursor, table_name, metadata["changes_since"])
+                    else:
+                        # Keys are compared as strings because that is how they round-trip through JSON
+                        still_present = {tuple(str(v) for v in key) for key in current_keys}
+                        deleted_keys = [list(key) for key in previous_keys
+                                        if tuple(str(v) for v in key) not in still_present]
+                    with open(os.path.join(output_dir, f"{table_name}_deleted.json"), 'w') as f:
+                        json.dump({"key_columns": key_columns, "keys": deleted_keys}, f, default=str)
+
+                    table_info["changed_rows"] = export_count
+                    table_info["deleted_rows"] = len(deleted_keys)
+                    print(f"  {export_count} changed row(s), {len(deleted_keys)} deleted row(s)")
+                else:
+                    where_sql = None
+                    select_params = ()
+                    export_count = row_count
 
-                print(f"  Exporting {row_count} rows in {total_batches} batch(es)")
+                # Add table to metadata
+                metadata['tables'].append(table_info)
 
-                # Open file for writing JSON
-                with open(os.path.join(output_dir, f"{table_name}.json"), 'w') as f:
-                    f.write('[\n')  # Start JSON array
+                # Write table header to txt file
+                txt_file.write(f"TABLE: {table_name}\n")
+                txt_file.write(f"ROWS: {export_count}\n")
+                txt_file.write("-" * 80 + "\n")
 
-                    for batch_num in range(total_batches):
-                        offset = batch_num * batch_size
-                        print(f"  Batch {batch_num + 1}/{total_batches}")
+                # Skip empty tables but create an empty file
+                if export_count == 0:
+                    print(f"  Nothing to export for {table_name}")
+                    with open(os.path.join(output_dir, f"{table_name}.json"), 'w') as f:
+                        json.dump([], f)
+                    txt_file.write("No data (table is empty)\n\n" if not is_delta else "No changes\n\n")
+                    if not is_delta:
+                        table_info["checksum"] = format(0, "064x")
+                    continue
 
-                        cursor.execute(f"SELECT * FROM `{table_name}` LIMIT {batch_size} OFFSET {offset}")
-                        batch_data = cursor.fetchall()
+                # Save column metadata for restoration
+                with open(os.path.join(output_dir, f"{table_name}_columns.json"), 'w') as f:
+                    json.dump(columns, f, default=str)
 
-                        # Write batch data to JSON file
-                        for i, row in enumerate(batch_data):
-                            json_str = json.dumps(row, default=str)
-                            # Add comma if not the last row of the last batch
-                            if batch_num < total_batches - 1 or i < len(batch_data) - 1:
-                                f.write(f"  {json_str},\n")
-                            else:
-                                f.write(f"  {json_str}\n")
+                # Write column headers to txt file
+                txt_file.write(f"Columns: {', '.join(column_names)}\n\n")
 
-                            # Write data to txt file in a readable format
-                            txt_file.write(f"Row {offset + i + 1}: {json_str}\n")
+                exported, checksum = export_rows(cursor, table_name, where_sql, select_params, key_columns,
+                                                 export_count, os.path.join(output_dir, f"{table_name}.json"),
+                                                 txt_file)
 
-                    f.write(']')  # End JSON array
+                # A delta only covers the changed rows, so only full exports get a table checksum.
+                # Rows written while the backup ran can make the count differ from COUNT(*) above
+                if is_delta:
+                    table_info["changed_rows"] = exported
+                else:
+                    table_info["rows"] = exported
+                    table_info["checksum"] = checksum
 
                 # Add a separator between tables in txt file
                 txt_file.write("\n" + "=" * 80 + "\n\n")
@@ -245,11 +517,19 @@ def backup_table_data(output_dir=None):
             f.write(f"Generated on: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             f.write("This directory contains JSON files with data from all tables in the database.\n")
             f.write("Use these files to restore data after recreating the database schema.\n\n")
+            if incremental:
+                f.write(f"This is an INCREMENTAL backup based on {metadata['parent_backup']}.\n")
+                f.write("Restoring it replays the full base backup and every incremental backup after it,\n")
+                f.write("so the parent backup directories must be kept next to this one.\n\n")
             f.write("Files:\n")
             f.write("- backup_metadata.json: Information about this backup\n")
             f.write("- table_dependencies.json: Table relationships for proper restoration order\n")
-            f.write("- [table_name].json: Data for each table\n")
+            f.write("- [table_name].json: Data for each table (only changed rows for delta tables)\n")
             f.write("- [table_name]_columns.json: Column information for each table\n")
+            f.write("- [table_name]_keys.json: Primary keys of every row at backup time (tables whose\n")
+            f.write("  deletions are not logged in row_deletions)\n")
+            if incremental:
+                f.write("- [table_name]_deleted.json: Primary keys of rows deleted since the parent backup\n")
             f.write(f"- {txt_filename}: All table data in a single text file\n\n")
             f.write("Note: This backup contains ONLY the data, not the schema.\n")
             f.write("Use the schema backup script to recreate the database structure first.\n")
@@ -257,6 +537,12 @@ def backup_table_data(output_dir=None):
         print(f"\nData backup successfully created in directory: {output_dir}")
         print(f"All data also written to: {txt_filepath}")
         print(f"Total tables processed: {len(tables)}")
+
+        if store_dir:
+            ingest_backup(output_dir, store_dir)
+            shutil.rmtree(output_dir)
+            print(f"Backup moved into store {store_dir}; rebuild it with: python BackupStore.py restore {output_dir}")
+
         return output_dir
 
     except mariadb.Error as e:
@@ -264,16 +550,21 @@ def backup_table_data(output_dir=None):
         sys.exit(1)
     finally:
         cursor.close()
-        conn.close()
+        if own_conn:
+            conn.close()
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Create data backups of all MariaDB tables')
     parser.add_argument('-o', '--output', help='Output directory for backup files')
+    parser.add_argument('-i', '--incremental', action='store_true',
+                        help='Only back up rows changed since the most recent backup')
+    parser.add_argument('-s', '--store', nargs='?', const=DEFAULT_STORE_DIR, default=None,
+                        help=f'Add the backup to the deduplicated backup store (default: {DEFAULT_STORE_DIR})')
     args = parser.parse_args()
 
     print("=== MariaDB Table Data Backup Tool ===")
-    backup_file = backup_table_data(args.output)
+    backup_file = backup_table_data(args.output, args.incremental, args.store)
     print(f"=== Backup complete! Data saved to: {backup_file} ===")
 
 # **********************************************************************************************************************
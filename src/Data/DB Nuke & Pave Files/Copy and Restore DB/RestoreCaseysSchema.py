@@ -36,6 +36,9 @@
 
 #                   - 05.11.2025: Updated to remove user input response in terminal to allow DB_BigRedButton.py to
 #                       function correctly
+#                   - 10.19.2026: Added --target-db to restore the schema into a different (scratch) database,
+#                       used by the data restore tool's --dry-run rehearsal
+#                   - 10.19.2026: accepts an open connection so DB_BigRedButton can run it in-process
 #
 #
 # **********************************************************************************************************************
@@ -310,9 +313,12 @@ def verify_restoration(cursor, db_name):
         print(f"Error verifying restored database: {e}")
 
 
-def restore_database_schema(backup_file_path=None, auto_yes=False):
+def restore_database_schema(backup_file_path=None, auto_yes=False, target_db=None, conn=None):
     """
-    Main function to restore a database from a schema backup file
+    Main function to restore a database from a schema backup file.
+    With target_db set, the schema is created in that database instead of the one
+    named in the backup file (the backup's database is left untouched).
+    Uses conn if one is given (it is left open), otherwise opens its own connection.
     """
     # If no backup file specified, find the most recent one
     if not backup_file_path:
@@ -325,11 +331,13 @@ def restore_database_schema(backup_file_path=None, auto_yes=False):
     print(f"Using backup file: {backup_file_path}")
 
     # Extract database name
-    db_name = extract_database_name(backup_file_path)
+    db_name = target_db or extract_database_name(backup_file_path)
     print(f"Target database name: {db_name}")
 
     # Connect to MariaDB server (without database)
-    conn = connect_to_server()
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_server()
     cursor = conn.cursor()
 
     try:
@@ -377,7 +385,8 @@ def restore_database_schema(backup_file_path=None, auto_yes=False):
         sys.exit(1)
     finally:
         cursor.close()
-        conn.close()
+        if own_conn:
+            conn.close()
 
     print(f"Database '{db_name}' has been successfully restored!")
     return db_name
@@ -389,10 +398,12 @@ if __name__ == "__main__":
                         help='Path to the schema backup SQL file (if not specified, the most recent backup file will be used)')
     parser.add_argument('--yes', '-y', action='store_true',
                         help='Automatically answer "yes" to all prompts (use with caution)')
+    parser.add_argument('--target-db', '-t',
+                        help='Restore into this database instead of the one named in the backup file')
     args = parser.parse_args()
 
     print("=== MariaDB Schema Restore Tool ===")
-    db_name = restore_database_schema(args.backup_file, args.yes)
+    db_name = restore_database_schema(args.backup_file, args.yes, args.target_db)
     print(f"=== Restore complete! Database '{db_name}' is ready to use ===")
 
 
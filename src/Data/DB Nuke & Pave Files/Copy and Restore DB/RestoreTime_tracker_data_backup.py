@@ -10,6 +10,21 @@
 #
 # Change Log:       - 05.05.2025: Initial setup
 #                   - 05.11.2025: updated to disable foreign key checks during data insertion
+#                   - 10.19.2026: table files are now streamed and inserted with executemany batches;
+#                       independent tables are restored in parallel (one connection per worker)
+#                       following the determine_table_order dependency levels; large tables
+#                       have unique checks and non-unique keys disabled while they load
+#                   - 10.19.2026: incremental backups are restored by replaying the full base backup
+#                       followed by every incremental backup in its chain (deletes + upserts)
+#                   - 10.19.2026: backups that only exist in the backup store (BackupStore.py) are
+#                       rebuilt and checksum-verified before they are restored
+#                   - 10.19.2026: added --dry-run (restore into a scratch database, compare row counts
+#                       and checksums with backup_metadata.json, report per-table times and the total
+#                       recovery time, then drop the scratch database) and --as-of to pick the latest
+#                       backup taken at or before a given time
+#                   - 10.19.2026: accepts an open connection so DB_BigRedButton can run it in-process
+#                   - 10.19.2026: a rejected batch is rolled back to a savepoint before it is retried row by
+#                       row, and a row missing a column raises instead of inserting NULL
 #
 # **********************************************************************************************************************
 # **********************************************************************************************************************  
@@ -22,16 +37,31 @@ import datetime
 import mariadb
 import argparse
 import glob
+import time
+import itertools
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from datetime import datetime
+from BackupStore import DEFAULT_STORE_DIR, ensure_backup_dir, list_manifests, table_checksum
+from RestoreCaseysSchema import connect_to_server, find_latest_backup_file, restore_database_schema
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Rows sent to the server per executemany call
+DEFAULT_BATCH_SIZE = 1000
 
-def connect_to_database():
+# Number of tables restored at the same time (each worker opens its own connection)
+DEFAULT_WORKERS = 4
+
+# Tables with at least this many rows get their non-unique keys rebuilt after loading
+LARGE_TABLE_ROWS = 10000
+
+
+def connect_to_database(database=None):
     """
-    Establish connection to MariaDB using environment variables with proper error handling
+    Establish connection to MariaDB using environment variables with proper error handling.
+    Connects to DB_NAME unless another database is given.
     """
     # Check if required environment variables are set
     required_vars = ["DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME"]
@@ -61,10 +91,10 @@ def connect_to_database():
             password=os.getenv("DB_PASSWORD"),
             host=os.getenv("DB_HOST"),
             port=db_port,
-            database=os.getenv("DB_NAME"),
+            database=database or os.getenv("DB_NAME"),
             connect_timeout=5
         )
-        print(f"Successfully connected to {os.getenv('DB_NAME')} database")
+        print(f"Successfully connected to {database or os.getenv('DB_NAME')} database")
         return conn
     except mariadb.Error as e:
         print(f"Error connecting to MariaDB: {e}")
@@ -179,14 +209,397 @@ def handle_generated_columns(cursor, table):
         return []
 
 
-def restore_table_data(backup_dir, tables_to_restore=None, disable_checks=True):  # Changed default to True
+def determine_restore_levels(backup_dir, restoration_order):
+    """
+    Group the restoration order into levels of tables that do not depend on each other.
+    Every table in a level only depends on tables from earlier levels, so a level can be
+    restored in parallel once the previous one is finished.
+    """
+    dependency_file = os.path.join(backup_dir, "table_dependencies.json")
+    dependencies = []
+    if os.path.exists(dependency_file):
+        with open(dependency_file, 'r') as f:
+            dependencies = json.load(f)
+
+    dep_graph = {table: set() for table in restoration_order}
+    for dep in dependencies:
+        table = dep["table_name"]
+        referenced = dep["referenced_table_name"]
+        if table in dep_graph and referenced in dep_graph and referenced != table:
+            dep_graph[table].add(referenced)
+
+    # A table sits one level above the deepest dependency that comes before it in the order.
+    # Dependencies that come later are the back edges of a cycle and were already broken
+    # by determine_table_order, so they are ignored here as well.
+    position = {table: i for i, table in enumerate(restoration_order)}
+    level_of = {}
+    for table in restoration_order:
+        earlier = [dep for dep in dep_graph[table] if position[dep] < position[table]]
+        level_of[table] = 1 + max((level_of[dep] for dep in earlier), default=-1)
+
+    levels = []
+    for table in restoration_order:
+        while len(levels) <= level_of[table]:
+            levels.append([])
+        levels[level_of[table]].append(table)
+
+    return levels
+
+
+def iter_table_rows(table_file, read_size=65536):
+    """
+    Stream the rows of a table data file one record at a time instead of loading
+    the whole JSON array into memory
+    """
+    decoder = json.JSONDecoder()
+
+    with open(table_file, 'r') as f:
+        buffer = ''
+        started = False
+        eof = False
+
+        while True:
+            buffer = buffer.lstrip()
+
+            if not started:
+                if buffer.startswith('['):
+                    buffer = buffer[1:]
+                    started = True
+                    continue
+                if buffer:
+                    raise ValueError(f"{table_file} does not contain a JSON array")
+            elif buffer.startswith(','):
+                buffer = buffer[1:]
+                continue
+            elif buffer.startswith(']'):
+                return
+            elif buffer:
+                try:
+                    row, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    # Most likely the record is split across reads; fetch more data
+                    if eof:
+                        raise
+                else:
+                    yield row
+                    buffer = buffer[end:]
+                    continue
+
+            if eof:
+                if not started:
+                    return  # empty file
+                raise ValueError(f"{table_file} ended before the JSON array was closed")
+
+            chunk = f.read(read_size)
+            if not chunk:
+                eof = True
+            buffer += chunk
+
+
+def iter_batches(rows, batch_size):
+    """
+    Collect an iterator of rows into lists of at most batch_size rows
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_batch(cursor, sql, batch, columns_to_insert):
+    """
+    Insert a batch with a single executemany round trip. If the server rejects the batch,
+    roll back to a savepoint taken before it (the rows before the bad one may already be in)
+    and fall back to row-by-row inserts so that only the bad rows are lost.
+
+    Every row must have every column in columns_to_insert; a row without one means the table
+    file is inconsistent and raises ValueError instead of inserting NULL.
+
+    Returns a tuple of (rows inserted, list of errors)
+    """
+    values = []
+    for row in batch:
+        try:
+            values.append([row[col] for col in columns_to_insert])
+        except KeyError as e:
+            raise ValueError(f"Row {row} has no {e.args[0]} column") from None
+
+    cursor.execute("SAVEPOINT restore_batch")
+    try:
+        cursor.executemany(sql, values)
+        return len(values), []
+    except mariadb.Error:
+        cursor.execute("ROLLBACK TO SAVEPOINT restore_batch")
+
+    inserted = 0
+    errors = []
+    for row_values in values:
+        try:
+            cursor.execute(sql, row_values)
+            inserted += 1
+        except mariadb.Error as e:
+            errors.append(e)
+
+    return inserted, errors
+
+
+def restore_single_table(conn, backup_dir, table, expected_rows=0, batch_size=DEFAULT_BATCH_SIZE,
+                         upsert=False):
+    """
+    Restore one table from its JSON file using the given connection and commit it.
+    With upsert=True, rows that already exist (same primary key) are updated in place;
+    this is how the changed rows of an incremental backup are applied.
+
+    Returns a dict with the table name, rows inserted, error count and elapsed seconds
+    """
+    start_time = time.time()
+    result = {"table": table, "inserted": 0, "errors": 0, "seconds": 0.0, "skipped": False}
+    table_file = os.path.join(backup_dir, f"{table}.json")
+
+    # Skip if the file doesn't exist
+    if not os.path.exists(table_file):
+        print(f"Skipping {table}: No data file found")
+        result["skipped"] = True
+        return result
+
+    rows = iter_table_rows(table_file)
+    first_row = next(rows, None)
+
+    # Skip if there's no data
+    if first_row is None:
+        print(f"Skipping {table}: No data to restore")
+        result["skipped"] = True
+        return result
+
+    cursor = conn.cursor()
+    large_table = expected_rows >= LARGE_TABLE_ROWS
+
+    try:
+        print(f"\nRestoring data for table: {table}")
+        if expected_rows:
+            print(f"  Rows to restore: {expected_rows}")
+
+        # Check for generated columns
+        generated_columns = handle_generated_columns(cursor, table)
+
+        # Get column information from the first row
+        # This assumes consistent column structure across all rows
+        columns = list(first_row.keys())
+
+        # Remove generated columns from the insertion
+        columns_to_insert = [col for col in columns if col not in generated_columns]
+
+        # Build the SQL for inserting
+        placeholders = ", ".join(["?"] * len(columns_to_insert))
+        column_str = ", ".join([f"`{col}`" for col in columns_to_insert])
+
+        sql = f"INSERT INTO `{table}` ({column_str}) VALUES ({placeholders})"
+        if upsert:
+            update_str = ", ".join([f"`{col}` = VALUES(`{col}`)" for col in columns_to_insert])
+            sql += f" ON DUPLICATE KEY UPDATE {update_str}"
+
+        # Only for plain inserts: ON DUPLICATE KEY UPDATE needs the unique checks to find the
+        # rows it should update, and without them would leave duplicates behind
+        bulk_load = large_table and not upsert
+        if bulk_load:
+            # InnoDB ignores DISABLE KEYS, but skipping the unique checks still saves the
+            # secondary index lookups; Aria/MyISAM tables rebuild their keys in one pass
+            print("  Large table: disabling non-unique keys until the load is finished")
+            cursor.execute("SET UNIQUE_CHECKS = 0")
+            cursor.execute(f"ALTER TABLE `{table}` DISABLE KEYS")
+
+        try:
+            all_rows = itertools.chain([first_row], rows)
+            for batch_num, batch in enumerate(iter_batches(all_rows, batch_size)):
+                print(f"  Processing batch {batch_num + 1}")
+                inserted, errors = insert_batch(cursor, sql, batch, columns_to_insert)
+                result["inserted"] += inserted
+
+                for e in errors:
+                    result["errors"] += 1
+                    if result["errors"] <= 5:  # Only show first few errors
+                        print(f"    Error inserting row: {e}")
+                    elif result["errors"] == 6:
+                        print("    Additional errors suppressed...")
+        finally:
+            # also after a failed load, so the session and the table are left as they were
+            if bulk_load:
+                cursor.execute(f"ALTER TABLE `{table}` ENABLE KEYS")
+                cursor.execute("SET UNIQUE_CHECKS = 1")
+
+        conn.commit()
+
+    finally:
+        cursor.close()
+
+    result["seconds"] = time.time() - start_time
+
+    # Report on the table
+    print(f"  {table}: inserted {result['inserted']} rows with {result['errors']} errors "
+          f"in {result['seconds']:.2f} seconds")
+    return result
+
+
+def resolve_backup_chain(backup_dir, store_dir=DEFAULT_STORE_DIR):
+    """
+    Return the list of backup directories needed to restore backup_dir, starting with the
+    full base backup and ending with backup_dir itself. A full backup is its own chain.
+    Parents that only exist in the backup store are rebuilt from it.
+    """
+    chain = []
+    current = backup_dir
+    parent_root = os.path.dirname(os.path.normpath(backup_dir))
+
+    while current is not None:
+        if current in chain:
+            print(f"Error: Backup chain for {backup_dir} loops back to {current}")
+            sys.exit(1)
+
+        metadata_file = os.path.join(current, "backup_metadata.json")
+        if not os.path.exists(metadata_file):
+            print(f"Error: Backup {current} is missing backup_metadata.json")
+            sys.exit(1)
+
+        with open(metadata_file, 'r') as f:
+            metadata = json.load(f)
+
+        chain.append(current)
+
+        if metadata.get("backup_type", "full") == "full":
+            break
+
+        parent = metadata.get("parent_backup")
+        if not parent:
+            print(f"Error: Incremental backup {current} does not name its parent backup")
+            sys.exit(1)
+
+        current = ensure_backup_dir(os.path.join(parent_root, parent), store_dir)
+        if current is None:
+            print(f"Error: Parent backup {parent} not found; the incremental chain is broken")
+            sys.exit(1)
+
+    chain.reverse()
+    return chain
+
+
+def apply_deleted_rows(cursor, backup_dir, table):
+    """
+    Delete the rows listed in [table]_deleted.json of an incremental backup
+
+    Returns the number of rows deleted
+    """
+    deleted_file = os.path.join(backup_dir, f"{table}_deleted.json")
+    if not os.path.exists(deleted_file):
+        return 0
+
+    with open(deleted_file, 'r') as f:
+        deleted = json.load(f)
+
+    if not deleted["keys"]:
+        return 0
+
+    where_str = " AND ".join([f"`{col}` = ?" for col in deleted["key_columns"]])
+    cursor.executemany(f"DELETE FROM `{table}` WHERE {where_str}", deleted["keys"])
+    return len(deleted["keys"])
+
+
+def apply_incremental_backup(conn, backup_dir, tables_to_restore=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Apply one incremental backup on top of the data already in the database.
+    Delta tables get their deleted rows removed and their changed rows upserted;
+    tables that were exported in full are cleared and reloaded.
+
+    Returns the list of per-table results
+    """
+    with open(os.path.join(backup_dir, "backup_metadata.json"), 'r') as f:
+        metadata = json.load(f)
+
+    print(f"\nApplying incremental backup {backup_dir} (changes since {metadata.get('changes_since')})")
+
+    table_info = {table["name"]: table for table in metadata["tables"]}
+    restoration_order = determine_table_order(backup_dir)
+    if tables_to_restore:
+        restoration_order = [table for table in restoration_order if table in tables_to_restore]
+
+    results = []
+    cursor = conn.cursor()
+    try:
+        for table in restoration_order:
+            info = table_info.get(table, {})
+
+            if info.get("mode") == "delta":
+                deleted = apply_deleted_rows(cursor, backup_dir, table)
+                if deleted:
+                    print(f"  {table}: deleted {deleted} rows")
+                result = restore_single_table(conn, backup_dir, table, info.get("changed_rows", 0),
+                                              batch_size, upsert=True)
+                result["deleted"] = deleted
+            else:
+                cursor.execute(f"DELETE FROM `{table}`")
+                result = restore_single_table(conn, backup_dir, table, info.get("rows", 0), batch_size)
+
+            conn.commit()
+            results.append(result)
+    finally:
+        cursor.close()
+
+    return results
+
+
+def _restore_table_worker(backup_dir, table, expected_rows, batch_size, disable_checks, database=None):
     """
-    Function to restore database from a backup directory
+    Restore a single table on its own connection (used by the parallel restore)
     """
-    conn = connect_to_database()
+    conn = connect_to_database(database)
     cursor = conn.cursor()
+    try:
+        if disable_checks:
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        conn.autocommit = False
+        return restore_single_table(conn, backup_dir, table, expected_rows, batch_size)
+    finally:
+        try:
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
+        except mariadb.Error:
+            pass
+        cursor.close()
+        conn.close()
+
+
+def restore_table_data(backup_dir, tables_to_restore=None, disable_checks=True,  # Changed default to True
+                       workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE, store_dir=DEFAULT_STORE_DIR,
+                       database=None, conn=None):
+    """
+    Function to restore database from a backup directory.
+
+    Tables are restored level by level (see determine_restore_levels). With more than one
+    worker, the tables within a level are loaded in parallel, each on its own connection.
+    Every table is committed as soon as it has been loaded.
+
+    If backup_dir is an incremental backup, its full base backup is restored first and
+    every incremental backup in the chain is then applied in order.
+
+    database overrides DB_NAME as the database to restore into (used by the dry run).
+    Uses conn if one is given (it is left open), otherwise opens its own connection.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect_to_database(database)
+    cursor = conn.cursor()
+    results = []
 
     try:
+        # Incremental backups are restored from their full base backup forward
+        chain = resolve_backup_chain(backup_dir, store_dir)
+        if len(chain) > 1:
+            print(f"Incremental backup chain: {' -> '.join(os.path.basename(d) for d in chain)}")
+        target_backup_dir = backup_dir
+        backup_dir = chain[0]
+
         # Get metadata
         with open(os.path.join(backup_dir, "backup_metadata.json"), 'r') as f:
             metadata = json.load(f)
@@ -194,6 +607,8 @@ def restore_table_data(backup_dir, tables_to_restore=None, disable_checks=True):
         print(f"Restoring data from backup created on: {metadata['backup_date']}")
         print(f"Database: {metadata['database']}")
 
+        expected_rows = {table["name"]: table.get("rows", 0) for table in metadata["tables"]}
+
         # Determine the order to restore tables
         restoration_order = determine_table_order(backup_dir)
 
@@ -204,79 +619,38 @@ def restore_table_data(backup_dir, tables_to_restore=None, disable_checks=True):
         # Report on tables to be restored
         print(f"\nWill restore tables in this order: {', '.join(restoration_order)}")
 
+        levels = determine_restore_levels(backup_dir, restoration_order)
+        if workers > 1:
+            print(f"Restoring with {workers} parallel workers in {len(levels)} level(s)")
+
         # Disable foreign key checks
-        print("\nTemporarily disabling foreign key checks due to circular dependencies...")
-        cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
+        if disable_checks:
+            print("\nTemporarily disabling foreign key checks due to circular dependencies...")
+            cursor.execute("SET FOREIGN_KEY_CHECKS = 0")
         conn.autocommit = False
 
-        # Process each table
-        for table in restoration_order:
-            table_file = os.path.join(backup_dir, f"{table}.json")
-
-            # Skip if the file doesn't exist
-            if not os.path.exists(table_file):
-                print(f"Skipping {table}: No data file found")
-                continue
-
-            # Load the data from the file
-            with open(table_file, 'r') as f:
-                data = json.load(f)
-
-            # Skip if there's no data
-            if not data:
-                print(f"Skipping {table}: No data to restore")
+        for level in levels:
+            if workers <= 1 or len(level) == 1:
+                for table in level:
+                    results.append(restore_single_table(conn, backup_dir, table,
+                                                        expected_rows.get(table, 0), batch_size))
                 continue
 
-            print(f"\nRestoring data for table: {table}")
-            print(f"  Rows to restore: {len(data)}")
-
-            # Check for generated columns
-            generated_columns = handle_generated_columns(cursor, table)
-
-            # Get column information from the first row
-            # This assumes consistent column structure across all rows
-            columns = list(data[0].keys())
-
-            # Remove generated columns from the insertion
-            columns_to_insert = [col for col in columns if col not in generated_columns]
-
-            # Build the SQL for inserting
-            placeholders = ", ".join(["?"] * len(columns_to_insert))
-            column_str = ", ".join([f"`{col}`" for col in columns_to_insert])
+            with ThreadPoolExecutor(max_workers=min(workers, len(level))) as executor:
+                futures = [
+                    executor.submit(_restore_table_worker, backup_dir, table,
+                                    expected_rows.get(table, 0), batch_size, disable_checks, database)
+                    for table in level
+                ]
+                for future in as_completed(futures):
+                    results.append(future.result())
 
-            sql = f"INSERT INTO `{table}` ({column_str}) VALUES ({placeholders})"
+        # Replay the incremental backups on top of the base
+        for incremental_dir in chain[1:]:
+            results.extend(apply_incremental_backup(conn, incremental_dir, tables_to_restore, batch_size))
 
-            # Process in batches
-            batch_size = 1000
-            batches = [data[i:i + batch_size] for i in range(0, len(data), batch_size)]
-
-            # Track progress
-            total_inserted = 0
-            errors = 0
-
-            for batch_num, batch in enumerate(batches):
-                try:
-                    print(f"  Processing batch {batch_num + 1}/{len(batches)}")
-
-                    # Prepare and execute each row
-                    for row in batch:
-                        values = [row[col] for col in columns_to_insert]
-                        try:
-                            cursor.execute(sql, values)
-                            total_inserted += 1
-                        except mariadb.Error as e:
-                            errors += 1
-                            if errors <= 5:  # Only show first few errors
-                                print(f"    Error inserting row: {e}")
-                            elif errors == 6:
-                                print("    Additional errors suppressed...")
-
-                except mariadb.Error as e:
-                    print(f"  Error processing batch: {e}")
-                    errors += 1
-
-            # Report on the table
-            print(f"  Inserted {total_inserted} rows with {errors} errors")
+        if len(chain) > 1:
+            print(f"\nRestored to the state of {target_backup_dir}")
 
         # Commit all changes
         print("\nCommitting all changes...")
@@ -287,7 +661,11 @@ def restore_table_data(backup_dir, tables_to_restore=None, disable_checks=True):
         cursor.execute("SET FOREIGN_KEY_CHECKS = 1")
         conn.autocommit = True
 
+        total_inserted = sum(r["inserted"] for r in results)
+        total_errors = sum(r["errors"] for r in results)
+        print(f"\nInserted {total_inserted} rows with {total_errors} errors")
         print("\nDatabase restoration complete!")
+        return results
 
     except Exception as e:
         print(f"Error during database restoration: {e}")
@@ -304,9 +682,153 @@ def restore_table_data(backup_dir, tables_to_restore=None, disable_checks=True):
         except:
             pass
 
+        cursor.close()
+        if own_conn:
+            conn.close()
+
+
+def parse_backup_timestamp(path):
+    """
+    Read the YYYYMMDD_HHMMSS timestamp at the end of a backup file or directory name
+
+    Returns a datetime, or None if the name does not end in a timestamp
+    """
+    name = os.path.splitext(os.path.basename(os.path.normpath(path)))[0]
+    try:
+        return datetime.strptime(name[-len("YYYYMMDD_HHMMSS"):], "%Y%m%d_%H%M%S")
+    except ValueError:
+        return None
+
+
+def find_backup_as_of(as_of, pattern="*_data_backup_*", store_dir=DEFAULT_STORE_DIR):
+    """
+    Find the most recent backup taken at or before as_of (a datetime), looking at backup
+    directories (or schema files, depending on the pattern) and at the backup store
+    """
+    candidates = set(glob.glob(pattern))
+    if store_dir and pattern == "*_data_backup_*":
+        candidates.update(list_manifests(store_dir))
+
+    dated = [(parse_backup_timestamp(c), c) for c in candidates]
+    dated = [(ts, c) for ts, c in dated if ts is not None and ts <= as_of]
+
+    if not dated:
+        print(f"Error: No backup matching {pattern} was taken at or before {as_of}")
+        sys.exit(1)
+
+    backup = max(dated)[1]
+    print(f"Using backup taken at or before {as_of}: {backup}")
+    return backup
+
+
+def verify_restored_data(backup_dir, database, chain_length=1):
+    """
+    Compare the row count and checksum of every table in the database with the values
+    in backup_metadata.json. Older backups without recorded checksums are checksummed from
+    their table files; tables only covered by an incremental delta are checked by row count.
+
+    Returns a list of dicts with the table name, expected/actual rows and checksum status
+    """
+    with open(os.path.join(backup_dir, "backup_metadata.json"), 'r') as f:
+        metadata = json.load(f)
+
+    conn = connect_to_database(database)
+    cursor = conn.cursor(dictionary=True)
+    report = []
+
+    try:
+        for table in metadata["tables"]:
+            name = table["name"]
+            expected_checksum = table.get("checksum")
+            if expected_checksum is None and chain_length == 1:
+                table_file = os.path.join(backup_dir, f"{name}.json")
+                if os.path.exists(table_file):
+                    expected_checksum = table_checksum(iter_table_rows(table_file))
+
+            cursor.execute(f"SELECT COUNT(*) AS row_count FROM `{name}`")
+            actual_rows = cursor.fetchone()["row_count"]
+
+            checksum_status = "n/a"
+            if expected_checksum is not None:
+                cursor.execute(f"SELECT * FROM `{name}`")
+                actual_checksum = table_checksum(cursor)
+                checksum_status = "match" if actual_checksum == expected_checksum else "MISMATCH"
+
+            report.append({
+                "table": name,
+                "expected_rows": table.get("rows", 0),
+                "actual_rows": actual_rows,
+                "checksum": checksum_status,
+                "ok": actual_rows == table.get("rows", 0) and checksum_status != "MISMATCH"
+            })
+    finally:
         cursor.close()
         conn.close()
 
+    return report
+
+
+def rehearse_restore(backup_dir, schema_file=None, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE,
+                     store_dir=DEFAULT_STORE_DIR, keep_scratch=False):
+    """
+    Dry run: restore the schema and data into a scratch database, verify the data against
+    the backup metadata and report how long each table took and the total recovery time.
+    The live database is never touched. The scratch database is dropped afterwards
+    unless keep_scratch is set.
+
+    Returns True if every table matched
+    """
+    scratch_db = f"{os.getenv('DB_NAME')}_restore_check_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    print(f"\nDry run: restoring into scratch database {scratch_db}")
+
+    if schema_file is None:
+        schema_file = find_latest_backup_file()
+
+    start_time = time.time()
+    try:
+        restore_database_schema(schema_file, auto_yes=True, target_db=scratch_db)
+        schema_seconds = time.time() - start_time
+
+        results = restore_table_data(backup_dir, workers=workers, batch_size=batch_size,
+                                     store_dir=store_dir, database=scratch_db)
+        restore_seconds = time.time() - start_time
+
+        chain = resolve_backup_chain(backup_dir, store_dir)
+        report = verify_restored_data(chain[-1], scratch_db, len(chain))
+    finally:
+        if not keep_scratch:
+            conn = connect_to_server()
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"DROP DATABASE IF EXISTS `{scratch_db}`")
+                print(f"\nDropped scratch database {scratch_db}")
+            finally:
+                cursor.close()
+                conn.close()
+
+    # Per-table time (an incremental chain can touch a table more than once)
+    seconds = {}
+    for result in results:
+        seconds[result["table"]] = seconds.get(result["table"], 0.0) + result["seconds"]
+
+    print("\n=== Dry Run Report ===")
+    print(f"{'Table':<32}{'Expected':>10}{'Restored':>10}{'Checksum':>10}{'Seconds':>10}")
+    for row in report:
+        flag = "" if row["ok"] else "  <-- FAILED"
+        print(f"{row['table']:<32}{row['expected_rows']:>10}{row['actual_rows']:>10}"
+              f"{row['checksum']:>10}{seconds.get(row['table'], 0.0):>10.2f}{flag}")
+
+    print(f"\nSchema restore: {schema_seconds:.2f} seconds")
+    print(f"Data restore:   {restore_seconds - schema_seconds:.2f} seconds")
+    print(f"Total recovery time (RTO): {restore_seconds:.2f} seconds")
+
+    all_ok = all(row["ok"] for row in report)
+    if all_ok:
+        print("Dry run passed: every table matches the backup")
+    else:
+        print("Dry run FAILED: see the tables marked above")
+    return all_ok
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Restore data from a MariaDB backup directory')
@@ -315,11 +837,26 @@ if __name__ == "__main__":
     parser.add_argument('-t', '--tables', help='Specific tables to restore (comma-separated)', type=str)
     parser.add_argument('-c', '--enable-fk', help='Enable foreign key checks during restoration (not recommended for circular dependencies)',
                         action='store_true')
+    parser.add_argument('-w', '--workers', help=f'Number of tables to restore in parallel (default: {DEFAULT_WORKERS})',
+                        type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('-s', '--store', help=f'Backup store to rebuild missing backups from (default: {DEFAULT_STORE_DIR})',
+                        default=DEFAULT_STORE_DIR)
+    parser.add_argument('-b', '--batch-size', help=f'Rows per bulk insert (default: {DEFAULT_BATCH_SIZE})',
+                        type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('-n', '--dry-run', action='store_true',
+                        help='Restore into a scratch database, verify it against the backup and drop it again')
+    parser.add_argument('--schema', help='Schema backup file for --dry-run (default: latest, or as of --as-of)')
+    parser.add_argument('--keep-scratch', action='store_true',
+                        help='Keep the scratch database created by --dry-run')
+    parser.add_argument('-a', '--as-of', help='Restore the latest backup taken at or before this time (YYYY-MM-DD HH:MM)',
+                        type=lambda value: datetime.strptime(value, "%Y-%m-%d %H:%M"))
     args = parser.parse_args()
 
-    # Use specified backup directory or find the latest
+    # Use specified backup directory or find the latest (as of the requested time)
     backup_dir = args.backup_dir
-    if backup_dir is None:
+    if backup_dir is None and args.as_of:
+        backup_dir = find_backup_as_of(args.as_of, store_dir=args.store)
+    elif backup_dir is None:
         backup_dir = find_latest_backup()
 
     # Process table list if provided
@@ -331,12 +868,24 @@ if __name__ == "__main__":
     print(f"Backup directory: {backup_dir}")
 
     if not os.path.exists(backup_dir):
-        print(f"Error: Backup directory {backup_dir} not found.")
-        sys.exit(1)
+        # The backup may only exist in the backup store; rebuild and verify it
+        if ensure_backup_dir(backup_dir, args.store) is None:
+            print(f"Error: Backup directory {backup_dir} not found.")
+            sys.exit(1)
+
+    if args.dry_run:
+        schema_file = args.schema
+        if schema_file is None and args.as_of:
+            schema_file = find_backup_as_of(args.as_of, pattern="*_schema_backup_*.sql")
+        passed = rehearse_restore(backup_dir, schema_file, workers=args.workers, batch_size=args.batch_size,
+                                  store_dir=args.store, keep_scratch=args.keep_scratch)
+        print("=== Dry run complete! ===")
+        sys.exit(0 if passed else 1)
 
     # Note: we've inverted the logic of the disable_checks flag for better usability
     # Now by default foreign key checks are disabled, and --enable-fk turns them on
-    restore_table_data(backup_dir, tables_to_restore, not args.enable_fk)
+    restore_table_data(backup_dir, tables_to_restore, not args.enable_fk,
+                       workers=args.workers, batch_size=args.batch_size, store_dir=args.store)
     print("=== Data restoration complete! ===")
 
 
@@ -0,0 +1,105 @@
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+# Author:           Erika Brooks
+# TTfeature:        Test_01
+# Date:             10.19.2026
+# Description:      creates the cache_version table. Database bumps an entity's VERSION whenever projects,
+#                   departments or employees change, and every worker compares it with the version its cached
+#                   reference data was loaded under
+# Input:            none
+# Output:           confirmation message
+# Sources:          Project Charter
+#
+# Change Log:       - 10.19.2026: Initial setup
+#
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+
+import os
+import sys
+import mariadb
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+CACHE_ENTITIES = ("projects", "departments", "employees")
+
+
+def connect_to_database():
+    """
+    Establish connection to MariaDB database.
+    """
+    try:
+        conn = mariadb.connect(
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            host=os.getenv("DB_HOST"),
+            port=int(os.getenv("DB_PORT")),
+            database=os.getenv("DB_NAME"),
+            connect_timeout=5
+        )
+        return conn
+    except mariadb.Error as error:
+        print(f"Error connecting to database: {error}")
+        sys.exit(1)
+
+
+def create_cache_version_table():
+    """
+    Create cache_version and seed one row per cached entity.
+    """
+    print("\n1. Creating cache_version table...")
+
+    conn = connect_to_database()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS `cache_version` (
+                `ENTITY` varchar(50) NOT NULL,
+                `VERSION` bigint(20) unsigned NOT NULL DEFAULT 0,
+                `UPDATED_AT` datetime NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+                PRIMARY KEY (`ENTITY`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci
+        """)
+
+        for entity in CACHE_ENTITIES:
+            cursor.execute("INSERT IGNORE INTO cache_version (ENTITY, VERSION) VALUES (?, 0)", (entity,))
+
+        conn.commit()
+        print(f"   ✅ cache_version ready ({', '.join(CACHE_ENTITIES)})")
+        return True
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error creating cache_version: {error}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    """
+    Main function to add the cache version table.
+    """
+    print("=== Adding Cache Version Table ===")
+
+    try:
+        if not create_cache_version_table():
+            sys.exit(1)
+
+        print("\n=== Cache Version Table Addition Complete! ===")
+        print("Restart the web workers so they start checking cache versions.")
+
+    except Exception as error:
+        print(f"\n❌ Error during execution: {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+
+# **********************************************************************************************************************
+# **********************************************************************************************************************
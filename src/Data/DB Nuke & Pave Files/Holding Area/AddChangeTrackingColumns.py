@@ -0,0 +1,290 @@
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+# Author:           Erika Brooks
+# TTfeature:        Test_01
+# Date:             10.19.2026
+# Description:      adds an UPDATED_AT column to every table so incremental data backups
+#                   (Get_SaveAllCurrentData.py --incremental) can find the rows changed since the last backup,
+#                   and an AFTER DELETE trigger per table that logs the primary key of every deleted row in
+#                   row_deletions so they can find deleted rows without reading every key
+# Input:            none
+# Output:           confirmation message
+# Sources:          Project Charter
+#
+# Change Log:       - 10.19.2026: Initial setup
+#                   - 10.19.2026: Added the row_deletions log and its delete triggers
+#
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+
+import os
+import sys
+import mariadb
+from dotenv import load_dotenv
+from prettytable import PrettyTable
+
+# Load environment variables
+load_dotenv()
+
+CHANGE_TRACKING_COLUMN = "UPDATED_AT"
+DELETION_LOG_TABLE = "row_deletions"
+DELETION_LOG_TRIGGER = "trg_{table}_log_delete"
+
+
+def connect_to_database():
+    """
+    Establish connection to MariaDB database.
+    """
+    try:
+        conn = mariadb.connect(
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            host=os.getenv("DB_HOST"),
+            port=int(os.getenv("DB_PORT")),
+            database=os.getenv("DB_NAME"),
+            connect_timeout=5
+        )
+        return conn
+    except mariadb.Error as error:
+        print(f"Error connecting to database: {error}")
+        sys.exit(1)
+
+
+def find_tables_missing_column():
+    """
+    Return the base tables that do not have the change tracking column yet.
+    """
+    print("\n1. Checking which tables need the UPDATED_AT column...")
+
+    conn = connect_to_database()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT t.TABLE_NAME
+            FROM INFORMATION_SCHEMA.TABLES t
+            WHERE t.TABLE_SCHEMA = DATABASE()
+            AND t.TABLE_TYPE = 'BASE TABLE'
+            AND t.TABLE_NAME <> ?
+            AND NOT EXISTS (
+                SELECT 1 FROM INFORMATION_SCHEMA.COLUMNS c
+                WHERE c.TABLE_SCHEMA = t.TABLE_SCHEMA
+                AND c.TABLE_NAME = t.TABLE_NAME
+                AND c.COLUMN_NAME = ?
+            )
+            ORDER BY t.TABLE_NAME;
+        """, (DELETION_LOG_TABLE, CHANGE_TRACKING_COLUMN))
+
+        tables = [row[0] for row in cursor.fetchall()]
+
+        if tables:
+            print(f"   📋 {len(tables)} table(s) to update: {', '.join(tables)}")
+        else:
+            print("   ✅ Every table already has the UPDATED_AT column")
+
+        return tables
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error checking tables: {error}")
+        return []
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def add_change_tracking_column(tables):
+    """
+    Add UPDATED_AT (maintained by the server on every insert and update) and an index on it.
+    Existing rows get the current time, so the first incremental backup after this runs should
+    be based on a full backup taken afterwards.
+    """
+    print("\n2. Adding UPDATED_AT column and index...")
+
+    conn = connect_to_database()
+    cursor = conn.cursor()
+    updated = []
+
+    try:
+        for table in tables:
+            try:
+                cursor.execute(f"""
+                    ALTER TABLE `{table}`
+                    ADD COLUMN `{CHANGE_TRACKING_COLUMN}` DATETIME NOT NULL
+                        DEFAULT current_timestamp() ON UPDATE current_timestamp()
+                        COMMENT 'Last insert/update time, used by incremental backups',
+                    ADD INDEX `idx_{table}_updated_at` (`{CHANGE_TRACKING_COLUMN}`)
+                """)
+                conn.commit()
+                updated.append(table)
+                print(f"   ✅ {table}")
+            except mariadb.Error as error:
+                print(f"   ❌ {table}: {error}")
+                conn.rollback()
+
+        return updated
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def add_deletion_log():
+    """
+    Create row_deletions and an AFTER DELETE trigger on every table with a primary key that
+    writes the deleted row's key to it (as a JSON array in key order). Triggers that already
+    exist are left alone, so their creation time keeps telling backups since when a table's
+    deletions are logged.
+    """
+    print("\n3. Adding deletion log and delete triggers...")
+
+    conn = connect_to_database()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS `{DELETION_LOG_TABLE}` (
+                `ID` bigint(20) unsigned NOT NULL AUTO_INCREMENT,
+                `TABLE_NAME` varchar(64) NOT NULL,
+                `ROW_KEY` longtext NOT NULL CHECK (json_valid(`ROW_KEY`)),
+                `DELETED_AT` datetime NOT NULL DEFAULT current_timestamp(),
+                PRIMARY KEY (`ID`),
+                KEY `idx_row_deletions_table_deleted_at` (`TABLE_NAME`, `DELETED_AT`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci
+        """)
+        conn.commit()
+        print(f"   ✅ {DELETION_LOG_TABLE} ready")
+
+        cursor.execute("""
+            SELECT k.TABLE_NAME, k.COLUMN_NAME
+            FROM INFORMATION_SCHEMA.KEY_COLUMN_USAGE k
+            JOIN INFORMATION_SCHEMA.TABLES t
+                ON t.TABLE_SCHEMA = k.TABLE_SCHEMA
+                AND t.TABLE_NAME = k.TABLE_NAME
+            WHERE k.TABLE_SCHEMA = DATABASE()
+            AND k.CONSTRAINT_NAME = 'PRIMARY'
+            AND t.TABLE_TYPE = 'BASE TABLE'
+            AND k.TABLE_NAME <> ?
+            ORDER BY k.TABLE_NAME, k.ORDINAL_POSITION;
+        """, (DELETION_LOG_TABLE,))
+        key_columns = {}
+        for table, column in cursor.fetchall():
+            key_columns.setdefault(table, []).append(column)
+
+        cursor.execute("SELECT TRIGGER_NAME FROM INFORMATION_SCHEMA.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        for table, columns in key_columns.items():
+            trigger = DELETION_LOG_TRIGGER.format(table=table)
+            if trigger in existing:
+                continue
+            key_values = ", ".join(f"OLD.`{column}`" for column in columns)
+            try:
+                cursor.execute(f"""
+                    CREATE TRIGGER `{trigger}` AFTER DELETE ON `{table}`
+                    FOR EACH ROW
+                    INSERT INTO `{DELETION_LOG_TABLE}` (TABLE_NAME, ROW_KEY)
+                    VALUES ('{table}', JSON_ARRAY({key_values}))
+                """)
+                print(f"   ✅ {trigger}")
+            except mariadb.Error as error:
+                print(f"   ❌ {trigger}: {error}")
+
+        return True
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error adding deletion log: {error}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def verify_column_addition():
+    """
+    Show every table with its change tracking column details.
+    """
+    print("\n4. Verifying column addition...")
+
+    conn = connect_to_database()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT t.TABLE_NAME, c.COLUMN_TYPE, c.COLUMN_DEFAULT, c.EXTRA
+            FROM INFORMATION_SCHEMA.TABLES t
+            LEFT JOIN INFORMATION_SCHEMA.COLUMNS c
+                ON c.TABLE_SCHEMA = t.TABLE_SCHEMA
+                AND c.TABLE_NAME = t.TABLE_NAME
+                AND c.COLUMN_NAME = ?
+            WHERE t.TABLE_SCHEMA = DATABASE()
+            AND t.TABLE_TYPE = 'BASE TABLE'
+            AND t.TABLE_NAME <> ?
+            ORDER BY t.TABLE_NAME;
+        """, (CHANGE_TRACKING_COLUMN, DELETION_LOG_TABLE))
+
+        pt = PrettyTable()
+        pt.field_names = ["Table", "Type", "Default", "Extra"]
+        pt.align = 'l'
+
+        all_present = True
+        for table, column_type, default, extra in cursor.fetchall():
+            if column_type is None:
+                all_present = False
+                pt.add_row([table, "MISSING", "", ""])
+            else:
+                pt.add_row([table, column_type, default or '', extra or ''])
+
+        print(pt)
+        return all_present
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error verifying columns: {error}")
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    """
+    Main function to add change tracking to every table.
+    """
+    print("=== Adding Change Tracking Columns ===")
+    print("This script adds an UPDATED_AT column to every table and logs deleted rows")
+    print("so data backups can be taken incrementally.")
+
+    try:
+        # Step 1: Find tables that still need the column
+        tables = find_tables_missing_column()
+
+        # Step 2: Add the column
+        if tables:
+            updated = add_change_tracking_column(tables)
+            if len(updated) != len(tables):
+                print("\n⚠️  Some tables could not be updated.")
+
+        # Step 3: Log deleted rows
+        if not add_deletion_log():
+            print("\n⚠️  Deleted rows are not logged; incremental backups will compare every key.")
+
+        # Step 4: Verify
+        if not verify_column_addition():
+            print("\n❌ Column verification failed.")
+            return
+
+        print("\n=== Change Tracking Addition Complete! ===")
+        print(f"\n📋 Next Steps:")
+        print("• Take a full backup: python Get_SaveAllCurrentData.py")
+        print("• Nightly backups can then use: python Get_SaveAllCurrentData.py --incremental")
+
+    except Exception as error:
+        print(f"\n❌ Error during execution: {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+
+# **********************************************************************************************************************
+# **********************************************************************************************************************
@@ -0,0 +1,129 @@
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+# Author:           Erika Brooks
+# TTfeature:        Test_01
+# Date:             10.19.2026
+# Description:      creates the timer_early_stops table. With write-behind on, a timer's start can still be in
+#                   one worker's journal when its stop reaches the database through another worker. The stop is
+#                   kept here and applied when the start is written (see Database.apply_timer_ops), instead of
+#                   matching no row and leaving the timer running forever
+# Input:            none
+# Output:           confirmation message
+# Sources:          Project Charter
+#
+# Change Log:       - 10.19.2026: Initial setup
+#
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+
+import os
+import sys
+import mariadb
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def connect_to_database():
+    """
+    Establish connection to MariaDB database.
+    """
+    try:
+        conn = mariadb.connect(
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            host=os.getenv("DB_HOST"),
+            port=int(os.getenv("DB_PORT")),
+            database=os.getenv("DB_NAME"),
+            connect_timeout=5
+        )
+        return conn
+    except mariadb.Error as error:
+        print(f"Error connecting to database: {error}")
+        sys.exit(1)
+
+
+def create_early_stops_table():
+    """
+    Create timer_early_stops: one row per TIMEID whose stop arrived before its start.
+    """
+    print("\n1. Creating timer_early_stops table...")
+
+    conn = connect_to_database()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS `timer_early_stops` (
+                `TIMEID` varchar(20) NOT NULL,
+                `EMPID` varchar(20) NOT NULL,
+                `STOP_TIME` datetime NOT NULL,
+                `CREATED_AT` datetime NOT NULL DEFAULT current_timestamp(),
+                PRIMARY KEY (`TIMEID`)
+            ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci
+        """)
+
+        conn.commit()
+        print("   ✅ timer_early_stops ready")
+        return True
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error creating timer_early_stops: {error}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def purge_stale_early_stops(days=30):
+    """
+    Delete early stops whose start never reached the database (it was dead-lettered, or
+    another timer was already running), so the table does not grow.
+    """
+    print(f"\n2. Purging early stops older than {days} days...")
+
+    conn = connect_to_database()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("DELETE FROM timer_early_stops WHERE CREATED_AT < NOW() - INTERVAL ? DAY", (days,))
+        conn.commit()
+        print(f"   ✅ Removed {cursor.rowcount} stale early stops")
+        return True
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error purging timer_early_stops: {error}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    """
+    Main function to add the early stops table. Re-running it only purges stale rows.
+    """
+    print("=== Adding Timer Early Stops Table ===")
+
+    try:
+        if not create_early_stops_table():
+            sys.exit(1)
+        if not purge_stale_early_stops():
+            sys.exit(1)
+
+        print("\n=== Timer Early Stops Table Addition Complete! ===")
+        print("Restart the web workers so they start holding early stops.")
+
+    except Exception as error:
+        print(f"\n❌ Error during execution: {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+
+# **********************************************************************************************************************
+# **********************************************************************************************************************
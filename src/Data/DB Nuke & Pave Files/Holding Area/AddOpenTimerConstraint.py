@@ -0,0 +1,162 @@
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+# Author:           Erika Brooks
+# TTfeature:        Test_01
+# Date:             10.19.2026
+# Description:      enforces "at most one running timer per employee" in the database: adds a generated column
+#                   OPEN_TIMER_EMPID (EMPID while STOP_TIME is NULL, otherwise NULL) with a unique index, so a
+#                   second concurrent start is rejected (see Database.start_timer). Timers that are already
+#                   duplicated are closed first, keeping each employee's most recent one running.
+# Input:            none
+# Output:           confirmation message
+# Sources:          Project Charter
+#
+# Change Log:       - 10.19.2026: Initial setup
+#
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+
+import os
+import sys
+import mariadb
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+COLUMN_NAME = "OPEN_TIMER_EMPID"
+INDEX_NAME = "uq_time_open_timer"
+
+
+def connect_to_database():
+    """
+    Establish connection to MariaDB database.
+    """
+    try:
+        conn = mariadb.connect(
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            host=os.getenv("DB_HOST"),
+            port=int(os.getenv("DB_PORT")),
+            database=os.getenv("DB_NAME"),
+            connect_timeout=5
+        )
+        return conn
+    except mariadb.Error as error:
+        print(f"Error connecting to database: {error}")
+        sys.exit(1)
+
+
+def close_duplicate_timers(conn):
+    """
+    Stop every open timer except each employee's most recent one, at the moment the next one
+    started, so the unique index can be created.
+    """
+    print("\n1. Closing duplicate running timers...")
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT t.TIMEID, t.EMPID, t.START_TIME,
+                   (SELECT MIN(n.START_TIME) FROM time n
+                    WHERE n.EMPID = t.EMPID AND n.STOP_TIME IS NULL AND n.START_TIME > t.START_TIME)
+            FROM time t
+            WHERE t.STOP_TIME IS NULL
+              AND EXISTS (SELECT 1 FROM time o
+                          WHERE o.EMPID = t.EMPID AND o.STOP_TIME IS NULL
+                            AND (o.START_TIME > t.START_TIME
+                                 OR (o.START_TIME = t.START_TIME AND o.TIMEID > t.TIMEID)))
+        """)
+        duplicates = cursor.fetchall()
+
+        if not duplicates:
+            print("   ✅ No employee has more than one running timer")
+            return True
+
+        for timeid, empid, start_time, next_start in duplicates:
+            # STOP_TIME must be after START_TIME (chk_time_valid)
+            cursor.execute("""
+                UPDATE time
+                SET STOP_TIME = GREATEST(COALESCE(?, START_TIME), START_TIME + INTERVAL 1 MINUTE)
+                WHERE TIMEID = ?
+            """, (next_start, timeid))
+            print(f"   🔹 Closed {timeid} for {empid} (started {start_time})")
+
+        conn.commit()
+        print(f"   ✅ Closed {len(duplicates)} duplicate timer(s)")
+        return True
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error closing duplicate timers: {error}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
+
+def column_exists(cursor):
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'time' AND COLUMN_NAME = ?
+    """, (COLUMN_NAME,))
+    return cursor.fetchone()[0] > 0
+
+
+def add_open_timer_constraint(conn):
+    """
+    Add the generated column and its unique index. NULLs do not collide in a unique index,
+    so only open timers (one per EMPID) are constrained.
+    """
+    print(f"\n2. Adding {COLUMN_NAME} and {INDEX_NAME} to time...")
+    cursor = conn.cursor()
+
+    try:
+        if column_exists(cursor):
+            print("   ✅ Constraint already exists")
+            return True
+
+        cursor.execute(f"""
+            ALTER TABLE `time`
+            ADD COLUMN `{COLUMN_NAME}` varchar(20)
+                GENERATED ALWAYS AS (IF(`STOP_TIME` IS NULL, `EMPID`, NULL)) STORED,
+            ADD UNIQUE KEY `{INDEX_NAME}` (`{COLUMN_NAME}`)
+        """)
+        conn.commit()
+        print("   ✅ Constraint created")
+        return True
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error adding constraint: {error}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+
+
+def main():
+    """
+    Main function to add the single-running-timer constraint.
+    """
+    print("=== Adding Open Timer Constraint ===")
+
+    conn = connect_to_database()
+    try:
+        if not close_duplicate_timers(conn):
+            sys.exit(1)
+        if not add_open_timer_constraint(conn):
+            sys.exit(1)
+
+        print("\n=== Open Timer Constraint Addition Complete! ===")
+
+    except Exception as error:
+        print(f"\n❌ Error during execution: {error}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
+
+# **********************************************************************************************************************
+# **********************************************************************************************************************
@@ -0,0 +1,109 @@
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+# Author:           Erika Brooks
+# TTfeature:        Test_01
+# Date:             10.19.2026
+# Description:      adds a covering index on time (EMPID, START_TIME, PROJECTID, TOTAL_MINUTES) so the weekly
+#                   timesheet query (Database.get_weekly_timesheet) reads one index range per employee-week
+#                   instead of every row for the employee
+# Input:            none
+# Output:           confirmation message
+# Sources:          Project Charter
+#
+# Change Log:       - 10.19.2026: Initial setup
+#
+# **********************************************************************************************************************
+# **********************************************************************************************************************
+
+import os
+import sys
+import mariadb
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+INDEX_NAME = "idx_time_emp_start"
+INDEX_COLUMNS = "EMPID, START_TIME, PROJECTID, TOTAL_MINUTES"
+
+
+def connect_to_database():
+    """
+    Establish connection to MariaDB database.
+    """
+    try:
+        conn = mariadb.connect(
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            host=os.getenv("DB_HOST"),
+            port=int(os.getenv("DB_PORT")),
+            database=os.getenv("DB_NAME"),
+            connect_timeout=5
+        )
+        return conn
+    except mariadb.Error as error:
+        print(f"Error connecting to database: {error}")
+        sys.exit(1)
+
+
+def index_exists(cursor):
+    """
+    Check whether the timesheet index is already on the time table.
+    """
+    cursor.execute("""
+        SELECT COUNT(*) FROM INFORMATION_SCHEMA.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'time' AND INDEX_NAME = ?
+    """, (INDEX_NAME,))
+    return cursor.fetchone()[0] > 0
+
+
+def add_timesheet_index():
+    """
+    Create the covering index. TOTAL_MINUTES is a stored generated column, so it can be indexed.
+    """
+    print(f"\n1. Adding {INDEX_NAME} ({INDEX_COLUMNS}) to time...")
+
+    conn = connect_to_database()
+    cursor = conn.cursor()
+
+    try:
+        if index_exists(cursor):
+            print("   ✅ Index already exists")
+            return True
+
+        cursor.execute(f"CREATE INDEX `{INDEX_NAME}` ON `time` ({INDEX_COLUMNS})")
+        conn.commit()
+        print("   ✅ Index created")
+        return True
+
+    except mariadb.Error as error:
+        print(f"   ❌ Error creating index: {error}")
+        conn.rollback()
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def main():
+    """
+    Main function to add the timesheet index.
+    """
+    print("=== Adding Timesheet Index ===")
+
+    try:
+        if not add_timesheet_index():
+            sys.exit(1)
+
+        print("\n=== Timesheet Index Addition Complete! ===")
+
+    except Exception as error:
+        print(f"\n❌ Error during execution: {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
+
+# **********************************************************************************************************************
+# **********************************************************************************************************************
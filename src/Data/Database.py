@@ -1,37 +1,303 @@
 import mariadb
 import os
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
-import pytz
-from datetime import datetime, timezone
-
-local_tz = pytz.timezone("America/Los_Angeles")  # adjust if needed
+from functools import partial
+from datetime import datetime, timezone, timedelta
+from src.Utils.AppLogger import get_logger
+from src.Utils.TimeZones import DEFAULT_TIMEZONE, get_zone, day_boundaries
+from src.Data.OrgTree import OrgTree, OrgNode, ORG_NODE_COLUMNS
+from src.Data.QueryCache import QueryCache, invalidates
+from src.Data.CacheBus import CacheBus
+from src.Data.WriteBehind import WriteBehindQueue
+from src.Data.StatementCache import in_list
+from src.Data.ConnectionPool import ConnectionPool
+from src.Data.Resilience import CircuitBreaker, DatabaseUnavailableError, DB_UNAVAILABLE_ERRORS, retries_reads
+from src.Data.ReadRouting import (
+    PRIMARY, REPLICA, connection_settings, prefers_primary, reads_from_replica, replica_configured
+)
+from src.Data.RowModels import (
+    EmployeeRow, EmployeeNameRow, ProjectRow, ProjectSummaryRow, DepartmentRow, LoginRow,
+    TimeEntryRow, EmployeeTimeEntryRow, TimeEntryRecordRow, ReportRow, DailyMinutesRow, TimesheetRow, WeeklyTimesheet, ActiveTimerRow, TimerRow, TimerChange,
+    EMPLOYEE_COLUMNS, DEPARTMENT_COLUMNS, LOGIN_COLUMNS, TIME_ENTRY_COLUMNS, TIME_ENTRY_RECORD_COLUMNS, REPORT_COLUMNS, to_rows, to_row
+)
+
+logger = get_logger(__name__)
+
+local_tz = get_zone(DEFAULT_TIMEZONE)
+
+# Other processes can change the hierarchy too, so a cached org tree is rebuilt at least this often
+ORG_TREE_MAX_AGE_SECONDS = 300
+
+# Reference data cache: TTL per entity (seconds) and size bound. Workers on this host see
+# each other's changes at once through the CacheBus stamp files; changes made on other hosts
+# are picked up by re-reading the cache_version table at most every CACHE_VERSION_POLL_SECONDS.
+CACHE_TTLS = {"projects": 60, "departments": 300, "employees": 60}
+CACHE_MAX_ENTRIES = 1024
+CACHE_VERSION_POLL_SECONDS = int(os.getenv("CACHE_VERSION_POLL_SECONDS", "5"))
+
+# IN lists longer than this are loaded into a temporary table and matched with a subquery
+# on it instead of one placeholder per value (tests/BenchmarkInList.py finds the crossover)
+IN_LIST_TEMP_TABLE_THRESHOLD = int(os.getenv("IN_LIST_TEMP_TABLE_THRESHOLD", "256"))
+
+# Entities whose changes can alter what a user may see or edit (src/Logic/Permissions.py)
+PERMISSION_ENTITIES = ("employees", "projects", "memberships")
+
+# Connections come from a bounded pool per route (see src/Data/ConnectionPool.py) and are
+# handed back at the end of each request. A new connection gives up after this many seconds,
+# and one that sat idle longer than DB_PING_AFTER_SECONDS (MariaDB's wait_timeout may have
+# closed it) is pinged before use.
+# Timer writes that find the database unreachable are journaled locally instead of failing
+# (see src/Data/WriteBehind.py); reads are retried (see src/Data/Resilience.py).
+DB_CONNECT_TIMEOUT = int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+DB_PING_AFTER_SECONDS = int(os.getenv("DB_PING_AFTER_SECONDS", "30"))
+
+# ER_DUP_ENTRY, and the unique index that allows one running timer per employee
+# (Holding Area/AddOpenTimerConstraint.py)
+DUPLICATE_KEY_ERRNO = 1062
+OPEN_TIMER_INDEX = "uq_time_open_timer"
 
 load_dotenv()
 
 class Database:
-    __connection = None
+    # a connection pool for the primary, and one for the replica reads are routed to (see
+    # src/Data/ReadRouting.py); per thread, the connection checked out of each until
+    # release_connection()
+    __pools = {}
+    __pool_lock = threading.Lock()
+    __locals = {PRIMARY: threading.local(), REPLICA: threading.local()}
+    __breakers = {PRIMARY: CircuitBreaker(), REPLICA: CircuitBreaker()}
+    # per thread: the route in use, and the read-your-writes state of the current request
+    __routing = threading.local()
+    __org_tree = None
+    __org_tree_version = None
+    __org_tree_built_at = 0.0
+    __query_cache = QueryCache(ttls=CACHE_TTLS, max_entries=CACHE_MAX_ENTRIES)
+    __cache_versions = {}
+    __cache_versions_read_at = 0.0
+    __cache_versions_available = True
+    # a connection of its own for re-reading cache_version, in autocommit mode so every
+    # read sees the latest commits without ending a caller's transaction
+    __cache_version_connection = None
+    __cache_version_lock = threading.Lock()
+    __cache_bus = CacheBus()
+    __change_tracking_available = True
+    __early_stops_available = True
+    # the local journal (a WriteBehindQueue, started once per process) and whether timer
+    # writes are routed through it
+    __journal = None
+    __journal_lock = threading.Lock()
+    __write_behind = False
+
+    @classmethod
+    def __route(cls):
+        return getattr(cls.__routing, "route", PRIMARY)
+
+    @classmethod
+    def __state(cls):
+        # the calling thread's connection state for the route in use
+        return cls.__locals[cls.__route()]
+
+    @classmethod
+    def __route_breaker(cls):
+        return cls.__breakers[cls.__route()]
+
+    @classmethod
+    def __pool(cls, route):
+        pool = cls.__pools.get(route)
+        if pool is None:
+            with cls.__pool_lock:
+                pool = cls.__pools.setdefault(route, ConnectionPool(partial(cls.__open_connection, route)))
+        return pool
+
+    @classmethod
+    def __open_connection(cls, route):
+        # the breaker counts attempts to reach the server of this route only
+        try:
+            connection = mariadb.connect(**connection_settings(route), connect_timeout=DB_CONNECT_TIMEOUT)
+        except DB_UNAVAILABLE_ERRORS:
+            cls.__breakers[route].record_failure()
+            raise
+        cls.__breakers[route].record_success()
+        return connection
 
     @classmethod
     def connect(cls):
-        if cls.__connection is None:
-            cls.__connection = mariadb.connect(
-                user=os.getenv("DB_USER"),
-                password=os.getenv("DB_PASSWORD"),
-                host=os.getenv("DB_HOST"),
-                port=int(os.getenv("DB_PORT")),
-                database=os.getenv("DB_NAME")
-            )
+        """
+        Check a connection out of the pool for the calling thread, unless it holds one
+        already, pinging it first if it sat idle too long.
+        """
+        state = cls.__state()
+        while True:
+            pooled = getattr(state, "pooled", None)
+            if pooled is None:
+                if not cls.__route_breaker().allow():
+                    raise DatabaseUnavailableError("Database unavailable, retry in %.0fs" % cls.__route_breaker().retry_after())
+                pooled = state.pooled = cls.__pool(cls.__route()).checkout()
+            if time.monotonic() - pooled.used_at <= DB_PING_AFTER_SECONDS:
+                break
+            try:
+                pooled.connection.ping()
+                break
+            except mariadb.Error as e:
+                logger.info("Idle database connection was closed (%s), reconnecting", e)
+                cls.discard_connection()
+        pooled.used_at = time.monotonic()
 
     @classmethod
-    def get_cursor(cls):
+    def get_connection(cls):
+        """
+        The connection the calling thread has checked out, checked out on first use.
+        Inside run_on_replica this is the replica connection.
+        """
         cls.connect()
-        return cls.__connection.cursor()
+        return cls.__state().pooled.connection
+
+    @classmethod
+    def release_connection(cls):
+        """
+        Hand the calling thread's connections back to their pools, ending any open
+        transaction. Called at the end of every web request and AsyncDatabase call; the
+        next call checks one out again, with the statements already prepared on it.
+        """
+        for route, state in cls.__locals.items():
+            pooled = getattr(state, "pooled", None)
+            if pooled is None:
+                continue
+            state.pooled = None
+            try:
+                pooled.connection.rollback()
+            except mariadb.Error as e:
+                logger.info("Dropping a database connection that failed to roll back: %s", e)
+                cls.__pool(route).discard(pooled)
+            else:
+                cls.__pool(route).checkin(pooled)
+
+    @classmethod
+    def get_pool_stats(cls):
+        return {route: pool.stats() for route, pool in cls.__pools.items()}
+
+    @classmethod
+    def get_retry_after(cls):
+        """
+        Seconds until the circuit breaker lets a call through again (0 if it is closed).
+        """
+        return cls.__route_breaker().retry_after()
+
+    @classmethod
+    def begin_request(cls, last_write_at=None):
+        """
+        Start of a web request on this thread. Reads stay on the primary while the user's
+        last write (epoch seconds, kept in their session) is within DB_REPLICA_LAG_SECONDS,
+        so they see their own changes. Also clears last_write_at().
+        """
+        cls.__routing.primary_for = last_write_at
+        cls.__routing.wrote_at = None
+
+    @classmethod
+    def last_write_at(cls):
+        """
+        When this thread last committed a write (or journaled one) since begin_request(), or None.
+        """
+        return getattr(cls.__routing, "wrote_at", None)
+
+    @classmethod
+    def run_on_replica(cls, func, *args, **kwargs):
+        """
+        Run the read func(cls, ...) on the replica connection (see src/Data/ReadRouting.py).
+        Runs it on the primary instead when no replica is configured, when the caller wrote
+        recently (read-your-writes), or when the replica cannot be reached.
+        """
+        recent_write = cls.last_write_at() or getattr(cls.__routing, "primary_for", None)
+        if cls.__route() == REPLICA or not replica_configured() or prefers_primary(recent_write, time.time()):
+            return func(cls, *args, **kwargs)
+
+        cls.__routing.route = REPLICA
+        try:
+            return func(cls, *args, **kwargs)
+        except DB_UNAVAILABLE_ERRORS as e:
+            logger.warning("Replica unavailable for %s, reading from the primary: %s", func.__name__, e)
+            cls.discard_connection()
+        finally:
+            cls.__routing.route = PRIMARY
+        return func(cls, *args, **kwargs)
+
+    @classmethod
+    def discard_connection(cls):
+        """
+        Close the calling thread's connection (after it failed) instead of handing it back to
+        the pool; the next call checks out another one.
+        """
+        pooled = getattr(cls.__state(), "pooled", None)
+        cls.__state().pooled = None
+        if pooled is not None:
+            cls.__pool(cls.__route()).discard(pooled)
+
+    @classmethod
+    def get_cursor(cls):
+        return cls.get_connection().cursor()
 
     @classmethod
     def commit(cls):
-        cls.__connection.commit()
+        cls.get_connection().commit()
+        cls.__routing.wrote_at = time.time()
 
     @classmethod
+    def execute_prepared(cls, query, params=()):
+        """
+        Run a query on the connection's prepared statement for it (see
+        src/Data/StatementCache.py), preparing it on first use. Build IN lists with
+        id_list() so the query text stays the same across list lengths.
+
+        Returns:
+            the cursor; read the result before running the same query again, and do not close it
+        """
+        cls.get_connection()
+        return cls.__state().pooled.statements.execute(query, params)
+
+    @classmethod
+    def id_list(cls, values, slot=0):
+        """
+        The right-hand side of "column IN ..." for a list of IDs (EMPIDs, PROJECTIDs, TIMEIDs).
+
+        Up to IN_LIST_TEMP_TABLE_THRESHOLD values become placeholders, padded to a bucket
+        size (see in_list). Longer lists are loaded into this connection's temporary table
+        tmp_ids_<slot> and matched with "(SELECT ID FROM tmp_ids_<slot>)", which MariaDB runs
+        as a semi-join; the query text then no longer depends on the list at all.
+
+        Args:
+            values: The IDs to match
+            slot: Which temporary table to use; give each list in one query its own slot
+
+        Returns:
+            (sql, params)
+        """
+        values = list(values)
+        if len(values) <= IN_LIST_TEMP_TABLE_THRESHOLD:
+            return in_list(values)
+
+        table = f"tmp_ids_{slot}"
+        cursor = cls.get_cursor()
+        if table not in cls.__state().pooled.temp_tables:
+            cursor.execute(f'''
+                CREATE TEMPORARY TABLE IF NOT EXISTS {table} (ID varchar(20) NOT NULL PRIMARY KEY)
+                ENGINE=MEMORY DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci
+            ''')
+            cls.__state().pooled.temp_tables.add(table)
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.executemany(f"INSERT IGNORE INTO {table} (ID) VALUES (?)", [(value,) for value in values])
+        cursor.close()
+        return f"(SELECT ID FROM {table})", []
+
+    @classmethod
+    def get_statement_cache_stats(cls):
+        pooled = getattr(cls.__state(), "pooled", None)
+        return pooled.statements.stats() if pooled is not None else {"statements": 0, "hits": 0, "misses": 0}
+
+    @classmethod
+    @retries_reads
     def fetch_one(cls, query, params=None):
         cursor = cls.get_cursor()
         cursor.execute(query, params or ())
@@ -39,11 +305,124 @@ class Database:
         cursor.close()
         return result
 
+# ======================
+# 🔹 Reference Data Cache
+# ======================
+
+    @classmethod
+    def get_cache_version(cls, entity):
+        """
+        Current version token of an entity: (cache_version row, same-host bus stamp).
+
+        The bus stamp is one os.stat() and is checked on every call. The cache_version
+        table is re-read at most every CACHE_VERSION_POLL_SECONDS. If that table does not
+        exist yet (see Holding Area/AddCacheVersionTable.py), its part is None and other
+        hosts' changes are only picked up when entries expire.
+        """
+        return (cls.__db_cache_version(entity), cls.__cache_bus.stamp(entity))
+
+    @classmethod
+    def __db_cache_version(cls, entity):
+        if not cls.__cache_versions_available:
+            return None
+
+        now = time.monotonic()
+        if now - cls.__cache_versions_read_at > CACHE_VERSION_POLL_SECONDS:
+            try:
+                cls.__cache_versions = cls.__read_cache_versions()
+                cls.__cache_versions_read_at = now
+            except DB_UNAVAILABLE_ERRORS as e:
+                # keep serving the last versions seen; the next call tries again
+                logger.debug("Could not re-read cache_version: %s", e)
+            except mariadb.Error as e:
+                logger.warning("cache_version table unavailable, reference data cache is TTL-only: %s", e)
+                cls.__cache_versions_available = False
+                return None
+
+        return cls.__cache_versions.get(entity, 0)
+
+    @classmethod
+    def __read_cache_versions(cls):
+        """
+        Read cache_version on the primary through the dedicated autocommit connection,
+        leaving the calling thread's connection and any transaction on it untouched.
+        """
+        with cls.__cache_version_lock:
+            connection = cls.__cache_version_connection
+            if connection is None:
+                if not cls.__breakers[PRIMARY].allow():
+                    raise DatabaseUnavailableError("Database unavailable, retry in %.0fs"
+                                                   % cls.__breakers[PRIMARY].retry_after())
+                connection = cls.__open_connection(PRIMARY)
+                connection.autocommit = True
+                cls.__cache_version_connection = connection
+            try:
+                cursor = connection.cursor()
+                cursor.execute("SELECT ENTITY, VERSION FROM cache_version")
+                versions = dict(cursor.fetchall())
+                cursor.close()
+            except DB_UNAVAILABLE_ERRORS:
+                cls.__cache_version_connection = None
+                try:
+                    connection.close()
+                except mariadb.Error:
+                    pass
+                raise
+        return versions
+
+    @classmethod
+    def bump_cache_version(cls, *entities):
+        """
+        Record that entities changed: drop them from this process's cache, publish on the
+        same-host bus and bump their version in cache_version so every other worker drops
+        theirs too.
+        """
+        for entity in entities:
+            cls.__query_cache.invalidate(entity)
+            cls.__cache_bus.publish(entity)
+        if not cls.__cache_versions_available:
+            return
+
+        try:
+            cursor = cls.get_cursor()
+            for entity in entities:
+                cursor.execute('''
+                    INSERT INTO cache_version (ENTITY, VERSION) VALUES (?, 1)
+                    ON DUPLICATE KEY UPDATE VERSION = VERSION + 1
+                ''', (entity,))
+            cls.commit()
+            cursor.close()
+        except DB_UNAVAILABLE_ERRORS as e:
+            # other hosts pick the change up when their cached entries expire
+            logger.warning("Could not bump cache version for %s: %s", entities, e)
+            cls.discard_connection()
+        except mariadb.Error as e:
+            logger.warning("Could not bump cache version for %s: %s", entities, e)
+            cls.__cache_versions_available = False
+        # re-read versions on the next cached read
+        cls.__cache_versions_read_at = 0.0
+
+    @classmethod
+    def cached(cls, entity, key, loader):
+        """
+        Read-through helper: the cached value for (entity, key) or loader()'s result.
+        """
+        return cls.__query_cache.get_or_load(entity, key, loader, cls.get_cache_version(entity))
+
+    @classmethod
+    def get_cache_stats(cls):
+        return cls.__query_cache.stats()
+
+    @classmethod
+    def clear_cache(cls):
+        cls.__query_cache.invalidate()
+
 # ======================
 # 🔹 Employee Queries
 # ======================
 
     @classmethod
+    @invalidates("employees")
     def add_employee(cls, empid, first_name, last_name, dptid, email=None, mgr_empid=None, active=1, emp_role="User"):
         cursor = cls.get_cursor()
         query = '''
@@ -55,18 +434,23 @@ class Database:
         cls.commit()
 
     @classmethod
+    @retries_reads
     def get_active_employees(cls):
-        cursor = cls.get_cursor()
-        cursor.execute("SELECT * FROM employee_table WHERE EMP_ACTIVE = 1")
-        return cursor.fetchall()
+        def load():
+            cursor = cls.get_cursor()
+            cursor.execute(f"SELECT {EMPLOYEE_COLUMNS} FROM employee_table WHERE EMP_ACTIVE = 1")
+            return tuple(to_rows(EmployeeRow, cursor.fetchall()))
+        return list(cls.cached("employees", "active", load))
 
     @classmethod
+    @retries_reads
     def get_employees_managed_by(cls, manager_id):
         cursor = cls.get_cursor()
         cursor.execute("SELECT EMPID FROM employee_table WHERE MGR_EMPID = ?", (manager_id,))
         return [row[0] for row in cursor.fetchall()]
 
     @classmethod
+    @retries_reads
     def get_department_of_employee(cls, empid):
         cursor = cls.get_cursor()
         cursor.execute("SELECT DPTID FROM employee_table WHERE EMPID = ?", (empid,))
@@ -74,11 +458,52 @@ class Database:
         return result[0] if result else None
 
     @classmethod
+    @retries_reads
     def get_employees_in_department(cls, dptid):
         cursor = cls.get_cursor()
         cursor.execute("SELECT EMPID FROM employee_table WHERE DPTID = ?", (dptid,))
         return [row[0] for row in cursor.fetchall()]
 
+    @classmethod
+    @retries_reads
+    def get_org_tree(cls):
+        """
+        The cached org hierarchy (see src/Data/OrgTree.py), built from one query over
+        employee_table. Rebuilt whenever the "employees" cache version changes (any worker's
+        @invalidates("employees") mutator), and at least every ORG_TREE_MAX_AGE_SECONDS.
+
+        Returns:
+            OrgTree
+        """
+        version = cls.get_cache_version("employees")
+        if (cls.__org_tree is None or cls.__org_tree_version != version
+                or time.monotonic() - cls.__org_tree_built_at > ORG_TREE_MAX_AGE_SECONDS):
+            cursor = cls.get_cursor()
+            cursor.execute(f"SELECT {ORG_NODE_COLUMNS} FROM employee_table")
+            cls.__org_tree = OrgTree(to_rows(OrgNode, cursor.fetchall()))
+            cls.__org_tree_version = version
+            cls.__org_tree_built_at = time.monotonic()
+        return cls.__org_tree
+
+    @classmethod
+    def get_permissions_version(cls):
+        """
+        Combined version of everything permissions depend on (PERMISSION_ENTITIES). Cached
+        permission sets and session profiles are rebuilt when it changes.
+        """
+        return tuple(cls.get_cache_version(entity) for entity in PERMISSION_ENTITIES)
+
+    @classmethod
+    @retries_reads
+    def get_visible_empids(cls, manager_id):
+        """
+        Every employee a manager may see: themself, direct and indirect reports, and their department.
+
+        Returns:
+            frozenset of EMPIDs
+        """
+        return cls.get_org_tree().visible_to_manager(manager_id)
+
     # @classmethod
     # def get_visible_employees(cls, current_empid, current_role):
     #     cursor = cls.get_cursor()
@@ -107,6 +532,7 @@ class Database:
     # ****************************
 
     @classmethod
+    @invalidates("employees")
     def update_employee_manager(cls, empid, new_mgr_empid):
         """
         Updates the manager (MGR_EMPID) for an employee.
@@ -132,6 +558,7 @@ class Database:
     # ****************************
 
     @classmethod
+    @invalidates("employees")
     def activate_emp(cls, empid):
         """
         Activates an employee by setting EMP_ACTIVE to 1.
@@ -150,7 +577,7 @@ class Database:
             cursor = cls.get_cursor()
             cursor.execute("SELECT COUNT(*) FROM employee_table WHERE EMPID = ?", (empid,))
             if cursor.fetchone()[0] == 0:
-                print(f"Employee ID {empid} not found")
+                logger.warning("Employee ID %s not found", empid)
                 return False
 
             cursor.execute('''
@@ -165,11 +592,12 @@ class Database:
             return rows_updated > 0
 
         except Exception as e:
-            print(f"Error activating employee: {e}")
-            cls.__connection.rollback()  # Rollback the transaction in case of error
+            logger.error("Error activating employee: %s", e)
+            cls.get_connection().rollback()  # Rollback the transaction in case of error
             raise  # Re-raise the exception for the caller to handle
 
     @classmethod
+    @invalidates("employees")
     def deactivate_emp(cls, empid):
         """
         Deactivates an employee by setting EMP_ACTIVE to 0.
@@ -188,7 +616,7 @@ class Database:
             cursor = cls.get_cursor()
             cursor.execute("SELECT COUNT(*) FROM employee_table WHERE EMPID = ?", (empid,))
             if cursor.fetchone()[0] == 0:
-                print(f"Employee ID {empid} not found")
+                logger.warning("Employee ID %s not found", empid)
                 return False
 
             cursor.execute('''
@@ -203,8 +631,8 @@ class Database:
             return rows_updated > 0
 
         except Exception as e:
-            print(f"Error deactivating employee: {e}")
-            cls.__connection.rollback()  # Rollback the transaction in case of error
+            logger.error("Error deactivating employee: %s", e)
+            cls.get_connection().rollback()  # Rollback the transaction in case of error
             raise  # Re-raise the exception for the caller to handle
 
     # ****************************
@@ -216,9 +644,9 @@ class Database:
 # ======================
 
     @classmethod
+    @invalidates("projects")
     def add_project(cls, projectid, name, created_by, date_created, prior_projectid=None, active=1):
-        print("🚀 Calling DB insert for project:", projectid)
-        print("📆 date_created type:", type(date_created))
+        logger.debug("Inserting project %s (date_created type %s)", projectid, type(date_created).__name__)
         cursor = cls.get_cursor()
         cursor.execute('''
             INSERT INTO projects 
@@ -228,51 +656,63 @@ class Database:
         cls.commit()
 
     @classmethod
+    @retries_reads
     def get_all_projects(cls):
-        cursor = cls.get_cursor()
-        cursor.execute("SELECT PROJECTID, PROJECT_NAME FROM projects")
-        return cursor.fetchall()
+        def load():
+            cursor = cls.get_cursor()
+            cursor.execute("SELECT PROJECTID, PROJECT_NAME FROM projects")
+            return tuple(to_rows(ProjectRow, cursor.fetchall()))
+        return list(cls.cached("projects", "all", load))
 
     @classmethod
+    @retries_reads
     def get_active_projects(cls):
-        cursor = cls.get_cursor()
-        cursor.execute("SELECT PROJECTID, PROJECT_NAME FROM projects WHERE PROJECT_ACTIVE = 1")
-        return cursor.fetchall()
+        def load():
+            cursor = cls.get_cursor()
+            cursor.execute("SELECT PROJECTID, PROJECT_NAME FROM projects WHERE PROJECT_ACTIVE = 1")
+            return tuple(to_rows(ProjectRow, cursor.fetchall()))
+        return list(cls.cached("projects", "active", load))
 
     @classmethod
+    @retries_reads
     def get_project_created_by(cls, projectid):
-        cursor = cls.get_cursor()
-        cursor.execute("SELECT CREATED_BY FROM projects WHERE PROJECTID = ?", (projectid,))
-        result = cursor.fetchone()
-        return result[0] if result else None
+        # one query loads the creator of every project; later lookups are dict hits
+        def load():
+            cursor = cls.get_cursor()
+            cursor.execute("SELECT PROJECTID, CREATED_BY FROM projects")
+            return dict(cursor.fetchall())
+        return cls.cached("projects", "created_by", load).get(projectid)
 
     @classmethod
+    @retries_reads
     def get_visible_employees(cls, current_empid, current_role):
         cursor = cls.get_cursor()
 
         if current_role == "admin":
             cursor.execute("SELECT EMPID, FIRST_NAME, LAST_NAME FROM employee_table WHERE EMP_ACTIVE = 1")
-            return cursor.fetchall()
+            return to_rows(EmployeeNameRow, cursor.fetchall())
 
         if current_role == "manager":
-            query = '''
-                SELECT EMPID, FIRST_NAME, LAST_NAME 
-                FROM employee_table 
-                WHERE EMP_ACTIVE = 1 AND (
-                    MGR_EMPID = ? OR 
-                    DPTID = (SELECT DPTID FROM employee_table WHERE EMPID = ?)
-                )
-            '''
-            cursor.execute(query, (current_empid, current_empid))
-            return cursor.fetchall()
+            # direct and indirect reports plus the manager's department
+            visible = cls.get_visible_empids(current_empid)
+            cursor.execute("SELECT EMPID, FIRST_NAME, LAST_NAME FROM employee_table WHERE EMP_ACTIVE = 1")
+            return [row for row in to_rows(EmployeeNameRow, cursor.fetchall()) if row.empid in visible]
 
         if current_role == "project_manager":
             cursor.execute("SELECT EMPID, FIRST_NAME, LAST_NAME FROM employee_table WHERE EMP_ACTIVE = 1")
-            return cursor.fetchall()
+            return to_rows(EmployeeNameRow, cursor.fetchall())
 
         return []
 
     @classmethod
+    @retries_reads
+    def get_project_ids_created_by(cls, empid):
+        cursor = cls.get_cursor()
+        cursor.execute("SELECT PROJECTID FROM projects WHERE CREATED_BY = ?", (empid,))
+        return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    @retries_reads
     def get_project_ids_for_employee(cls, empid):
         cursor = cls.get_cursor()
         cursor.execute('''
@@ -282,6 +722,7 @@ class Database:
         return [row[0] for row in cursor.fetchall()]
 
     @classmethod
+    @invalidates("memberships")
     def add_employee_to_project(cls, project_id, empid):
         cursor = cls.get_cursor()
         cursor.execute('''
@@ -291,13 +732,13 @@ class Database:
         cls.commit()
 
     @classmethod
+    @retries_reads
+    @reads_from_replica
     def get_project_summary(cls, project_ids, start=None, end=None):
         if not project_ids:
             return []
 
-        cursor = cls.get_cursor()
-        placeholders = ','.join('?' for _ in project_ids)
-        params = list(project_ids)
+        placeholders, params = cls.id_list(project_ids)
 
         query = f'''
             SELECT 
@@ -307,7 +748,7 @@ class Database:
                 SUM(t.TOTAL_MINUTES) AS total_minutes
             FROM time t
             JOIN projects p ON t.PROJECTID = p.PROJECTID
-            WHERE t.PROJECTID IN ({placeholders})
+            WHERE t.PROJECTID IN {placeholders}
         '''
 
         if start:
@@ -319,10 +760,11 @@ class Database:
 
         query += " GROUP BY p.PROJECTID"
 
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        cursor = cls.execute_prepared(query, params)
+        return to_rows(ProjectSummaryRow, cursor.fetchall())
 
     @classmethod
+    @retries_reads
     def get_employees_assigned_to_project(cls, projectid):
         cursor = cls.get_cursor()
         cursor.execute('''
@@ -332,6 +774,7 @@ class Database:
         return [row[0] for row in cursor.fetchall()]
 
     @classmethod
+    @retries_reads
     def get_projects_by_user(cls, empid):
         cursor = cls.get_cursor()
         query = """
@@ -342,13 +785,14 @@ class Database:
               AND (p.CREATED_BY = ? OR ep.EMPID = ?)
         """
         cursor.execute(query, (empid, empid))
-        return cursor.fetchall()
+        return to_rows(ProjectRow, cursor.fetchall())
 
     # *******************************
     # written on 5.4.2025 - EAB
     # *******************************
 
     @classmethod
+    @invalidates("projects")
     def deactivate_project(cls, projectid):
         """
         Deactivates a project by setting PROJECT_ACTIVE to 0.
@@ -365,6 +809,7 @@ class Database:
         cls.commit()
 
     @classmethod
+    @invalidates("projects")
     def activate_project(cls, projectid):
         """
         Activates a project by setting PROJECT_ACTIVE to 1.
@@ -389,6 +834,7 @@ class Database:
     # ****************************
 
     @classmethod
+    @invalidates("projects", "memberships")
     def change_project_name(cls, current_projectid, new_project_name, created_by):
         """
         Creates a new project as a renamed version of an existing project.
@@ -415,11 +861,11 @@ class Database:
             # 1. Check if the current project exists
             cursor.execute("SELECT COUNT(*) FROM projects WHERE PROJECTID = ?", (current_projectid,))
             if cursor.fetchone()[0] == 0:
-                print(f"Project ID {current_projectid} not found")
+                logger.warning("Project ID %s not found", current_projectid)
                 return {'success': False, 'error': 'Project not found'}
 
             # 2. Begin transaction
-            cls.__connection.autocommit = False
+            cls.get_connection().autocommit = False
 
             # 3. Generate a new project ID
             # Note: We don't actually need to generate it manually because
@@ -486,8 +932,8 @@ class Database:
             return {'success': True, 'new_projectid': new_projectid}
 
         except Exception as e:
-            print(f"Error changing project name: {e}")
-            cls.__connection.rollback()  # Rollback the transaction in case of error
+            logger.error("Error changing project name: %s", e)
+            cls.get_connection().rollback()  # Rollback the transaction in case of error
             return {'success': False, 'error': str(e)}
 
     # ****************************
@@ -499,12 +945,16 @@ class Database:
 # ======================
 
     @classmethod
+    @retries_reads
     def get_departments(cls):
-        cursor = cls.get_cursor()
-        cursor.execute("SELECT * FROM department")
-        return cursor.fetchall()
+        def load():
+            cursor = cls.get_cursor()
+            cursor.execute(f"SELECT {DEPARTMENT_COLUMNS} FROM department")
+            return tuple(to_rows(DepartmentRow, cursor.fetchall()))
+        return list(cls.cached("departments", "all", load))
 
     @classmethod   # updated on 5.12.2025
+    @invalidates("departments")
     def add_department(cls, dptid, dpt_name, manager_id=None, active=1):
         """
         Adds a new department to the database.
@@ -527,6 +977,7 @@ class Database:
     # ****************************
 
     @classmethod
+    @invalidates("departments")
     def deactivate_department(cls, dptid):
         """
         Deactivates a department by setting DPT_ACTIVE to 0.
@@ -543,6 +994,7 @@ class Database:
         cls.commit()
 
     @classmethod
+    @invalidates("departments")
     def activate_department(cls, dptid):
         """
         Activates a department by setting DPT_ACTIVE to 1.
@@ -559,6 +1011,7 @@ class Database:
         cls.commit()
 
     @classmethod
+    @invalidates("departments")
     def update_manager_ID(cls, dptid, new_mgr_empid):
         """
         Updates the manager (MANAGERID) for an department.
@@ -584,6 +1037,7 @@ class Database:
     # ****************************
 
     @classmethod
+    @invalidates("departments")
     def update_department_name(cls, dptid, new_dpt_name):
         """
         Updates the department name (DPT_NAME) for an existing department.
@@ -611,10 +1065,10 @@ class Database:
 # ======================
 
     @classmethod
+    @retries_reads
     def get_login_by_empid(cls, empid):
-        cursor = cls.get_cursor()
-        cursor.execute("SELECT * FROM login_table WHERE EMPID = ?", (empid,))
-        return cursor.fetchone()
+        cursor = cls.execute_prepared(f"SELECT {LOGIN_COLUMNS} FROM login_table WHERE EMPID = ?", (empid,))
+        return to_row(LoginRow, cursor.fetchone())
 
     @classmethod
     def add_login(cls, loginid, empid, password, last_reset=None, force_reset=0):
@@ -636,21 +1090,21 @@ class Database:
         cls.commit()
 
     @classmethod
+    @retries_reads
     def get_login_by_email(cls, email):
-        cursor = cls.get_cursor()
-        cursor.execute('''
+        cursor = cls.execute_prepared('''
             SELECT l.LOGINID, l.EMPID, l.PASSWORD, l.LAST_RESET, l.FORCE_RESET, e.EMP_ROLE
             FROM login_table l
             JOIN employee_table e ON l.EMPID = e.EMPID
             WHERE e.EMAIL_ADDRESS = ?
         ''', (email,))
-        return cursor.fetchone()
+        return to_row(LoginRow, cursor.fetchone())
 
     @classmethod
+    @retries_reads
     def get_employee_by_empid(cls, empid):
-        cursor = cls.get_cursor()
-        cursor.execute("SELECT * FROM employee_table WHERE EMPID = ?", (empid,))
-        return cursor.fetchone()
+        cursor = cls.execute_prepared(f"SELECT {EMPLOYEE_COLUMNS} FROM employee_table WHERE EMPID = ?", (empid,))
+        return to_row(EmployeeRow, cursor.fetchone())
 
     # *******************************
     # written on 5.12.2025 - EAB
@@ -708,7 +1162,7 @@ class Database:
             cursor = cls.get_cursor()
             cursor.execute("SELECT COUNT(*) FROM login_table WHERE LOGINID = ?", (loginid,))
             if cursor.fetchone()[0] == 0:
-                print(f"Login ID {loginid} not found")
+                logger.warning("Login ID %s not found", loginid)
                 return False
 
             current_time = datetime.now(timezone.utc)
@@ -725,8 +1179,8 @@ class Database:
             return rows_updated > 0
 
         except Exception as e:
-            print(f"Error resetting password: {e}")
-            cls.__connection.rollback()  # Rollback the transaction in case of error
+            logger.error("Error resetting password: %s", e)
+            cls.get_connection().rollback()  # Rollback the transaction in case of error
             raise  # Re-raise the exception for the caller to handle
 
     # ****************************
@@ -745,7 +1199,7 @@ class Database:
             WHERE t.TIMEID = ? AND t.STOP_TIME IS NULL
         """
         result = Database.fetch_one(query, (timeid,))
-        return result
+        return to_row(TimerRow, result)
 
     @classmethod
     def add_time_entry(cls,
@@ -757,29 +1211,37 @@ class Database:
                        notes,
                        manual_entry,
                        total_minutes):
-        cursor = cls.get_cursor()
-        cursor.execute('''
-            INSERT INTO time 
-            (TIMEID, EMPID, PROJECTID, START_TIME, STOP_TIME, NOTES, MANUAL_ENTRY)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (timeid, empid, projectid, start_time, stop_time, notes, manual_entry))
-        cls.commit()
+        op = {"op": "entry", "timeid": timeid, "empid": empid, "projectid": projectid,
+              "start": cls.__datetime_text(start_time), "stop": cls.__datetime_text(stop_time),
+              "notes": notes, "manual_entry": manual_entry}
+        if cls.__journals_writes():
+            cls.__submit(op)
+            return
+
+        try:
+            cursor = cls.get_cursor()
+            cursor.execute('''
+                INSERT INTO time 
+                (TIMEID, EMPID, PROJECTID, START_TIME, STOP_TIME, NOTES, MANUAL_ENTRY)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (timeid, empid, projectid, start_time, stop_time, notes, manual_entry))
+            cls.commit()
+        except DB_UNAVAILABLE_ERRORS as e:
+            cls.__journal_offline(op, e)
 
     # test consolidated project reporting page below
     @classmethod
+    @retries_reads
+    @reads_from_replica
     def get_time_entries_filtered_by_projects(cls, project_ids, selected_project=None, start_date=None, end_date=None):
-        cursor = cls.get_cursor()
-
-        placeholders = ','.join('?' for _ in project_ids)
+        placeholders, params = cls.id_list(project_ids)
         query = f'''
-            SELECT t.TIMEID, e.FIRST_NAME, e.LAST_NAME, p.PROJECT_NAME,
-                   t.START_TIME, t.STOP_TIME, t.TOTAL_MINUTES, t.NOTES
+            SELECT {TIME_ENTRY_COLUMNS}
             FROM time t
             JOIN employee_table e ON t.EMPID = e.EMPID
             JOIN projects p ON t.PROJECTID = p.PROJECTID
-            WHERE t.PROJECTID IN ({placeholders})
+            WHERE t.PROJECTID IN {placeholders}
         '''
-        params = list(project_ids)
 
         if selected_project:
             query += ' AND t.PROJECTID = ?'
@@ -793,8 +1255,8 @@ class Database:
 
         query += " ORDER BY t.STOP_TIME IS NOT NULL, t.STOP_TIME DESC"
 
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        cursor = cls.execute_prepared(query, params)
+        return to_rows(TimeEntryRow, cursor.fetchall())
 
     # ****************************
     # written on 4.29.25 - EAB
@@ -809,13 +1271,21 @@ class Database:
             timeid: The ID of the time entry to update
             new_notes: The new notes text to set
         """
-        cursor = cls.get_cursor()
-        cursor.execute('''
-                    UPDATE time_entries
-                    SET NOTES = ?
-                    WHERE TIMEID = ?
-                ''', (new_notes, timeid))
-        cls.commit()
+        op = {"op": "notes", "timeid": timeid, "notes": new_notes}
+        if cls.__journals_writes():
+            cls.__submit(op)
+            return
+
+        try:
+            cursor = cls.get_cursor()
+            cursor.execute('''
+                        UPDATE time
+                        SET NOTES = ?
+                        WHERE TIMEID = ?
+                    ''', (new_notes, timeid))
+            cls.commit()
+        except DB_UNAVAILABLE_ERRORS as e:
+            cls.__journal_offline(op, e)
 
     # ****************************
     # end of 4.29.25 update - EAB
@@ -859,7 +1329,7 @@ class Database:
         cls.commit()
 
     @classmethod
-    def add_manual_time_entry(cls, empid, projectid, start_datetime, stop_datetime, notes=None):
+    def add_manual_time_entry(cls, empid, projectid, start_datetime, stop_datetime, notes=None, timeid=None):
         """
         Add a manual time entry to the database.
 
@@ -869,30 +1339,48 @@ class Database:
             start_datetime: Start datetime in format 'YYYY-MM-DD HH:MM:SS'
             stop_datetime: Stop datetime in format 'YYYY-MM-DD HH:MM:SS'
             notes: Optional notes for the time entry
+            timeid: Client-chosen TIMEID, generated if None (a retry with the same one is a no-op)
+
+        Returns:
+            the entry's TIMEID
 
         Note: If seconds are not provided, they will default to :00
         """
-        cursor = cls.get_cursor()
-
         # If the datetime doesn't include seconds, add :00
         if len(start_datetime.split(':')) == 2:
             start_datetime += ':00'
         if len(stop_datetime.split(':')) == 2:
             stop_datetime += ':00'
 
-        # Calculate total minutes
-        from datetime import datetime
-        start_dt = datetime.strptime(start_datetime, '%Y-%m-%d %H:%M:%S')
-        stop_dt = datetime.strptime(stop_datetime, '%Y-%m-%d %H:%M:%S')
-        total_minutes = int((stop_dt - start_dt).total_seconds() / 60)
+        # Insert the time entry with manual_entry flag set to 1 (TOTAL_MINUTES is computed by the database)
+        timeid = timeid or f"t-{uuid.uuid4().hex[:8]}"
+        op = {"op": "entry", "timeid": timeid, "empid": empid, "projectid": projectid,
+              "start": start_datetime, "stop": stop_datetime, "notes": notes, "manual_entry": 1}
+        if cls.__journals_writes():
+            cls.__submit(op)
+            return timeid
 
-        # Insert the time entry with manual_entry flag set to 1
-        cursor.execute('''
-            INSERT INTO time 
-            (EMPID, PROJECTID, START_TIME, STOP_TIME, NOTES, MANUAL_ENTRY, TOTAL_MINUTES)
-            VALUES (?, ?, ?, ?, ?, 1, ?)
-        ''', (empid, projectid, start_datetime, stop_datetime, notes, total_minutes))
-        cls.commit()
+        try:
+            cursor = cls.get_cursor()
+            cursor.execute('''
+                INSERT INTO time 
+                (TIMEID, EMPID, PROJECTID, START_TIME, STOP_TIME, NOTES, MANUAL_ENTRY)
+                VALUES (?, ?, ?, ?, ?, ?, 1)
+            ''', (timeid, empid, projectid, start_datetime, stop_datetime, notes))
+            cls.commit()
+        except DB_UNAVAILABLE_ERRORS as e:
+            cls.__journal_offline(op, e)
+        except mariadb.IntegrityError as e:
+            # a retry of this employee's entry is a no-op; any other error (unknown project,
+            # invalid times, someone else's TIMEID) is the caller's to report
+            cls.get_connection().rollback()
+            if getattr(e, "errno", None) != DUPLICATE_KEY_ERRNO or OPEN_TIMER_INDEX in str(e):
+                raise
+            cursor.execute("SELECT TIMEID FROM time WHERE TIMEID = ? AND EMPID = ?", (timeid, empid))
+            if cursor.fetchone() is None:
+                raise
+            logger.debug("Manual entry %s for %s was already saved", timeid, empid)
+        return timeid
 
 #                      *** EXAMPLES OF HOW TO USE ***
 #                            Database.add_manual_time_entry(
@@ -919,6 +1407,8 @@ class Database:
     # ****************************
 
     @classmethod
+    @retries_reads
+    @reads_from_replica
     def get_all_time_entries(cls):
         cursor = cls.get_cursor()
         cursor.execute('''
@@ -935,22 +1425,20 @@ class Database:
             JOIN employee_table e ON t.EMPID = e.EMPID
             JOIN projects p ON t.PROJECTID = p.PROJECTID
         ''')
-        return cursor.fetchall()
+        return to_rows(EmployeeTimeEntryRow, cursor.fetchall())
 
     @classmethod
+    @retries_reads
+    @reads_from_replica
     def get_time_entries_filtered_multiple_empids(cls, empids, start_date=None, end_date=None):
-        cursor = cls.get_cursor()
-
-        placeholders = ','.join('?' for _ in empids)
+        placeholders, params = cls.id_list(empids)
         query = f'''
-            SELECT t.TIMEID, e.FIRST_NAME, e.LAST_NAME, p.PROJECT_NAME, 
-                   t.START_TIME, t.STOP_TIME, t.NOTES, t.TOTAL_MINUTES, t.FLAGGED_FOR_REVIEW
+            SELECT {TIME_ENTRY_COLUMNS}
             FROM time t
             JOIN employee_table e ON t.EMPID = e.EMPID
             JOIN projects p ON t.PROJECTID = p.PROJECTID
-            WHERE t.EMPID IN ({placeholders})
+            WHERE t.EMPID IN {placeholders}
         '''
-        params = empids
 
         if start_date:
             query += " AND t.START_TIME >= ?"
@@ -961,16 +1449,15 @@ class Database:
 
         query += " ORDER BY t.STOP_TIME IS NOT NULL, t.STOP_TIME DESC"
 
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        cursor = cls.execute_prepared(query, params)
+        return to_rows(TimeEntryRow, cursor.fetchall())
 
     @classmethod
+    @retries_reads
+    @reads_from_replica
     def get_time_entries_filtered(cls, start_date=None, end_date=None, empid=None):
-        cursor = cls.get_cursor()
-
-        query = '''
-            SELECT t.TIMEID, e.FIRST_NAME, e.LAST_NAME, p.PROJECT_NAME, 
-                   t.START_TIME, t.STOP_TIME, t.NOTES, t.TOTAL_MINUTES, t.FLAGGED_FOR_REVIEW
+        query = f'''
+            SELECT {TIME_ENTRY_COLUMNS}
             FROM time t
             JOIN employee_table e ON t.EMPID = e.EMPID
             JOIN projects p ON t.PROJECTID = p.PROJECTID
@@ -988,13 +1475,224 @@ class Database:
 
         query += " ORDER BY t.STOP_TIME IS NOT NULL, t.STOP_TIME DESC"
 
-        cursor.execute(query, params)
-        return cursor.fetchall()
+        cursor = cls.execute_prepared(query, params)
+        return to_rows(TimeEntryRow, cursor.fetchall())
+
+    @classmethod
+    @retries_reads
+    @reads_from_replica
+    def get_report_rows(cls, empids=None, project_ids=None, start_date=None, end_date=None):
+        """
+        Narrow rows for summaries and pivots (see src/Logic/Reporting.py). Only the columns
+        the reports group on are selected, and running timers count as 0 minutes.
+
+        Args:
+            empids: Limit to these employees (None for everyone)
+            project_ids: Limit to these projects (None for every project)
+            start_date: Earliest START_TIME, inclusive (UTC)
+            end_date: Latest START_TIME, inclusive (UTC)
+
+        Returns:
+            list of ReportRow
+        """
+        if (empids is not None and not empids) or (project_ids is not None and not project_ids):
+            return []
+
+        where, params = cls.__time_filters(empids, project_ids, start_date, end_date)
+        cursor = cls.execute_prepared(f'''
+            SELECT {REPORT_COLUMNS}
+            FROM time t
+            JOIN employee_table e ON t.EMPID = e.EMPID
+            JOIN projects p ON t.PROJECTID = p.PROJECTID
+            LEFT JOIN department d ON e.DPTID = d.DPTID
+            WHERE 1=1{where}
+        ''', params)
+        return to_rows(ReportRow, cursor.fetchall())
+
+    @classmethod
+    def __time_filters(cls, empids, project_ids, start_date, end_date):
+        """
+        " AND ..." conditions on time t (START_TIME range inclusive) and their parameters.
+        """
+        where = ""
+        params = []
+        if empids is not None:
+            placeholders, values = cls.id_list(empids)
+            where += f" AND t.EMPID IN {placeholders}"
+            params.extend(values)
+        if project_ids is not None:
+            placeholders, values = cls.id_list(project_ids, slot=1)
+            where += f" AND t.PROJECTID IN {placeholders}"
+            params.extend(values)
+        if start_date:
+            where += " AND t.START_TIME >= ?"
+            params.append(start_date)
+        if end_date:
+            where += " AND t.START_TIME <= ?"
+            params.append(end_date)
+        return where, params
+
+    @classmethod
+    @retries_reads
+    @reads_from_replica
+    def get_time_entry_fingerprint(cls, empids=None, project_ids=None, start_date=None, end_date=None):
+        """
+        Cheap summary of the time entries matching the same filters as get_report_rows():
+        the row count and the latest UPDATED_AT. It changes whenever a matching entry is
+        added, removed or edited, so the API can derive ETags from it without reading rows.
+
+        Without the UPDATED_AT column (see Holding Area/AddChangeTrackingColumns.py) it falls
+        back to the latest start/stop time and the minute total, which misses edits to notes.
+
+        Returns:
+            tuple of values
+        """
+        if (empids is not None and not empids) or (project_ids is not None and not project_ids):
+            return (0,)
+
+        where, params = cls.__time_filters(empids, project_ids, start_date, end_date)
+        if cls.__change_tracking_available:
+            try:
+                cursor = cls.execute_prepared(f"SELECT COUNT(*), MAX(t.UPDATED_AT) FROM time t WHERE 1=1{where}", params)
+                return tuple(cursor.fetchone())
+            except DB_UNAVAILABLE_ERRORS:
+                raise
+            except mariadb.Error as e:
+                logger.warning("time.UPDATED_AT unavailable, using start/stop times for fingerprints: %s", e)
+                cls.__change_tracking_available = False
+
+        cursor = cls.execute_prepared(f'''
+            SELECT COUNT(*), MAX(COALESCE(t.STOP_TIME, t.START_TIME)), SUM(COALESCE(t.TOTAL_MINUTES, 0))
+            FROM time t
+            WHERE 1=1{where}
+        ''', params)
+        return tuple(cursor.fetchone())
+
+    @classmethod
+    @retries_reads
+    @reads_from_replica
+    def get_time_entries_page(cls, empids=None, project_ids=None, start_date=None, end_date=None,
+                              after=None, limit=100):
+        """
+        One page of time entries in (START_TIME, TIMEID) order, using keyset pagination:
+        instead of an OFFSET, each page starts right after the last row of the previous one,
+        so deep pages cost the same as the first.
+
+        Args:
+            empids, project_ids, start_date, end_date: as for get_report_rows()
+            after: (start_time, timeid) of the last row already returned, or None for the first page
+            limit: Maximum rows to return
+
+        Returns:
+            list of TimeEntryRecordRow
+        """
+        if (empids is not None and not empids) or (project_ids is not None and not project_ids):
+            return []
+
+        where, params = cls.__time_filters(empids, project_ids, start_date, end_date)
+        if after is not None:
+            where += " AND (t.START_TIME > ? OR (t.START_TIME = ? AND t.TIMEID > ?))"
+            params.extend([after[0], after[0], after[1]])
+
+        cursor = cls.execute_prepared(f'''
+            SELECT {TIME_ENTRY_RECORD_COLUMNS}
+            FROM time t
+            JOIN employee_table e ON t.EMPID = e.EMPID
+            JOIN projects p ON t.PROJECTID = p.PROJECTID
+            WHERE 1=1{where}
+            ORDER BY t.START_TIME, t.TIMEID
+            LIMIT ?
+        ''', params + [int(limit)])
+        return to_rows(TimeEntryRecordRow, cursor.fetchall())
 
     @classmethod
+    @retries_reads
+    @reads_from_replica
+    def get_minutes_by_local_day(cls, first_day, num_days, tz, empids=None, project_ids=None):
+        """
+        Minutes per employee, project and local day, bucketed by the database.
+
+        The UTC instant of each local midnight is worked out once (DST-safe, see
+        src/Utils/TimeZones.py) and the query assigns every entry to a day with a CASE over
+        those boundaries, then groups. Only the grouped totals come back, and MariaDB does not
+        need its timezone tables loaded the way CONVERT_TZ would.
+
+        Args:
+            first_day: Local date of the first day
+            num_days: Number of days to cover
+            tz: pytz timezone or zone name, usually session["timezone"]
+            empids: Limit to these employees (None for everyone)
+            project_ids: Limit to these projects (None for every project)
+
+        Returns:
+            list of DailyMinutesRow (days with no time are not included)
+        """
+        if num_days < 1 or (empids is not None and not empids) or (project_ids is not None and not project_ids):
+            return []
+
+        boundaries = day_boundaries(first_day, num_days, tz)
+        day_case = " ".join(f"WHEN t.START_TIME < ? THEN {i}" for i in range(num_days - 1))
+        day_case = f"CASE {day_case} ELSE {num_days - 1} END" if day_case else "0"
+
+        query = f'''
+            SELECT t.EMPID, CONCAT(e.FIRST_NAME, ' ', e.LAST_NAME), t.PROJECTID, p.PROJECT_NAME,
+                   {day_case} AS DAY_INDEX,
+                   SUM(COALESCE(t.TOTAL_MINUTES, 0))
+            FROM time t
+            JOIN employee_table e ON t.EMPID = e.EMPID
+            JOIN projects p ON t.PROJECTID = p.PROJECTID
+            WHERE t.START_TIME >= ? AND t.START_TIME < ?
+        '''
+        params = boundaries[1:num_days] + [boundaries[0], boundaries[num_days]]
+
+        if empids is not None:
+            placeholders, values = cls.id_list(empids)
+            query += f" AND t.EMPID IN {placeholders}"
+            params.extend(values)
+        if project_ids is not None:
+            placeholders, values = cls.id_list(project_ids, slot=1)
+            query += f" AND t.PROJECTID IN {placeholders}"
+            params.extend(values)
+
+        query += " GROUP BY t.EMPID, t.PROJECTID, DAY_INDEX"
+
+        cursor = cls.execute_prepared(query, params)
+        return [DailyMinutesRow(empid, name, projectid, project_name,
+                                first_day + timedelta(days=day_index), int(minutes))
+                for empid, name, projectid, project_name, day_index, minutes in cursor.fetchall()]
+
+    @classmethod
+    @retries_reads
+    @reads_from_replica
+    def get_weekly_timesheet(cls, empid, week_start, tz):
+        """
+        Minutes per project per local day for one employee's week.
+
+        Args:
+            empid: Employee to build the timesheet for
+            week_start: Local date of the Monday the week starts on
+            tz: pytz timezone or zone name, usually session["timezone"]
+
+        Returns:
+            WeeklyTimesheet
+        """
+        days = tuple(week_start + timedelta(days=i) for i in range(7))
+
+        grid = {}
+        for row in cls.get_minutes_by_local_day(week_start, 7, tz, empids=[empid]):
+            minutes = grid.setdefault((row.project_name, row.projectid), [0] * 7)
+            minutes[(row.day - week_start).days] += row.minutes
+
+        rows = [TimesheetRow(projectid, project_name, tuple(minutes), sum(minutes))
+                for (project_name, projectid), minutes in sorted(grid.items())]
+        day_totals = tuple(sum(row.minutes[i] for row in rows) for i in range(7))
+        return WeeklyTimesheet(week_start, days, rows, day_totals, sum(day_totals))
+
+    @classmethod
+    @retries_reads
     def get_active_timer_for_user(cls, empid):
-        cursor = cls.get_cursor()
-        cursor.execute('''
+        cls.wait_for_queued_writes()
+        cursor = cls.execute_prepared('''
             SELECT t.TIMEID, p.PROJECT_NAME, t.START_TIME, t.NOTES
             FROM time t
             JOIN projects p ON t.PROJECTID = p.PROJECTID
@@ -1002,28 +1700,386 @@ class Database:
             ORDER BY t.START_TIME DESC
             LIMIT 1
         ''', (empid,))
-        return cursor.fetchone()
+        return to_row(ActiveTimerRow, cursor.fetchone())
 
     @classmethod
-    def start_time_entry(cls, timeid, empid, projectid, start_time, notes):
+    def start_timer(cls, empid, projectid, notes=None, timeid=None):
+        """
+        Start a timer in one round trip. At most one timer runs per employee: the
+        uq_time_open_timer unique index (Holding Area/AddOpenTimerConstraint.py) rejects a
+        second open row, so double-clicks and concurrent tabs cannot both insert.
+
+        Passing the same timeid again (a retried request) is a no-op that returns the same
+        timer. A start while another timer is running returns that timer instead.
+
+        Args:
+            empid: The employee starting the timer
+            projectid: Project to log time against
+            notes: Optional notes
+            timeid: Client-chosen TIMEID, generated if None
+
+        Returns:
+            TimerChange(timeid of the running timer, True if this call started it)
+        """
+        timeid = timeid or f"t-{uuid.uuid4().hex[:8]}"
+        op = {"op": "start", "timeid": timeid, "empid": empid, "projectid": projectid,
+              "notes": notes, "at": cls.__utc_now_text()}
+        if cls.__journals_writes():
+            cls.__submit(op)
+            return TimerChange(timeid, True)
+
+        try:
+            cursor = cls.get_cursor()
+            cursor.execute('''
+                INSERT INTO time (TIMEID, EMPID, PROJECTID, START_TIME, NOTES, MANUAL_ENTRY)
+                VALUES (?, ?, ?, ?, ?, 0)
+            ''', (timeid, empid, projectid, op["at"], notes))
+            cls.__apply_early_stop(cursor, timeid)
+            cls.commit()
+        except DB_UNAVAILABLE_ERRORS as e:
+            cls.__journal_offline(op, e)
+            return TimerChange(timeid, True)
+        except mariadb.IntegrityError as e:
+            cls.get_connection().rollback()
+            if getattr(e, "errno", None) != DUPLICATE_KEY_ERRNO:
+                raise
+            if OPEN_TIMER_INDEX in str(e):
+                # a timer is already open: report it instead
+                cursor.execute('''
+                    SELECT TIMEID FROM time
+                    WHERE EMPID = ? AND STOP_TIME IS NULL
+                    LIMIT 1
+                ''', (empid,))
+            else:
+                # the TIMEID is taken: a no-op only if it is this employee's retried start
+                cursor.execute('''
+                    SELECT TIMEID FROM time
+                    WHERE TIMEID = ? AND EMPID = ?
+                ''', (timeid, empid))
+            row = cursor.fetchone()
+            if row is None:
+                raise
+            logger.debug("Timer start for %s was a no-op, running timer is %s", empid, row[0])
+            return TimerChange(row[0], False)
+
+        cls.__cache_bus.publish(cls.__timer_channel(empid))
+        return TimerChange(timeid, True)
+
+    @classmethod
+    def stop_timer(cls, empid, timeid=None):
+        """
+        Stop the employee's running timer. With a timeid this is one round trip and
+        idempotent: stopping an already stopped timer changes nothing. A stop for a TIMEID
+        that has no row yet is held until its start is written (see apply_timer_ops).
+
+        Args:
+            empid: The employee stopping the timer
+            timeid: The timer to stop; None stops whichever timer is running
+
+        Returns:
+            TimerChange(timeid stopped or asked for, True if this call stopped it)
+        """
+        op = {"op": "stop", "timeid": timeid, "empid": empid, "at": cls.__utc_now_text()}
+        if cls.__journals_writes():
+            cls.__submit(op)
+            return TimerChange(timeid, True)
+
+        try:
+            cursor = cls.get_cursor()
+            if timeid is None:
+                cursor.execute("SELECT TIMEID FROM time WHERE EMPID = ? AND STOP_TIME IS NULL LIMIT 1", (empid,))
+                row = cursor.fetchone()
+                if row is None:
+                    return TimerChange(None, False)
+                timeid = row[0]
+
+            # a stop in the same second as the start would fail chk_time_valid (STOP_TIME > START_TIME)
+            cursor.execute('''
+                UPDATE time
+                SET STOP_TIME = GREATEST(?, START_TIME + INTERVAL 1 SECOND)
+                WHERE TIMEID = ? AND EMPID = ? AND STOP_TIME IS NULL
+            ''', (op["at"], timeid, empid))
+            changed = cursor.rowcount > 0
+            if not changed:
+                # the start may still be in another worker's journal
+                changed = cls.__hold_early_stop(cursor, timeid, empid, op["at"])
+            cls.commit()
+        except DB_UNAVAILABLE_ERRORS as e:
+            # op still has the timeid the caller gave, or None: "whichever timer was running at op["at"]"
+            cls.__journal_offline(op, e)
+            return TimerChange(op["timeid"], True)
+
+        if changed:
+            cls.__cache_bus.publish(cls.__timer_channel(empid))
+        return TimerChange(timeid, changed)
+
+    # Write-behind for timer writes (see src/Data/WriteBehind.py)
+
+    @classmethod
+    def start_journal(cls, **options):
+        """
+        Start the local journal and its reconciler without routing writes through it. Segments
+        left by processes that exited before their journaled writes reached the database are
+        adopted and replayed, so call this at startup whether or not write-behind is on.
+        Never touches the database, so it works while it is down.
+
+        Args:
+            options: passed to WriteBehindQueue (journal_dir, flush_interval_ms, flush_batch, fsync);
+                writes the database rejects end up in its dead-letter file
+
+        Returns:
+            number of journaled writes left by earlier processes and queued for replay
+        """
+        with cls.__journal_lock:
+            if cls.__journal is not None:
+                return 0
+            journal = WriteBehindQueue(cls.__apply_journaled, retry_errors=DB_UNAVAILABLE_ERRORS, **options)
+            replayed = journal.start()
+            cls.__journal = journal
+            return replayed
+
+    @classmethod
+    def stop_journal(cls):
+        """
+        Flush queued writes (unless the database is unreachable) and stop the reconciler, at
+        exit. Whatever is left stays in the journal for the next process.
+        """
+        with cls.__journal_lock:
+            cls.__write_behind = False
+            if cls.__journal is not None:
+                cls.__journal.stop()
+                cls.__journal = None
+
+    @classmethod
+    def enable_write_behind(cls, **options):
+        """
+        Route start_timer, stop_timer, add_time_entry, add_manual_time_entry and update_notes
+        through the local journal, which the reconciler commits in batches. They then return
+        once the write is journaled locally, whether or not the database is reachable; with
+        write-behind on, a start that conflicts with a running timer is dropped when applied
+        instead of being reported, and the next read of the timer shows the outcome.
+
+        Without it, a write that finds the database unreachable is journaled instead of lost,
+        and later writes follow it into the journal until the reconciler has applied
+        everything (see __journals_writes).
+
+        Args:
+            options: passed to start_journal() if the journal is not running yet
+
+        Returns:
+            number of journaled writes left by earlier processes and queued for replay
+        """
+        replayed = cls.start_journal(**options)
+        cls.__write_behind = True
+        return replayed
+
+    @classmethod
+    def disable_write_behind(cls):
+        """
+        Go back to committing each write directly. Writes already journaled are still applied.
+        """
+        cls.__write_behind = False
+
+    @classmethod
+    def wait_for_queued_writes(cls, timeout=5):
+        """
+        Block until this process's queued timer writes are in the database, so a read after
+        a write sees it. Returns immediately when nothing is queued.
+        """
+        if cls.__journal is not None:
+            return cls.__journal.wait_applied(timeout=timeout)
+        return True
+
+    @classmethod
+    def is_write_behind_healthy(cls):
+        """
+        False while journaled writes are waiting for an unreachable database.
+        """
+        return cls.__journal is None or cls.__journal.is_healthy()
+
+    @classmethod
+    def __apply_journaled(cls, ops):
+        # the reconciler thread hands its connection back to the pool after every batch
+        try:
+            cls.apply_timer_ops(ops)
+        finally:
+            cls.release_connection()
+
+    @classmethod
+    def __journals_writes(cls):
+        # with write-behind off, writes still go through the journal while it holds writes
+        # the database does not have yet (an outage, or a replay at startup), so they are
+        # applied in order; once it has drained, writes are committed directly again and
+        # start_timer reports a running timer instead of queueing a start
+        if cls.__write_behind:
+            return True
+        journal = cls.__journal
+        return journal is not None and (not journal.is_healthy() or journal.pending_count() > 0)
+
+    @classmethod
+    def __journal_offline(cls, op, error):
+        cls.discard_connection()
+        logger.warning("Database unreachable (%s), journaling timer writes locally until it is back", error)
+        cls.start_journal()
+        cls.__submit(op)
+
+    @classmethod
+    def __submit(cls, op):
+        cls.__journal.submit(op)
+        cls.__routing.wrote_at = time.time()
+
+    @staticmethod
+    def __utc_now_text():
+        # journaled operations carry the time they were requested, not the time they are flushed
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def __datetime_text(value):
+        if isinstance(value, datetime):
+            return value.strftime("%Y-%m-%d %H:%M:%S")
+        return value
+
+    @classmethod
+    def apply_timer_ops(cls, ops):
+        """
+        Apply journaled timer operations in order, in one transaction with one commit. Every
+        operation is idempotent, so a batch can be replayed after a crash:
+          - start: a no-op if the TIMEID exists, or if another timer is already open
+          - stop: only closes a timer that is still open (and, without a TIMEID, one that
+            started before the stop was requested). A stop whose TIMEID has no row yet (its
+            start is still in another worker's journal) is held in timer_early_stops and
+            applied when the start is inserted
+          - entry: a finished (or manual) entry, a no-op if the TIMEID exists
+          - notes: sets NOTES on the entry
+
+        Inserts use ON DUPLICATE KEY UPDATE rather than INSERT IGNORE: IGNORE would also turn
+        a foreign key, chk_time_valid or data-too-long error into a warning and drop or
+        truncate the row, while these raise, so WriteBehindQueue can dead-letter the operation.
+        """
         cursor = cls.get_cursor()
-        cursor.execute('''
-            INSERT INTO time (TIMEID, EMPID, PROJECTID, START_TIME, NOTES, MANUAL_ENTRY)
-            VALUES (?, ?, ?, ?, ?, 0)
-        ''', (timeid, empid, projectid, datetime.now(timezone.utc), notes))
-        cls.commit()
+        empids = set()
+        try:
+            for op in ops:
+                kind = op.get("op")
+                if kind == "start":
+                    cursor.execute('''
+                        INSERT INTO time (TIMEID, EMPID, PROJECTID, START_TIME, NOTES, MANUAL_ENTRY)
+                        VALUES (?, ?, ?, ?, ?, 0)
+                        ON DUPLICATE KEY UPDATE TIMEID = TIMEID
+                    ''', (op["timeid"], op["empid"], op["projectid"], op["at"], op.get("notes")))
+                    cls.__apply_early_stop(cursor, op["timeid"])
+                    empids.add(op["empid"])
+                elif kind == "stop" and op.get("timeid"):
+                    cursor.execute('''
+                        UPDATE time
+                        SET STOP_TIME = GREATEST(?, START_TIME + INTERVAL 1 SECOND)
+                        WHERE TIMEID = ? AND EMPID = ? AND STOP_TIME IS NULL
+                    ''', (op["at"], op["timeid"], op["empid"]))
+                    if cursor.rowcount == 0:
+                        cls.__hold_early_stop(cursor, op["timeid"], op["empid"], op["at"])
+                    empids.add(op["empid"])
+                elif kind == "stop":
+                    cursor.execute('''
+                        UPDATE time
+                        SET STOP_TIME = GREATEST(?, START_TIME + INTERVAL 1 SECOND)
+                        WHERE EMPID = ? AND STOP_TIME IS NULL AND START_TIME <= ?
+                    ''', (op["at"], op["empid"], op["at"]))
+                    empids.add(op["empid"])
+                elif kind == "entry":
+                    cursor.execute('''
+                        INSERT INTO time (TIMEID, EMPID, PROJECTID, START_TIME, STOP_TIME, NOTES, MANUAL_ENTRY)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        ON DUPLICATE KEY UPDATE TIMEID = TIMEID
+                    ''', (op["timeid"], op["empid"], op["projectid"], op["start"], op["stop"], op.get("notes"),
+                          op.get("manual_entry", 0)))
+                elif kind == "notes":
+                    cursor.execute("UPDATE time SET NOTES = ? WHERE TIMEID = ?", (op["notes"], op["timeid"]))
+                else:
+                    logger.warning("Skipping unknown journaled operation %s", op)
+            cls.commit()
+            cursor.close()
+        except DB_UNAVAILABLE_ERRORS:
+            # the connection is gone; the reconciler's next attempt reconnects
+            cls.discard_connection()
+            raise
+        except Exception:
+            # rejected (or malformed) operation: nothing of the batch is kept
+            cls.get_connection().rollback()
+            cursor.close()
+            raise
+
+        for empid in empids:
+            cls.__cache_bus.publish(cls.__timer_channel(empid))
+        logger.debug("Applied %d journaled timer writes", len(ops))
+
+    @classmethod
+    def __hold_early_stop(cls, cursor, timeid, empid, at):
+        """
+        Keep a stop for a TIMEID that has no row yet in timer_early_stops, in the caller's
+        transaction. Nothing is held if the row exists (the timer was already stopped). If
+        that table does not exist yet (see Holding Area/AddEarlyStopsTable.py), such a stop
+        is dropped as before.
+
+        Returns:
+            True if the stop was held
+        """
+        if not cls.__early_stops_available:
+            return False
+        try:
+            # the earliest stop of a timer wins, as when a stopped timer is stopped again
+            cursor.execute('''
+                INSERT INTO timer_early_stops (TIMEID, EMPID, STOP_TIME)
+                SELECT ?, ?, ? FROM DUAL
+                WHERE NOT EXISTS (SELECT 1 FROM time WHERE TIMEID = ?)
+                ON DUPLICATE KEY UPDATE STOP_TIME = LEAST(STOP_TIME, VALUES(STOP_TIME))
+            ''', (timeid, empid, at, timeid))
+        except mariadb.ProgrammingError as e:
+            logger.warning("timer_early_stops table unavailable, stops that arrive before their start are lost: %s", e)
+            cls.__early_stops_available = False
+            return False
+        if cursor.rowcount > 0:
+            logger.debug("Holding the stop of %s until its start is written", timeid)
+        return cursor.rowcount > 0
+
+    @classmethod
+    def __apply_early_stop(cls, cursor, timeid):
+        # right after a start is inserted: close it if its stop arrived first
+        if not cls.__early_stops_available:
+            return
+        try:
+            cursor.execute('''
+                UPDATE time t
+                JOIN timer_early_stops s ON s.TIMEID = t.TIMEID AND s.EMPID = t.EMPID
+                SET t.STOP_TIME = GREATEST(s.STOP_TIME, t.START_TIME + INTERVAL 1 SECOND)
+                WHERE t.TIMEID = ? AND t.STOP_TIME IS NULL
+            ''', (timeid,))
+            if cursor.rowcount > 0:
+                cursor.execute("DELETE FROM timer_early_stops WHERE TIMEID = ?", (timeid,))
+                logger.debug("Applied the stop of %s that arrived before its start", timeid)
+        except mariadb.ProgrammingError as e:
+            logger.warning("timer_early_stops table unavailable, stops that arrive before their start are lost: %s", e)
+            cls.__early_stops_available = False
+
+    @classmethod
+    def start_time_entry(cls, timeid, empid, projectid, start_time, notes):
+        # kept for existing callers; start_time is ignored as before (the server clock is used)
+        return cls.start_timer(empid, projectid, notes, timeid)
 
     @classmethod
     def stop_time_entry(cls, empid):
-        cursor = cls.get_cursor()
-        stop_time = datetime.now(timezone.utc)
-        cursor.execute('''
-            UPDATE time
-            SET STOP_TIME = ?
-            WHERE EMPID = ? AND STOP_TIME IS NULL
-        ''', (stop_time, empid))
+        return cls.stop_timer(empid)
 
-        cls.commit()
+    @staticmethod
+    def __timer_channel(empid):
+        return "timer-" + "".join(c if c.isalnum() else "_" for c in str(empid))
+
+    @classmethod
+    def get_timer_stamp(cls, empid):
+        """
+        Bus stamp that changes whenever a worker on this host starts or stops empid's timer
+        (see src/UI/WebUI/TimerEvents.py). Compare with an earlier stamp; no query is run.
+        """
+        return cls.__cache_bus.stamp(cls.__timer_channel(empid))
 
     # *******************************
     # written on 5.4.2025 - EAB
@@ -1041,9 +2097,9 @@ class Database:
                 VALUES (%s, %s, %s, %s, %s)
             ''', (empid, projectid, start_time, stop_time, manual_entry))
             cls.commit()
-            print("Simple insert successful!")
+            logger.debug("Simple insert successful!")
         except Exception as e:
-            print(f"Simple insert failed: {e}")
+            logger.error("Simple insert failed: %s", e)
 
         # Now try with notes
         try:
@@ -1052,9 +2108,9 @@ class Database:
                 VALUES (%s, %s, %s, %s, %s, %s)
             ''', (empid, projectid, start_time, stop_time, notes, manual_entry))
             cls.commit()
-            print("Full insert successful!")
+            logger.debug("Full insert successful!")
         except Exception as e:
-            print(f"Full insert failed: {e}")
+            logger.error("Full insert failed: %s", e)
 
     # ****************************
     # end of 5.4.2025 update - EAB
@@ -1098,7 +2154,7 @@ class Database:
             empid, first_name, last_name, projectid, project_name, start_time, stop_time = result
 
             # Begin transaction
-            cls.__connection.autocommit = False
+            cls.get_connection().autocommit = False
 
             # Delete the time entry
             cursor.execute("DELETE FROM time WHERE TIMEID = ?", (timeid,))
@@ -1106,7 +2162,7 @@ class Database:
             # Check if any rows were affected
             rows_deleted = cursor.rowcount
             if rows_deleted == 0:
-                cls.__connection.rollback()
+                cls.get_connection().rollback()
                 return {'success': False, 'error': f"No time entry found with ID {timeid}"}
 
             # Commit the transaction
@@ -1127,10 +2183,10 @@ class Database:
             }
 
         except Exception as e:
-            print(f"Error removing time entry: {e}")
+            logger.error("Error removing time entry: %s", e)
             # Ensure we rollback in case of error
-            if hasattr(cls, '__connection') and cls.__connection:
-                cls.__connection.rollback()
+            if getattr(cls.__state(), "pooled", None):
+                cls.get_connection().rollback()
             return {'success': False, 'error': str(e)}
 
     @classmethod
@@ -1164,7 +2220,7 @@ class Database:
             cursor = cls.get_cursor()
             cursor.execute("SELECT COUNT(*) FROM time WHERE TIMEID = ?", (timeid,))
             if cursor.fetchone()[0] == 0:
-                print(f"Time entry ID {timeid} not found")
+                logger.warning("Time entry ID %s not found", timeid)
                 return False
 
             # Update the time entry
@@ -1180,8 +2236,8 @@ class Database:
             return rows_updated > 0
 
         except Exception as e:
-            print(f"Error updating time entry: {e}")
-            cls.__connection.rollback()  # Rollback the transaction in case of error
+            logger.error("Error updating time entry: %s", e)
+            cls.get_connection().rollback()  # Rollback the transaction in case of error
             raise  # Re-raise the exception for the caller to handle
 
     @classmethod
@@ -1209,7 +2265,7 @@ class Database:
             cursor.execute("SELECT STOP_TIME FROM time WHERE TIMEID = ?", (timeid,))
             result = cursor.fetchone()
             if not result:
-                print(f"Time entry ID {timeid} not found")
+                logger.warning("Time entry ID %s not found", timeid)
                 return False
 
             # Check if there's a stop time and if so, validate that the new start time is before it
@@ -1230,8 +2286,8 @@ class Database:
             return rows_updated > 0
 
         except Exception as e:
-            print(f"Error updating start time: {e}")
-            cls.__connection.rollback()  # Rollback the transaction in case of error
+            logger.error("Error updating start time: %s", e)
+            cls.get_connection().rollback()  # Rollback the transaction in case of error
             raise  # Re-raise the exception for the caller to handle
 
     @classmethod
@@ -1259,7 +2315,7 @@ class Database:
             cursor.execute("SELECT START_TIME FROM time WHERE TIMEID = ?", (timeid,))
             result = cursor.fetchone()
             if not result:
-                print(f"Time entry ID {timeid} not found")
+                logger.warning("Time entry ID %s not found", timeid)
                 return False
 
             # Validate that the new stop time is after the start time
@@ -1280,8 +2336,8 @@ class Database:
             return rows_updated > 0
 
         except Exception as e:
-            print(f"Error updating stop time: {e}")
-            cls.__connection.rollback()  # Rollback the transaction in case of error
+            logger.error("Error updating stop time: %s", e)
+            cls.get_connection().rollback()  # Rollback the transaction in case of error
             raise  # Re-raise the exception for the caller to handle
 
 #   ***** This class method exists for an extreme edge case. Please carefully consider if this
@@ -1303,7 +2359,7 @@ class Database:
             cursor = cls.get_cursor()
             cursor.execute("SELECT COUNT(*) FROM time WHERE TIMEID = ?", (timeid,))
             if cursor.fetchone()[0] == 0:
-                print(f"Time entry ID {timeid} not found")
+                logger.warning("Time entry ID %s not found", timeid)
                 return False
 
             cursor.execute('''
@@ -1316,8 +2372,8 @@ class Database:
             return cursor.rowcount > 0
 
         except Exception as e:
-            print(f"Error reverting manual entry flag: {e}")
-            cls.__connection.rollback()
+            logger.error("Error reverting manual entry flag: %s", e)
+            cls.get_connection().rollback()
             raise
 
     # ****************************
@@ -1526,7 +2582,7 @@ class Database:
             return True
 
         except Exception as e:
-            cls.__connection.rollback()
+            cls.get_connection().rollback()
             raise e
         finally:
             cursor.close()
@@ -1559,7 +2615,7 @@ class Database:
             return True
 
         except Exception as e:
-            cls.__connection.rollback()
+            cls.get_connection().rollback()
             raise e
         finally:
             cursor.close()
@@ -1597,7 +2653,7 @@ class Database:
             return bool(new_flag)
 
         except Exception as e:
-            cls.__connection.rollback()
+            cls.get_connection().rollback()
             raise e
         finally:
             cursor.close()
@@ -1622,22 +2678,24 @@ class Database:
             if not timeid_list:
                 return 0
 
-            # Create placeholders for the IN clause
-            placeholders = ','.join(['?' for _ in timeid_list])
-            query = f"UPDATE time SET FLAGGED_FOR_REVIEW = 0 WHERE TIMEID IN ({placeholders})"
+            # long lists go through a temporary table instead of one placeholder per TIMEID
+            placeholders, params = cls.id_list(timeid_list)
+            query = f"UPDATE time SET FLAGGED_FOR_REVIEW = 0 WHERE TIMEID IN {placeholders}"
 
-            cursor.execute(query, timeid_list)
+            cursor.execute(query, params)
             affected_rows = cursor.rowcount
             cls.commit()
             return affected_rows
 
         except Exception as e:
-            cls.__connection.rollback()
+            cls.get_connection().rollback()
             raise e
         finally:
             cursor.close()
 
     @classmethod
+    @retries_reads
+    @reads_from_replica
     def get_flagged_entries_summary(cls):
         """
         Get a summary of flagged time entries by employee and department.
@@ -1707,6 +2765,8 @@ class Database:
             cursor.close()
 
     @classmethod
+    @retries_reads
+    @reads_from_replica
     def get_time_entries_needing_attention(cls, manager_empid=None, days_back=30):
         """
         Get time entries that might need attention (flagged, missing notes on long entries, etc.).
@@ -1815,8 +2875,8 @@ class Database:
             return True
 
         except Exception as e:
-            print(f"Error inserting time entry {timeid}: {e}")
-            cls.__connection.rollback() if hasattr(cls, '_Database__connection') and cls.__connection else None
+            logger.error("Error inserting time entry %s: %s", timeid, e)
+            cls.get_connection().rollback() if getattr(cls.__state(), "pooled", None) else None
             raise
 
 # ======================
@@ -1828,6 +2888,7 @@ class Database:
     # ****************************
 
     @classmethod
+    @invalidates("memberships")
     def add_employee_project(cls, empid, project_id):
         """
         Add an employee-project relationship to the employee_projects junction table.
@@ -1852,6 +2913,7 @@ class Database:
 # ======================
 
     @classmethod
+    @invalidates("employees")
     def update_employee_department(cls, empid, new_dptid, assignment_date=None):
         """
         Update an employee's department assignment and record the change in history.
@@ -1909,7 +2971,7 @@ class Database:
             return True
 
         except Exception as e:
-            cls.__connection.rollback()
+            cls.get_connection().rollback()
             raise e
         finally:
             cursor.close()
@@ -2050,7 +3112,7 @@ def update_employee_role(cls, empid, new_role, assignment_date=None):
         return True
 
     except Exception as e:
-        cls.__connection.rollback()
+        cls.get_connection().rollback()
         raise e
     finally:
         cursor.close()
@@ -0,0 +1,106 @@
+# src/Data/OrgTree.py
+#
+# In-memory org hierarchy built from employee_table.MGR_EMPID and DPTID.
+#
+# The whole employee table is read in one query and the manager -> report closure is
+# computed here, so "who can manager X see" (direct and indirect reports plus everyone in
+# X's department) is one set lookup instead of three queries per request. Database keeps
+# one tree cached (Database.get_org_tree) and drops it whenever a manager or department
+# assignment changes.
+
+from collections import defaultdict
+from typing import NamedTuple, Optional
+
+
+class OrgNode(NamedTuple):
+    empid: str
+    mgr_empid: Optional[str]
+    dptid: Optional[str]
+    emp_active: int
+
+
+# Select list for OrgNode
+ORG_NODE_COLUMNS = "EMPID, MGR_EMPID, DPTID, EMP_ACTIVE"
+
+
+class OrgTree:
+    def __init__(self, nodes):
+        """
+        Args:
+            nodes: iterable of OrgNode (or (empid, mgr_empid, dptid, emp_active) tuples)
+        """
+        self.__nodes = {}
+        self.__direct_reports = defaultdict(list)
+        self.__departments = defaultdict(set)
+        self.__visible = {}
+
+        for node in nodes:
+            node = OrgNode._make(node)
+            self.__nodes[node.empid] = node
+            if node.mgr_empid:
+                self.__direct_reports[node.mgr_empid].append(node.empid)
+            if node.dptid:
+                self.__departments[node.dptid].add(node.empid)
+
+    def __contains__(self, empid):
+        return empid in self.__nodes
+
+    def __len__(self):
+        return len(self.__nodes)
+
+    def get_node(self, empid):
+        return self.__nodes.get(empid)
+
+    def department_of(self, empid):
+        node = self.__nodes.get(empid)
+        return node.dptid if node else None
+
+    def department_members(self, dptid):
+        return frozenset(self.__departments.get(dptid, ()))
+
+    def direct_reports(self, mgr_empid):
+        return list(self.__direct_reports.get(mgr_empid, ()))
+
+    def all_reports(self, mgr_empid):
+        """
+        Everyone below mgr_empid in the hierarchy, at any depth. A MGR_EMPID cycle in the
+        data cannot loop forever; each employee is visited once.
+        """
+        seen = set()
+        pending = list(self.__direct_reports.get(mgr_empid, ()))
+        while pending:
+            empid = pending.pop()
+            if empid in seen or empid == mgr_empid:
+                continue
+            seen.add(empid)
+            pending.extend(self.__direct_reports.get(empid, ()))
+        return frozenset(seen)
+
+    def chain_of_command(self, empid):
+        """
+        Managers above empid, nearest first.
+        """
+        chain = []
+        node = self.__nodes.get(empid)
+        while node and node.mgr_empid and node.mgr_empid not in chain and node.mgr_empid != empid:
+            chain.append(node.mgr_empid)
+            node = self.__nodes.get(node.mgr_empid)
+        return chain
+
+    def visible_to_manager(self, mgr_empid):
+        """
+        Employees whose time manager mgr_empid may see: themself, every direct and indirect
+        report, and everyone in their department. Computed once per manager per tree.
+
+        Returns:
+            frozenset of EMPIDs
+        """
+        visible = self.__visible.get(mgr_empid)
+        if visible is None:
+            visible = self.all_reports(mgr_empid) | self.department_members(self.department_of(mgr_empid))
+            visible = visible | {mgr_empid}
+            self.__visible[mgr_empid] = visible
+        return visible
+
+    def can_see(self, mgr_empid, empid):
+        return empid in self.visible_to_manager(mgr_empid)
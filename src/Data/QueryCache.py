@@ -0,0 +1,129 @@
+# src/Data/QueryCache.py
+#
+# Read-through cache for reference data (projects, departments, employees) that is read on
+# nearly every page but rarely changes.
+#
+#   - entries are grouped by entity ("projects", ...) and expire after that entity's TTL
+#   - the cache holds at most max_entries entries and evicts the least recently used
+#   - every entry remembers the entity version it was loaded under; Database passes the
+#     current version (cache_version table plus the same-host CacheBus stamp) on each
+#     read, so a bump made by any worker process makes older entries misses
+#   - hit/miss/eviction counters per entity for tuning
+#
+# All operations take a lock, so the cache is safe to share between threads. Loaders run
+# outside the lock; two threads missing at once may both load, which is harmless.
+
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+DEFAULT_TTL_SECONDS = 60
+DEFAULT_MAX_ENTRIES = 512
+
+
+class QueryCache:
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            ttls: dict of entity -> TTL in seconds
+            default_ttl: TTL for entities not in ttls
+            max_entries: upper bound on cached entries across all entities
+        """
+        self.__ttls = dict(ttls or {})
+        self.__default_ttl = default_ttl
+        self.__max_entries = max_entries
+        self.__entries = OrderedDict()      # (entity, key) -> (value, version, expires_at)
+        self.__stats = {}
+        self.__lock = threading.Lock()
+
+    def __entity_stats(self, entity):
+        return self.__stats.setdefault(entity, {"hits": 0, "misses": 0, "evictions": 0})
+
+    def get(self, entity, key, version=None):
+        """
+        Look up a cached value.
+
+        Returns:
+            (True, value) on a hit, (False, None) on a miss or a stale/expired entry
+        """
+        with self.__lock:
+            stats = self.__entity_stats(entity)
+            entry = self.__entries.get((entity, key))
+            if entry is not None:
+                value, entry_version, expires_at = entry
+                if entry_version == version and time.monotonic() < expires_at:
+                    self.__entries.move_to_end((entity, key))
+                    stats["hits"] += 1
+                    return True, value
+                del self.__entries[(entity, key)]
+            stats["misses"] += 1
+            return False, None
+
+    def put(self, entity, key, value, version=None):
+        with self.__lock:
+            ttl = self.__ttls.get(entity, self.__default_ttl)
+            self.__entries[(entity, key)] = (value, version, time.monotonic() + ttl)
+            self.__entries.move_to_end((entity, key))
+            while len(self.__entries) > self.__max_entries:
+                (evicted_entity, _), _ = self.__entries.popitem(last=False)
+                self.__entity_stats(evicted_entity)["evictions"] += 1
+
+    def get_or_load(self, entity, key, loader, version=None):
+        """
+        Return the cached value, or call loader(), cache and return its result.
+        """
+        hit, value = self.get(entity, key, version)
+        if hit:
+            return value
+        value = loader()
+        self.put(entity, key, value, version)
+        return value
+
+    def invalidate(self, entity=None):
+        """
+        Drop every entry for one entity, or everything when entity is None.
+        """
+        with self.__lock:
+            if entity is None:
+                self.__entries.clear()
+                return
+            for cache_key in [k for k in self.__entries if k[0] == entity]:
+                del self.__entries[cache_key]
+
+    def stats(self):
+        """
+        Counters per entity plus current sizes, e.g. {"projects": {"hits": 10, "misses": 2,
+        "evictions": 0, "size": 2, "hit_rate": 0.83}}
+        """
+        with self.__lock:
+            sizes = {}
+            for entity, _ in self.__entries:
+                sizes[entity] = sizes.get(entity, 0) + 1
+            report = {}
+            for entity, counters in self.__stats.items():
+                lookups = counters["hits"] + counters["misses"]
+                report[entity] = dict(counters,
+                                      size=sizes.get(entity, 0),
+                                      hit_rate=round(counters["hits"] / lookups, 3) if lookups else None)
+            return report
+
+    def __len__(self):
+        with self.__lock:
+            return len(self.__entries)
+
+
+def invalidates(*entities):
+    """
+    Decorator for Database mutators: after the wrapped classmethod returns, bump the cache
+    version of each entity so every worker drops its cached copies. Apply it below
+    @classmethod.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(cls, *args, **kwargs):
+            result = func(cls, *args, **kwargs)
+            cls.bump_cache_version(*entities)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,71 @@
+# src/Data/ReadRouting.py
+#
+# Sending report reads to a read-only replica so they do not compete with timer writes on
+# the primary.
+#
+# Set DB_REPLICA_HOST (and DB_REPLICA_PORT / _USER / _PASSWORD / _NAME where they differ
+# from the primary's DB_* values) to turn it on. Database methods marked
+# @reads_from_replica then run on a connection from a second pool, to the replica; every
+# other query, and every write, stays on the primary.
+#
+# Read-your-writes: a replica may lag behind the primary. The web app remembers when a
+# user last wrote (session["last_write_at"]) and hands it to Database.begin_request(); for
+# DB_REPLICA_LAG_SECONDS after a write that user's reports are read from the primary, so
+# they always include the change they just made. If the replica cannot be reached, reads
+# fall back to the primary.
+#
+# Locally, run a second MariaDB (e.g. another container on port 3307) loaded from the same
+# dump and point DB_REPLICA_HOST/DB_REPLICA_PORT at it; without replication the two copies
+# drift apart, which makes it easy to see which one served a page.
+
+import os
+from functools import wraps
+
+PRIMARY = "primary"
+REPLICA = "replica"
+
+REPLICA_LAG_SECONDS = float(os.getenv("DB_REPLICA_LAG_SECONDS", "5"))
+
+
+def replica_configured():
+    return bool(os.getenv("DB_REPLICA_HOST"))
+
+
+def connection_settings(route):
+    """
+    mariadb.connect() arguments for the primary or the replica. Replica settings that are
+    not given default to the primary's.
+    """
+    settings = {
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+        "host": os.getenv("DB_HOST"),
+        "port": int(os.getenv("DB_PORT")),
+        "database": os.getenv("DB_NAME")
+    }
+    if route == REPLICA:
+        for key, name in (("user", "DB_REPLICA_USER"), ("password", "DB_REPLICA_PASSWORD"),
+                          ("host", "DB_REPLICA_HOST"), ("database", "DB_REPLICA_NAME")):
+            settings[key] = os.getenv(name) or settings[key]
+        settings["port"] = int(os.getenv("DB_REPLICA_PORT") or settings["port"])
+    return settings
+
+
+def prefers_primary(last_write_at, now):
+    """
+    Whether a caller who last wrote at last_write_at (epoch seconds, None if never) must
+    still read from the primary at now.
+    """
+    return last_write_at is not None and now - last_write_at < REPLICA_LAG_SECONDS
+
+
+def reads_from_replica(func):
+    """
+    Decorator for Database classmethods that only read and can tolerate replica lag
+    (reports, summaries, listings): run them through cls.run_on_replica. Apply it below
+    @retries_reads, so a replica failure falls back to the primary before any retry.
+    """
+    @wraps(func)
+    def wrapper(cls, *args, **kwargs):
+        return cls.run_on_replica(func, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,150 @@
+# src/Data/Resilience.py
+#
+# Keeping Database usable through MariaDB restarts, wait_timeout disconnects and network
+# blips, without a process restart:
+#
+#   - CircuitBreaker: after DB_BREAKER_FAILURES consecutive connection failures, calls fail
+#     at once with DatabaseUnavailableError for DB_BREAKER_RESET_SECONDS instead of each one
+#     waiting on a connect timeout; then one caller is let through to probe, and the first
+#     success closes the breaker again. Database keeps one breaker per route (primary,
+#     replica) and reports to it from connect(), so it always counts against the server
+#     that was actually contacted.
+#   - retries_reads: decorator for idempotent Database reads; on a lost connection it
+#     reconnects and tries again, up to DB_RETRY_ATTEMPTS times with jittered backoff.
+#
+# Writes are not retried here (a retried INSERT may run twice); timer writes fall back to
+# the local journal instead (see src/Data/WriteBehind.py).
+
+import os
+import random
+import threading
+import time
+from functools import wraps
+import mariadb
+from src.Utils.AppLogger import get_logger
+
+logger = get_logger(__name__)
+
+# Errors meaning the database cannot be reached (as opposed to a rejected statement)
+DB_UNAVAILABLE_ERRORS = (mariadb.OperationalError, mariadb.InterfaceError)
+
+RETRY_ATTEMPTS = int(os.getenv("DB_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY_SECONDS = 0.1
+RETRY_MAX_DELAY_SECONDS = 2.0
+
+
+class DatabaseUnavailableError(mariadb.OperationalError):
+    """
+    Raised without contacting the database while the circuit breaker is open.
+    """
+
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY_SECONDS, cap=RETRY_MAX_DELAY_SECONDS):
+    """
+    Full-jitter exponential backoff: a random delay up to base * 2**attempt (at most cap), so
+    workers that lost the database together do not all retry at the same instant.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=None, reset_seconds=None, clock=time.monotonic):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the breaker (env DB_BREAKER_FAILURES)
+            reset_seconds: How long it stays open before a probe is allowed (env DB_BREAKER_RESET_SECONDS)
+            clock: Monotonic time source (tests pass their own)
+        """
+        self.failure_threshold = failure_threshold or int(os.getenv("DB_BREAKER_FAILURES", "5"))
+        self.reset_seconds = reset_seconds or float(os.getenv("DB_BREAKER_RESET_SECONDS", "5"))
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__state = self.CLOSED
+        self.__failures = 0
+        self.__changed_at = 0.0
+
+    @property
+    def state(self):
+        with self.__lock:
+            return self.__state
+
+    def allow(self):
+        """
+        Whether a call may go to the database now. While open, returns False until
+        reset_seconds have passed, then True for a single probe (half-open); another probe is
+        allowed if that one has not reported back within reset_seconds.
+        """
+        with self.__lock:
+            if self.__state == self.CLOSED:
+                return True
+            if self.__clock() - self.__changed_at < self.reset_seconds:
+                return False
+            self.__state = self.HALF_OPEN
+            self.__changed_at = self.__clock()
+            return True
+
+    def record_success(self):
+        with self.__lock:
+            if self.__state != self.CLOSED:
+                logger.warning("Database reachable again, closing circuit breaker")
+            self.__state = self.CLOSED
+            self.__failures = 0
+
+    def record_failure(self):
+        with self.__lock:
+            self.__failures += 1
+            if self.__state == self.HALF_OPEN or (self.__state == self.CLOSED
+                                                  and self.__failures >= self.failure_threshold):
+                if self.__state == self.CLOSED:
+                    logger.error("Database unreachable after %d attempts, failing fast for %ss",
+                                 self.__failures, self.reset_seconds)
+                self.__state = self.OPEN
+                self.__changed_at = self.__clock()
+
+    def retry_after(self):
+        """
+        Seconds until the next probe is allowed (0 when closed), for Retry-After headers.
+        """
+        with self.__lock:
+            if self.__state == self.CLOSED:
+                return 0
+            return max(0.0, self.reset_seconds - (self.__clock() - self.__changed_at))
+
+
+# nesting depth of retries_reads calls on this thread; only the outermost one retries
+_retry_state = threading.local()
+
+
+def retries_reads(func):
+    """
+    Decorator for Database classmethods that only read: when the connection turns out to be
+    gone, drop it (cls.discard_connection) and run the method again on a fresh one, with
+    jittered backoff between attempts. Gives up at once when the circuit breaker is open.
+    Apply it below @classmethod.
+    """
+    @wraps(func)
+    def wrapper(cls, *args, **kwargs):
+        depth = getattr(_retry_state, "depth", 0)
+        _retry_state.depth = depth + 1
+        try:
+            for attempt in range(RETRY_ATTEMPTS):
+                try:
+                    return func(cls, *args, **kwargs)
+                except DatabaseUnavailableError:
+                    raise
+                except DB_UNAVAILABLE_ERRORS as e:
+                    # the reconnect on the next attempt is what counts towards the breaker
+                    cls.discard_connection()
+                    if depth or attempt == RETRY_ATTEMPTS - 1:
+                        raise
+                    delay = backoff_delay(attempt)
+                    logger.warning("%s lost the database connection (%s), retrying in %.2fs",
+                                   func.__name__, e, delay)
+                    time.sleep(delay)
+        finally:
+            _retry_state.depth = depth
+    return wrapper
@@ -0,0 +1,228 @@
+# src/Data/RowModels.py
+#
+# Immutable row types returned by the Database read methods. They are NamedTuples, so rows
+# carry no per-instance __dict__, still unpack and index like the plain tuples the cursor
+# returns, and can be read by name (entry.total_minutes instead of entry[7]).
+
+from itertools import starmap
+from typing import NamedTuple, Optional
+from datetime import datetime, date
+
+
+# ======================
+# 🔹 Employee Rows
+# ======================
+
+class EmployeeRow(NamedTuple):
+    empid: str
+    first_name: str
+    last_name: str
+    dptid: str
+    email_address: str
+    mgr_empid: Optional[str]
+    emp_active: int
+    emp_role: str
+
+
+# Columns in EmployeeRow order, for SELECT lists
+EMPLOYEE_COLUMNS = "EMPID, FIRST_NAME, LAST_NAME, DPTID, EMAIL_ADDRESS, MGR_EMPID, EMP_ACTIVE, EMP_ROLE"
+
+
+class EmployeeNameRow(NamedTuple):
+    empid: str
+    first_name: str
+    last_name: str
+
+
+# ======================
+# 🔹 Project Rows
+# ======================
+
+class ProjectRow(NamedTuple):
+    projectid: str
+    project_name: str
+
+
+class ProjectSummaryRow(NamedTuple):
+    project_name: str
+    projectid: str
+    employee_count: int
+    total_minutes: Optional[int]
+
+
+# ======================
+# 🔹 Department Rows
+# ======================
+
+class DepartmentRow(NamedTuple):
+    dptid: str
+    dpt_name: str
+    managerid: Optional[str]
+    dpt_active: int
+
+
+DEPARTMENT_COLUMNS = "DPTID, DPT_NAME, MANAGERID, DPT_ACTIVE"
+
+
+# ======================
+# 🔹 Login Rows
+# ======================
+
+class LoginRow(NamedTuple):
+    loginid: str
+    empid: str
+    password: str
+    last_reset: Optional[datetime]
+    force_reset: int
+    emp_role: Optional[str] = None  # only filled in when joined with employee_table
+
+
+LOGIN_COLUMNS = "LOGINID, EMPID, PASSWORD, LAST_RESET, FORCE_RESET"
+
+
+# ======================
+# 🔹 TimeEntry Rows
+# ======================
+
+class TimeEntryRow(NamedTuple):
+    """
+    A time entry joined with employee and project names, as shown on the reports.
+    Every time entry report query selects TIME_ENTRY_COLUMNS so they all share this layout.
+    """
+    timeid: str
+    first_name: str
+    last_name: str
+    project_name: str
+    start_time: datetime
+    stop_time: Optional[datetime]
+    notes: Optional[str]
+    total_minutes: Optional[int]
+    flagged_for_review: int
+
+
+# Select list for TimeEntryRow (time t JOIN employee_table e JOIN projects p)
+TIME_ENTRY_COLUMNS = '''t.TIMEID, e.FIRST_NAME, e.LAST_NAME, p.PROJECT_NAME,
+                   t.START_TIME, t.STOP_TIME, t.NOTES, t.TOTAL_MINUTES, t.FLAGGED_FOR_REVIEW'''
+
+
+class EmployeeTimeEntryRow(NamedTuple):
+    empid: str
+    employee_name: str
+    projectid: str
+    project_name: str
+    start_time: datetime
+    stop_time: Optional[datetime]
+    total_minutes: Optional[int]
+    notes: Optional[str]
+
+
+class ReportRow(NamedTuple):
+    """
+    The narrow per-entry row the reporting module (src/Logic/Reporting.py) aggregates.
+    """
+    empid: str
+    employee_name: str
+    dptid: Optional[str]
+    dpt_name: Optional[str]
+    projectid: str
+    project_name: str
+    start_time: datetime
+    total_minutes: int
+
+
+# Select list for ReportRow (time t JOIN employee_table e JOIN projects p LEFT JOIN department d)
+REPORT_COLUMNS = '''t.EMPID, CONCAT(e.FIRST_NAME, ' ', e.LAST_NAME), e.DPTID, d.DPT_NAME,
+                   t.PROJECTID, p.PROJECT_NAME, t.START_TIME, COALESCE(t.TOTAL_MINUTES, 0)'''
+
+
+class TimeEntryRecordRow(NamedTuple):
+    """
+    One time entry with its ids and names, as served by the JSON API (src/UI/WebUI/Api.py).
+    """
+    timeid: str
+    empid: str
+    employee_name: str
+    projectid: str
+    project_name: str
+    start_time: datetime
+    stop_time: Optional[datetime]
+    total_minutes: Optional[int]
+    notes: Optional[str]
+    manual_entry: int
+    flagged_for_review: int
+
+
+# Select list for TimeEntryRecordRow (time t JOIN employee_table e JOIN projects p)
+TIME_ENTRY_RECORD_COLUMNS = '''t.TIMEID, t.EMPID, CONCAT(e.FIRST_NAME, ' ', e.LAST_NAME), t.PROJECTID, p.PROJECT_NAME,
+                   t.START_TIME, t.STOP_TIME, t.TOTAL_MINUTES, t.NOTES, t.MANUAL_ENTRY, t.FLAGGED_FOR_REVIEW'''
+
+
+class DailyMinutesRow(NamedTuple):
+    """
+    Minutes for one employee on one project on one local day.
+    """
+    empid: str
+    employee_name: str
+    projectid: str
+    project_name: str
+    day: date
+    minutes: int
+
+
+class TimesheetRow(NamedTuple):
+    projectid: str
+    project_name: str
+    minutes: tuple      # one value per day of the week, Monday first
+    total: int
+
+
+class WeeklyTimesheet(NamedTuple):
+    """
+    A project x day grid of minutes for one employee and one ISO week.
+    """
+    week_start: date    # local Monday
+    days: tuple         # the seven local dates, Monday first
+    rows: list          # TimesheetRow, ordered by project name
+    day_totals: tuple
+    total: int
+
+
+class ActiveTimerRow(NamedTuple):
+    timeid: str
+    project_name: str
+    start_time: datetime
+    notes: Optional[str]
+
+
+class TimerRow(NamedTuple):
+    timeid: str
+    start_time: datetime
+    stop_time: Optional[datetime]
+    notes: Optional[str]
+    projectid: str
+
+
+class TimerChange(NamedTuple):
+    """
+    Result of Database.start_timer/stop_timer: the timer concerned and whether this call
+    changed it (False when it was already running/stopped, e.g. on a retried request).
+    """
+    timeid: Optional[str]
+    changed: bool
+
+
+def to_rows(row_type, rows):
+    """
+    Convert cursor rows into a list of row_type. Rows may leave out trailing fields
+    that have defaults (e.g. LoginRow.emp_role).
+    """
+    if row_type._field_defaults:
+        return list(starmap(row_type, rows))
+    return list(map(row_type._make, rows))
+
+
+def to_row(row_type, row):
+    """
+    Convert a single cursor row (or None) into row_type
+    """
+    return row_type(*row) if row is not None else None
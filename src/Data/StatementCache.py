@@ -0,0 +1,112 @@
+# src/Data/StatementCache.py
+#
+# Server-side prepared statements for the hot read queries, kept per connection.
+#
+# A MariaDB cursor opened with prepared=True prepares its statement on the first execute()
+# and reuses it for every later execute() of the same SQL text, sending only the
+# parameters (binary protocol). StatementCache keeps one such cursor per distinct SQL text,
+# least recently used first out, so the parse/plan work for a query happens once per
+# connection instead of on every call.
+#
+# Queries with IN (...) lists would otherwise produce a different SQL text for every list
+# length. in_list() pads the list to the next of IN_LIST_BUCKETS by repeating its last value
+# (duplicates do not change an IN), so a query has at most len(IN_LIST_BUCKETS) shapes per
+# list. Lists longer than the largest bucket get exact placeholders and are run unprepared.
+
+import os
+from collections import OrderedDict
+from src.Utils.AppLogger import get_logger
+
+logger = get_logger(__name__)
+
+IN_LIST_BUCKETS = (1, 4, 16, 64, 256)
+DEFAULT_MAX_STATEMENTS = 64
+
+# More parameters than this means an IN list beyond the largest bucket: a one-off shape that
+# would only push hot statements out of the cache
+MAX_PREPARED_PARAMS = 2 * IN_LIST_BUCKETS[-1] + 16
+
+
+def in_list(values):
+    """
+    Placeholders and parameters for "IN (...)", padded to a bucket size.
+
+    Args:
+        values: The values to match
+
+    Returns:
+        ("(?, ?, ...)", list of parameters); "(NULL)" with no parameters for an empty list,
+        which matches nothing
+    """
+    values = list(values)
+    if not values:
+        return "(NULL)", []
+    size = next((bucket for bucket in IN_LIST_BUCKETS if bucket >= len(values)), len(values))
+    values += [values[-1]] * (size - len(values))
+    return "(" + ", ".join("?" * size) + ")", values
+
+
+class StatementCache:
+    def __init__(self, connection, max_statements=None):
+        """
+        Args:
+            connection: The mariadb connection the statements are prepared on
+            max_statements: Prepared statements kept open (env DB_STATEMENT_CACHE_SIZE, 0 disables)
+        """
+        self.__connection = connection
+        self.max_statements = int(os.getenv("DB_STATEMENT_CACHE_SIZE", DEFAULT_MAX_STATEMENTS)) \
+            if max_statements is None else max_statements
+        self.__cursors = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def execute(self, sql, params=()):
+        """
+        Run sql with params on its prepared cursor, preparing it on first use.
+
+        Returns:
+            the cursor, with the result buffered; read it before the same SQL runs again on
+            this connection, and do not close it
+        """
+        if self.max_statements <= 0 or len(params) > MAX_PREPARED_PARAMS:
+            cursor = self.__connection.cursor()
+            cursor.execute(sql, params)
+            return cursor
+
+        cursor = self.__cursors.pop(sql, None)
+        if cursor is None:
+            self.misses += 1
+            cursor = self.__connection.cursor(prepared=True, buffered=True)
+            while len(self.__cursors) >= self.max_statements:
+                _, oldest = self.__cursors.popitem(last=False)
+                self.__close(oldest)
+        else:
+            self.hits += 1
+        self.__cursors[sql] = cursor
+        try:
+            cursor.execute(sql, params)
+        except Exception:
+            # a statement that failed to prepare or run is not kept
+            del self.__cursors[sql]
+            self.__close(cursor)
+            raise
+        return cursor
+
+    def stats(self):
+        return {"statements": len(self.__cursors), "hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        """
+        Close every prepared statement. Errors are ignored: this runs when the connection is
+        being thrown away, often because it already broke.
+        """
+        for cursor in self.__cursors.values():
+            self.__close(cursor)
+        self.__cursors.clear()
+
+    @staticmethod
+    def __close(cursor):
+        try:
+            cursor.close()
+        except Exception as e:
+            logger.debug("Closing a prepared statement failed: %s", e)
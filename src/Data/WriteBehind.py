@@ -0,0 +1,374 @@
+# src/Data/WriteBehind.py
+#
+# Local append-only journal and reconciler for timer writes (start, stop, time entries,
+# note edits).
+#
+# submit() appends the operation to the journal (one JSON line, fsynced) and returns. A
+# background reconciler applies queued operations to the database in order and in
+# batches, one transaction and one commit per batch, every flush_interval_ms or as soon as
+# flush_batch operations are waiting. Request latency is bounded by a local disk append
+# instead of a commit on the remote database, and writes keep being accepted while the
+# database is slow or down: the reconciler retries with growing delays until it is back.
+#
+# The journal is segmented. Each process writes timer-<pid>-<segment>.jsonl files and
+# holds an exclusive lock on timer-<pid>.lock for its lifetime. A segment is sealed once it
+# reaches SEGMENT_BYTES and deleted once every operation in it has been applied, so the
+# journal only holds what the database does not have yet.
+#
+# On start, segments whose process is gone (its lock file is not held) are adopted: renamed
+# into this process's namespace, ahead of its own segments, and replayed by the reconciler
+# like any other queued operation. Operations carry their own timestamps and TIMEIDs and are
+# applied idempotently (see Database.apply_timer_ops), so replaying one that already
+# reached the database is harmless.
+#
+# Only errors meaning the database cannot be reached (retry_errors) are retried. An
+# operation the database rejects (bad data, a failed constraint) would otherwise hold up
+# everything queued behind it, so it is moved to dead-letter.jsonl in the journal directory
+# and logged, and the reconciler carries on.
+#
+# The journal must be on persistent storage for the fsync to mean anything: it defaults to
+# data/journal in the project directory, and start() warns when it is on a temporary
+# directory or a tmpfs mount that is cleared on reboot.
+
+import glob
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from src.Utils.AppLogger import get_logger
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; journals are then not shared safely between processes
+    fcntl = None
+
+logger = get_logger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_JOURNAL_DIR = os.path.join(PROJECT_DIR, "data", "journal")
+DEAD_LETTER_FILE = "dead-letter.jsonl"
+DEFAULT_FLUSH_INTERVAL_MS = 200
+DEFAULT_FLUSH_BATCH = 100
+SEGMENT_BYTES = 1024 * 1024
+RETRY_DELAY_SECONDS = 1
+MAX_RETRY_DELAY_SECONDS = 60
+
+SEGMENT_PATTERN = re.compile(r"timer-(\d+)-(\d+)\.jsonl$")
+
+
+def _lock(f):
+    """
+    Take an exclusive, non-blocking lock on an open file. Returns False if another process holds it.
+    """
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def on_temporary_storage(path):
+    """
+    Whether path is under the system temporary directory or on a tmpfs/ramfs mount, i.e.
+    likely to be emptied on reboot.
+    """
+    path = os.path.realpath(path)
+    for root in (os.path.realpath(tempfile.gettempdir()), "/dev/shm"):
+        if path == root or path.startswith(root + os.sep):
+            return True
+    try:
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) > 2]
+    except OSError:
+        return False
+    # the mount with the longest mount point containing path is the one it lives on
+    containing = [(point, fstype) for point, fstype in mounts
+                  if path == point or path.startswith(point.rstrip(os.sep) + os.sep)]
+    if not containing:
+        return False
+    return max(containing, key=lambda mount: len(mount[0]))[1] in ("tmpfs", "ramfs")
+
+
+def read_journal(path):
+    """
+    Operations in a journal segment, in order. A torn last line (crash mid-append) is skipped.
+    """
+    ops = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                ops.append(json.loads(line))
+            except ValueError:
+                logger.warning("Skipping unreadable journal line in %s", path)
+    return ops
+
+
+class WriteBehindQueue:
+    def __init__(self, apply_batch, journal_dir=None, flush_interval_ms=None, flush_batch=None, fsync=True,
+                 segment_bytes=SEGMENT_BYTES, retry_errors=(ConnectionError,)):
+        """
+        Args:
+            apply_batch: Callable applying a list of operations in one transaction; raises on failure
+            journal_dir: Directory for journal files (env WRITE_BEHIND_DIR)
+            flush_interval_ms: Longest time an operation waits before a flush (env WRITE_BEHIND_FLUSH_MS)
+            flush_batch: Flush as soon as this many operations are waiting (env WRITE_BEHIND_BATCH)
+            fsync: fsync the journal on every submit (survives power loss, not just a process crash)
+            segment_bytes: Size at which a segment is sealed and a new one started
+            retry_errors: Exception types meaning the database is unreachable; anything else
+                apply_batch raises is a rejected operation
+        """
+        self.__apply_batch = apply_batch
+        self.retry_errors = retry_errors
+        self.journal_dir = journal_dir or os.getenv("WRITE_BEHIND_DIR") or DEFAULT_JOURNAL_DIR
+        self.flush_interval = (flush_interval_ms or int(os.getenv("WRITE_BEHIND_FLUSH_MS", DEFAULT_FLUSH_INTERVAL_MS))) / 1000
+        self.flush_batch = flush_batch or int(os.getenv("WRITE_BEHIND_BATCH", DEFAULT_FLUSH_BATCH))
+        self.fsync = fsync
+        self.segment_bytes = segment_bytes
+        self.dead_letter_path = os.path.join(self.journal_dir, DEAD_LETTER_FILE)
+        self.__pid = os.getpid()
+        self.__pending = deque()        # (segment path, op), oldest first
+        self.__unapplied = {}           # segment path -> operations not yet applied
+        self.__submitted = 0
+        self.__applied = 0
+        self.__failures = 0
+        self.__cond = threading.Condition()
+        self.__lock_file = None
+        self.__segment_no = 0
+        self.__journal = None
+        self.__thread = None
+        self.__stopping = False
+
+    def __segment_path(self, segment_no):
+        return os.path.join(self.journal_dir, f"timer-{self.__pid}-{segment_no:06d}.jsonl")
+
+    @property
+    def journal_path(self):
+        """
+        The segment new operations are appended to.
+        """
+        return self.__segment_path(self.__segment_no)
+
+    def start(self):
+        """
+        Take this process's journal lock, adopt orphaned segments, open a fresh segment and
+        start the reconciler. Never touches the database, so it works while it is down.
+
+        Returns:
+            number of orphaned operations queued for replay
+        """
+        os.makedirs(self.journal_dir, exist_ok=True)
+        if on_temporary_storage(self.journal_dir):
+            logger.warning("Timer journal %s is on temporary storage and may not survive a reboot; "
+                           "set WRITE_BEHIND_DIR to a persistent directory", self.journal_dir)
+        self.__lock_file = open(os.path.join(self.journal_dir, f"timer-{self.__pid}.lock"), "a")
+        if not _lock(self.__lock_file):
+            raise RuntimeError(f"Journal lock for process {self.__pid} is held by another process")
+
+        adopted = self.__adopt_orphans()
+        self.__open_segment()
+        self.__thread = threading.Thread(target=self.__run, name="journal-reconciler", daemon=True)
+        self.__thread.start()
+        return adopted
+
+    def __adopt_orphans(self):
+        segments = {}
+        for path in glob.glob(os.path.join(self.journal_dir, "timer-*-*.jsonl")):
+            match = SEGMENT_PATTERN.search(os.path.basename(path))
+            if match:
+                segments.setdefault(int(match.group(1)), []).append((int(match.group(2)), path))
+
+        # leftovers from an earlier process with our pid stay where they are and go first
+        own = sorted(segments.pop(self.__pid, []))
+        self.__segment_no = own[-1][0] + 1 if own else 0
+        adopted = sum(self.__queue_segment(path) for _, path in own)
+
+        for pid in sorted(segments):
+            lock_path = os.path.join(self.journal_dir, f"timer-{pid}.lock")
+            with open(lock_path, "a") as lock_file:
+                if not _lock(lock_file):
+                    continue    # a live process owns these segments
+                for _, path in sorted(segments[pid]):
+                    target = self.__segment_path(self.__segment_no)
+                    try:
+                        os.replace(path, target)
+                    except FileNotFoundError:
+                        # another worker booting at the same time adopted it after our glob
+                        continue
+                    self.__segment_no += 1
+                    adopted += self.__queue_segment(target, adopted_from=path)
+            try:
+                os.remove(lock_path)
+            except OSError:
+                pass
+        return adopted
+
+    def __queue_segment(self, path, adopted_from=None):
+        ops = read_journal(path)
+        if not ops:
+            os.remove(path)
+            return 0
+        logger.warning("Replaying %d journaled timer writes from %s", len(ops), adopted_from or path)
+        for op in ops:
+            self.__pending.append((path, op))
+        self.__unapplied[path] = len(ops)
+        self.__submitted += len(ops)
+        return len(ops)
+
+    def __open_segment(self):
+        if self.__journal is not None:
+            self.__journal.close()
+        self.__journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def submit(self, op):
+        """
+        Journal an operation and queue it for the reconciler.
+
+        Returns:
+            the operation's sequence number, for wait_applied()
+        """
+        line = json.dumps(op, default=str)
+        with self.__cond:
+            self.__journal.write(line + "\n")
+            self.__journal.flush()
+            if self.fsync:
+                os.fsync(self.__journal.fileno())
+
+            path = self.journal_path
+            self.__pending.append((path, op))
+            self.__unapplied[path] = self.__unapplied.get(path, 0) + 1
+            if self.__journal.tell() >= self.segment_bytes:
+                # seal this segment; it is deleted once its operations are applied
+                self.__segment_no += 1
+                self.__open_segment()
+
+            self.__submitted += 1
+            if len(self.__pending) >= self.flush_batch:
+                self.__cond.notify_all()
+            return self.__submitted
+
+    def is_healthy(self):
+        """
+        False while the reconciler cannot reach the database.
+        """
+        with self.__cond:
+            return self.__failures == 0
+
+    def wait_applied(self, seq=None, timeout=None):
+        """
+        Block until the operation with sequence number seq (default: everything submitted so
+        far) is in the database. Returns False on timeout, or at once while the database is
+        unreachable.
+        """
+        with self.__cond:
+            target = self.__submitted if seq is None else seq
+            return self.__cond.wait_for(lambda: self.__applied >= target or self.__failures > 0, timeout) \
+                and self.__applied >= target
+
+    def pending_count(self):
+        with self.__cond:
+            return len(self.__pending)
+
+    def __run(self):
+        delay = self.flush_interval
+        while True:
+            with self.__cond:
+                self.__cond.wait_for(lambda: self.__stopping or len(self.__pending) >= self.flush_batch, delay)
+                if self.__stopping and (not self.__pending or self.__failures):
+                    return
+                batch = [op for _, op in list(self.__pending)[:max(self.flush_batch, 1)]]
+
+            if not batch:
+                continue
+            try:
+                self.__apply(batch)
+            except self.retry_errors + (OSError,) as e:
+                # database unreachable (or the dead-letter file could not be written): the
+                # batch stays queued and journaled; retry with growing delays
+                with self.__cond:
+                    self.__failures += 1
+                    delay = min(MAX_RETRY_DELAY_SECONDS, RETRY_DELAY_SECONDS * 2 ** (self.__failures - 1))
+                    self.__cond.notify_all()
+                logger.error("Applying %d journaled timer writes failed, retrying in %ss: %s", len(batch), delay, e)
+                continue
+
+            with self.__cond:
+                if self.__failures:
+                    logger.warning("Database reachable again after %d failed attempts", self.__failures)
+                self.__failures = 0
+                delay = self.flush_interval
+                for _ in batch:
+                    path, _ = self.__pending.popleft()
+                    self.__unapplied[path] -= 1
+                    if self.__unapplied[path] == 0:
+                        del self.__unapplied[path]
+                        self.__discard_segment(path)
+                self.__applied += len(batch)
+                self.__cond.notify_all()
+
+    def __apply(self, batch):
+        # a rejected batch is applied again one operation at a time, to find the ones to
+        # set aside; retry_errors propagate so the whole batch is retried later
+        try:
+            self.__apply_batch(batch)
+            return
+        except self.retry_errors:
+            raise
+        except Exception as e:
+            if len(batch) == 1:
+                self.__dead_letter(batch[0], e)
+                return
+            logger.warning("Database rejected a batch of %d journaled timer writes, applying them one by one: %s",
+                           len(batch), e)
+        for op in batch:
+            try:
+                self.__apply_batch([op])
+            except self.retry_errors:
+                raise
+            except Exception as e:
+                self.__dead_letter(op, e)
+
+    def __dead_letter(self, op, error):
+        logger.error("Database rejected journaled timer write %s, moved to %s: %s", op, self.dead_letter_path, error)
+        entry = {"op": op, "error": str(error), "rejected_at": datetime.now(timezone.utc).isoformat()}
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def __discard_segment(self, path):
+        # every operation in the segment is in the database
+        if path == self.journal_path:
+            self.__journal.truncate(0)
+            self.__journal.seek(0)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stop(self, timeout=10):
+        """
+        Flush what is queued (unless the database is unreachable) and stop the reconciler.
+        Anything left stays in the journal and is adopted by the next process.
+        """
+        with self.__cond:
+            self.__stopping = True
+            self.__cond.notify_all()
+        if self.__thread is not None:
+            self.__thread.join(timeout)
+        with self.__cond:
+            clean = not self.__pending
+        if self.__journal is not None:
+            self.__journal.close()
+            if clean:
+                os.remove(self.journal_path)
+        if self.__lock_file is not None:
+            self.__lock_file.close()
+            if clean:
+                os.remove(self.__lock_file.name)
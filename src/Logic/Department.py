@@ -3,6 +3,8 @@
 from src.Data.Database import Database
 
 class Department:
+    __slots__ = ("__dptid", "__name", "__manager_id", "__active")
+
     def __init__(self, dptid, name, manager_id=None, active=1):
         self.__dptid = dptid
         self.__name = name
@@ -1,6 +1,8 @@
 from src.Data.Database import Database
 
 class Employee:
+    __slots__ = ("__empid", "__first_name", "__last_name", "__dptid", "__email", "__mgr_empid", "__active")
+
     def __init__(self, empid, first_name, last_name, dptid, email=None, mgr_empid=None, active=1):
         self.__empid = empid
         self.__first_name = first_name
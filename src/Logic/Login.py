@@ -2,6 +2,8 @@ from src.Data.Database import Database
 from datetime import datetime
 
 class Login:
+    __slots__ = ("__loginid", "__empid", "__password", "__last_reset", "__force_reset", "__emp_role")
+
     def __init__(self, loginid, empid, password, last_reset=None, force_reset=0, emp_role="user"):
         self.__loginid = loginid
         self.__empid = empid
@@ -0,0 +1,119 @@
+# src/Logic/Permissions.py
+#
+# One place for "who can see what". A Permissions object holds, for one user and role:
+#   - the employees whose time they may see (everyone for admin/project_manager, the org
+#     tree's visible set for managers, only themself otherwise)
+#   - the projects they own (and so may edit) and the projects they are a member of
+#
+# get_permissions() builds it with at most three queries and keeps it until
+# Database.get_permissions_version() changes (any worker changed employees, projects or
+# memberships), or until it is as old as the org tree it was built from. WebUI also keeps the current
+# user's object on flask.g so a request resolves it once.
+
+import time
+from src.Data.Database import Database, ORG_TREE_MAX_AGE_SECONDS
+
+# Roles that see every employee
+UNRESTRICTED_ROLES = ("admin", "project_manager")
+
+
+class Permissions:
+    __slots__ = ("__empid", "__role", "__visible_empids", "__owned_project_ids", "__member_project_ids")
+
+    def __init__(self, empid, role, visible_empids, owned_project_ids, member_project_ids):
+        """
+        Args:
+            visible_empids: frozenset of EMPIDs, or None when the role may see everyone
+        """
+        self.__empid = empid
+        self.__role = role
+        self.__visible_empids = visible_empids
+        self.__owned_project_ids = frozenset(owned_project_ids)
+        self.__member_project_ids = frozenset(member_project_ids)
+
+    # Getters
+    def get_empid(self):
+        return self.__empid
+
+    def get_role(self):
+        return self.__role
+
+    def get_visible_empids(self):
+        return self.__visible_empids
+
+    def get_owned_project_ids(self):
+        return self.__owned_project_ids
+
+    def get_member_project_ids(self):
+        return self.__member_project_ids
+
+    # Checks
+    def sees_everyone(self):
+        return self.__visible_empids is None
+
+    def can_see_employee(self, empid):
+        return self.__visible_empids is None or empid in self.__visible_empids
+
+    def filter_visible(self, items, key=lambda item: item):
+        """
+        Keep only the items (employees, rows, ids) whose key is a visible EMPID.
+        """
+        if self.__visible_empids is None:
+            return list(items)
+        return [item for item in items if key(item) in self.__visible_empids]
+
+    def can_edit_project(self, projectid):
+        # only the project's creator may rename or edit it
+        return projectid in self.__owned_project_ids
+
+    def is_project_member(self, projectid):
+        return projectid in self.__member_project_ids
+
+
+# (empid, role) -> (permissions version, built at, Permissions)
+_cache = {}
+
+
+def build_permissions(empid, role):
+    """
+    Build a user's permission set straight from the database.
+    """
+    if role in UNRESTRICTED_ROLES:
+        visible = None
+    elif role == "manager":
+        visible = Database.get_visible_empids(empid)
+    else:
+        visible = frozenset([empid])
+
+    return Permissions(
+        empid=empid,
+        role=role,
+        visible_empids=visible,
+        owned_project_ids=Database.get_project_ids_created_by(empid),
+        member_project_ids=Database.get_project_ids_for_employee(empid)
+    )
+
+
+def get_permissions(empid, role):
+    """
+    Cached permission set for a user, rebuilt when the permissions version changes.
+
+    Args:
+        empid: The user's employee ID
+        role: The user's role (session["emp_role"])
+
+    Returns:
+        Permissions
+    """
+    version = Database.get_permissions_version()
+    cached = _cache.get((empid, role))
+    if cached and cached[0] == version and time.monotonic() - cached[1] <= ORG_TREE_MAX_AGE_SECONDS:
+        return cached[2]
+
+    permissions = build_permissions(empid, role)
+    _cache[(empid, role)] = (version, time.monotonic(), permissions)
+    return permissions
+
+
+def clear_permissions_cache():
+    _cache.clear()
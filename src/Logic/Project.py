@@ -1,7 +1,12 @@
 from src.Data.Database import Database
 from datetime import datetime
+from src.Utils.AppLogger import get_logger
+
+logger = get_logger(__name__)
 
 class Project:
+    __slots__ = ("__projectid", "__name", "__created_by", "__date_created", "__prior_projectid", "__active")
+
     def __init__(self, projectid, name, created_by, date_created=None, prior_projectid=None, active=1):
         self.__projectid = projectid
         self.__name = name
@@ -36,13 +41,9 @@ class Project:
 
     # Save project to DB
     def save_to_database(self):
-        print("📝 Preparing to insert project with:")
-        print("ID:", self.__projectid)
-        print("Name:", self.__name)
-        print("Created by:", self.__created_by)
-        print("Date:", self.__date_created)
-        print("Prior:", self.__prior_projectid)
-        print("Active:", self.__active)
+        logger.debug("Inserting project %s (name=%r, created_by=%s, date=%s, prior=%s, active=%s)",
+                     self.__projectid, self.__name, self.__created_by, self.__date_created,
+                     self.__prior_projectid, self.__active)
         Database.add_project(
             projectid=self.__projectid,
             name=self.__name,
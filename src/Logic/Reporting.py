@@ -0,0 +1,347 @@
+# src/Logic/Reporting.py
+#
+# Columnar reporting helpers for the summary pages. Time rows are loaded once into
+# parallel columns: each grouping key (employee, project, department, day, week) becomes
+# a list of labels plus an integer code per row, and minutes become one integer array.
+# Group-bys and pivots are then a single weighted bincount over the codes instead of
+# nested dict updates per row.
+#
+# Loading does no per-row Python work either: columns are pulled out of the rows with
+# itemgetter, labels are worked out once per distinct value (local days once per UTC day)
+# and mapped back onto the rows with dict lookups or, with numpy, by indexing.
+#
+# numpy is optional. When it is installed the group-bys run vectorized; without it the
+# same code paths fall back to array-backed pure Python loops and give identical results.
+
+from array import array
+from datetime import date, datetime, timedelta
+from functools import partial
+from itertools import repeat
+from operator import attrgetter, is_, itemgetter, methodcaller
+import pytz
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+
+# Keys every TimeColumns can group by
+GROUP_KEYS = ("employee", "project", "department", "day", "week")
+
+# Every UTC offset in use is a multiple of 15 minutes and changes on a 15 minute boundary,
+# so rows that start in the same 15 minute UTC slot always fall on the same local day
+_SLOT_MINUTES = 15
+_DAY_MINUTES = 24 * 60
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _codes(values, count):
+    """
+    An integer code per row from an iterable of ints: a numpy array when numpy is
+    installed (so pivot() can combine codes without a loop), otherwise an array("l").
+    """
+    if np is not None:
+        return np.fromiter(values, dtype=np.intp, count=count)
+    return array("l", values)
+
+
+def _factorize(values, label_of=None):
+    """
+    Turn a column of values into (labels, codes): sorted unique labels and, for each
+    row, the index of its label. label_of, if given, turns each distinct value into its
+    label (several values may share one); it is called once per distinct value.
+    """
+    distinct = set(values)
+    label_for = {value: label_of(value) for value in distinct} if label_of else {value: value for value in distinct}
+    labels = sorted(set(label_for.values()), key=lambda v: (v is None, v))
+    index = {label: i for i, label in enumerate(labels)}
+    code_of = {value: index[label] for value, label in label_for.items()}
+    return labels, _codes(map(code_of.__getitem__, values), len(values))
+
+
+def _refactorize(labels, codes, label_of):
+    """
+    Factors of a coarser key derived from an already factorized one (e.g. week from day):
+    label_of is applied once per label and the row codes are translated in one pass.
+    """
+    new_labels, label_codes = _factorize(labels, label_of)
+    if np is not None:
+        return new_labels, np.asarray(label_codes, dtype=np.intp)[codes]
+    return new_labels, array("l", map(label_codes.__getitem__, codes))
+
+
+def _utc_offset(minute, tz):
+    # UTC offset of tz, in minutes, at a UTC time given as minutes since the epoch
+    return pytz.utc.localize(_EPOCH + timedelta(minutes=minute)).astimezone(tz).utcoffset() // timedelta(minutes=1)
+
+
+def _day_offset(utc_day, tz):
+    """
+    UTC offset of tz in minutes throughout a UTC day (days since the epoch), or None on
+    a day the offset changes (a DST transition).
+    """
+    start = utc_day * _DAY_MINUTES
+    first = _utc_offset(start, tz)
+    return first if first == _utc_offset(start + _DAY_MINUTES - 1, tz) else None
+
+
+def _local_day_factors(start_times, tz):
+    """
+    Factorized local calendar dates of UTC start times. Offsets only change at DST
+    transitions, so tz is consulted once per UTC day, and per 15 minute slot only on
+    the days a transition falls on.
+    """
+    if np is not None:
+        count = len(start_times)
+        missing = np.fromiter(map(is_, start_times, repeat(None)), dtype=bool, count=count)
+        if missing.any():
+            start_times = [_EPOCH if start is None else start for start in start_times]
+        # minutes since the epoch, read with C-level getters (numpy parses datetime objects
+        # one at a time and far slower); seconds are dropped, which keeps a row in its slot
+        minutes = ((np.fromiter(map(methodcaller("toordinal"), start_times), dtype=np.int64, count=count)
+                    - _EPOCH.toordinal()) * _DAY_MINUTES
+                   + np.fromiter(map(attrgetter("hour"), start_times), dtype=np.int64, count=count) * 60
+                   + np.fromiter(map(attrgetter("minute"), start_times), dtype=np.int64, count=count))
+        if tz is not None:
+            utc_days, day_of_row = np.unique(minutes // _DAY_MINUTES, return_inverse=True)
+            day_offsets = [_day_offset(day, tz) for day in utc_days.tolist()]
+            offsets = np.array([0 if offset is None else offset for offset in day_offsets],
+                               dtype=np.int64)[day_of_row.ravel()]
+            changing = np.isin(day_of_row.ravel(), [i for i, offset in enumerate(day_offsets) if offset is None])
+            if changing.any():
+                slots, slot_of_row = np.unique(minutes[changing] // _SLOT_MINUTES, return_inverse=True)
+                slot_offsets = [_utc_offset(slot * _SLOT_MINUTES, tz) for slot in slots.tolist()]
+                offsets[changing] = np.array(slot_offsets, dtype=np.int64)[slot_of_row.ravel()]
+            minutes += offsets
+        # missing start times sort last, as None does in _factorize
+        local_days = np.where(missing, np.iinfo(np.int64).max, minutes // _DAY_MINUTES)
+        day_numbers, codes = np.unique(local_days, return_inverse=True)
+        labels = [None if missing_day else _EPOCH.date() + timedelta(days=day)
+                  for day, missing_day in zip(day_numbers.tolist(), day_numbers == np.iinfo(np.int64).max)]
+        return labels, codes.ravel().astype(np.intp)
+
+    day_offsets = {}
+
+    def slot(start):
+        if start is None:
+            return None
+        minutes = (start - _EPOCH) // timedelta(minutes=1)
+        return minutes - minutes % _SLOT_MINUTES
+
+    def local_day(slot):
+        if slot is None:
+            return None
+        offset = 0
+        if tz is not None:
+            utc_day = slot // _DAY_MINUTES
+            if utc_day not in day_offsets:
+                day_offsets[utc_day] = _day_offset(utc_day, tz)
+            offset = day_offsets[utc_day]
+            if offset is None:
+                offset = _utc_offset(slot, tz)
+        return _EPOCH.date() + timedelta(days=(slot + offset) // _DAY_MINUTES)
+
+    return _factorize(list(map(slot, start_times)), local_day)
+
+
+def iso_week_label(day):
+    """
+    ISO week label for a date, e.g. date(2025, 5, 6) -> "2025-W19".
+    """
+    if day is None:
+        return None
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def parse_iso_week(label):
+    """
+    Monday of an ISO week label such as "2025-W19" (the format of <input type="week">).
+
+    Raises:
+        ValueError: If the label is not a valid ISO week
+    """
+    try:
+        year, week = label.strip().upper().split("-W")
+        return date.fromisocalendar(int(year), int(week), 1)
+    except (AttributeError, ValueError) as e:
+        raise ValueError(f"Invalid week '{label}', expected YYYY-Www") from e
+
+
+class Pivot:
+    """
+    A two-way table of summed minutes, e.g. employee x project.
+
+    Attributes:
+        row_labels: labels down the side
+        col_labels: labels across the top
+        cells: list of rows, cells[i][j] is minutes for row_labels[i] x col_labels[j]
+        row_totals, col_totals, grand_total: the margins
+    """
+
+    def __init__(self, row_labels, col_labels, cells):
+        self.row_labels = row_labels
+        self.col_labels = col_labels
+        self.cells = cells
+        self.row_totals = [sum(row) for row in cells]
+        self.col_totals = [sum(col) for col in zip(*cells)] if cells else [0] * len(col_labels)
+        self.grand_total = sum(self.row_totals)
+
+    def to_nested_dict(self, skip_empty=True):
+        """
+        {row_label: {col_label: minutes}}, the shape the summary templates iterate over.
+        Cells with no time are left out unless skip_empty is False.
+        """
+        nested = {}
+        for label, row in zip(self.row_labels, self.cells):
+            inner = {col: minutes for col, minutes in zip(self.col_labels, row)
+                     if minutes or not skip_empty}
+            if inner or not skip_empty:
+                nested[label] = inner
+        return nested
+
+
+class TimeColumns:
+    """
+    Time rows stored column by column for fast group-bys.
+
+    Build it with TimeColumns.from_rows() from any Database row type that has
+    total_minutes and start_time plus either employee_name or first_name/last_name,
+    or from DailyMinutesRow rows the database has already bucketed by local day.
+    """
+
+    def __init__(self, minutes, keys):
+        self.__minutes = minutes
+        self.__keys = keys            # name -> callable returning (labels, codes), called on first use
+        self.__factors = {}
+
+    @classmethod
+    def from_rows(cls, rows, tz=None):
+        """
+        Load rows into columns.
+
+        Args:
+            rows: TimeEntryRow, ReportRow, DailyMinutesRow or any NamedTuple with the same field names
+            tz: pytz timezone used to assign rows to local days/weeks (UTC if None); not
+                needed for DailyMinutesRow, which already carries its local day
+
+        Returns:
+            TimeColumns
+        """
+        if not rows:
+            return cls(array("l"), {key: partial(_factorize, []) for key in GROUP_KEYS})
+
+        fields = rows[0]._fields
+        count = len(rows)
+
+        def column(name):
+            return list(map(itemgetter(fields.index(name)), rows))
+
+        minute_column = column("minutes" if "minutes" in fields else "total_minutes")
+        if np is not None:
+            # None (a running timer) becomes NaN, then 0
+            minutes = np.nan_to_num(np.array(minute_column, dtype=np.float64)).astype(np.int64)
+        else:
+            minutes = array("l", (int(m) if m else 0 for m in minute_column))
+
+        if "employee_name" in fields:
+            employees = partial(_factorize, column("employee_name"))
+        else:
+            names = list(zip(column("first_name"), column("last_name")))
+            employees = partial(_factorize, names, " ".join)
+
+        # days are needed for weeks as well, so they are worked out here rather than on first use
+        if "day" in fields:
+            days = _factorize(column("day"))
+        else:
+            days = _local_day_factors(column("start_time"), tz)
+
+        keys = {
+            "employee": employees,
+            "project": partial(_factorize, column("project_name")),
+            "department": partial(_factorize, column("dpt_name") if "dpt_name" in fields else [None] * count),
+            "day": lambda: days,
+            "week": partial(_refactorize, days[0], days[1], iso_week_label),
+        }
+        return cls(minutes, keys)
+
+    def __len__(self):
+        return len(self.__minutes)
+
+    def __factor(self, key):
+        if key not in self.__keys:
+            raise ValueError(f"Unknown report key '{key}', expected one of {', '.join(GROUP_KEYS)}")
+        if key not in self.__factors:
+            self.__factors[key] = self.__keys[key]()
+        return self.__factors[key]
+
+    def total(self):
+        """
+        Total minutes across every row.
+        """
+        return int(np.sum(self.__minutes)) if np is not None else sum(self.__minutes)
+
+    def group_sum(self, key):
+        """
+        Minutes summed per label of one key, e.g. group_sum("project").
+
+        Returns:
+            dict of label -> minutes, in label order
+        """
+        labels, codes = self.__factor(key)
+        totals = self.__bincount(codes, len(labels))
+        return dict(zip(labels, totals))
+
+    def pivot(self, row_key, col_key):
+        """
+        Minutes summed for every (row_key, col_key) pair, e.g. pivot("employee", "project").
+
+        Returns:
+            Pivot
+        """
+        row_labels, row_codes = self.__factor(row_key)
+        col_labels, col_codes = self.__factor(col_key)
+        width = len(col_labels)
+
+        if np is not None:
+            flat_codes = np.asarray(row_codes, dtype=np.int64) * width + np.asarray(col_codes, dtype=np.int64)
+        else:
+            flat_codes = array("l", (r * width + c for r, c in zip(row_codes, col_codes)))
+
+        flat = self.__bincount(flat_codes, len(row_labels) * width)
+        cells = [flat[i * width:(i + 1) * width] for i in range(len(row_labels))]
+        return Pivot(row_labels, col_labels, cells)
+
+    def __bincount(self, codes, size):
+        """
+        Sum minutes into `size` buckets by code. Always returns a list of Python ints so
+        results can go straight to templates and tojson.
+        """
+        if size == 0:
+            return []
+        if np is not None:
+            minutes = np.asarray(self.__minutes, dtype=np.int64)
+            sums = np.bincount(np.asarray(codes, dtype=np.intp), weights=minutes, minlength=size)
+            return [int(value) for value in sums.round()]
+
+        sums = [0] * size
+        for code, minutes in zip(codes, self.__minutes):
+            sums[code] += minutes
+        return sums
+
+
+# ======================
+# 🔹 Report shortcuts
+# ======================
+
+def employee_project_pivot(rows, tz=None):
+    return TimeColumns.from_rows(rows, tz).pivot("employee", "project")
+
+
+def project_day_pivot(rows, tz=None):
+    return TimeColumns.from_rows(rows, tz).pivot("project", "day")
+
+
+def department_week_pivot(rows, tz=None):
+    return TimeColumns.from_rows(rows, tz).pivot("department", "week")
@@ -1,7 +1,12 @@
 import uuid
 from src.Data.Database import Database
+from src.Utils.AppLogger import get_logger
+
+logger = get_logger(__name__)
 
 class TimeEntry:
+    __slots__ = ("__timeid", "__empid", "__projectid", "__start_time", "__stop_time", "__notes", "__manual_entry", "__total_minutes")
+
     def __init__(self, empid, projectid, start_time, stop_time=None, notes=None, manual_entry=0, total_minutes=None, timeid=None):
         self.__timeid = timeid or f"t-{uuid.uuid4().hex[:8]}"
         self.__empid = empid
@@ -52,9 +57,9 @@ class TimeEntry:
 
     # Save time entry to DB
     def save_to_database(self):
-        print("🧪 Available methods on Database:")
-        print(dir(Database))
         self.calculate_total_minutes()
+        logger.debug("Saving time entry %s for %s on %s (%s minutes)",
+                     self.__timeid, self.__empid, self.__projectid, self.__total_minutes)
         Database.add_time_entry(
             timeid=self.__timeid,
             empid=self.__empid,
@@ -79,8 +84,7 @@ class TimeEntry:
             timeid: The ID of the time entry to update
             new_notes: The new notes text to set
         """
-        print("🧪 Available methods on Database:")
-        print(dir(Database))
+        logger.debug("Updating notes for time entry %s", timeid)
         # Update the instance notes as well
         self.set_notes(new_notes)
         # Call the database alter_notes method
@@ -0,0 +1,81 @@
+# src/Logic/UserProfile.py
+#
+# A per-user snapshot kept in the server-side session (src/UI/WebUI/SessionStore.py):
+# name, department, manager, role and the permission sets from src/Logic/Permissions.py.
+# Page handlers read it instead of querying the employee and project tables on every
+# request. The profile records Database.get_permissions_version() at build time and is
+# rebuilt once that changes (an employee, project or membership change in any worker), or
+# once it is older than the org tree cache as a backstop.
+
+import json
+import time
+from src.Data.Database import Database, ORG_TREE_MAX_AGE_SECONDS
+from src.Logic.Permissions import Permissions, build_permissions
+
+
+def build_profile(empid, role):
+    """
+    Build a JSON-serializable profile for the session.
+
+    Args:
+        empid: The user's employee ID
+        role: The user's role
+
+    Returns:
+        dict
+    """
+    # read the version first so a change made while building still marks the profile stale
+    versions = Database.get_permissions_version()
+    employee = Database.get_employee_by_empid(empid)
+    permissions = build_permissions(empid, role)
+    visible = permissions.get_visible_empids()
+
+    return {
+        "empid": empid,
+        "role": role,
+        "first_name": employee.first_name if employee else None,
+        "last_name": employee.last_name if employee else None,
+        "dptid": employee.dptid if employee else None,
+        "mgr_empid": employee.mgr_empid if employee else None,
+        "visible_empids": sorted(visible) if visible is not None else None,
+        "owned_project_ids": sorted(permissions.get_owned_project_ids()),
+        "member_project_ids": sorted(permissions.get_member_project_ids()),
+        "versions": version_token(versions),
+        "built_at": time.time()
+    }
+
+
+def version_token(versions):
+    """
+    Permissions version as a string that survives the JSON round trip through the session.
+    """
+    return json.dumps(versions, default=str)
+
+
+def profile_is_stale(profile, empid, role, versions=None):
+    """
+    True if the profile is missing, belongs to another user/role, was built under other
+    permission versions, or has outlived the org tree cache.
+
+    Args:
+        versions: Database.get_permissions_version(); None skips the version check
+    """
+    if not profile or profile.get("empid") != empid or profile.get("role") != role:
+        return True
+    if versions is not None and profile.get("versions") != version_token(versions):
+        return True
+    return time.time() - profile.get("built_at", 0) > ORG_TREE_MAX_AGE_SECONDS
+
+
+def permissions_from_profile(profile):
+    """
+    Rebuild the Permissions object from a session profile without touching the database.
+    """
+    visible = profile.get("visible_empids")
+    return Permissions(
+        empid=profile["empid"],
+        role=profile["role"],
+        visible_empids=frozenset(visible) if visible is not None else None,
+        owned_project_ids=profile.get("owned_project_ids", []),
+        member_project_ids=profile.get("member_project_ids", [])
+    )
@@ -0,0 +1,62 @@
+# src/UI/WebUI/Api.py
+#
+# Flask blueprint serving the versioned JSON API (/api/v1). The handlers themselves live in
+# src/UI/WebUI/ApiCore.py so the async server (src/UI/WebUI/AsgiApp.py) can share them;
+# this module only adapts Flask's request and session to them.
+
+from functools import wraps
+from flask import Blueprint, Response, jsonify, request, session
+from src.UI.WebUI import ApiCore
+from src.UI.WebUI.ApiCore import ApiError, user_from_session
+from src.Utils.AppLogger import get_logger
+
+logger = get_logger(__name__)
+
+api = Blueprint("api_v1", __name__, url_prefix="/api/v1")
+
+
+@api.errorhandler(ApiError)
+def handle_api_error(error):
+    logger.debug("API error %s on %s: %s", error.status, request.path, error)
+    return jsonify({"error": str(error)}), error.status
+
+
+# like WebUI's login_required, but answers 401 instead of redirecting to the login page
+def api_login_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not session.get("empid"):
+            return jsonify({"error": "Not logged in"}), 401
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+
+def respond(handler):
+    result = handler(request.args, user_from_session(session), request.if_none_match.contains)
+    if result.payload is None:
+        response = Response(status=304)
+    else:
+        response = jsonify(result.payload)
+        # clients may keep the body but must revalidate it on every use
+        response.headers["Cache-Control"] = "private, no-cache"
+    response.set_etag(result.etag)
+    return response
+
+
+@api.route("/time-entries")
+@api_login_required
+def time_entries():
+    return respond(ApiCore.time_entries)
+
+
+@api.route("/projects")
+@api_login_required
+def projects():
+    return respond(ApiCore.projects)
+
+
+@api.route("/summary")
+@api_login_required
+def summary():
+    return respond(ApiCore.summary)
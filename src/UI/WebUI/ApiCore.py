@@ -0,0 +1,182 @@
+# src/UI/WebUI/ApiCore.py
+#
+# The /api/v1 handlers without any web framework, shared by the Flask blueprint
+# (src/UI/WebUI/Api.py) and the async server (src/UI/WebUI/AsgiApp.py):
+#
+#   GET /api/v1/time-entries   ?start=&end=&employee=&project=&fields=&limit=&cursor=
+#   GET /api/v1/projects       ?fields=
+#   GET /api/v1/summary        ?start=&end=&group=project|employee|department|day|week
+#
+# start/end are local dates (YYYY-MM-DD) in the user's time zone. Every response carries an
+# ETag built from a cheap fingerprint of the data behind it (row count and latest change
+# for time entries, cache versions for projects); when the client already has it the
+# handler returns before any rows are read. Time entries are paged by keyset: follow
+# "next_cursor" until it is null.
+#
+# Handlers are plain blocking functions; the async server runs them on AsyncDatabase's pool.
+
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from src.Data.Database import Database
+from src.Logic.Permissions import get_permissions
+from src.Logic.Reporting import TimeColumns, GROUP_KEYS
+from src.Data.RowModels import TimeEntryRecordRow, ProjectRow
+from src.Utils.ApiPaging import (
+    encode_cursor, decode_cursor, parse_page_size, parse_fields, select_fields, json_value, make_etag
+)
+from src.Utils.TimeZones import get_zone, local_day_range
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiUser(NamedTuple):
+    empid: str
+    role: Optional[str]
+    timezone: Optional[str]
+
+
+class ApiResult(NamedTuple):
+    """
+    payload is None when the client's ETag still matches (answer 304).
+    """
+    payload: Optional[dict]
+    etag: str
+
+
+def user_from_session(session_data):
+    """
+    The logged-in user from session data, or None when not logged in.
+    """
+    if not session_data or not session_data.get("empid"):
+        return None
+    return ApiUser(session_data["empid"], session_data.get("emp_role"), session_data.get("timezone"))
+
+
+def parse_day(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise ApiError(f"'{name}' must be a date as YYYY-MM-DD")
+
+
+def time_filters(args, user, permissions):
+    """
+    (empids, project_ids, start_utc, end_utc) for get_report_rows-style queries from the
+    start/end/employee/project parameters, limited to what the user may see.
+    """
+    empids = permissions.get_visible_empids()
+    employee = args.get("employee")
+    if employee:
+        if not permissions.can_see_employee(employee):
+            raise ApiError(f"Not allowed to see time for employee '{employee}'", 403)
+        empids = [employee]
+    elif empids is not None:
+        empids = sorted(empids)
+
+    project = args.get("project")
+    project_ids = [project] if project else None
+
+    start, end = parse_day(args, "start"), parse_day(args, "end")
+    zone = get_zone(user.timezone)
+    start_utc = end_utc = None
+    if start:
+        start_utc = local_day_range(start, start, zone)[0]
+    if end:
+        end_utc = local_day_range(end, end, zone)[1] - timedelta(seconds=1)
+    return empids, project_ids, start_utc, end_utc
+
+
+def time_entries(args, user, has_etag):
+    """
+    Args:
+        args: Query parameters (any mapping with .get)
+        user: ApiUser
+        has_etag: Callable telling whether the client already holds an ETag
+
+    Returns:
+        ApiResult
+    """
+    try:
+        fields = parse_fields(args.get("fields"), TimeEntryRecordRow._fields)
+        limit = parse_page_size(args.get("limit"))
+        cursor = args.get("cursor")
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise ApiError(str(e))
+
+    empids, project_ids, start_utc, end_utc = time_filters(args, user, get_permissions(user.empid, user.role))
+    fingerprint = Database.get_time_entry_fingerprint(empids, project_ids, start_utc, end_utc)
+    etag = make_etag("time-entries", empids, project_ids, start_utc, end_utc, fields, limit, cursor, fingerprint)
+    if has_etag(etag):
+        return ApiResult(None, etag)
+
+    # one extra row tells whether there is another page
+    rows = Database.get_time_entries_page(empids, project_ids, start_utc, end_utc, after, limit + 1)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].start_time, rows[-1].timeid)
+
+    return ApiResult({
+        "data": [select_fields(row, fields) for row in rows],
+        "next_cursor": next_cursor
+    }, etag)
+
+
+def projects(args, user, has_etag):
+    try:
+        fields = parse_fields(args.get("fields"), ProjectRow._fields)
+    except ValueError as e:
+        raise ApiError(str(e))
+
+    permissions = get_permissions(user.empid, user.role)
+    if permissions.sees_everyone():
+        project_ids = None
+    else:
+        project_ids = permissions.get_owned_project_ids() | permissions.get_member_project_ids()
+
+    # projects and memberships only change through Database mutators, which bump these versions
+    fingerprint = (Database.get_cache_version("projects"), Database.get_cache_version("memberships"))
+    etag = make_etag("projects", sorted(project_ids) if project_ids is not None else None, fields, fingerprint)
+    if has_etag(etag):
+        return ApiResult(None, etag)
+
+    rows = [row for row in Database.get_all_projects()
+            if project_ids is None or row.projectid in project_ids]
+    return ApiResult({"data": [select_fields(row, fields) for row in rows]}, etag)
+
+
+def summary(args, user, has_etag):
+    group = args.get("group", "project")
+    if group not in GROUP_KEYS:
+        raise ApiError(f"'group' must be one of {', '.join(GROUP_KEYS)}")
+
+    empids, project_ids, start_utc, end_utc = time_filters(args, user, get_permissions(user.empid, user.role))
+    zone = get_zone(user.timezone)
+    fingerprint = Database.get_time_entry_fingerprint(empids, project_ids, start_utc, end_utc)
+    etag = make_etag("summary", group, zone.zone, empids, project_ids, start_utc, end_utc, fingerprint)
+    if has_etag(etag):
+        return ApiResult(None, etag)
+
+    columns = TimeColumns.from_rows(Database.get_report_rows(empids, project_ids, start_utc, end_utc), zone)
+    totals = columns.group_sum(group)
+    return ApiResult({
+        "group": group,
+        "data": [{"label": json_value(label), "minutes": minutes} for label, minutes in totals.items()],
+        "total_minutes": columns.total()
+    }, etag)
+
+
+# path under /api/v1 -> handler, for servers that route by table
+ROUTES = {
+    "/time-entries": time_entries,
+    "/projects": projects,
+    "/summary": summary,
+}
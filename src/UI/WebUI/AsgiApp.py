@@ -0,0 +1,95 @@
+# src/UI/WebUI/AsgiApp.py
+#
+# Async (ASGI) entry point. The read-heavy JSON endpoints (/api/v1, see
+# src/UI/WebUI/ApiCore.py) are served by async Starlette views that await the blocking
+# handlers on AsyncDatabase's thread pool, so a single process can keep hundreds of
+# requests in flight while they wait on MariaDB. The live timer stream (/timer-events, see
+# src/UI/WebUI/TimerEvents.py) is only served here, where it holds no thread per listener;
+# pages served through this app use it instead of polling /timer-status.
+# Every other path is passed through to the Flask app unchanged, and both read the same
+# server-side sessions.
+#
+#   uvicorn src.UI.WebUI.AsgiApp:asgi_app --port 8000
+#
+# Requires starlette and an ASGI server (uvicorn); the Flask app runs without them.
+# Compare against the sync server with tests/BenchmarkApi.py.
+
+import contextlib
+from starlette.applications import Starlette
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+from src.Data.AsyncDatabase import AsyncDatabase
+from src.Data.Database import Database
+from src.Data.Resilience import DB_UNAVAILABLE_ERRORS
+from src.UI.WebUI.ApiCore import ApiError, ROUTES, user_from_session
+from src.UI.WebUI.TimerEvents import stream_async
+from src.UI.WebUI.WebUI import app as flask_app
+from src.Utils.ApiPaging import etag_matches
+from src.Utils.AppLogger import get_logger
+
+logger = get_logger(__name__)
+
+
+def load_session(request):
+    sid = request.cookies.get(flask_app.config["SESSION_COOKIE_NAME"])
+    return flask_app.session_interface.load(sid, flask_app.permanent_session_lifetime.total_seconds())
+
+
+def api_endpoint(handler):
+    async def endpoint(request):
+        if_none_match = request.headers.get("if-none-match")
+
+        def handle():
+            # the session file read is blocking too, so it runs on the pool with the queries
+            session_data = load_session(request)
+            Database.begin_request((session_data or {}).get("last_write_at"))
+            user = user_from_session(session_data)
+            if user is None:
+                return None
+            return handler(request.query_params, user, lambda etag: etag_matches(if_none_match, etag))
+
+        try:
+            result = await AsyncDatabase.run(handle)
+        except ApiError as e:
+            logger.debug("API error %s on %s: %s", e.status, request.url.path, e)
+            return JSONResponse({"error": str(e)}, status_code=e.status)
+        except DB_UNAVAILABLE_ERRORS as e:
+            # the pool thread has already dropped its connection (see src/Data/Resilience.py)
+            logger.warning("Database unavailable on %s: %s", request.url.path, e)
+            return JSONResponse({"error": "Database temporarily unavailable"}, status_code=503,
+                                headers={"Retry-After": str(max(1, round(Database.get_retry_after())))})
+
+        if result is None:
+            return JSONResponse({"error": "Not logged in"}, status_code=401)
+        headers = {"ETag": f'"{result.etag}"'}
+        if result.payload is None:
+            return Response(status_code=304, headers=headers)
+        # clients may keep the body but must revalidate it on every use
+        headers["Cache-Control"] = "private, no-cache"
+        return JSONResponse(result.payload, headers=headers)
+
+    return endpoint
+
+
+async def timer_events(request):
+    user = user_from_session(await AsyncDatabase.run(load_session, request))
+    if user is None:
+        return JSONResponse({"error": "Not logged in"}, status_code=401)
+    return StreamingResponse(stream_async(user.empid, AsyncDatabase.run), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    AsyncDatabase.shutdown()
+
+
+flask_app.config["TIMER_EVENTS_STREAM"] = True
+
+routes = [Route(f"/api/v1{path}", api_endpoint(handler)) for path, handler in ROUTES.items()]
+routes.append(Route("/timer-events", timer_events))
+routes.append(Mount("/", app=WSGIMiddleware(flask_app)))
+
+asgi_app = Starlette(routes=routes, lifespan=lifespan)
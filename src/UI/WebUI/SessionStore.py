@@ -0,0 +1,187 @@
+# src/UI/WebUI/SessionStore.py
+#
+# Server-side Flask sessions kept as small JSON files. The browser cookie only carries a
+# random session id; the data (including the cached user profile, see
+# src/Logic/UserProfile.py) stays on the server, so it can be larger than a cookie and is
+# shared by every worker process on the host.
+#
+# Files are written atomically (temp file + os.replace) and only when the session changed.
+# Expired sessions are removed lazily when read and by an occasional sweep.
+#
+# The directory must be configured (SESSION_DIR) and persistent: a temp directory is
+# emptied on reboot, logging everyone out, and is shared with every other user on the
+# host. It is created, or tightened, to be readable by the server's user only.
+
+import json
+import os
+import secrets
+import tempfile
+import time
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+# Owner-only access for the session directory
+SESSION_DIR_MODE = 0o700
+
+# Sweep expired files roughly once per this many saves
+SWEEP_EVERY = 500
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(session):
+            session.modified = True
+
+        CallbackDict.__init__(self, initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class FileSystemSessionInterface(SessionInterface):
+    def __init__(self, session_dir=None):
+        """
+        Args:
+            session_dir: Where session files are kept (env SESSION_DIR)
+
+        Raises:
+            RuntimeError: If no directory is configured or it belongs to another user
+        """
+        self.session_dir = session_dir or os.getenv("SESSION_DIR")
+        if not self.session_dir:
+            raise RuntimeError("SESSION_DIR is not set; server-side sessions need a persistent directory "
+                               "(e.g. /var/lib/time_tracker/sessions)")
+        self._prepare_dir(self.session_dir)
+        self.__saves = 0
+
+    # ======================
+    # 🔹 File helpers
+    # ======================
+
+    @staticmethod
+    def _prepare_dir(session_dir):
+        # session files carry login state: nobody but the server's user may list or add them
+        os.makedirs(session_dir, mode=SESSION_DIR_MODE, exist_ok=True)
+        info = os.stat(session_dir)
+        if hasattr(os, "getuid") and info.st_uid != os.getuid():
+            raise RuntimeError(f"Session directory {session_dir} belongs to another user")
+        if info.st_mode & 0o777 != SESSION_DIR_MODE:
+            os.chmod(session_dir, SESSION_DIR_MODE)
+
+    def _path(self, sid):
+        return os.path.join(self.session_dir, f"{sid}.json")
+
+    @staticmethod
+    def _valid_sid(sid):
+        # ids come from the cookie; only accept what token_urlsafe produces
+        return bool(sid) and len(sid) <= 128 and all(c.isalnum() or c in "-_" for c in sid)
+
+    def _read(self, sid, lifetime_seconds):
+        path = self._path(sid)
+        try:
+            if time.time() - os.path.getmtime(path) > lifetime_seconds:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, sid, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.session_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, default=str)
+            os.replace(tmp_path, self._path(sid))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _delete(self, sid):
+        try:
+            os.remove(self._path(sid))
+        except OSError:
+            pass
+
+    def sweep_expired(self, lifetime_seconds):
+        """
+        Remove session files that have not been written within the session lifetime.
+        """
+        cutoff = time.time() - lifetime_seconds
+        removed = 0
+        for name in os.listdir(self.session_dir):
+            path = os.path.join(self.session_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def load(self, sid, lifetime_seconds):
+        """
+        Session data for a cookie's session id outside a Flask request (e.g. the async
+        server in src/UI/WebUI/AsgiApp.py), or None if it is missing, invalid or expired.
+        """
+        if not sid or not self._valid_sid(sid):
+            return None
+        return self._read(sid, lifetime_seconds)
+
+    def regenerate(self, session):
+        """
+        Give the session a new id (call on login so a pre-login id cannot be reused).
+        """
+        if not session.new:
+            self._delete(session.sid)
+        session.sid = secrets.token_urlsafe(32)
+        session.modified = True
+
+    # ======================
+    # 🔹 SessionInterface
+    # ======================
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid and self._valid_sid(sid):
+            data = self._read(sid, app.permanent_session_lifetime.total_seconds())
+            if data is not None:
+                return ServerSideSession(data, sid=sid)
+        return ServerSideSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        # cleared (e.g. logout): drop the file and the cookie
+        if not session:
+            if session.modified:
+                self._delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified or session.new:
+            self._write(session.sid, dict(session))
+            self.__saves += 1
+            if self.__saves % SWEEP_EVERY == 0:
+                self.sweep_expired(app.permanent_session_lifetime.total_seconds())
+        elif self.should_set_cookie(app, session):
+            # keep the file's mtime in step with a refreshed cookie
+            try:
+                os.utime(self._path(session.sid), None)
+            except OSError:
+                pass
+
+        expires = self.get_expiration_time(app, session)
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=expires,
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
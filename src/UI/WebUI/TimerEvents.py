@@ -0,0 +1,101 @@
+# src/UI/WebUI/TimerEvents.py
+#
+# Live timer status for the logged-in user as Server-Sent Events (GET /timer-events), for
+# pages that show the timer.
+#
+# Database.start_timer/stop_timer publish on the same-host CacheBus; a stream checks the
+# user's bus stamp about once a second (a stat(), no query) and only when it changes reads
+# the timer from the database and pushes
+#
+#   event: timer
+#   data: {"running": true, "timeid": "t-1a2b3c4d", "project_name": "...", "start_time": "..."}
+#
+# The database is also re-read every DB_RECHECK_SECONDS as a backstop for changes made on
+# another host. Streams end after STREAM_SECONDS and the browser's EventSource reconnects
+# on its own.
+#
+# Only the async server (src/UI/WebUI/AsgiApp.py) streams: there a listener costs no
+# thread and takes a database connection only for the moment of each check. Under plain
+# Flask a stream would hold a worker thread and its connection for minutes per open page,
+# so pages poll GET /timer-status (timer_state as JSON) every STATUS_POLL_SECONDS instead.
+
+import asyncio
+import json
+import time
+from src.Data.Database import Database
+from src.Utils.ApiPaging import json_value
+
+POLL_SECONDS = 1
+HEARTBEAT_SECONDS = 15
+DB_RECHECK_SECONDS = 30
+STREAM_SECONDS = 300
+RECONNECT_MILLISECONDS = 2000
+STATUS_POLL_SECONDS = 10
+
+
+def timer_state(empid):
+    """
+    The user's running timer as a JSON-ready dict, {"running": False} when there is none.
+    """
+    timer = Database.get_active_timer_for_user(empid)
+    if timer is None:
+        return {"running": False}
+    return {
+        "running": True,
+        "timeid": timer.timeid,
+        "project_name": timer.project_name,
+        "start_time": json_value(timer.start_time)
+    }
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class TimerWatch:
+    """
+    Tracks what one stream last sent and decides when to look at the database again.
+    """
+
+    def __init__(self, empid):
+        self.__empid = empid
+        self.__stamp = None
+        self.__state = None
+        self.__checked_at = 0.0
+        self.__sent_at = time.monotonic()
+
+    def poll(self):
+        """
+        Returns:
+            the next chunk to send (an event or a heartbeat comment), or None
+        """
+        now = time.monotonic()
+        stamp = Database.get_timer_stamp(self.__empid)
+        if stamp != self.__stamp or now - self.__checked_at > DB_RECHECK_SECONDS:
+            self.__stamp = stamp
+            self.__checked_at = now
+            state = timer_state(self.__empid)
+            if state != self.__state:
+                self.__state = state
+                self.__sent_at = now
+                return format_event("timer", state)
+
+        if now - self.__sent_at > HEARTBEAT_SECONDS:
+            self.__sent_at = now
+            return ": keep-alive\n\n"
+        return None
+
+
+async def stream_async(empid, run):
+    """
+    Event stream for an async server; the first chunk is the current state. run awaits a
+    blocking call off the event loop (AsyncDatabase.run).
+    """
+    watch = TimerWatch(empid)
+    deadline = time.monotonic() + STREAM_SECONDS
+    yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+    while time.monotonic() < deadline:
+        chunk = await run(watch.poll)
+        if chunk:
+            yield chunk
+        await asyncio.sleep(POLL_SECONDS)
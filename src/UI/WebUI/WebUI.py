@@ -1,29 +1,62 @@
+import atexit
+import os
 import random
-import pytz
-from flask import Flask, render_template, request, redirect, session, url_for, flash, abort
+from flask import Flask, Response, jsonify, render_template, request, redirect, session, url_for, flash, abort, g
 from functools import wraps
 from src.Logic.TimeEntry import TimeEntry
 from src.Data.Database import Database
+from src.Data.Resilience import DB_UNAVAILABLE_ERRORS
 from src.Logic.Login import Login
 from src.Logic.Employee import Employee
 from src.Logic.Project import Project
-from datetime import datetime, timezone
+from src.Logic.Reporting import TimeColumns, iso_week_label, parse_iso_week
+from src.Logic.UserProfile import build_profile, profile_is_stale, permissions_from_profile
+from src.UI.WebUI.SessionStore import FileSystemSessionInterface
+from src.UI.WebUI.Api import api
+from src.UI.WebUI.TimerEvents import STATUS_POLL_SECONDS, timer_state
+from datetime import datetime, timezone, timedelta
+from src.Utils.AppLogger import get_logger
+from src.Utils.TimeZones import get_zone, today_in, local_to_utc, local_day_range
 import uuid
 
+logger = get_logger(__name__)
 
-# helper function to normalize minutes column in entries
-def normalize_minutes_column(entries, minute_index):
+
+# helper function to normalize total_minutes in time entry rows (NULL for running timers -> 0)
+def normalize_minutes(entries):
     normalized = []
     for entry in entries:
-        entry = list(entry)
         try:
-            entry[minute_index] = int(entry[minute_index])
+            minutes = int(entry.total_minutes)
         except (ValueError, TypeError):
-            entry[minute_index] = 0
-        normalized.append(tuple(entry))
+            minutes = 0
+        normalized.append(entry._replace(total_minutes=minutes))
     return normalized
 
 
+# the user's time zone as reported by their browser (see /set-timezone)
+def current_zone():
+    return get_zone(session.get("timezone"))
+
+
+# the logged-in user's profile snapshot from the server-side session, rebuilt when stale
+def current_profile():
+    empid = session.get("empid")
+    role = session.get("emp_role")
+    profile = session.get("profile")
+    if profile_is_stale(profile, empid, role, Database.get_permissions_version()):
+        profile = build_profile(empid, role)
+        session["profile"] = profile
+    return profile
+
+
+# the logged-in user's permission set, resolved once per request from their profile
+def current_permissions():
+    if "permissions" not in g:
+        g.permissions = permissions_from_profile(current_profile())
+    return g.permissions
+
+
 # creates a decorator to check if user is logged in
 def login_required(f):
     @wraps(f)
@@ -37,6 +70,59 @@ def login_required(f):
 
 app = Flask(__name__)
 app.secret_key = "supersecretkey"
+app.session_interface = FileSystemSessionInterface()
+app.register_blueprint(api)
+
+# the local journal always runs, so timer writes journaled by an earlier run while the
+# database was down are replayed; with TIMER_WRITE_BEHIND=1 every timer write goes through
+# it and is committed in batches (see src/Data/WriteBehind.py)
+replayed = Database.start_journal()
+if replayed:
+    logger.warning("Replaying %d journaled timer writes from a previous run", replayed)
+if os.getenv("TIMER_WRITE_BEHIND") == "1":
+    Database.enable_write_behind()
+atexit.register(Database.stop_journal)
+
+
+# the database is down or the connection dropped: the thread reconnects on its next request
+# (see src/Data/Resilience.py), so ask the client to come back shortly instead of a 500
+def database_unavailable(error):
+    logger.warning("Database unavailable on %s: %s", request.path, error)
+    Database.discard_connection()
+    retry_after = max(1, round(Database.get_retry_after()))
+    if request.path.startswith("/api/"):
+        response = jsonify({"error": "Database temporarily unavailable"})
+    else:
+        response = Response("The database is temporarily unavailable. Please try again in a few seconds.",
+                            mimetype="text/plain")
+    response.status_code = 503
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+
+for error_type in DB_UNAVAILABLE_ERRORS:
+    app.register_error_handler(error_type, database_unavailable)
+
+
+# read-your-writes with a read replica (see src/Data/ReadRouting.py): remember in the
+# session when this user last wrote, so their next reports come from the primary
+@app.before_request
+def route_reads():
+    Database.begin_request(session.get("last_write_at"))
+
+
+@app.after_request
+def remember_last_write(response):
+    wrote_at = Database.last_write_at()
+    if wrote_at is not None:
+        session["last_write_at"] = wrote_at
+    return response
+
+
+# connections are checked out per request, not per thread (see src/Data/ConnectionPool.py)
+@app.teardown_request
+def release_connection(error):
+    Database.release_connection()
 
 @app.route("/set-timezone", methods=["POST"])
 def set_timezone():
@@ -59,27 +145,18 @@ def format_minutes(total_minutes):
     return f"{hours}hr {remainder}min"
 
 
+# the header's stop button starts from the session, without a query per render. Pages that
+# show a timer (the header's stop button while one runs, and Log Time) keep it current when
+# it is started or stopped in another tab or device: through /timer-events when the async
+# server set TIMER_EVENTS_STREAM (src/UI/WebUI/AsgiApp.py), otherwise by polling /timer-status
 @app.context_processor
 def inject_timer_state():
-    timer_running = False
-    log_timer_url = None
-
-    try:
-        timer_id = session.get("active_timer_id") or request.cookies.get("active_timer_id")
-
-        if timer_id:
-            timer = Database.get_timer_by_timeid(timer_id)
-            if timer:
-                # If using a tuple (e.g. fetch_one), check stop_time by index
-                stop_time = timer[2]  # assuming STOP_TIME is 3rd column
-                if stop_time is None:
-                    timer_running = True
-                    log_timer_url = url_for("log_time")
-
-    except Exception as e:
-        print(f"❌ inject_timer_state error: {e}")
-
-    return dict(timer_running=timer_running, log_timer_url=log_timer_url)
+    timer_running = bool(session.get("active_timer_id"))
+    log_timer_url = url_for("log_time") if timer_running else None
+    return dict(timer_running=timer_running, log_timer_url=log_timer_url,
+                shows_timer=timer_running or request.endpoint == "log_time",
+                timer_events_stream=app.config.get("TIMER_EVENTS_STREAM", False),
+                timer_poll_ms=STATUS_POLL_SECONDS * 1000)
 
 
 @app.route("/")
@@ -90,6 +167,7 @@ def home():
     role = session.get("emp_role", "user")  # default to user if missing
 
     menu_choices = {
+        "/timesheet": "My Timesheet",
         "/report": "View Time Report",
         "/log-time": "Log Time"
     }
@@ -154,29 +232,26 @@ def filter_report():
     if emp_role == "individual":
         empid = session_empid
         entries = TimeEntry.get_time_entries_filtered(empid, start, end)
-        entries = normalize_minutes_column(entries, 7)
+        entries = normalize_minutes(entries)
         employees = []
 
     elif emp_role == "manager":
-        managed = Database.get_employees_managed_by(session_empid)
-        dptid = Database.get_department_of_employee(session_empid)
-        in_dept = Database.get_employees_in_department(dptid)
-        all_ids = list(set(managed + in_dept + [session_empid]))
+        visible_ids = current_permissions().get_visible_empids()
 
         # Apply filter only if selected empid is in allowed list
-        if empid and empid in all_ids:
+        if empid and empid in visible_ids:
             filtered_ids = [empid]
         else:
-            filtered_ids = all_ids
+            filtered_ids = list(visible_ids)
 
         entries = TimeEntry.get_entries_for_empids(filtered_ids, start, end)
-        entries = normalize_minutes_column(entries, 7)
-        employees = [emp for emp in TimeEntry.get_all_employees() if emp[0] in all_ids]
-        print(entries[0])
+        entries = normalize_minutes(entries)
+        employees = [emp for emp in TimeEntry.get_all_employees() if emp.empid in visible_ids]
+        logger.debug("Manager report: %d entries for %d employees", len(entries), len(filtered_ids))
 
     else:  # future: customize for other roles like admin/project_manager
         entries = TimeEntry.get_time_entries_filtered(empid, start, end)
-        entries = normalize_minutes_column(entries, 7)
+        entries = normalize_minutes(entries)
         employees = TimeEntry.get_all_employees()
 
     return render_template("report.html",
@@ -226,21 +301,18 @@ def login():
         if not login_record or login_record.get_password() != password:
             return "❌ Invalid email or password."
 
+        app.session_interface.regenerate(session)
         session["empid"] = login_record.get_empid()
         session["emp_role"] = login_record.get_role()
 
-        employee = Database.get_employee_by_empid(session["empid"])
-        session["first_name"] = employee[1]
+        profile = build_profile(session["empid"], session["emp_role"])
+        session["profile"] = profile
+        session["first_name"] = profile["first_name"]
 
         active_timer = Database.get_active_timer_for_user(session["empid"])
         if active_timer:
-            timeid = active_timer[0]
-            session["active_timer_id"] = timeid
-            resp = redirect("/")
-            resp.set_cookie("active_timer_id", timeid, max_age=12 * 3600)
-            return resp
+            session["active_timer_id"] = active_timer.timeid
 
-        # Default redirect if no active timer
         return redirect("/")
 
     return render_template("login.html")
@@ -266,11 +338,35 @@ def my_time():
         )
     else:
         entries = TimeEntry.get_time_entries_filtered(empid=empid)
-        entries = normalize_minutes_column(entries, 7)
+    entries = normalize_minutes(entries)
 
     return render_template("myTime.html", entries=entries)
 
 
+@app.route("/timesheet", methods=["GET"])
+@login_required
+def timesheet():
+    empid = session.get("empid")
+    local_tz = current_zone()
+
+    week = request.args.get("week")
+    try:
+        week_start = parse_iso_week(week) if week else None
+    except ValueError:
+        week_start = None
+    if week_start is None:
+        today = today_in(local_tz)
+        week_start = today - timedelta(days=today.weekday())
+
+    sheet = Database.get_weekly_timesheet(empid, week_start, local_tz)
+
+    return render_template("timesheet.html",
+                           sheet=sheet,
+                           week=iso_week_label(week_start),
+                           prev_week=iso_week_label(week_start - timedelta(days=7)),
+                           next_week=iso_week_label(week_start + timedelta(days=7)))
+
+
 # @app.route("/todays-summary")
 # @login_required
 # def todays_summary():
@@ -286,7 +382,7 @@ def my_time():
 #         start_date=today_start.strftime("%Y-%m-%d %H:%M:%S"),
 #         end_date=today_end.strftime("%Y-%m-%d %H:%M:%S")
 #     )
-#     entries = normalize_minutes_column(entries, 7)
+#     entries = normalize_minutes(entries)
 #
 #     # Summarize total time by project
 #     for entry in entries:
@@ -308,31 +404,18 @@ def todays_summary():
     if not empid:
         return redirect("/login")
 
-    # Use user's local timezone (e.g., Pacific Time)
-    local_tz = pytz.timezone("America/Los_Angeles")  # You can make this dynamic later
+    # UTC range of the user's local "today"
+    local_tz = current_zone()
+    today = today_in(local_tz)
+    today_start_utc, tomorrow_start_utc = local_day_range(today, today, local_tz)
 
-    # Get start and end of day in local time
-    now_local = datetime.now(local_tz)
-    today_start_local = local_tz.localize(datetime(now_local.year, now_local.month, now_local.day, 0, 0, 0))
-    today_end_local = local_tz.localize(datetime(now_local.year, now_local.month, now_local.day, 23, 59, 59))
-
-    # Convert to UTC for DB filtering
-    today_start_utc = today_start_local.astimezone(pytz.utc).strftime("%Y-%m-%d %H:%M:%S")
-    today_end_utc = today_end_local.astimezone(pytz.utc).strftime("%Y-%m-%d %H:%M:%S")
-
-    # Query using UTC times
     entries = TimeEntry.get_time_entries_filtered(
         empid=empid,
         start_date=today_start_utc,
-        end_date=today_end_utc
+        end_date=tomorrow_start_utc - timedelta(seconds=1)
     )
-    entries = normalize_minutes_column(entries, 7)
-
-    project_summary = {}
-    for entry in entries:
-        project = entry[3]  # project_name
-        minutes = int(entry[7])
-        project_summary[project] = project_summary.get(project, 0) + minutes
+    entries = normalize_minutes(entries)
+    project_summary = TimeColumns.from_rows(entries).group_sum("project")
 
     return render_template("todaysSummary.html", entries=entries, project_summary=project_summary)
 
@@ -357,7 +440,7 @@ def todays_summary():
 #         start_date=today_start.strftime("%Y-%m-%d %H:%M:%S"),
 #         end_date=today_end.strftime("%Y-%m-%d %H:%M:%S")
 #     )
-#     entries = normalize_minutes_column(entries, 7)
+#     entries = normalize_minutes(entries)
 #
 #     summary = {}
 #     for entry in entries:
@@ -387,48 +470,17 @@ def todays_summary_manager():
         return redirect("/")
 
     empid = session.get("empid")
-    dptid = Database.get_department_of_employee(empid)
-    managed = Database.get_employees_managed_by(empid)
-    in_dept = Database.get_employees_in_department(dptid)
-    all_ids = list(set(managed + in_dept))
-
-    # Get user's local timezone from browser (saved in session or default to Pacific)
-    local_tz_str = session.get("timezone", "America/Los_Angeles")
-    local_tz = pytz.timezone(local_tz_str)
-
-    # Calculate local "today" and convert to UTC for querying
-    local_now = datetime.now(local_tz)
-    local_today_start = local_now.replace(hour=0, minute=0, second=0, microsecond=0)
-    local_today_end = local_now.replace(hour=23, minute=59, second=59, microsecond=999999)
-    utc_today_start = local_today_start.astimezone(pytz.utc).strftime("%Y-%m-%d %H:%M:%S")
-    utc_today_end = local_today_end.astimezone(pytz.utc).strftime("%Y-%m-%d %H:%M:%S")
-
-    today_start_display = local_today_start.strftime("%B %d, %Y")
-
-    entries = TimeEntry.get_entries_for_empids(
-        empids=all_ids,
-        start_date=utc_today_start,
-        end_date=utc_today_end
-    )
-    entries = normalize_minutes_column(entries, 7)
-
-    summary = {}
-    for entry in entries:
-        emp_name = f"{entry[1]} {entry[2]}"  # first + last
-        project = entry[3]
-        minutes = int(entry[7])
-        # summary.setdefault(emp_name, {})[project] = summary[emp_name].get(project, 0) + minutes
-        if emp_name not in summary:
-            summary[emp_name] = {}
-
-        summary[emp_name][project] = summary[emp_name].get(project, 0) + minutes
+    all_ids = list(current_permissions().get_visible_empids())
 
+    # Local "today" in the manager's browser time zone; the database buckets and sums it
+    local_tz = current_zone()
+    today = today_in(local_tz)
+    today_start_display = today.strftime("%B %d, %Y")
 
-    project_totals = {}
-    for entry in entries:
-        project = entry[3]
-        minutes = int(entry[7])
-        project_totals[project] = project_totals.get(project, 0) + minutes
+    rows = Database.get_minutes_by_local_day(today, 1, local_tz, empids=all_ids)
+    columns = TimeColumns.from_rows(rows)
+    summary = columns.pivot("employee", "project").to_nested_dict()
+    project_totals = columns.group_sum("project")
 
     return render_template("managerSummary.html",
                            summary=summary,
@@ -495,27 +547,26 @@ def project_report():
     # Determine view
     view_mode = request.args.get("view", "detailed")
 
+    permissions = current_permissions()
     all_projects = Database.get_all_projects()
-    owned_projects = [p for p in all_projects if Database.get_project_created_by(p[0]) == empid]
-    assigned_ids = Database.get_project_ids_for_employee(empid)
+    owned_projects = [p for p in all_projects if permissions.can_edit_project(p.projectid)]
+    assigned_ids = permissions.get_member_project_ids()
 
     # Team projects = projects they're assigned to but don't own
-    team_projects = [p for p in all_projects if p[0] in assigned_ids and p not in owned_projects]
-    team_ids = [p[0] for p in team_projects]
+    team_projects = [p for p in all_projects if p.projectid in assigned_ids and p not in owned_projects]
+    team_ids = [p.projectid for p in team_projects]
 
     if view_mode == "summary":
-        # Get all projects and relevant user IDs
-        all_projects = Database.get_all_projects()
-        assigned_ids = Database.get_project_ids_for_employee(empid)
-
         # Filter down to team projects: user is assigned AND at least one other member exists
         team_projects = []
-        for pid, name in all_projects:
-            members = Database.get_employees_assigned_to_project(pid)
+        for project in all_projects:
+            if project.projectid not in assigned_ids:
+                continue
+            members = Database.get_employees_assigned_to_project(project.projectid)
             if empid in members and len(members) > 1:
-                team_projects.append((pid, name))
+                team_projects.append(project)
 
-        team_ids = [p[0] for p in team_projects]
+        team_ids = [p.projectid for p in team_projects]
         selected_project = request.args.get("project")
         summary_ids = [selected_project] if selected_project else team_ids
 
@@ -532,12 +583,12 @@ def project_report():
     end = request.args.get("end")
 
     entries = TimeEntry.get_entries_filtered_by_project_ids(
-        project_ids=[p[0] for p in owned_projects],
+        project_ids=[p.projectid for p in owned_projects],
         selected_project=project_filter,
         start=start,
         end=end
     )
-    entries = normalize_minutes_column(entries, 6)
+    entries = normalize_minutes(entries)
 
     return render_template("projectReport.html",
                            view_mode="detailed",
@@ -552,12 +603,13 @@ def project_report():
 @login_required
 def my_projects():
     empid = session.get("empid")
-    all_projects = Database.get_all_projects()  # This returns (PROJECTID, PROJECT_NAME)
+    all_projects = Database.get_all_projects()  # This returns ProjectRow(projectid, project_name)
 
     # Filter to only show user's own projects
+    permissions = current_permissions()
     my_projects = [
         (pid, name) for pid, name in all_projects
-        if Database.get_project_created_by(pid) == empid
+        if permissions.can_edit_project(pid)
     ]
 
     return render_template("myProjects.html", projects=my_projects)
@@ -594,18 +646,18 @@ def manage_projects():
     empid = session.get("empid")
     # all_projects = Database.get_all_projects()
     active_projects = Database.get_active_projects()
-    project_membership = Database.get_project_ids_for_employee(empid)
+    project_membership = current_permissions().get_member_project_ids()
 
     personal = []
     team = []
 
     for pid, name in active_projects:
+        if pid not in project_membership:
+            continue  # skip if not part of project
+
         creator = Database.get_project_created_by(pid)
         members = Database.get_employees_assigned_to_project(pid)
 
-        if empid not in members:
-            continue  # skip if not part of project
-
         if creator == empid and len(members) == 1:
             personal.append((pid, name))
         else:
@@ -614,7 +666,7 @@ def manage_projects():
                 "pid": pid,
                 "name": name,
                 "owner_id": creator,
-                "owner_name": f"{owner[1]} {owner[2]}" if owner else "Unknown"
+                "owner_name": f"{owner.first_name} {owner.last_name}" if owner else "Unknown"
             })
 
     # Sort team: owned first, then others; alphabetically by project name
@@ -633,10 +685,8 @@ def project_summary():
         return redirect("/")
 
     # Get project IDs created or assigned
-    created = [pid for pid, _ in Database.get_all_projects()
-               if Database.get_project_created_by(pid) == empid]
-    assigned = Database.get_project_ids_for_employee(empid)
-    all_project_ids = list(set(created + assigned))
+    permissions = current_permissions()
+    all_project_ids = list(permissions.get_owned_project_ids() | permissions.get_member_project_ids())
 
     start = request.form.get("start")
     end = request.form.get("end")
@@ -651,30 +701,27 @@ def project_summary():
 def project_detail(projectid):
     # basic data for now, reuse existing functions
     project_name = next((name for pid, name in Database.get_all_projects() if pid == projectid), "Unknown Project")
-    entries = TimeEntry.get_entries_filtered_by_project_ids(project_ids=[projectid])
     team = Database.get_employees_assigned_to_project(projectid)
     team_info = [Database.get_employee_by_empid(empid) for empid in team]
 
     start = request.args.get("start")
     end = request.args.get("end")
-    entries = TimeEntry.get_time_entries_filtered(
-        empid=None,
-        start_date=start + " 00:00:00" if start else None,
-        end_date=end + " 23:59:59" if end else None
-    )
     entries = TimeEntry.get_entries_filtered_by_project_ids(
         project_ids=[projectid],
         start=start,
         end=end
     )
-    entries = normalize_minutes_column(entries, 6)
-    print("🔍 Entries for total_minutes:", entries)
+    entries = normalize_minutes(entries)
+    logger.debug("Project %s detail: %d entries", projectid, len(entries))
 
-    total_minutes = sum(int(e[6]) for e in entries)
+    columns = TimeColumns.from_rows(entries, current_zone())
+    total_minutes = columns.total()
+    member_totals = columns.group_sum("employee")
+    daily_totals = columns.group_sum("day")
     owner_id = Database.get_project_created_by(projectid)
     owner = Database.get_employee_by_empid(owner_id)
-    owner_name = f"{owner[1]} {owner[2]}" if owner else "Unknown"
-    is_owner = (session.get("empid") == owner_id)
+    owner_name = f"{owner.first_name} {owner.last_name}" if owner else "Unknown"
+    is_owner = current_permissions().can_edit_project(projectid)
 
     return render_template("projectDetail.html",
                            project_name=project_name,
@@ -682,6 +729,8 @@ def project_detail(projectid):
                            owner_name=owner_name,
                            team=team_info,
                            total_minutes=total_minutes,
+                           member_totals=member_totals,
+                           daily_totals=daily_totals,
                            entries=entries,
                            start=start,
                            end=end,
@@ -690,10 +739,7 @@ def project_detail(projectid):
 @app.route("/edit-project/<projectid>", methods=["GET"])
 @login_required
 def edit_project_view(projectid):
-    empid = session.get("empid")
-    owner_id = Database.get_project_created_by(projectid)
-
-    if empid != owner_id:
+    if not current_permissions().can_edit_project(projectid):
         flash("You do not have permission to edit this project.", "error")
         return redirect(url_for("project_detail", projectid=projectid))
 
@@ -707,7 +753,7 @@ def edit_project_name(projectid):
     empid = session.get("empid")
 
     # Double-check ownership before allowing rename
-    if empid != Database.get_project_created_by(projectid):
+    if not current_permissions().can_edit_project(projectid):
         flash("You do not have permission to edit this project.", "error")
         return redirect(url_for("project_detail", projectid=projectid))
 
@@ -730,30 +776,21 @@ def edit_project_name(projectid):
 def log_time():
     empid = session.get("empid")
 
-    # Check if timer is already running
-    active_timer = Database.get_active_timer_for_user(empid)
-
     if request.method == "POST":
-        print("📬 POST received:", request.form)
+        logger.debug("log_time POST from %s with fields %s", empid, sorted(request.form.keys()))
 
         if request.form.get("manual"):
-            print("📝 Manual entry form detected")
             project_id = request.form.get("project_manual")
             start_time = request.form.get("start_manual")
             stop_time = request.form.get("stop_manual")
             notes = request.form.get("notes_manual")
 
-            print("Raw start:", start_time)
-            print("Raw stop:", stop_time)
-
-            # start_dt = datetime.strptime(start_time, "%Y-%m-%dT%H:%M")
-            # stop_dt = datetime.strptime(stop_time, "%Y-%m-%dT%H:%M")
-            pacific = pytz.timezone("America/Los_Angeles")
-            start_local = pacific.localize(datetime.strptime(start_time, "%Y-%m-%dT%H:%M"))
-            stop_local = pacific.localize(datetime.strptime(stop_time, "%Y-%m-%dT%H:%M"))
+            logger.debug("Manual entry: start=%s stop=%s", start_time, stop_time)
 
-            start_dt = start_local.astimezone(pytz.utc).replace(tzinfo=None)
-            stop_dt = stop_local.astimezone(pytz.utc).replace(tzinfo=None)
+            # form times are in the user's local zone; store UTC
+            local_tz = current_zone()
+            start_dt = local_to_utc(datetime.strptime(start_time, "%Y-%m-%dT%H:%M"), local_tz)
+            stop_dt = local_to_utc(datetime.strptime(stop_time, "%Y-%m-%dT%H:%M"), local_tz)
 
             timeid = f"t-{uuid.uuid4().hex[:8]}"
             manual_entry = TimeEntry(
@@ -771,38 +808,53 @@ def log_time():
             # flash("✅ Manual time entry added.", "success")
             return redirect(url_for("my_time"))
 
-        # Regular timer entry
-        elif not active_timer:
-            project_id = request.form.get("project_id")
-            notes = request.form.get("notes", "")
-            timeid = f"t-{uuid.uuid4().hex[:8]}"
-
-            Database.start_time_entry(
-                timeid=timeid,
+        # Regular timer entry: one atomic insert. The form's timeid makes a resubmit a no-op,
+        # and a start from a second tab gets the already running timer back.
+        elif request.form.get("project_id"):
+            timeid = request.form.get("timeid")
+            result = Database.start_timer(
                 empid=empid,
-                projectid=project_id,
-                start_time=datetime.now(),
-                notes=notes
+                projectid=request.form.get("project_id"),
+                notes=request.form.get("notes", ""),
+                timeid=timeid if timeid and len(timeid) <= 20 else None
             )
 
-            session["active_timer_id"] = timeid
-            flash("⏱️ Timer started!", "success")
-            resp = redirect(url_for("log_time"))
-            resp.set_cookie("active_timer_id", timeid, max_age=12 * 3600)
-            return resp
+            session["active_timer_id"] = result.timeid
+            if result.changed:
+                flash("⏱️ Timer started!", "success")
+            else:
+                flash("⏱️ A timer is already running.", "info")
+            return redirect(url_for("log_time"))
+
+    # GET method — fetch data for view, and bring the session in line with the running timer
+    # (it may have been started or stopped from another device)
+    active_timer = Database.get_active_timer_for_user(empid)
+    if active_timer:
+        session["active_timer_id"] = active_timer.timeid
+    else:
+        session.pop("active_timer_id", None)
 
-    # GET method — fetch data for view
     projects = Project.get_projects_for_user(empid)
-    return render_template("logTime.html", projects=projects, active_timer=active_timer)
+    return render_template("logTime.html", projects=projects, active_timer=active_timer,
+                           new_timeid=f"t-{uuid.uuid4().hex[:8]}")
 
 @app.route("/stop-timer", methods=["POST"])
 @login_required
 def stop_timer():
     empid = session.get("empid")
-    Database.stop_time_entry(empid)
+    # stop the timer the button was shown for, so a resubmit cannot stop a newer one
+    Database.stop_timer(empid, request.form.get("timeid") or None)
     session.pop("active_timer_id", None)
     return redirect("/my-time")
 
+
+@app.route("/timer-status")
+@login_required
+def timer_status():
+    response = jsonify(timer_state(session["empid"]))
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
 # @app.route("/flag-time-entry", methods=["POST"])
 # @login_required
 # def flag_time_entry():
@@ -828,6 +880,7 @@ def toggle_flag():
 def logout():
     session.clear()
     resp = redirect("/login")
+    # clear the timer cookie older versions set
     resp.delete_cookie("active_timer_id")
     return resp
 
@@ -0,0 +1,114 @@
+# src/Utils/ApiPaging.py
+#
+# Helpers for the JSON API (src/UI/WebUI/Api.py) that do not depend on Flask:
+#   - opaque keyset cursors for paging through time entries
+#   - ?fields= selection and JSON-ready values for row NamedTuples
+#   - ETags built from cheap fingerprints of the data behind a response
+
+import base64
+import hashlib
+import json
+from datetime import datetime, date, timezone
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(start_time, timeid):
+    """
+    Cursor pointing just after the row (start_time, timeid).
+    """
+    raw = json.dumps([start_time.isoformat(), timeid]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    Inverse of encode_cursor().
+
+    Returns:
+        (start_time, timeid)
+
+    Raises:
+        ValueError: if the token was not produced by encode_cursor()
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        start_time, timeid = json.loads(raw.decode("utf-8"))
+        return datetime.fromisoformat(start_time), str(timeid)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor '{token}'") from e
+
+
+def parse_page_size(value):
+    """
+    ?limit= as an int between 1 and MAX_PAGE_SIZE (DEFAULT_PAGE_SIZE if missing).
+    """
+    if not value:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(value), MAX_PAGE_SIZE))
+
+
+def parse_fields(value, allowed):
+    """
+    Resolve ?fields=a,b against the fields a row type has.
+
+    Args:
+        value: The raw parameter, or None/"" for every field
+        allowed: The row type's _fields
+
+    Returns:
+        tuple of field names, in the order requested
+
+    Raises:
+        ValueError: on an unknown field
+    """
+    if not value:
+        return tuple(allowed)
+    fields = tuple(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s) {', '.join(unknown)}, expected any of {', '.join(allowed)}")
+    return fields
+
+
+def json_value(value):
+    # the database stores naive UTC datetimes
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def select_fields(row, fields):
+    """
+    The chosen fields of a row NamedTuple as a JSON-ready dict.
+    """
+    return {name: json_value(getattr(row, name)) for name in fields}
+
+
+def etag_matches(if_none_match, etag):
+    """
+    True if an If-None-Match header value lists etag (or is "*"). Weak and strong forms match.
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+def make_etag(*parts):
+    """
+    Strong ETag value for a response determined by parts (fingerprints, filters, user).
+    """
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
@@ -0,0 +1,79 @@
+# src/Utils/AppLogger.py
+#
+# Shared logging setup. Each module asks for its own logger:
+#
+#     from src.Utils.AppLogger import get_logger
+#     logger = get_logger(__name__)
+#     logger.debug("Saving time entry %s", timeid)
+#
+# Pass values as arguments instead of building f-strings so the message is only formatted
+# when the record is actually emitted. The level comes from LOG_LEVEL in .env (default WARNING),
+# so debug records cost a single level check in normal use.
+
+import logging
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+ROOT_LOGGER_NAME = "timetracker"
+DEFAULT_LEVEL = "WARNING"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_configured = False
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Standard formatter that also appends any fields passed with extra={"fields": {...}}
+    as key=value pairs, e.g. logger.info("Timer stopped", extra={"fields": {"timeid": timeid}})
+    """
+
+    def format(self, record):
+        message = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            message += " " + " ".join(f"{key}={value!r}" for key, value in fields.items())
+        return message
+
+
+def configure_logging(level=None):
+    """
+    Set up the shared timetracker logger once. Safe to call more than once.
+
+    Args:
+        level: Level name or number; defaults to the LOG_LEVEL environment variable
+    """
+    global _configured
+
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    level = level or os.getenv("LOG_LEVEL", DEFAULT_LEVEL)
+    if isinstance(level, str):
+        level = logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.getLevelName(DEFAULT_LEVEL)
+    root.setLevel(level)
+
+    if not _configured:
+        handler = logging.StreamHandler()
+        handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+        root.addHandler(handler)
+        root.propagate = False
+        _configured = True
+
+    return root
+
+
+def get_logger(name):
+    """
+    Return a per-module logger under the shared timetracker logger.
+
+    Args:
+        name: Usually __name__ of the calling module
+
+    Returns:
+        logging.Logger
+    """
+    if not _configured:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
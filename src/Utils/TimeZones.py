@@ -0,0 +1,99 @@
+# src/Utils/TimeZones.py
+#
+# Shared time zone helpers. Times are stored in the database as naive UTC; users see them in
+# the zone their browser reports (session["timezone"], set by /set-timezone).
+#
+# Zone objects are cached, so a request pays for pytz.timezone() at most once per zone per
+# process, and local day ranges are turned into UTC boundaries once so the database can do
+# the day bucketing (see Database.get_minutes_by_local_day).
+
+from datetime import datetime, timedelta
+from functools import lru_cache
+import pytz
+
+DEFAULT_TIMEZONE = "America/Los_Angeles"
+
+
+@lru_cache(maxsize=64)
+def get_zone(name=None):
+    """
+    Cached pytz zone for a name. Unknown or missing names fall back to DEFAULT_TIMEZONE,
+    since the name usually comes straight from the browser.
+
+    Args:
+        name: IANA zone name, e.g. "America/New_York"
+
+    Returns:
+        pytz timezone
+    """
+    try:
+        return pytz.timezone(name or DEFAULT_TIMEZONE)
+    except pytz.UnknownTimeZoneError:
+        return pytz.timezone(DEFAULT_TIMEZONE)
+
+
+def as_zone(tz):
+    """
+    Accept either a zone name or a pytz zone.
+    """
+    return get_zone(tz) if tz is None or isinstance(tz, str) else tz
+
+
+def today_in(tz):
+    """
+    Today's local date in the given zone.
+    """
+    return datetime.now(as_zone(tz)).date()
+
+
+def local_to_utc(local_dt, tz):
+    """
+    Convert a naive local datetime (e.g. from a datetime-local form field) to naive UTC
+    for storing in the database.
+    """
+    return as_zone(tz).localize(local_dt).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def utc_to_local(utc_dt, tz):
+    """
+    Convert a naive UTC datetime from the database to an aware local datetime.
+    """
+    return pytz.utc.localize(utc_dt).astimezone(as_zone(tz))
+
+
+def day_boundaries(first_day, num_days, tz):
+    """
+    Naive UTC instants at local midnight for first_day and each following day, plus the
+    midnight that ends the last day (num_days + 1 values). Each day is computed on its own,
+    so days either side of a DST change get the right offset.
+
+    Args:
+        first_day: Local date of the first day
+        num_days: Number of days covered
+        tz: Zone name or pytz zone
+
+    Returns:
+        list of datetime
+    """
+    zone = as_zone(tz)
+    boundaries = []
+    for i in range(num_days + 1):
+        day = first_day + timedelta(days=i)
+        local_midnight = zone.localize(datetime(day.year, day.month, day.day))
+        boundaries.append(local_midnight.astimezone(pytz.utc).replace(tzinfo=None))
+    return boundaries
+
+
+def local_day_range(first_day, last_day, tz):
+    """
+    UTC range [start, end) covering the local dates first_day through last_day inclusive.
+
+    Returns:
+        (start, end) as naive UTC datetimes
+    """
+    zone = as_zone(tz)
+    start = zone.localize(datetime(first_day.year, first_day.month, first_day.day))
+    after = last_day + timedelta(days=1)
+    end = zone.localize(datetime(after.year, after.month, after.day))
+    return (start.astimezone(pytz.utc).replace(tzinfo=None),
+            end.astimezone(pytz.utc).replace(tzinfo=None))
@@ -0,0 +1,103 @@
+# tests/BenchmarkApi.py
+#
+# Load test comparing the sync Flask server with the async server (src/UI/WebUI/AsgiApp.py)
+# on the same JSON API request. Both servers read the same server-side sessions, so one
+# login works for both.
+#
+#   # terminal 1: sync server, one process with a few threads
+#   flask --app src.UI.WebUI.WebUI run --port 5000 --with-threads
+#   # terminal 2: async server, one process
+#   uvicorn src.UI.WebUI.AsgiApp:asgi_app --port 8000
+#   # terminal 3
+#   python tests/BenchmarkApi.py --email you@example.com --password secret \
+#       --path "/api/v1/summary?start=2025-05-01&end=2025-05-31" \
+#       http://127.0.0.1:5000 http://127.0.0.1:8000
+#
+# Every request opens its own connection (like independent dashboard clients) and asks
+# for a full body (no If-None-Match). Prints throughput and latency percentiles per server.
+
+import argparse
+import asyncio
+import time
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+
+def login(base_url, email, password):
+    """
+    Log in through the HTML form and return the session cookie value.
+    """
+    jar = CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    data = urllib.parse.urlencode({"email": email, "password": password}).encode("utf-8")
+    opener.open(f"{base_url}/login", data=data, timeout=30).read()
+    for cookie in jar:
+        if cookie.name == "session":
+            return cookie.value
+    raise SystemExit("❌ Login failed: no session cookie returned")
+
+
+async def fetch(host, port, path, cookie):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write((f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                  f"Cookie: session={cookie}\r\nConnection: close\r\n\r\n").encode("ascii"))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b" ", 2)[1])
+
+
+async def run_load(base_url, path, cookie, total, concurrency):
+    parsed = urllib.parse.urlsplit(base_url)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                status = await fetch(parsed.hostname, parsed.port or 80, path, cookie)
+            except (OSError, ValueError, IndexError):
+                status = None
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started, sorted(latencies), errors
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare API throughput of the sync and async servers")
+    parser.add_argument("urls", nargs="+", help="Base URLs of the servers to compare")
+    parser.add_argument("--path", default="/api/v1/summary", help="API path and query to request")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    cookie = login(args.urls[0], args.email, args.password)
+
+    print(f"{args.requests} requests of {args.path}, {args.concurrency} concurrent\n")
+    print(f"{'server':<28}{'ok':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for url in args.urls:
+        elapsed, latencies, errors = asyncio.run(run_load(url, args.path, cookie, args.requests, args.concurrency))
+        print(f"{url:<28}{len(latencies):>7}{errors:>8}{len(latencies) / elapsed:>9.1f}"
+              f"{percentile(latencies, 0.50) * 1000:>9.1f}{percentile(latencies, 0.95) * 1000:>9.1f}"
+              f"{percentile(latencies, 0.99) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
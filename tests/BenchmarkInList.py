@@ -0,0 +1,75 @@
+# tests/BenchmarkInList.py
+#
+# Finds the list length at which matching IDs through a temporary table beats an
+# IN (?, ?, ...) list, to set IN_LIST_TEMP_TABLE_THRESHOLD (src/Data/Database.py).
+#
+#   python tests/BenchmarkInList.py --sizes 16 64 256 1024 4096 --repeat 20
+#
+# Uses the database from .env. Each size is timed with both strategies on the same
+# Database query; lists are the real EMPIDs (or PROJECTIDs) padded with IDs that match
+# nothing, so every size returns the same rows and only the filter cost differs.
+
+import argparse
+import statistics
+import time
+import src.Data.Database as database_module
+from src.Data.Database import Database
+
+QUERIES = {
+    # COUNT + MAX over the filter: isolates the cost of the IN list itself
+    "fingerprint": lambda ids: Database.get_time_entry_fingerprint(empids=ids),
+    # full rows, as the manager report reads them
+    "entries": lambda ids: Database.get_time_entries_filtered_multiple_empids(ids),
+    "project-summary": lambda ids: Database.get_project_summary(ids),
+}
+
+
+def id_list_of_size(real_ids, size):
+    padding = [f"zz-{i:06d}" for i in range(max(0, size - len(real_ids)))]
+    return (list(real_ids) + padding)[:size]
+
+
+def time_query(query, ids, threshold, repeat):
+    database_module.IN_LIST_TEMP_TABLE_THRESHOLD = threshold
+    query(ids)  # warm up: prepare statements, create the temporary table
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        query(ids)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare IN lists with temporary-table joins")
+    parser.add_argument("--query", choices=sorted(QUERIES), default="fingerprint")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 256, 512, 1024, 2048, 4096])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    query = QUERIES[args.query]
+    if args.query == "project-summary":
+        real_ids = [project.projectid for project in Database.get_all_projects()]
+    else:
+        real_ids = [employee.empid for employee in Database.get_active_employees()]
+
+    print(f"{args.query}: median of {args.repeat} runs, {len(real_ids)} real IDs per list\n")
+    print(f"{'ids':>7}{'IN list ms':>13}{'temp table ms':>16}  faster")
+    crossover = None
+    for size in args.sizes:
+        ids = id_list_of_size(real_ids, size)
+        in_list_seconds = time_query(query, ids, threshold=size, repeat=args.repeat)
+        temp_table_seconds = time_query(query, ids, threshold=0, repeat=args.repeat)
+        faster = "temp table" if temp_table_seconds < in_list_seconds else "IN list"
+        if faster == "temp table" and crossover is None:
+            crossover = size
+        print(f"{size:>7}{in_list_seconds * 1000:>13.2f}{temp_table_seconds * 1000:>16.2f}  {faster}")
+
+    if crossover is None:
+        print("\nIN lists were faster at every size; raise IN_LIST_TEMP_TABLE_THRESHOLD above the largest size")
+    else:
+        print(f"\nTemporary tables win from about {crossover} IDs; set IN_LIST_TEMP_TABLE_THRESHOLD just below it")
+
+
+if __name__ == "__main__":
+    main()
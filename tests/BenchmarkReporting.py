@@ -0,0 +1,82 @@
+# tests/BenchmarkReporting.py
+#
+# Times TimeColumns (src/Logic/Reporting.py) against the per-row dict loop the summary
+# pages used before, on synthetic ReportRows, to check that loading and pivoting stay
+# cheap as reports grow.
+#
+#   python tests/BenchmarkReporting.py --sizes 1000 10000 100000 --repeat 5
+#
+# Needs no database. Run it once with numpy installed and once without to compare the
+# vectorized and pure Python paths of Reporting.py.
+
+import argparse
+import random
+import statistics
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+import pytz
+import src.Logic.Reporting as reporting
+from src.Logic.Reporting import TimeColumns
+from src.Data.RowModels import ReportRow
+
+TIMEZONE = pytz.timezone("America/Los_Angeles")
+
+
+def make_report_rows(count, employees=200, projects=50, days=90, seed=1):
+    rng = random.Random(seed)
+    first_day = datetime(2025, 1, 1)
+    rows = []
+    for _ in range(count):
+        emp = rng.randrange(employees)
+        project = rng.randrange(projects)
+        start = first_day + timedelta(days=rng.randrange(days), seconds=rng.randrange(86400))
+        rows.append(ReportRow(f"E{emp:04d}", f"Employee {emp}", f"D{emp % 8:02d}", f"Department {emp % 8}",
+                              f"P{project:03d}", f"Project {project}", start, rng.randrange(5, 480)))
+    return rows
+
+
+def per_row_pivot(rows):
+    # the nested dict updates TimeColumns replaced
+    pivot = defaultdict(lambda: defaultdict(int))
+    by_day = defaultdict(int)
+    for row in rows:
+        pivot[row.employee_name][row.project_name] += row.total_minutes
+        by_day[pytz.utc.localize(row.start_time).astimezone(TIMEZONE).date()] += row.total_minutes
+    return pivot, by_day
+
+
+def columnar_pivot(rows):
+    columns = TimeColumns.from_rows(rows, TIMEZONE)
+    return columns.pivot("employee", "project"), columns.group_sum("day")
+
+
+def time_call(function, rows, repeat):
+    function(rows)  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(rows)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare columnar report grouping with per-row dict updates")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    numpy_state = "with numpy" if reporting.np is not None else "without numpy"
+    print(f"employee x project pivot + local day totals, median of {args.repeat} runs, {numpy_state}\n")
+    print(f"{'rows':>9}{'per row ms':>13}{'columns ms':>13}  speedup")
+    for size in args.sizes:
+        rows = make_report_rows(size)
+        per_row_seconds = time_call(per_row_pivot, rows, args.repeat)
+        columnar_seconds = time_call(columnar_pivot, rows, args.repeat)
+        print(f"{size:>9}{per_row_seconds * 1000:>13.2f}{columnar_seconds * 1000:>13.2f}"
+              f"  {per_row_seconds / columnar_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from src.Utils.ApiPaging import (
+    encode_cursor, decode_cursor, parse_page_size, parse_fields, select_fields, make_etag, etag_matches, MAX_PAGE_SIZE
+)
+from src.Data.RowModels import ProjectRow, TimeEntryRecordRow
+from datetime import datetime
+import pytest
+
+def test_cursor_round_trip():
+    start = datetime(2025, 5, 20, 13, 45, 0)
+    token = encode_cursor(start, "T00042")
+
+    assert "=" not in token
+    assert decode_cursor(token) == (start, "T00042")
+
+def test_bad_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+def test_page_size_is_clamped():
+    assert parse_page_size(None) == 100
+    assert parse_page_size("0") == 1
+    assert parse_page_size("100000") == MAX_PAGE_SIZE
+
+def test_fields_default_to_all_and_keep_requested_order():
+    assert parse_fields(None, ProjectRow._fields) == ("projectid", "project_name")
+    assert parse_fields("project_name, projectid,project_name", ProjectRow._fields) == ("project_name", "projectid")
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError):
+        parse_fields("projectid,password", ProjectRow._fields)
+
+def test_select_fields_serializes_datetimes_as_utc():
+    row = TimeEntryRecordRow("T1", "E1", "Ann Lee", "P1", "Apollo",
+                             datetime(2025, 5, 20, 13, 0), None, None, "notes", 0, 0)
+
+    assert select_fields(row, ("timeid", "start_time", "stop_time")) == {
+        "timeid": "T1", "start_time": "2025-05-20T13:00:00+00:00", "stop_time": None
+    }
+
+def test_etag_changes_with_fingerprint():
+    assert make_etag("time-entries", (10, datetime(2025, 5, 20))) == make_etag("time-entries", (10, datetime(2025, 5, 20)))
+    assert make_etag("time-entries", (10, datetime(2025, 5, 20))) != make_etag("time-entries", (11, datetime(2025, 5, 20)))
+
+def test_etag_matches_if_none_match_forms():
+    assert etag_matches('"abc"', "abc")
+    assert etag_matches('W/"abc", "def"', "def")
+    assert etag_matches("*", "abc")
+    assert not etag_matches('"abc"', "abd")
+    assert not etag_matches(None, "abc")
@@ -0,0 +1,28 @@
+from src.Data.AsyncDatabase import _AsyncDatabase
+import asyncio
+import threading
+import time
+
+def test_run_offloads_to_pool_thread():
+    db = _AsyncDatabase(pool_size=2)
+
+    assert asyncio.run(db.run(threading.get_ident)) != threading.get_ident()
+    db.shutdown()
+
+def test_blocking_calls_overlap():
+    db = _AsyncDatabase(pool_size=4)
+
+    async def four_calls():
+        await asyncio.gather(*(db.run(time.sleep, 0.2) for _ in range(4)))
+
+    started = time.perf_counter()
+    asyncio.run(four_calls())
+
+    assert time.perf_counter() - started < 0.6
+    db.shutdown()
+
+def test_database_methods_are_awaitable():
+    db = _AsyncDatabase(pool_size=1)
+
+    assert asyncio.iscoroutinefunction(db.get_report_rows)
+    db.shutdown()
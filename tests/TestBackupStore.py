@@ -0,0 +1,147 @@
+import io
+import json
+import os
+import sys
+import time
+import zlib
+import pytest
+
+# the backup and restore scripts import each other by file name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "Data", "DB Nuke & Pave Files",
+                                "Copy and Restore DB"))
+
+import BackupStore
+from BackupStore import (chunk_path, collect_garbage, delete_manifest, ingest_backup, iter_chunks, list_manifests,
+                         load_manifest, materialize_backup, store_chunk, table_checksum, verify_backup)
+
+def table_lines(count, start=0):
+    return [json.dumps({"EMPID": f"E{i:05d}", "MINUTES": i % 480}).encode() + b"\n" for i in range(start, start + count)]
+
+@pytest.fixture
+def backup_dir(tmp_path):
+    # a small data backup: two table files with one row per line, and its metadata
+    directory = tmp_path / "time_tracker_data_backup_20261019_120000"
+    directory.mkdir()
+    (directory / "time.json").write_bytes(b"".join(table_lines(2000)))
+    (directory / "department.json").write_bytes(b"".join(table_lines(20)))
+    (directory / "backup_metadata.json").write_text(json.dumps({"backup_type": "full"}))
+    return directory
+
+@pytest.fixture
+def store_dir(tmp_path):
+    return str(tmp_path / "backup_store")
+
+def test_chunks_end_on_lines_and_rebuild_the_file():
+    data = b"".join(table_lines(2000))
+
+    chunks = list(iter_chunks(io.BytesIO(data)))
+
+    assert b"".join(chunks) == data
+    assert len(chunks) > 1
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+def test_inserted_row_only_changes_the_chunk_it_lands_in():
+    lines = table_lines(2000)
+    before = set(iter_chunks(io.BytesIO(b"".join(lines))))
+
+    lines.insert(1000, b'{"EMPID": "E99999", "MINUTES": 1}\n')
+    after = set(iter_chunks(io.BytesIO(b"".join(lines))))
+
+    assert len(after - before) <= 2
+    assert len(before - after) <= 2
+
+def test_chunks_are_cut_at_the_size_limit(monkeypatch):
+    monkeypatch.setattr(BackupStore, "MAX_CHUNK_BYTES", 100)
+    # no line ends a chunk by its hash
+    lines = [line for line in table_lines(500) if zlib.crc32(line) % BackupStore.CHUNK_LINE_DIVISOR][:50]
+
+    chunks = list(iter_chunks(io.BytesIO(b"".join(lines))))
+
+    assert all(len(chunk) < 100 + max(map(len, lines)) for chunk in chunks)
+    assert len(chunks) > 1
+
+def test_ingest_writes_a_manifest_and_deduplicates(backup_dir, store_dir, tmp_path, capsys):
+    path = ingest_backup(str(backup_dir), store_dir)
+
+    manifest = load_manifest(backup_dir.name, store_dir)
+    assert path.endswith(f"{backup_dir.name}.json")
+    assert manifest["metadata"] == {"backup_type": "full"}
+    assert sorted(manifest["files"]) == ["backup_metadata.json", "department.json", "time.json"]
+    assert manifest["files"]["time.json"]["size"] == (backup_dir / "time.json").stat().st_size
+
+    # the same tables again cost no new chunk data
+    second = tmp_path / "time_tracker_data_backup_20261020_120000"
+    second.mkdir()
+    for name in ("time.json", "department.json"):
+        (second / name).write_bytes((backup_dir / name).read_bytes())
+    capsys.readouterr()
+    ingest_backup(str(second), store_dir)
+    assert "; 0 bytes of new chunk data stored" in capsys.readouterr().out
+    assert list_manifests(store_dir) == [second.name, backup_dir.name]
+
+def test_materialized_backup_matches_the_original(backup_dir, store_dir, tmp_path):
+    ingest_backup(str(backup_dir), store_dir)
+
+    rebuilt = materialize_backup(backup_dir.name, str(tmp_path / "rebuilt"), store_dir)
+
+    for name in ("time.json", "department.json", "backup_metadata.json"):
+        assert (tmp_path / "rebuilt" / name).read_bytes() == (backup_dir / name).read_bytes()
+    assert rebuilt == str(tmp_path / "rebuilt")
+
+def test_verify_reports_a_corrupt_chunk_and_ingest_repairs_it(backup_dir, store_dir):
+    ingest_backup(str(backup_dir), store_dir)
+    assert verify_backup(backup_dir.name, store_dir) == []
+
+    chunk_hash = load_manifest(backup_dir.name, store_dir)["files"]["department.json"]["chunks"][0]
+    with open(chunk_path(store_dir, chunk_hash), "wb") as f:
+        f.write(zlib.compress(b"not the rows\n"))
+
+    problems = verify_backup(backup_dir.name, store_dir)
+    assert problems == [f"department.json: chunk {chunk_hash} is missing or corrupt"]
+    assert verify_backup("no_such_backup", store_dir) == ["No manifest found for no_such_backup"]
+
+    # a corrupt chunk is written again instead of being reused
+    ingest_backup(str(backup_dir), store_dir)
+    assert verify_backup(backup_dir.name, store_dir) == []
+
+def test_store_chunk_writes_each_chunk_once(store_dir):
+    chunk_hash, written = store_chunk(store_dir, b"row\n")
+
+    assert written > 0
+    assert store_chunk(store_dir, b"row\n") == (chunk_hash, 0)
+
+def test_gc_removes_only_old_unreferenced_chunks(backup_dir, store_dir):
+    ingest_backup(str(backup_dir), store_dir)
+    kept = set(chunk for info in load_manifest(backup_dir.name, store_dir)["files"].values() for chunk in info["chunks"])
+
+    old_hash, _ = store_chunk(store_dir, b"deleted backup row\n")
+    young_hash, _ = store_chunk(store_dir, b"row of an ingest still running\n")
+    an_hour_ago = time.time() - 3600
+    for chunk_hash in kept | {old_hash}:
+        os.utime(chunk_path(store_dir, chunk_hash), (an_hour_ago, an_hour_ago))
+
+    assert collect_garbage(store_dir, dry_run=True, grace_seconds=60)[0] == 1
+    assert os.path.exists(chunk_path(store_dir, old_hash))
+
+    removed, freed = collect_garbage(store_dir, grace_seconds=60)
+
+    assert removed == 1 and freed > 0
+    assert not os.path.exists(chunk_path(store_dir, old_hash))
+    assert os.path.exists(chunk_path(store_dir, young_hash))
+    assert verify_backup(backup_dir.name, store_dir) == []
+
+def test_gc_frees_the_chunks_of_a_deleted_backup(backup_dir, store_dir):
+    ingest_backup(str(backup_dir), store_dir)
+    delete_manifest(backup_dir.name, store_dir)
+
+    removed, _ = collect_garbage(store_dir, grace_seconds=0)
+
+    assert removed > 0
+    assert list_manifests(store_dir) == []
+    assert collect_garbage(store_dir, grace_seconds=0) == (0, 0)
+
+def test_table_checksum_ignores_row_order():
+    rows = [{"EMPID": "E001", "MINUTES": 30}, {"EMPID": "E002", "MINUTES": 45}]
+
+    assert table_checksum(rows) == table_checksum(reversed(rows))
+    assert table_checksum(rows) != table_checksum(rows[:1])
@@ -0,0 +1,85 @@
+import os
+import sys
+import pytest
+
+# the backup and restore scripts import each other by file name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "Data", "DB Nuke & Pave Files",
+                                "Copy and Restore DB"))
+
+import DB_BigRedButton
+from DB_BigRedButton import load_pipeline_state, run_pipeline
+
+@pytest.fixture
+def steps(monkeypatch):
+    # every pipeline step only records that it ran; set fail[name] to make it raise
+    calls = []
+    fail = {}
+
+    def step(name):
+        def run(state, conn):
+            calls.append(name)
+            if name in fail:
+                raise RuntimeError(fail.pop(name))
+            if name == "backup_data":
+                state["backup_dir"] = "backup_1"
+            elif name == "backup_schema":
+                state["schema_file"] = "schema_1.sql"
+        return run
+
+    for name in DB_BigRedButton.STEP_FUNCTIONS:
+        monkeypatch.setitem(DB_BigRedButton.STEP_FUNCTIONS, name, step(name))
+    return calls, fail
+
+def test_pipeline_runs_every_step_in_order(steps, tmp_path):
+    calls, _ = steps
+    state_file = str(tmp_path / "state.json")
+
+    state = run_pipeline(state_file=state_file, conn=object())
+
+    assert state["status"] == "done"
+    assert calls == ["backup_data", "backup_schema", "drop_tables", "restore_schema", "restore_data"]
+    assert load_pipeline_state(state_file)["backup_dir"] == "backup_1"
+
+def test_resume_after_failed_data_restore_restores_the_schema_again(steps, tmp_path):
+    calls, fail = steps
+    state_file = str(tmp_path / "state.json")
+
+    fail["restore_data"] = "Duplicate entry 'E001' for key 'PRIMARY'"
+    assert run_pipeline(state_file=state_file, conn=object())["status"] == "failed"
+    del calls[:]
+
+    state = run_pipeline(resume=True, state_file=state_file, conn=object())
+
+    assert state["status"] == "done"
+    # the backups are reused; the tables filled before the failure are emptied first
+    assert calls == ["restore_schema", "restore_data"]
+    assert state["schema_file"] == "schema_1.sql"
+
+def test_resume_continues_from_the_failed_step(steps, tmp_path):
+    calls, fail = steps
+    state_file = str(tmp_path / "state.json")
+
+    fail["backup_schema"] = "disk full"
+    assert run_pipeline(state_file=state_file, conn=object())["status"] == "failed"
+    del calls[:]
+
+    assert run_pipeline(resume=True, state_file=state_file, conn=object())["status"] == "done"
+    assert calls == ["backup_schema", "drop_tables", "restore_schema", "restore_data"]
+
+def test_failed_drop_is_a_warning(steps, tmp_path):
+    calls, fail = steps
+
+    fail["drop_tables"] = "no tables"
+    state = run_pipeline(state_file=str(tmp_path / "state.json"), conn=object())
+
+    assert state["status"] == "done"
+    assert state["steps"]["drop_tables"]["status"] == "warning"
+    assert calls[-1] == "restore_data"
+
+def test_declined_drop_cancels_before_anything_is_dropped(steps, tmp_path):
+    calls, _ = steps
+
+    state = run_pipeline(state_file=str(tmp_path / "state.json"), conn=object(), confirm_destructive=lambda: False)
+
+    assert state["status"] == "cancelled"
+    assert calls == ["backup_data", "backup_schema"]
@@ -0,0 +1,30 @@
+from src.Data.CacheBus import CacheBus, MAX_STAMP_BYTES
+
+def test_unpublished_entity_has_empty_stamp(tmp_path):
+    bus = CacheBus(str(tmp_path))
+
+    assert bus.stamp("projects") == (0, 0)
+
+def test_publish_changes_stamp_every_time(tmp_path):
+    bus = CacheBus(str(tmp_path))
+    bus.publish("projects")
+    first = bus.stamp("projects")
+    bus.publish("projects")
+
+    assert first != (0, 0)
+    assert bus.stamp("projects") != first
+    assert bus.stamp("employees") == (0, 0)
+
+def test_other_process_sees_publish(tmp_path):
+    reader = CacheBus(str(tmp_path))
+    before = reader.stamp("employees")
+    CacheBus(str(tmp_path)).publish("employees")
+
+    assert reader.stamp("employees") != before
+
+def test_stamp_file_stays_small(tmp_path):
+    bus = CacheBus(str(tmp_path))
+    for _ in range(MAX_STAMP_BYTES + 10):
+        bus.publish("departments")
+
+    assert bus.stamp("departments")[1] <= MAX_STAMP_BYTES
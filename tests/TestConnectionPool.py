@@ -0,0 +1,80 @@
+from src.Data.ConnectionPool import ConnectionPool, PoolExhaustedError
+import pytest
+import threading
+import time
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def cursor(self, prepared=False, buffered=False):
+        raise AssertionError("not used")
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def opened():
+    # every connection the pool opened, in order
+    return []
+
+@pytest.fixture
+def connect(opened):
+    def connect():
+        opened.append(FakeConnection(len(opened)))
+        return opened[-1]
+    return connect
+
+def test_handed_back_connection_is_reused_with_its_statements(connect, opened):
+    pool = ConnectionPool(connect, size=2, timeout=1)
+
+    first = pool.checkout()
+    first.temp_tables.add("tmp_ids_0")
+    pool.checkin(first)
+    again = pool.checkout()
+
+    assert again is first
+    assert again.statements is first.statements and again.temp_tables == {"tmp_ids_0"}
+    assert len(opened) == 1
+
+def test_checkout_waits_for_a_free_connection(connect, opened):
+    pool = ConnectionPool(connect, size=1, timeout=2)
+    held = pool.checkout()
+    threading.Timer(0.1, pool.checkin, (held,)).start()
+
+    started = time.monotonic()
+    assert pool.checkout() is held
+    assert time.monotonic() - started >= 0.05
+    assert len(opened) == 1
+
+def test_exhausted_pool_gives_up_after_the_timeout(connect):
+    pool = ConnectionPool(connect, size=1, timeout=0.1)
+    pool.checkout()
+
+    with pytest.raises(PoolExhaustedError):
+        pool.checkout()
+
+def test_discarded_connection_is_closed_and_its_slot_freed(connect, opened):
+    pool = ConnectionPool(connect, size=1, timeout=0.1)
+    broken = pool.checkout()
+    pool.discard(broken)
+
+    fresh = pool.checkout()
+    assert broken.connection.closed
+    assert fresh.connection is opened[1]
+    assert pool.stats() == {"size": 1, "open": 1, "idle": 0}
+
+def test_failed_connect_frees_its_slot():
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("Can't connect")
+        return FakeConnection(len(attempts))
+
+    pool = ConnectionPool(connect, size=1, timeout=0.1)
+    with pytest.raises(ConnectionError):
+        pool.checkout()
+    assert pool.checkout().connection.number == 2
@@ -0,0 +1,210 @@
+import io
+import json
+import os
+import re
+import sqlite3
+import sys
+import pytest
+
+# the backup and restore scripts import each other by file name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "Data", "DB Nuke & Pave Files",
+                                "Copy and Restore DB"))
+
+from BackupStore import table_checksum
+from Get_SaveAllCurrentData import backup_table_data, export_rows
+
+class SqliteCursor:
+    """
+    A dictionary cursor over sqlite, which understands the backticks, ? placeholders and
+    keyset conditions the backup script sends
+    """
+    def __init__(self, db):
+        self.db = db
+        self.statements = []
+        self.result = []
+
+    def execute(self, sql, params=()):
+        self.statements.append(" ".join(sql.split()))
+        cursor = self.db.execute(sql, params)
+        names = [column[0] for column in cursor.description or ()]
+        self.result = [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def fetchall(self):
+        return self.result
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def db():
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE time (EMPID TEXT, TIMEID TEXT, MINUTES INTEGER, PRIMARY KEY (EMPID, TIMEID))")
+    # inserted out of key order, as rows come back from a table without ORDER BY
+    db.executemany("INSERT INTO time VALUES (?, ?, ?)",
+                   [(f"E{i % 3}", f"t-{(i * 7) % 25:03d}", i) for i in range(25)])
+    yield db
+    db.close()
+
+def test_export_pages_through_the_primary_key(db, tmp_path):
+    cursor = SqliteCursor(db)
+    json_path = tmp_path / "time.json"
+
+    exported, checksum = export_rows(cursor, "time", None, (), ["EMPID", "TIMEID"], 25, str(json_path),
+                                     io.StringIO(), batch_size=4)
+
+    rows = json.loads(json_path.read_text())
+    assert exported == 25
+    assert [(row["EMPID"], row["TIMEID"]) for row in rows] == sorted((row["EMPID"], row["TIMEID"]) for row in rows)
+    assert len({(row["EMPID"], row["TIMEID"]) for row in rows}) == 25
+    assert checksum == table_checksum(rows)
+
+    # every batch after the first starts after the previous batch's last key
+    assert len(cursor.statements) == 7
+    assert all("ORDER BY `EMPID`, `TIMEID` LIMIT 4" in sql and "OFFSET" not in sql for sql in cursor.statements)
+    assert "WHERE ((`EMPID` > ?) OR (`EMPID` = ? AND `TIMEID` > ?))" in cursor.statements[1]
+
+def test_export_keeps_the_delta_condition_on_every_batch(db, tmp_path):
+    cursor = SqliteCursor(db)
+    json_path = tmp_path / "time.json"
+
+    exported, _ = export_rows(cursor, "time", "`MINUTES` >= ?", (10,), ["EMPID", "TIMEID"], 15, str(json_path),
+                              io.StringIO(), batch_size=4)
+
+    assert exported == 15
+    assert sorted(row["MINUTES"] for row in json.loads(json_path.read_text())) == list(range(10, 25))
+
+def test_table_without_primary_key_is_read_in_one_query(db, tmp_path):
+    cursor = SqliteCursor(db)
+    json_path = tmp_path / "time.json"
+
+    exported, _ = export_rows(cursor, "time", None, (), [], 25, str(json_path), io.StringIO(), batch_size=4)
+
+    assert exported == 25
+    assert cursor.statements == ["SELECT * FROM `time`"]
+    assert len(json.loads(json_path.read_text())) == 25
+
+class FakeServer:
+    """
+    MariaDB as far as backup_table_data sees it: sqlite tables, the information_schema
+    queries it sends, NOW() and the delete triggers of the deletion log
+    """
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute("CREATE TABLE time (TIMEID TEXT PRIMARY KEY, EMPID TEXT, MINUTES INTEGER, UPDATED_AT TEXT)")
+        self.db.execute("CREATE TABLE department (DPTID TEXT PRIMARY KEY, DPT_NAME TEXT)")
+        self.db.execute("CREATE TABLE row_deletions (ID INTEGER PRIMARY KEY, TABLE_NAME TEXT, ROW_KEY TEXT, "
+                        "DELETED_AT TEXT)")
+        self.db.executemany("INSERT INTO time VALUES (?, ?, ?, '2026-10-18 12:00:00')",
+                            [(f"t-{i:03d}", "E001", i) for i in range(10)])
+        self.db.executemany("INSERT INTO department VALUES (?, ?)", [("D01", "Sales"), ("D02", "Ops")])
+        self.now = "2026-10-19 01:00:00"
+        self.triggers = []
+        self.cursors = []
+
+    def delete(self, table, key_column, key, at):
+        self.db.execute(f"DELETE FROM {table} WHERE {key_column} = ?", (key,))
+        if any(trigger["table_name"] == table for trigger in self.triggers):
+            self.db.execute("INSERT INTO row_deletions (TABLE_NAME, ROW_KEY, DELETED_AT) VALUES (?, ?, ?)",
+                            (table, json.dumps([key]), at))
+
+    def cursor(self, dictionary=False):
+        cursor = ServerCursor(self)
+        self.cursors.append(cursor)
+        return cursor
+
+    def statements(self):
+        return [sql for cursor in self.cursors for sql in cursor.statements]
+
+    def close(self):
+        pass
+
+class ServerCursor(SqliteCursor):
+    def __init__(self, server):
+        super().__init__(server.db)
+        self.server = server
+
+    def execute(self, sql, params=()):
+        if "information_schema" not in sql and "DATABASE()" not in sql:
+            return super().execute(sql, params)
+
+        self.statements.append(" ".join(sql.split()))
+        if "NOW()" in sql:
+            self.result = [{"db_name": "time_tracker", "snapshot_time": self.server.now}]
+        elif "information_schema.triggers" in sql:
+            self.result = list(self.server.triggers)
+        elif "referenced_table_name" in sql:
+            self.result = []
+        elif "information_schema.tables" in sql:
+            names = self.db.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name").fetchall()
+            self.result = [{"table_name": name} for name, in names if name not in params]
+        elif "constraint_name = 'PRIMARY'" in sql:
+            columns = self.db.execute(f"PRAGMA table_info({params[0]})").fetchall()
+            self.result = [{"column_name": column[1]} for column in sorted(columns, key=lambda c: c[5]) if column[5]]
+        elif "information_schema.columns" in sql:
+            table = re.search(r"table_name = '(\w+)'", sql).group(1)
+            columns = self.db.execute(f"PRAGMA table_info({table})").fetchall()
+            self.result = [{"column_name": column[1], "data_type": column[2].lower(), "column_type": column[2].lower()}
+                           for column in columns]
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    # backups are found by directory name in the working directory
+    monkeypatch.chdir(tmp_path)
+    return FakeServer()
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def test_incremental_backup_reads_deletions_from_the_log(server):
+    server.triggers = [{"table_name": "time", "trigger_name": "trg_time_log_delete", "created": "2026-10-01 00:00:00"}]
+    full = backup_table_data("time_tracker_data_backup_20261019_010000", conn=server)
+
+    assert len(read_json(os.path.join(full, "time.json"))) == 10
+    # the log covers time's deletions, so only department's keys are saved
+    assert not os.path.exists(os.path.join(full, "time_keys.json"))
+    assert read_json(os.path.join(full, "department_keys.json")) == [["D01"], ["D02"]]
+
+    server.db.execute("UPDATE time SET MINUTES = 99, UPDATED_AT = '2026-10-19 02:00:00' WHERE TIMEID = 't-004'")
+    server.delete("time", "TIMEID", "t-007", "2026-10-19 02:30:00")
+    server.now = "2026-10-19 03:00:00"
+    del server.cursors[:]
+
+    delta = backup_table_data("time_tracker_data_backup_20261019_030000", incremental=True, conn=server)
+
+    metadata = read_json(os.path.join(delta, "backup_metadata.json"))
+    time_info = next(table for table in metadata["tables"] if table["name"] == "time")
+    assert metadata["parent_backup"] == full
+    assert (time_info["mode"], time_info["rows"], time_info["changed_rows"], time_info["deleted_rows"]) == \
+        ("delta", 9, 1, 1)
+    assert [row["TIMEID"] for row in read_json(os.path.join(delta, "time.json"))] == ["t-004"]
+    assert read_json(os.path.join(delta, "time_deleted.json")) == {"key_columns": ["TIMEID"], "keys": [["t-007"]]}
+    # no table is read key by key
+    assert not any(sql.startswith("SELECT `TIMEID`") for sql in server.statements())
+    assert "row_deletions" not in [table["name"] for table in metadata["tables"]]
+
+def test_incremental_backup_compares_keys_without_a_deletion_log(server):
+    full = backup_table_data("time_tracker_data_backup_20261019_010000", conn=server)
+    assert len(read_json(os.path.join(full, "time_keys.json"))) == 10
+
+    server.delete("time", "TIMEID", "t-002", "2026-10-19 02:30:00")
+    server.now = "2026-10-19 03:00:00"
+    delta = backup_table_data("time_tracker_data_backup_20261019_030000", incremental=True, conn=server)
+
+    assert read_json(os.path.join(delta, "time_deleted.json"))["keys"] == [["t-002"]]
+    assert read_json(os.path.join(delta, "time.json")) == []
+
+def test_log_newer_than_the_previous_backup_is_not_trusted(server):
+    backup_table_data("time_tracker_data_backup_20261019_010000", conn=server)
+
+    # deletions before the trigger existed are only found by comparing keys
+    server.delete("time", "TIMEID", "t-003", "2026-10-19 01:30:00")
+    server.triggers = [{"table_name": "time", "trigger_name": "trg_time_log_delete", "created": "2026-10-19 02:00:00"}]
+    server.delete("time", "TIMEID", "t-005", "2026-10-19 02:30:00")
+    server.now = "2026-10-19 03:00:00"
+    delta = backup_table_data("time_tracker_data_backup_20261019_030000", incremental=True, conn=server)
+
+    assert sorted(read_json(os.path.join(delta, "time_deleted.json"))["keys"]) == [["t-003"], ["t-005"]]
@@ -0,0 +1,272 @@
+import json
+import os
+import sqlite3
+import sys
+import mariadb
+import pytest
+
+# the backup and restore scripts import each other by file name
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "Data", "DB Nuke & Pave Files",
+                                "Copy and Restore DB"))
+
+import RestoreTime_tracker_data_backup as restore_module
+from BackupStore import table_checksum
+from RestoreTime_tracker_data_backup import (determine_restore_levels, determine_table_order, insert_batch,
+                                             iter_table_rows, rehearse_restore, verify_restored_data)
+
+ROWS = [{"EMPID": "E001", "NOTES": "line one, with [brackets] and a \"quote\""},
+        {"EMPID": "E002", "NOTES": None},
+        {"EMPID": "E003", "NOTES": "}, {"}]
+
+def write_backup(backup_dir, tables, dependencies):
+    backup_dir.mkdir(exist_ok=True)
+    (backup_dir / "backup_metadata.json").write_text(json.dumps({"tables": [{"name": name} for name in tables]}))
+    (backup_dir / "table_dependencies.json").write_text(json.dumps(
+        [{"table_name": table, "referenced_table_name": referenced} for table, referenced in dependencies]))
+    return str(backup_dir)
+
+def test_rows_are_streamed_across_small_reads(tmp_path):
+    table_file = tmp_path / "time.json"
+    # the layout the backup script writes: one row per line
+    table_file.write_text("[" + ",".join(f"\n  {json.dumps(row)}" for row in ROWS) + "\n]")
+
+    assert list(iter_table_rows(str(table_file), read_size=7)) == ROWS
+
+def test_empty_and_broken_table_files(tmp_path):
+    empty, blank, truncated, not_array = (tmp_path / name for name in ("empty", "blank", "truncated", "not_array"))
+    empty.write_text("[]")
+    blank.write_text("")
+    truncated.write_text('[\n  {"EMPID": "E001"},\n  {"EMPID": "E0')
+    not_array.write_text('{"EMPID": "E001"}')
+
+    assert list(iter_table_rows(str(empty))) == []
+    assert list(iter_table_rows(str(blank))) == []
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_table_rows(str(truncated), read_size=8))
+    with pytest.raises(ValueError, match="does not contain a JSON array"):
+        list(iter_table_rows(str(not_array)))
+
+def test_tables_are_grouped_into_dependency_levels(tmp_path):
+    backup_dir = write_backup(tmp_path / "backup",
+                              ["time", "projects", "employees", "departments", "login_table"],
+                              [("time", "projects"), ("time", "employees"), ("employees", "departments"),
+                               ("projects", "employees")])
+
+    order = determine_table_order(backup_dir)
+    levels = determine_restore_levels(backup_dir, order)
+
+    assert [sorted(level) for level in levels] == [["departments", "login_table"], ["employees"], ["projects"],
+                                                   ["time"]]
+
+def test_cycles_and_self_references_do_not_block_a_level(tmp_path):
+    backup_dir = write_backup(tmp_path / "backup", ["employees", "departments"],
+                              [("employees", "employees"), ("employees", "departments"),
+                               ("departments", "employees")])
+
+    order = determine_table_order(backup_dir)
+    levels = determine_restore_levels(backup_dir, order)
+
+    assert sum(levels, []) == order
+    assert len(levels) == 2
+
+def test_levels_without_a_dependency_file(tmp_path):
+    assert determine_restore_levels(str(tmp_path), ["a", "b"]) == [["a", "b"]]
+
+class BatchCursor:
+    """
+    Rejects any batch or row whose EMPID is in bad; a rejected batch keeps the rows before
+    the bad one, as the server does, until it is rolled back to the savepoint
+    """
+    def __init__(self, bad):
+        self.bad = bad
+        self.rows = []
+        self.savepoint = None
+        self.statements = []
+
+    def execute(self, sql, params=()):
+        self.statements.append(sql)
+        if sql == "SAVEPOINT restore_batch":
+            self.savepoint = len(self.rows)
+        elif sql == "ROLLBACK TO SAVEPOINT restore_batch":
+            del self.rows[self.savepoint:]
+        elif params[0] in self.bad:
+            raise mariadb.IntegrityError(f"Duplicate entry '{params[0]}' for key 'PRIMARY'")
+        else:
+            self.rows.append(params[0])
+
+    def executemany(self, sql, values):
+        for row_values in values:
+            self.execute(sql, row_values)
+
+def test_rejected_batch_is_rolled_back_before_rows_are_retried():
+    cursor = BatchCursor(bad={"E002"})
+    batch = [{"EMPID": "E001"}, {"EMPID": "E002"}, {"EMPID": "E003"}]
+
+    inserted, errors = insert_batch(cursor, "INSERT INTO employees (EMPID) VALUES (?)", batch, ["EMPID"])
+
+    assert (inserted, len(errors)) == (2, 1)
+    assert cursor.rows == ["E001", "E003"]
+
+def test_row_without_a_column_raises():
+    cursor = BatchCursor(bad=set())
+
+    with pytest.raises(ValueError, match="no NOTES column"):
+        insert_batch(cursor, "INSERT INTO time (EMPID, NOTES) VALUES (?, ?)", [{"EMPID": "E001"}], ["EMPID", "NOTES"])
+    assert cursor.statements == []
+
+class SqliteConnection:
+    """
+    A restored database as verify_restored_data sees it: dictionary cursors over sqlite
+    """
+    def __init__(self, db):
+        self.db = db
+        self.closed = False
+
+    def cursor(self, dictionary=False):
+        return SqliteCursor(self.db)
+
+    def close(self):
+        self.closed = True
+
+class SqliteCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rows = []
+
+    def execute(self, sql, params=()):
+        cursor = self.db.execute(sql.replace("`", '"'), params)
+        names = [column[0] for column in cursor.description]
+        self.rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def restored(monkeypatch):
+    # the scratch database, with employees restored as backed up and one time row changed
+    db = sqlite3.connect(":memory:")
+    db.execute("CREATE TABLE employees (EMPID TEXT PRIMARY KEY, NOTES TEXT)")
+    db.executemany("INSERT INTO employees VALUES (?, ?)", [(row["EMPID"], row["NOTES"]) for row in ROWS])
+    db.execute("CREATE TABLE time (TIMEID TEXT PRIMARY KEY, MINUTES INTEGER)")
+    db.executemany("INSERT INTO time VALUES (?, ?)", [("t-001", 30), ("t-002", 99)])
+    connections = []
+
+    def connect(database=None):
+        connections.append((database, SqliteConnection(db)))
+        return connections[-1][1]
+
+    monkeypatch.setattr(restore_module, "connect_to_database", connect)
+    yield connections
+    db.close()
+
+def write_verify_backup(backup_dir, time_rows):
+    backup_dir.mkdir()
+    (backup_dir / "time.json").write_text(json.dumps(time_rows))
+    # employees has its checksum recorded; time is from an older backup without one
+    (backup_dir / "backup_metadata.json").write_text(json.dumps({"tables": [
+        {"name": "employees", "rows": 3, "checksum": table_checksum(ROWS)},
+        {"name": "time", "rows": 2},
+    ]}))
+    return str(backup_dir)
+
+def test_verify_matches_counts_and_checksums(restored, tmp_path):
+    backup_dir = write_verify_backup(tmp_path / "backup", [{"TIMEID": "t-001", "MINUTES": 30},
+                                                           {"TIMEID": "t-002", "MINUTES": 45}])
+
+    report = verify_restored_data(backup_dir, "scratch_db")
+
+    assert report == [
+        {"table": "employees", "expected_rows": 3, "actual_rows": 3, "checksum": "match", "ok": True},
+        # same row count, but a row differs from the table file
+        {"table": "time", "expected_rows": 2, "actual_rows": 2, "checksum": "MISMATCH", "ok": False},
+    ]
+    assert [database for database, _ in restored] == ["scratch_db"]
+    assert restored[0][1].closed
+
+def test_verify_checks_only_row_counts_of_a_delta_without_checksums(restored, tmp_path):
+    backup_dir = write_verify_backup(tmp_path / "backup", [{"TIMEID": "t-002", "MINUTES": 45}])
+
+    report = verify_restored_data(backup_dir, "scratch_db", chain_length=2)
+
+    assert report[1] == {"table": "time", "expected_rows": 2, "actual_rows": 2, "checksum": "n/a", "ok": True}
+
+class RehearsalServer:
+    """
+    Stands in for everything rehearse_restore calls: records which database each step
+    targets and the statements sent to the server
+    """
+    def __init__(self, report):
+        self.report = report
+        self.calls = []
+        self.statements = []
+        self.fail_data_restore = False
+
+    def restore_database_schema(self, schema_file, auto_yes=False, target_db=None):
+        self.calls.append(("schema", schema_file, target_db))
+
+    def restore_table_data(self, backup_dir, workers, batch_size, store_dir, database):
+        self.calls.append(("data", backup_dir, database))
+        if self.fail_data_restore:
+            raise RuntimeError("Lost connection to server during query")
+        return [{"table": "employees", "seconds": 1.5}, {"table": "time", "seconds": 0.5}]
+
+    def verify_restored_data(self, backup_dir, database, chain_length=1):
+        self.calls.append(("verify", backup_dir, database))
+        return self.report
+
+    def connect_to_server(self):
+        return self
+
+    def cursor(self):
+        return self
+
+    def execute(self, sql, params=()):
+        self.statements.append(sql)
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def rehearsal(monkeypatch):
+    monkeypatch.setenv("DB_NAME", "time_tracker")
+    server = RehearsalServer([{"table": "employees", "expected_rows": 3, "actual_rows": 3, "checksum": "match",
+                               "ok": True}])
+    for name in ("restore_database_schema", "restore_table_data", "verify_restored_data", "connect_to_server"):
+        monkeypatch.setattr(restore_module, name, getattr(server, name))
+    monkeypatch.setattr(restore_module, "resolve_backup_chain", lambda backup_dir, store_dir: [backup_dir])
+    return server
+
+def test_rehearsal_restores_into_a_scratch_database_and_drops_it(rehearsal, capsys):
+    assert rehearse_restore("backup_1", schema_file="schema_1.sql") is True
+
+    scratch = rehearsal.calls[0][2]
+    assert scratch.startswith("time_tracker_restore_check_")
+    assert rehearsal.calls == [("schema", "schema_1.sql", scratch), ("data", "backup_1", scratch),
+                               ("verify", "backup_1", scratch)]
+    assert rehearsal.statements == [f"DROP DATABASE IF EXISTS `{scratch}`"]
+    out = capsys.readouterr().out
+    assert "Dry run passed" in out
+    assert "Total recovery time (RTO)" in out
+
+def test_failed_rehearsal_reports_the_table_and_can_keep_the_scratch_database(rehearsal, capsys):
+    rehearsal.report = [{"table": "time", "expected_rows": 2, "actual_rows": 1, "checksum": "MISMATCH", "ok": False}]
+
+    assert rehearse_restore("backup_1", schema_file="schema_1.sql", keep_scratch=True) is False
+
+    assert rehearsal.statements == []
+    out = capsys.readouterr().out
+    assert "<-- FAILED" in out and "Dry run FAILED" in out
+
+def test_scratch_database_is_dropped_when_the_data_restore_fails(rehearsal):
+    rehearsal.fail_data_restore = True
+
+    with pytest.raises(RuntimeError, match="Lost connection"):
+        rehearse_restore("backup_1", schema_file="schema_1.sql")
+
+    assert rehearsal.statements == [f"DROP DATABASE IF EXISTS `{rehearsal.calls[0][2]}`"]
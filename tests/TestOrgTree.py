@@ -0,0 +1,33 @@
+from src.Data.OrgTree import OrgTree, OrgNode
+import pytest
+
+@pytest.fixture
+def tree():
+    return OrgTree([
+        OrgNode("E001", None, "D01", 1),     # director
+        OrgNode("E002", "E001", "D01", 1),   # manager under E001
+        OrgNode("E003", "E002", "D02", 1),   # report in another department
+        OrgNode("E004", "E003", "D02", 1),   # indirect report, two levels down
+        OrgNode("E005", None, "D02", 1),     # unrelated, same department as E002's reports
+        OrgNode("E006", "E005", "D03", 0),
+    ])
+
+def test_all_reports_includes_indirect(tree):
+    assert tree.direct_reports("E002") == ["E003"]
+    assert tree.all_reports("E001") == {"E002", "E003", "E004"}
+    assert tree.all_reports("E004") == frozenset()
+
+def test_visible_to_manager(tree):
+    # E002 sees self, both levels of reports and the rest of D01
+    assert tree.visible_to_manager("E002") == {"E001", "E002", "E003", "E004"}
+    assert tree.can_see("E005", "E004")      # same department
+    assert not tree.can_see("E003", "E006")
+
+def test_chain_of_command(tree):
+    assert tree.chain_of_command("E004") == ["E003", "E002", "E001"]
+
+def test_manager_cycle_does_not_loop():
+    tree = OrgTree([("A", "B", None, 1), ("B", "A", None, 1)])
+
+    assert tree.all_reports("A") == {"B"}
+    assert tree.chain_of_command("A") == ["B"]
@@ -0,0 +1,22 @@
+from src.Logic.Permissions import Permissions
+
+def test_manager_sees_only_visible_employees():
+    permissions = Permissions("E002", "manager", frozenset({"E002", "E003"}), ["P1"], ["P1", "P2"])
+
+    assert not permissions.sees_everyone()
+    assert permissions.can_see_employee("E003")
+    assert not permissions.can_see_employee("E009")
+    assert permissions.filter_visible(["E003", "E009"]) == ["E003"]
+
+def test_unrestricted_role_sees_everyone():
+    permissions = Permissions("E001", "admin", None, [], [])
+
+    assert permissions.sees_everyone()
+    assert permissions.can_see_employee("E999")
+
+def test_only_owner_can_edit_project():
+    permissions = Permissions("E002", "individual", frozenset({"E002"}), ["P1"], ["P1", "P2"])
+
+    assert permissions.can_edit_project("P1")
+    assert not permissions.can_edit_project("P2")
+    assert permissions.is_project_member("P2")
@@ -0,0 +1,64 @@
+from src.Data.QueryCache import QueryCache, invalidates
+import time
+
+def test_read_through_counts_hits_and_misses():
+    cache = QueryCache()
+    calls = []
+    loader = lambda: calls.append(1) or ["P1", "P2"]
+
+    assert cache.get_or_load("projects", "all", loader, version=1) == ["P1", "P2"]
+    assert cache.get_or_load("projects", "all", loader, version=1) == ["P1", "P2"]
+    assert len(calls) == 1
+
+    stats = cache.stats()["projects"]
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["size"] == 1
+
+def test_new_version_is_a_miss():
+    cache = QueryCache()
+    cache.put("projects", "all", "old", version=1)
+
+    assert cache.get("projects", "all", version=2) == (False, None)
+    assert len(cache) == 0
+
+def test_entries_expire_after_ttl():
+    cache = QueryCache(ttls={"projects": 0.01})
+    cache.put("projects", "all", "value")
+    time.sleep(0.02)
+
+    assert cache.get("projects", "all") == (False, None)
+
+def test_lru_eviction():
+    cache = QueryCache(max_entries=2)
+    cache.put("employees", "a", 1)
+    cache.put("employees", "b", 2)
+    cache.get("employees", "a")          # a is now most recently used
+    cache.put("employees", "c", 3)
+
+    assert cache.get("employees", "b") == (False, None)
+    assert cache.get("employees", "a") == (True, 1)
+    assert cache.stats()["employees"]["evictions"] == 1
+
+def test_invalidate_one_entity():
+    cache = QueryCache()
+    cache.put("projects", "all", 1)
+    cache.put("departments", "all", 2)
+    cache.invalidate("projects")
+
+    assert cache.get("projects", "all") == (False, None)
+    assert cache.get("departments", "all") == (True, 2)
+
+def test_invalidates_decorator_bumps_after_call():
+    class FakeDatabase:
+        bumped = []
+
+        @classmethod
+        def bump_cache_version(cls, *entities):
+            cls.bumped.extend(entities)
+
+        @classmethod
+        @invalidates("projects")
+        def deactivate_project(cls, projectid):
+            return projectid
+
+    assert FakeDatabase.deactivate_project("P1") == "P1"
+    assert FakeDatabase.bumped == ["projects"]
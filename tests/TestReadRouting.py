@@ -0,0 +1,171 @@
+from src.Data import Database as database_module
+from src.Data.Database import Database
+from src.Data.ReadRouting import PRIMARY, REPLICA, REPLICA_LAG_SECONDS, connection_settings, prefers_primary
+from src.Data.Resilience import CircuitBreaker
+import mariadb
+import pytest
+import threading
+import time
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+
+    def execute(self, sql, params=()):
+        self.connection.queries.append(sql)
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return (0, None)
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self, host):
+        self.host = host
+        self.queries = []
+        self.commits = 0
+
+    def cursor(self, prepared=False, buffered=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def ping(self):
+        pass
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def servers(monkeypatch):
+    monkeypatch.setenv("DB_HOST", "primary")
+    monkeypatch.setenv("DB_PORT", "3306")
+    monkeypatch.setenv("DB_REPLICA_HOST", "replica")
+    monkeypatch.delenv("DB_REPLICA_PORT", raising=False)
+    connections = {}
+    down = set()
+
+    def connect(**settings):
+        if settings["host"] in down:
+            raise mariadb.OperationalError(f"Can't connect to {settings['host']}")
+        return connections.setdefault(settings["host"], FakeConnection(settings["host"]))
+
+    def discard_both():
+        Database.begin_request(None)
+        Database.discard_connection()
+        Database.run_on_replica(lambda cls: cls.discard_connection())
+
+    monkeypatch.setattr(database_module.mariadb, "connect", connect)
+    monkeypatch.setattr(Database, "_Database__pools", {})
+    monkeypatch.setattr(Database, "_Database__breakers", {
+        PRIMARY: CircuitBreaker(failure_threshold=1, reset_seconds=60),
+        REPLICA: CircuitBreaker(failure_threshold=1, reset_seconds=60),
+    })
+    discard_both()
+    Database.begin_request(None)
+    yield connections, down
+    discard_both()
+
+def queried(connections, host):
+    return host in connections and any("FROM time t" in sql for sql in connections[host].queries)
+
+def test_replica_settings_default_to_the_primary(monkeypatch):
+    monkeypatch.setenv("DB_HOST", "primary")
+    monkeypatch.setenv("DB_PORT", "3306")
+    monkeypatch.setenv("DB_USER", "tracker")
+    monkeypatch.setenv("DB_REPLICA_HOST", "replica")
+    monkeypatch.setenv("DB_REPLICA_PORT", "3307")
+    monkeypatch.delenv("DB_REPLICA_USER", raising=False)
+
+    settings = connection_settings("replica")
+    assert settings["host"] == "replica"
+    assert settings["port"] == 3307
+    assert settings["user"] == "tracker"
+    assert connection_settings("primary")["host"] == "primary"
+
+def test_prefers_primary_right_after_a_write():
+    now = 1000.0
+    assert not prefers_primary(None, now)
+    assert prefers_primary(now - 1, now)
+    assert not prefers_primary(now - REPLICA_LAG_SECONDS - 1, now)
+
+def test_reports_read_from_the_replica(servers):
+    connections, _ = servers
+    Database.get_report_rows(empids=["E001"])
+
+    assert queried(connections, "replica")
+    assert not queried(connections, "primary")
+
+def test_reports_read_from_the_primary_after_own_write(servers):
+    connections, _ = servers
+    Database.begin_request(last_write_at=time.time() - 1)
+    Database.get_report_rows(empids=["E001"])
+
+    assert queried(connections, "primary")
+    assert not queried(connections, "replica")
+
+def test_write_in_the_same_request_switches_to_the_primary(servers):
+    connections, _ = servers
+    Database.commit()
+    Database.get_report_rows(empids=["E001"])
+
+    assert Database.last_write_at() is not None
+    assert queried(connections, "primary")
+    assert not queried(connections, "replica")
+
+def test_cache_versions_are_read_on_the_primary_without_committing(servers, monkeypatch):
+    connections, _ = servers
+    monkeypatch.setattr(Database, "_Database__cache_version_connection", None)
+    monkeypatch.setattr(Database, "_Database__cache_versions_read_at", 0.0)
+    monkeypatch.setattr(Database, "_Database__cache_versions_available", True)
+
+    Database.run_on_replica(lambda cls: cls.get_cache_version("projects"))
+
+    assert "SELECT ENTITY, VERSION FROM cache_version" in connections["primary"].queries
+    assert connections["primary"].autocommit is True
+    assert "replica" not in connections or not connections["replica"].queries
+    assert all(connection.commits == 0 for connection in connections.values())
+
+def test_unreachable_replica_falls_back_to_the_primary(servers):
+    connections, down = servers
+    down.add("replica")
+    Database.get_report_rows(empids=["E001"])
+
+    assert queried(connections, "primary")
+
+def test_replica_read_does_not_close_the_primary_breaker(servers):
+    connections, down = servers
+    down.add("primary")
+    with pytest.raises(mariadb.OperationalError):
+        Database.get_connection()
+    assert Database.get_retry_after() > 0
+
+    Database.get_report_rows(empids=["E001"])
+
+    assert queried(connections, "replica")
+    assert Database.get_retry_after() > 0
+
+def test_connections_outlive_the_request_threads(servers):
+    def request():
+        Database.begin_request(None)
+        Database.get_report_rows(empids=["E001"])
+        Database.get_connection()
+        Database.release_connection()
+
+    for _ in range(3):
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+    stats = Database.get_pool_stats()
+    assert (stats[PRIMARY]["open"], stats[PRIMARY]["idle"]) == (1, 1)
+    assert (stats[REPLICA]["open"], stats[REPLICA]["idle"]) == (1, 1)
@@ -0,0 +1,95 @@
+from src.Logic.Reporting import TimeColumns, employee_project_pivot, iso_week_label, parse_iso_week
+from src.Data.RowModels import ReportRow, TimeEntryRow, DailyMinutesRow
+from datetime import datetime, date
+import pytest
+import pytz
+
+@pytest.fixture
+def rows():
+    return [
+        ReportRow("E001", "Ann Lee", "D01", "Sales", "P1", "Alpha", datetime(2025, 5, 5, 16, 0), 30),
+        ReportRow("E001", "Ann Lee", "D01", "Sales", "P2", "Beta", datetime(2025, 5, 5, 17, 0), 45),
+        ReportRow("E002", "Bo Kim", "D02", "Ops", "P1", "Alpha", datetime(2025, 5, 6, 3, 0), 60),
+        ReportRow("E001", "Ann Lee", "D01", "Sales", "P1", "Alpha", datetime(2025, 5, 12, 16, 0), 15),
+    ]
+
+def test_group_sum_by_project(rows):
+    columns = TimeColumns.from_rows(rows)
+
+    assert columns.group_sum("project") == {"Alpha": 105, "Beta": 45}
+    assert columns.total() == 150
+    assert len(columns) == 4
+
+def test_employee_project_pivot(rows):
+    pivot = employee_project_pivot(rows)
+
+    assert pivot.row_labels == ["Ann Lee", "Bo Kim"]
+    assert pivot.col_labels == ["Alpha", "Beta"]
+    assert pivot.cells == [[45, 45], [60, 0]]
+    assert pivot.to_nested_dict() == {"Ann Lee": {"Alpha": 45, "Beta": 45}, "Bo Kim": {"Alpha": 60}}
+    assert pivot.grand_total == 150
+
+def test_days_use_local_timezone(rows):
+    # 2025-05-06 03:00 UTC is still May 5 in Los Angeles
+    columns = TimeColumns.from_rows(rows, pytz.timezone("America/Los_Angeles"))
+    days = columns.group_sum("day")
+
+    assert days[datetime(2025, 5, 5).date()] == 135
+
+def test_department_week_pivot(rows):
+    pivot = TimeColumns.from_rows(rows).pivot("department", "week")
+
+    assert pivot.row_labels == ["Ops", "Sales"]
+    assert pivot.col_labels == ["2025-W19", "2025-W20"]
+    assert pivot.cells == [[60, 0], [75, 15]]
+
+def test_time_entry_rows_and_running_timers():
+    rows = [
+        TimeEntryRow("t1", "Ann", "Lee", "Alpha", datetime(2025, 5, 5, 16, 0), None, None, None, 0),
+        TimeEntryRow("t2", "Ann", "Lee", "Alpha", datetime(2025, 5, 5, 17, 0), None, None, 20, 0),
+    ]
+
+    assert TimeColumns.from_rows(rows).group_sum("employee") == {"Ann Lee": 20}
+
+def test_empty_rows():
+    columns = TimeColumns.from_rows([])
+
+    assert columns.group_sum("project") == {}
+    assert columns.pivot("employee", "project").to_nested_dict() == {}
+
+def test_parse_iso_week():
+    assert parse_iso_week("2025-W19") == date(2025, 5, 5)
+    assert iso_week_label(date(2025, 5, 11)) == "2025-W19"
+    assert iso_week_label(parse_iso_week("2026-W01")) == "2026-W01"
+
+def test_parse_iso_week_rejects_bad_input():
+    for bad in ["2025-19", "2025-W54", "", None]:
+        try:
+            parse_iso_week(bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+def test_database_bucketed_rows():
+    rows = [
+        DailyMinutesRow("E001", "Ann Lee", "P1", "Alpha", date(2025, 5, 5), 90),
+        DailyMinutesRow("E002", "Bo Kim", "P1", "Alpha", date(2025, 5, 5), 30),
+        DailyMinutesRow("E002", "Bo Kim", "P2", "Beta", date(2025, 5, 6), 10),
+    ]
+    columns = TimeColumns.from_rows(rows)
+
+    assert columns.group_sum("day") == {date(2025, 5, 5): 120, date(2025, 5, 6): 10}
+    assert columns.pivot("employee", "project").to_nested_dict() == {"Ann Lee": {"Alpha": 90},
+                                                                      "Bo Kim": {"Alpha": 30, "Beta": 10}}
+
+def test_local_days_at_slot_edges_and_missing_start_times():
+    rows = [
+        # 06:59:59 UTC is 23:59:59 on May 4 in Los Angeles; one second later it is May 5
+        ReportRow("E001", "Ann Lee", "D01", "Sales", "P1", "Alpha", datetime(2025, 5, 5, 6, 59, 59), 10),
+        ReportRow("E001", "Ann Lee", "D01", "Sales", "P1", "Alpha", datetime(2025, 5, 5, 7, 0, 0), 20),
+        ReportRow("E002", "Bo Kim", "D02", "Ops", "P1", "Alpha", None, 5),
+    ]
+    columns = TimeColumns.from_rows(rows, pytz.timezone("America/Los_Angeles"))
+
+    assert columns.group_sum("day") == {date(2025, 5, 4): 10, date(2025, 5, 5): 20, None: 5}
+    assert columns.group_sum("week") == {"2025-W18": 10, "2025-W19": 20, None: 5}
@@ -0,0 +1,113 @@
+from src.Data import Resilience
+from src.Data.Resilience import CircuitBreaker, DatabaseUnavailableError, backoff_delay, retries_reads
+import mariadb
+import pytest
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeDatabase:
+    calls = 0
+    failures_left = 0
+    discarded = 0
+
+    @classmethod
+    def discard_connection(cls):
+        cls.discarded += 1
+
+    @classmethod
+    @retries_reads
+    def read(cls):
+        cls.calls += 1
+        if cls.failures_left:
+            cls.failures_left -= 1
+            raise mariadb.InterfaceError("Lost connection to server")
+        return "rows"
+
+    @classmethod
+    @retries_reads
+    def outer(cls):
+        return cls.read()
+
+@pytest.fixture
+def database(monkeypatch):
+    monkeypatch.setattr(Resilience.time, "sleep", lambda seconds: None)
+    FakeDatabase.calls = FakeDatabase.failures_left = FakeDatabase.discarded = 0
+    return FakeDatabase
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=10, clock=clock)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == 10
+
+def test_breaker_lets_one_probe_through_after_reset():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    # a failed probe opens it again for another reset period
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 15
+    assert not breaker.allow()
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+def test_backoff_delay_is_jittered_and_capped():
+    delays = [backoff_delay(attempt, base=0.1, cap=1.0) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 1.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+def test_read_is_retried_on_a_fresh_connection(database):
+    database.failures_left = 1
+
+    assert database.read() == "rows"
+    assert database.calls == 2
+    assert database.discarded == 1
+
+def test_read_gives_up_after_retry_attempts(database):
+    database.failures_left = 100
+
+    with pytest.raises(mariadb.InterfaceError):
+        database.read()
+    assert database.calls == Resilience.RETRY_ATTEMPTS
+
+def test_nested_reads_only_retry_at_the_outermost_call(database):
+    database.failures_left = 1
+
+    assert database.outer() == "rows"
+    assert database.calls == 2
+
+def test_open_breaker_is_not_retried(database):
+    calls = []
+
+    class Closed(FakeDatabase):
+        @classmethod
+        @retries_reads
+        def read(cls):
+            calls.append(1)
+            raise DatabaseUnavailableError("Database unavailable")
+
+    with pytest.raises(DatabaseUnavailableError):
+        Closed.read()
+    assert calls == [1]
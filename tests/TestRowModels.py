@@ -0,0 +1,45 @@
+from src.Data.RowModels import EmployeeRow, LoginRow, ProjectRow, TimeEntryRow, to_row, to_rows
+from datetime import datetime
+import pytest
+
+def test_cursor_rows_become_named_rows():
+    rows = to_rows(ProjectRow, [("P1", "Alpha"), ("P2", "Beta")])
+
+    assert rows == [ProjectRow("P1", "Alpha"), ProjectRow("P2", "Beta")]
+    assert [row.project_name for row in rows] == ["Alpha", "Beta"]
+    # still unpack and index like the cursor's tuples
+    projectid, name = rows[0]
+    assert (projectid, name, rows[1][0]) == ("P1", "Alpha", "P2")
+
+def test_no_rows():
+    assert to_rows(ProjectRow, []) == []
+    assert to_rows(ProjectRow, iter(())) == []
+
+def test_single_row_or_none():
+    row = to_row(EmployeeRow, ("E001", "Ann", "Lee", "D01", "ann@example.com", None, 1, "Employee"))
+
+    assert row.empid == "E001"
+    assert row.mgr_empid is None
+    assert to_row(EmployeeRow, None) is None
+
+def test_rows_are_immutable():
+    row = to_row(TimeEntryRow, ("t1", "Ann", "Lee", "Alpha", datetime(2025, 5, 5, 16, 0), None, None, None, 0))
+
+    with pytest.raises(AttributeError):
+        row.total_minutes = 30
+    assert row._replace(total_minutes=30).total_minutes == 30
+    assert row.total_minutes is None
+
+def test_row_of_the_wrong_width_raises():
+    with pytest.raises(TypeError):
+        to_row(ProjectRow, ("P1", "Alpha", "extra"))
+    with pytest.raises(TypeError):
+        to_rows(ProjectRow, [("P1",)])
+
+def test_login_row_without_the_joined_role():
+    # LOGIN_COLUMNS leaves out EMP_ROLE, which only the join with employee_table selects
+    row = to_row(LoginRow, ("L1", "E001", "hash", None, 0))
+
+    assert row.emp_role is None
+    assert to_row(LoginRow, ("L1", "E001", "hash", None, 0, "Admin")).emp_role == "Admin"
+    assert to_rows(LoginRow, [("L1", "E001", "hash", None, 0)])[0].emp_role is None
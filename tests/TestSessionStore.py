@@ -0,0 +1,39 @@
+from src.UI.WebUI.SessionStore import FileSystemSessionInterface
+import os
+import stat
+import pytest
+
+def mode_of(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+def test_session_dir_must_be_configured(monkeypatch):
+    monkeypatch.delenv("SESSION_DIR", raising=False)
+
+    with pytest.raises(RuntimeError, match="SESSION_DIR is not set"):
+        FileSystemSessionInterface()
+
+def test_session_dir_is_created_owner_only(monkeypatch, tmp_path):
+    session_dir = tmp_path / "sessions"
+    monkeypatch.setenv("SESSION_DIR", str(session_dir))
+
+    store = FileSystemSessionInterface()
+
+    assert store.session_dir == str(session_dir)
+    assert mode_of(session_dir) == 0o700
+
+def test_existing_session_dir_is_tightened(tmp_path):
+    session_dir = tmp_path / "sessions"
+    session_dir.mkdir(mode=0o777)
+    os.chmod(session_dir, 0o777)
+
+    FileSystemSessionInterface(str(session_dir))
+
+    assert mode_of(session_dir) == 0o700
+
+def test_sessions_round_trip(tmp_path):
+    store = FileSystemSessionInterface(str(tmp_path / "sessions"))
+    store._write("abc_123", {"empid": "E001"})
+
+    assert store.load("abc_123", lifetime_seconds=60) == {"empid": "E001"}
+    assert mode_of(store._path("abc_123")) == 0o600
+    assert store.load("../abc_123", lifetime_seconds=60) is None
@@ -0,0 +1,92 @@
+from src.Data.StatementCache import IN_LIST_BUCKETS, MAX_PREPARED_PARAMS, StatementCache, in_list
+import pytest
+
+class FakeCursor:
+    def __init__(self, prepared):
+        self.prepared = prepared
+        self.statements = []
+        self.closed = False
+
+    def execute(self, sql, params):
+        if "BROKEN" in sql:
+            raise RuntimeError("syntax error")
+        self.statements.append((sql, list(params)))
+
+    def close(self):
+        self.closed = True
+
+class FakeConnection:
+    def __init__(self):
+        self.cursors = []
+
+    def cursor(self, prepared=False, buffered=False):
+        cursor = FakeCursor(prepared)
+        self.cursors.append(cursor)
+        return cursor
+
+def test_in_list_pads_to_bucket_sizes():
+    assert in_list(["E001"]) == ("(?)", ["E001"])
+    assert in_list(["E001", "E002"]) == ("(?, ?, ?, ?)", ["E001", "E002", "E002", "E002"])
+
+    shapes = {in_list(range(n))[0] for n in range(1, IN_LIST_BUCKETS[-1] + 1)}
+    assert len(shapes) == len(IN_LIST_BUCKETS)
+
+def test_in_list_beyond_largest_bucket_is_exact():
+    placeholders, params = in_list(range(300))
+    assert placeholders.count("?") == 300
+    assert params == list(range(300))
+
+def test_empty_in_list_matches_nothing():
+    assert in_list([]) == ("(NULL)", [])
+
+def test_same_sql_reuses_prepared_cursor():
+    connection = FakeConnection()
+    cache = StatementCache(connection, max_statements=8)
+
+    first = cache.execute("SELECT 1 FROM time WHERE EMPID = ?", ("E001",))
+    second = cache.execute("SELECT 1 FROM time WHERE EMPID = ?", ("E002",))
+
+    assert first is second
+    assert first.prepared
+    assert first.statements[1] == ("SELECT 1 FROM time WHERE EMPID = ?", ["E002"])
+    assert cache.stats() == {"statements": 1, "hits": 1, "misses": 1}
+
+def test_least_recently_used_statement_is_closed():
+    connection = FakeConnection()
+    cache = StatementCache(connection, max_statements=2)
+
+    a = cache.execute("SELECT ?", (1,))
+    b = cache.execute("SELECT ?, ?", (1, 2))
+    cache.execute("SELECT ?", (1,))
+    cache.execute("SELECT ?, ?, ?", (1, 2, 3))
+
+    assert b.closed and not a.closed
+    assert cache.stats()["statements"] == 2
+
+def test_failed_statement_is_not_kept():
+    connection = FakeConnection()
+    cache = StatementCache(connection)
+
+    with pytest.raises(RuntimeError):
+        cache.execute("SELECT BROKEN", ())
+    assert connection.cursors[0].closed
+    assert cache.stats()["statements"] == 0
+
+def test_oversized_and_disabled_run_unprepared():
+    connection = FakeConnection()
+    cache = StatementCache(connection)
+    cursor = cache.execute("SELECT ...", list(range(MAX_PREPARED_PARAMS + 1)))
+    assert not cursor.prepared
+
+    disabled = StatementCache(connection, max_statements=0)
+    assert not disabled.execute("SELECT ?", (1,)).prepared
+
+def test_close_closes_every_statement():
+    connection = FakeConnection()
+    cache = StatementCache(connection)
+    cache.execute("SELECT ?", (1,))
+    cache.execute("SELECT ?, ?", (1, 2))
+
+    cache.close()
+    assert all(cursor.closed for cursor in connection.cursors)
+    assert cache.stats()["statements"] == 0
@@ -1,5 +1,9 @@
 from src.Logic.TimeEntry import TimeEntry
+from src.Data import Database as database_module
+from src.Data.Database import Database
 from datetime import datetime, timedelta
+import mariadb
+import pytest
 
 def test_time_entry_all_fields():
     start = datetime(2025, 4, 20, 13, 0)
@@ -42,4 +46,183 @@ def test_time_entry_manual_start_stop_and_save():
 
     entry.save_to_database()  # 🔥 this saves it to the DB
 
-    assert entry.get_total_minutes() == 90
\ No newline at end of file
+    assert entry.get_total_minutes() == 90
+
+def integrity_error(errno, message):
+    error = mariadb.IntegrityError(message)
+    error.errno = errno
+    return error
+
+class FakeTimeTable:
+    """
+    The time table's keys the way MariaDB enforces them: PRIMARY (TIMEID), uq_time_open_timer
+    (one open timer per EMPID) and the PROJECTID foreign key, and timer_early_stops. Only the
+    statements the timer methods send are understood; anything else returns no rows.
+    """
+    def __init__(self, projects):
+        self.projects = projects
+        self.rows = {}          # TIMEID -> [EMPID, STOP_TIME]
+        self.early_stops = {}   # TIMEID -> [EMPID, STOP_TIME]
+        self.statements = []
+        self.id_rows = 0
+
+    def insert(self, timeid, empid, projectid, stop_time):
+        if projectid not in self.projects:
+            raise integrity_error(1452, "Cannot add or update a child row: a foreign key constraint fails")
+        if timeid in self.rows:
+            raise integrity_error(1062, f"Duplicate entry '{timeid}' for key 'PRIMARY'")
+        if stop_time is None and any(row == [empid, None] for row in self.rows.values()):
+            raise integrity_error(1062, f"Duplicate entry '{empid}' for key 'uq_time_open_timer'")
+        self.rows[timeid] = [empid, stop_time]
+
+class FakeCursor:
+    def __init__(self, table):
+        self.table = table
+        self.result = []
+        self.rowcount = 0
+
+    def execute(self, sql, params=()):
+        sql = " ".join(sql.split())
+        self.table.statements.append(sql)
+        self.result = []
+        if sql.startswith("INSERT INTO timer_early_stops"):
+            held = params[0] not in self.table.rows
+            if held:
+                self.table.early_stops.setdefault(params[0], [params[1], params[2]])
+            self.rowcount = int(held)
+        elif sql.startswith("UPDATE time t JOIN timer_early_stops"):
+            row, stop = self.table.rows.get(params[0]), self.table.early_stops.get(params[0])
+            self.rowcount = int(bool(row and stop) and row[1] is None and row[0] == stop[0])
+            if self.rowcount:
+                row[1] = stop[1]
+        elif sql.startswith("DELETE FROM timer_early_stops"):
+            self.rowcount = int(self.table.early_stops.pop(params[0], None) is not None)
+        elif sql.startswith("INSERT INTO time") and "STOP_TIME" in sql:
+            self.table.insert(params[0], params[1], params[2], params[4])
+        elif sql.startswith("INSERT INTO time"):
+            self.table.insert(params[0], params[1], params[2], None)
+        elif sql.startswith("SELECT TIMEID FROM time WHERE EMPID = ? AND STOP_TIME IS NULL"):
+            self.result = [(timeid,) for timeid, row in self.table.rows.items() if row == [params[0], None]][:1]
+        elif sql.startswith("SELECT TIMEID FROM time WHERE TIMEID = ? AND EMPID = ?"):
+            row = self.table.rows.get(params[0])
+            self.result = [(params[0],)] if row and row[0] == params[1] else []
+        elif sql.startswith("UPDATE time SET STOP_TIME"):
+            row = self.table.rows.get(params[1])
+            self.rowcount = int(bool(row) and row == [params[2], None])
+            if self.rowcount:
+                row[1] = params[0]
+
+    def executemany(self, sql, rows):
+        self.table.statements.append(" ".join(sql.split()))
+        self.table.id_rows += len(rows)
+
+    def fetchone(self):
+        return self.result[0] if self.result else None
+
+    def fetchall(self):
+        return self.result
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    def __init__(self, table):
+        self.table = table
+
+    def cursor(self, prepared=False, buffered=False):
+        return FakeCursor(self.table)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def ping(self):
+        pass
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def time_table(monkeypatch):
+    # Database runs against an in-memory time table instead of the real database
+    table = FakeTimeTable(projects={"P001"})
+    Database.release_connection()
+    for name, value in (("DB_HOST", "fake"), ("DB_PORT", "3306"), ("DB_USER", "tracker"), ("DB_NAME", "time_tracker")):
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("DB_REPLICA_HOST", raising=False)
+    monkeypatch.setattr(database_module.mariadb, "connect", lambda **settings: FakeConnection(table))
+    monkeypatch.setattr(Database, "_Database__pools", {})
+    Database.begin_request(None)
+    yield table
+    Database.release_connection()
+
+def test_timer_start_and_stop_are_idempotent(time_table):
+    started = Database.start_timer("E001", "P001", "Double-click test", timeid="t-dbl00001")
+    retried = Database.start_timer("E001", "P001", "Double-click test", timeid="t-dbl00001")
+    other_tab = Database.start_timer("E001", "P001", "Second tab")
+
+    assert started == ("t-dbl00001", True)
+    assert retried == ("t-dbl00001", False)
+    assert other_tab == ("t-dbl00001", False)
+
+    assert Database.stop_timer("E001", "t-dbl00001") == ("t-dbl00001", True)
+    assert Database.stop_timer("E001", "t-dbl00001") == ("t-dbl00001", False)
+
+def test_timer_start_rejected_for_other_reasons_raises(time_table):
+    # unknown project: a foreign key error, not "a timer is already running"
+    with pytest.raises(mariadb.IntegrityError):
+        Database.start_timer("E001", "P-missing")
+
+    # another employee's TIMEID: a collision, not a retried start
+    Database.start_timer("E001", "P001", timeid="t-own00001")
+    with pytest.raises(mariadb.IntegrityError):
+        Database.start_timer("E002", "P001", timeid="t-own00001")
+
+def test_long_empid_list_goes_through_a_temporary_table(time_table):
+    # the padding IDs match nothing; past IN_LIST_TEMP_TABLE_THRESHOLD they are loaded into a temporary table
+    Database.get_time_entries_filtered_multiple_empids(["E001"])
+    Database.get_time_entries_filtered_multiple_empids(["E001"] + [f"zz-{i:06d}" for i in range(2000)])
+
+    short, long = [sql for sql in time_table.statements if sql.startswith("SELECT") and "FROM time t" in sql]
+    assert "t.EMPID IN (?)" in short
+    assert "t.EMPID IN (SELECT ID FROM tmp_ids_0)" in long
+    assert time_table.id_rows == 2001
+
+def test_manual_entry_is_written_or_rejected(time_table):
+    entry = ("E001", "P001", "2025-05-20 09:00", "2025-05-20 10:00")
+
+    assert Database.add_manual_time_entry(*entry, timeid="t-man00001") == "t-man00001"
+    # a retried save is a no-op
+    assert Database.add_manual_time_entry(*entry, timeid="t-man00001") == "t-man00001"
+    assert time_table.rows["t-man00001"] == ["E001", "2025-05-20 10:00:00"]
+
+    with pytest.raises(mariadb.IntegrityError):
+        Database.add_manual_time_entry("E001", "P-missing", "2025-05-20 11:00", "2025-05-20 12:00")
+    with pytest.raises(mariadb.IntegrityError):
+        Database.add_manual_time_entry("E002", "P001", "2025-05-20 11:00", "2025-05-20 12:00", timeid="t-man00001")
+
+def test_stop_that_arrives_before_its_start_is_applied_with_it(time_table):
+    # worker B stops a timer whose start is still in worker A's journal
+    assert Database.stop_timer("E001", "t-early001") == ("t-early001", True)
+    assert "t-early001" not in time_table.rows
+
+    Database.apply_timer_ops([{"op": "start", "timeid": "t-early001", "empid": "E001", "projectid": "P001",
+                               "notes": None, "at": "2025-05-20 09:00:00"}])
+    assert time_table.rows["t-early001"][1] is not None
+    assert time_table.early_stops == {}
+
+    # the same through both journals, and for a start written directly
+    Database.apply_timer_ops([{"op": "stop", "timeid": "t-early002", "empid": "E001", "at": "2025-05-20 11:00:00"}])
+    Database.apply_timer_ops([{"op": "start", "timeid": "t-early002", "empid": "E001", "projectid": "P001",
+                               "notes": None, "at": "2025-05-20 10:00:00"}])
+    assert time_table.rows["t-early002"] == ["E001", "2025-05-20 11:00:00"]
+
+    Database.stop_timer("E001", "t-early003")
+    assert Database.start_timer("E001", "P001", timeid="t-early003") == ("t-early003", True)
+    assert time_table.rows["t-early003"][1] is not None
+
+    # a stop of an existing, already stopped timer is not held
+    assert Database.stop_timer("E001", "t-early003") == ("t-early003", False)
+    assert time_table.early_stops == {}
@@ -0,0 +1,24 @@
+from src.Utils.TimeZones import get_zone, day_boundaries, local_day_range, local_to_utc, DEFAULT_TIMEZONE
+from datetime import datetime, date
+
+def test_zones_are_cached():
+    assert get_zone("America/New_York") is get_zone("America/New_York")
+
+def test_unknown_zone_falls_back_to_default():
+    assert get_zone("Not/AZone").zone == DEFAULT_TIMEZONE
+    assert get_zone(None).zone == DEFAULT_TIMEZONE
+
+def test_day_boundaries_across_dst_change():
+    # US clocks sprang forward on 2025-03-09, so that day is 23 hours long
+    boundaries = day_boundaries(date(2025, 3, 8), 2, "America/New_York")
+
+    assert boundaries == [datetime(2025, 3, 8, 5, 0), datetime(2025, 3, 9, 5, 0), datetime(2025, 3, 10, 4, 0)]
+
+def test_local_day_range():
+    start, end = local_day_range(date(2025, 5, 5), date(2025, 5, 11), "America/Los_Angeles")
+
+    assert start == datetime(2025, 5, 5, 7, 0)
+    assert end == datetime(2025, 5, 12, 7, 0)
+
+def test_local_to_utc():
+    assert local_to_utc(datetime(2025, 1, 15, 9, 30), "Asia/Kolkata") == datetime(2025, 1, 15, 4, 0)
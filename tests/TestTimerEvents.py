@@ -0,0 +1,30 @@
+from src.UI.WebUI.TimerEvents import format_event, TimerWatch
+from src.Data.Database import Database
+from src.Data.RowModels import ActiveTimerRow
+from datetime import datetime
+import json
+
+def test_format_event_is_one_sse_message():
+    message = format_event("timer", {"running": True, "timeid": "t-1"})
+    lines = message.split("\n")
+
+    assert lines[0] == "event: timer"
+    assert json.loads(lines[1][len("data: "):]) == {"running": True, "timeid": "t-1"}
+    assert message.endswith("\n\n")
+
+def test_watch_sends_only_changes(monkeypatch):
+    stamp = [(1, 1)]
+    timer = [None]
+    queries = []
+    monkeypatch.setattr(Database, "get_timer_stamp", lambda empid: stamp[0])
+    monkeypatch.setattr(Database, "get_active_timer_for_user", lambda empid: queries.append(empid) or timer[0])
+    watch = TimerWatch("E001")
+
+    assert "\"running\": false" in watch.poll()
+    assert watch.poll() is None
+    assert len(queries) == 1
+
+    stamp[0] = (2, 2)
+    timer[0] = ActiveTimerRow("t-1", "Apollo", datetime(2025, 5, 20, 13, 0), None)
+    assert "\"timeid\": \"t-1\"" in watch.poll()
+    assert len(queries) == 2
@@ -0,0 +1,53 @@
+from src.Logic.UserProfile import profile_is_stale, permissions_from_profile, version_token
+import pytest
+import time
+
+@pytest.fixture
+def profile():
+    return {
+        "empid": "E002",
+        "role": "manager",
+        "first_name": "Ann",
+        "last_name": "Lee",
+        "dptid": "D01",
+        "mgr_empid": "E001",
+        "visible_empids": ["E002", "E003"],
+        "owned_project_ids": ["P1"],
+        "member_project_ids": ["P1", "P2"],
+        "built_at": time.time()
+    }
+
+def test_fresh_profile_is_not_stale(profile):
+    assert not profile_is_stale(profile, "E002", "manager")
+
+def test_profile_for_other_user_or_role_is_stale(profile):
+    assert profile_is_stale(profile, "E003", "manager")
+    assert profile_is_stale(profile, "E002", "admin")
+    assert profile_is_stale(None, "E002", "manager")
+
+def test_old_profile_is_stale(profile):
+    profile["built_at"] = time.time() - 3600
+
+    assert profile_is_stale(profile, "E002", "manager")
+
+def test_permissions_from_profile(profile):
+    permissions = permissions_from_profile(profile)
+
+    assert permissions.can_see_employee("E003")
+    assert not permissions.can_see_employee("E004")
+    assert permissions.can_edit_project("P1")
+    assert permissions.is_project_member("P2")
+
+def test_permissions_from_unrestricted_profile(profile):
+    profile.update(role="admin", visible_empids=None)
+    permissions = permissions_from_profile(profile)
+
+    assert permissions.sees_everyone()
+
+def test_profile_is_stale_after_version_change(profile):
+    versions = ((3, (100, 1)), (7, (0, 0)), (1, (0, 0)))
+    profile["versions"] = version_token(versions)
+
+    assert not profile_is_stale(profile, "E002", "manager", versions)
+    assert profile_is_stale(profile, "E002", "manager", ((3, (200, 2)), (7, (0, 0)), (1, (0, 0))))
+    assert profile_is_stale(profile, "E002", "manager", ((4, (100, 1)), (7, (0, 0)), (1, (0, 0))))
@@ -0,0 +1,253 @@
+from src.Data.Database import Database
+from src.Data.WriteBehind import WriteBehindQueue, on_temporary_storage, read_journal
+import fcntl
+import glob
+import json
+import mariadb
+import os
+import pytest
+import tempfile
+import time
+
+@pytest.fixture
+def batches():
+    # every batch the queue applied, in order
+    return []
+
+@pytest.fixture
+def queue(tmp_path, batches, request):
+    # a queue journaling to tmp_path; other options are passed with
+    # @pytest.mark.parametrize("queue", [{...}], indirect=True)
+    options = {"flush_interval_ms": 20, **getattr(request, "param", {})}
+    return WriteBehindQueue(batches.append, journal_dir=str(tmp_path), fsync=False, **options)
+
+def wait_until(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+OPS = [{"op": "start", "timeid": "t-1", "empid": "E001", "projectid": "P001", "notes": None, "at": "2025-05-20 13:00:00"},
+       {"op": "stop", "timeid": "t-1", "empid": "E001", "at": "2025-05-20 14:00:00"}]
+
+@pytest.mark.parametrize("queue", [{"flush_interval_ms": 50, "flush_batch": 100}], indirect=True)
+def test_submit_journals_then_flushes_in_one_batch(queue, batches):
+    queue.start()
+
+    seq = None
+    for i in range(5):
+        seq = queue.submit({"op": "notes", "timeid": f"t-{i}", "notes": "x"})
+
+    assert queue.wait_applied(seq, timeout=2)
+    assert sum(len(batch) for batch in batches) == 5
+    assert len(batches) == 1
+    queue.stop()
+
+@pytest.mark.parametrize("queue", [{"flush_interval_ms": 10000, "flush_batch": 3}], indirect=True)
+def test_full_batch_flushes_before_interval(queue):
+    queue.start()
+
+    for i in range(3):
+        queue.submit({"op": "notes", "timeid": f"t-{i}", "notes": "x"})
+
+    assert queue.wait_applied(timeout=2)
+    queue.stop()
+
+def test_journal_is_truncated_once_applied(queue):
+    queue.start()
+    queue.submit({"op": "stop", "timeid": "t-1", "empid": "E001", "at": "2025-05-20 13:00:00"})
+    queue.wait_applied(timeout=2)
+
+    assert os.path.getsize(queue.journal_path) == 0
+    queue.stop()
+
+def test_orphaned_journal_is_replayed_on_start(queue, batches, tmp_path):
+    orphan = tmp_path / "timer-999999-000000.jsonl"
+    orphan.write_text("".join(json.dumps(op) + "\n" for op in OPS) + '{"op": "sto')
+
+    assert queue.start() == 2
+    assert queue.wait_applied(timeout=2)
+    assert batches == [OPS]
+    assert not orphan.exists()
+    queue.stop()
+
+def test_orphans_are_replayed_with_write_behind_off(tmp_path, monkeypatch):
+    orphan = tmp_path / "timer-999997-000000.jsonl"
+    orphan.write_text("".join(json.dumps(op) + "\n" for op in OPS))
+    applied = []
+    monkeypatch.setattr(Database, "apply_timer_ops", classmethod(lambda cls, ops: applied.extend(ops)))
+
+    assert Database.start_journal(journal_dir=str(tmp_path), flush_interval_ms=20, fsync=False) == 2
+    try:
+        assert Database.wait_for_queued_writes(timeout=2)
+        assert applied == OPS
+        assert not orphan.exists()
+    finally:
+        Database.stop_journal()
+
+def test_writes_are_committed_directly_again_once_the_journal_drained(tmp_path, monkeypatch):
+    down = [True]
+    inserted = []
+    applied = []
+
+    class Cursor:
+        rowcount = 0
+
+        def execute(self, sql, params=()):
+            if down[0]:
+                raise mariadb.OperationalError("Lost connection to server")
+            if sql.strip().startswith("INSERT"):
+                inserted.append(params[0])
+
+    def apply(cls, ops):
+        if down[0]:
+            raise mariadb.OperationalError("Lost connection to server")
+        applied.extend(op["timeid"] for op in ops)
+
+    monkeypatch.setattr(Database, "get_cursor", classmethod(lambda cls: Cursor()))
+    monkeypatch.setattr(Database, "commit", classmethod(lambda cls: None))
+    monkeypatch.setattr(Database, "apply_timer_ops", classmethod(apply))
+
+    Database.start_journal(journal_dir=str(tmp_path), flush_interval_ms=20, fsync=False)
+    try:
+        assert Database.start_timer("E001", "P001", timeid="t-down") == ("t-down", True)
+        assert wait_until(lambda: not Database.is_write_behind_healthy())
+        down[0] = False
+
+        assert wait_until(lambda: applied == ["t-down"])
+        assert Database.start_timer("E001", "P001", timeid="t-up") == ("t-up", True)
+        assert inserted == ["t-up"]
+        assert applied == ["t-down"]
+    finally:
+        Database.stop_journal()
+
+def test_orphan_adopted_by_another_worker_meanwhile_is_skipped(queue, batches, tmp_path, monkeypatch):
+    orphan = tmp_path / "timer-999996-000000.jsonl"
+    orphan.write_text("".join(json.dumps(op) + "\n" for op in OPS))
+    # listed, then moved away by a worker that booted at the same time
+    taken = tmp_path / "timer-999996-000001.jsonl"
+    listed = glob.glob
+    monkeypatch.setattr(glob, "glob", lambda pattern: listed(pattern) + [str(taken)])
+
+    assert queue.start() == 2
+    assert queue.wait_applied(timeout=2)
+    assert batches == [OPS]
+    queue.stop()
+
+def test_segments_of_a_live_process_are_left_alone(queue, tmp_path):
+    segment = tmp_path / "timer-999998-000000.jsonl"
+    segment.write_text("".join(json.dumps(op) + "\n" for op in OPS))
+    with open(tmp_path / "timer-999998.lock", "a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        assert queue.start() == 0
+        assert segment.exists()
+        queue.stop()
+
+@pytest.mark.parametrize("queue", [{"flush_interval_ms": 10000, "flush_batch": 1000, "segment_bytes": 200}],
+                         indirect=True)
+def test_full_segments_are_sealed_and_removed_once_applied(queue, batches, tmp_path):
+    queue.start()
+    for i in range(10):
+        queue.submit({"op": "notes", "timeid": f"t-{i}", "notes": "x" * 40})
+
+    segments = sorted(tmp_path.glob("timer-*-*.jsonl"))
+    assert len(segments) > 2
+    assert sum(len(read_journal(str(path))) for path in segments) == 10
+
+    queue.stop()
+    assert [op["timeid"] for batch in batches for op in batch] == [f"t-{i}" for i in range(10)]
+    assert list(tmp_path.glob("timer-*")) == []
+
+def test_failed_flush_keeps_operations(tmp_path):
+    calls = []
+
+    def flaky(batch):
+        calls.append(list(batch))
+        if len(calls) == 1:
+            raise ConnectionError("database unavailable")
+
+    queue = WriteBehindQueue(flaky, journal_dir=str(tmp_path), flush_interval_ms=20, fsync=False)
+    queue.start()
+    queue.submit({"op": "notes", "timeid": "t-1", "notes": "x"})
+
+    assert read_journal(queue.journal_path) == [{"op": "notes", "timeid": "t-1", "notes": "x"}]
+    assert wait_until(lambda: not queue.is_healthy())
+    # readers are not held up while the database is unreachable
+    assert queue.wait_applied(timeout=5) is False
+    assert wait_until(lambda: queue.pending_count() == 0)
+    assert queue.is_healthy()
+    assert calls[0] == calls[1]
+    queue.stop()
+
+def test_rejected_operation_is_dead_lettered(tmp_path):
+    applied = []
+
+    def strict(batch):
+        if any(op["notes"] == "bad" for op in batch):
+            raise ValueError("Data too long for column 'NOTES'")
+        applied.extend(op["timeid"] for op in batch)
+
+    queue = WriteBehindQueue(strict, journal_dir=str(tmp_path), flush_interval_ms=20, flush_batch=100, fsync=False)
+    queue.start()
+    for i, notes in enumerate(["x", "bad", "y"]):
+        queue.submit({"op": "notes", "timeid": f"t-{i}", "notes": notes})
+
+    assert queue.wait_applied(timeout=5)
+    assert applied == ["t-0", "t-2"]
+    assert queue.is_healthy()
+    rejected = [json.loads(line) for line in open(queue.dead_letter_path, encoding="utf-8")]
+    assert [entry["op"]["timeid"] for entry in rejected] == ["t-1"]
+    assert "Data too long" in rejected[0]["error"]
+    queue.stop()
+
+class MariaDbLikeCursor:
+    """
+    Runs the statements apply_timer_ops sends the way MariaDB treats a foreign key error:
+    an error, unless the statement says IGNORE (then only a warning, and no row).
+    """
+    rowcount = 0
+
+    def __init__(self, projects, rows):
+        self.projects = projects
+        self.rows = rows
+
+    def execute(self, sql, params=()):
+        if sql.strip().startswith("INSERT"):
+            if params[2] not in self.projects:
+                if "IGNORE" in sql:
+                    return
+                raise mariadb.IntegrityError("Cannot add or update a child row: a foreign key constraint fails")
+            self.rows.setdefault(params[0], params)
+
+    def close(self):
+        pass
+
+def test_start_for_an_unknown_project_is_dead_lettered(tmp_path, monkeypatch):
+    rows = {}
+
+    class Connection:
+        def rollback(self):
+            pass
+
+    monkeypatch.setattr(Database, "get_cursor", classmethod(lambda cls: MariaDbLikeCursor({"P001"}, rows)))
+    monkeypatch.setattr(Database, "get_connection", classmethod(lambda cls: Connection()))
+    monkeypatch.setattr(Database, "commit", classmethod(lambda cls: None))
+
+    Database.enable_write_behind(journal_dir=str(tmp_path), flush_interval_ms=20, fsync=False)
+    try:
+        Database.start_timer("E001", "P-missing", timeid="t-bad")
+        Database.add_time_entry("t-good", "E001", "P001", "2025-05-20 13:00:00", "2025-05-20 14:00:00", None, 0, 60)
+        assert Database.wait_for_queued_writes(timeout=5)
+    finally:
+        Database.stop_journal()
+
+    rejected = [json.loads(line) for line in open(tmp_path / "dead-letter.jsonl", encoding="utf-8")]
+    assert [entry["op"]["timeid"] for entry in rejected] == ["t-bad"]
+    assert list(rows) == ["t-good"]
+
+def test_journal_on_temporary_storage_is_detected():
+    assert on_temporary_storage(os.path.join(tempfile.gettempdir(), "time_tracker_journal"))
+    assert on_temporary_storage("/dev/shm/time_tracker_journal")